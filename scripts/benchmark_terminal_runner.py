@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Benchmark the terminal output throughput of the Docker and Kubernetes terminal sessions.
+
+The sessions are connected to in-process fakes (a socket pair for Docker, a fake websocket client for Kubernetes),
+so no Docker daemon or Kubernetes cluster is required. Timings depend on the host, so this script is not part of the
+test suite.
+
+Usage:
+    python3 scripts/benchmark_terminal_runner.py [--size MB] [--echoes N]
+"""
+import argparse
+import os
+import queue
+import socket
+import statistics
+import sys
+import threading
+import time
+from unittest import mock
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from Kathara.foundation.manager.terminal.core import TerminalRunner as terminal_runner_module
+from Kathara.foundation.manager.terminal.core.IConsoleAdapter import IConsoleAdapter
+from Kathara.foundation.manager.terminal.core.TerminalRunner import TerminalRunner, MIN_READ_SIZE
+from Kathara.manager.docker.terminal.session.DockerTTYTerminalSession import DockerTTYTerminalSession
+from Kathara.manager.kubernetes.terminal.session.KubernetesWSTerminalSession import KubernetesWSTerminalSession
+
+MB: int = 1024 * 1024
+
+
+class CountingConsole(IConsoleAdapter):
+    """Console discarding the output, counting the writes and the written bytes."""
+
+    def __init__(self, on_write=None):
+        self.writes = 0
+        self.size = 0
+        self.on_write = on_write
+
+    def enter_raw(self):
+        pass
+
+    def exit_raw(self):
+        pass
+
+    def install_input_reader(self, loop, on_bytes, on_close):
+        pass
+
+    def remove_input_reader(self, loop):
+        pass
+
+    def write_stdout(self, data):
+        self.writes += 1
+        self.size += len(data)
+        if self.on_write:
+            self.on_write(data)
+
+    def watch_resize(self, loop, cb):
+        pass
+
+    def unwatch_resize(self, loop):
+        pass
+
+
+class FakeWSClient(object):
+    """Websocket client returning the frames put in its queue, until a None is received."""
+
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.buffer = []
+        self.connected = True
+
+    def is_open(self):
+        return self.connected
+
+    def update(self, timeout=0):
+        try:
+            frame = self.frames.get(timeout=timeout)
+            while frame is not None:
+                self.buffer.append(frame)
+                frame = self.frames.get_nowait()
+            self.connected = False
+        except queue.Empty:
+            pass
+
+    def read_all(self):
+        (data, self.buffer) = ("".join(self.buffer), [])
+        return data
+
+    def close(self):
+        self.connected = False
+
+
+def run_docker_session(payload, chunk_size=65536):
+    (session_socket, container_socket) = socket.socketpair()
+    console = CountingConsole()
+    handler = Mock(fileno=Mock(return_value=session_socket.detach()))
+    runner = TerminalRunner(console, DockerTTYTerminalSession(handler, Mock(), "exec_id"))
+
+    def produce():
+        with container_socket:
+            for i in range(0, len(payload), chunk_size):
+                container_socket.sendall(payload[i:i + chunk_size])
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    start = time.perf_counter()
+    runner.start()
+    elapsed = time.perf_counter() - start
+    producer.join()
+
+    return console, elapsed
+
+
+def run_kubernetes_session(frames):
+    ws_client = FakeWSClient()
+    console = CountingConsole()
+    runner = TerminalRunner(console, KubernetesWSTerminalSession(ws_client))
+
+    def produce():
+        for frame in frames:
+            ws_client.frames.put(frame)
+        ws_client.frames.put(None)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    start = time.perf_counter()
+    runner.start()
+    elapsed = time.perf_counter() - start
+    producer.join()
+
+    return console, elapsed
+
+
+def run_kubernetes_echoes(echoes):
+    ws_client = FakeWSClient()
+    latencies = []
+    sent_at = []
+
+    def on_write(_):
+        latencies.append(time.perf_counter() - sent_at[-1])
+        if len(latencies) < echoes:
+            sent_at.append(time.perf_counter())
+            ws_client.frames.put("$ ")
+        else:
+            ws_client.frames.put(None)
+
+    runner = TerminalRunner(CountingConsole(on_write=on_write), KubernetesWSTerminalSession(ws_client))
+    sent_at.append(time.perf_counter())
+    ws_client.frames.put("$ ")
+    runner.start()
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the terminal output throughput of the sessions.")
+    parser.add_argument("--size", type=int, default=32, help="Megabytes of output of each session (default: 32).")
+    parser.add_argument("--echoes", type=int, default=50, help="Number of Kubernetes echo round trips (default: 50).")
+    args = parser.parse_args()
+
+    size = args.size * MB
+    payload = b"x" * size
+
+    with mock.patch.object(terminal_runner_module, "MAX_READ_SIZE", MIN_READ_SIZE):
+        (fixed_console, fixed_time) = run_docker_session(payload)
+    print(f"docker, fixed reads:    {fixed_console.writes} writes, {args.size / fixed_time:.2f}MB/s")
+
+    (adaptive_console, adaptive_time) = run_docker_session(payload)
+    print(f"docker, adaptive reads: {adaptive_console.writes} writes, {args.size / adaptive_time:.2f}MB/s")
+
+    frame_size = 16384
+    (kubernetes_console, kubernetes_time) = run_kubernetes_session(["x" * frame_size] * (size // frame_size))
+    print(f"kubernetes:             {kubernetes_console.writes} writes, {args.size / kubernetes_time:.2f}MB/s")
+
+    latencies = run_kubernetes_echoes(args.echoes)
+    print(f"kubernetes echo latency: median {statistics.median(latencies) * 1000:.2f}ms, "
+          f"max {max(latencies) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
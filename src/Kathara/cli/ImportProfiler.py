@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import importlib.abc
+import sys
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from ..exceptions import InstantiationError
+
+IMPORT_PROFILE_ENV_VAR: str = "KATHARA_IMPORT_PROFILE"
+DEFAULT_REPORT_SIZE: int = 25
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Measure the time spent executing each imported module.
+
+    The profiler is a meta path finder that wraps the loader of each module found by the other finders, so it only
+    measures modules imported after `start` is called.
+
+    Attributes:
+        timings (Dict[str, Tuple[float, float]]): Keys are module names, values are tuples composed by the time spent
+            executing the module body only and the time spent executing it including its imports (in seconds).
+    """
+    __slots__ = ['timings', '_stack', '_start_time', '_enabled']
+
+    __instance: ImportProfiler = None
+
+    @staticmethod
+    def get_instance() -> ImportProfiler:
+        """Get an instance of the ImportProfiler.
+
+        Returns:
+            ImportProfiler: An instance of the class.
+
+        Raises:
+            InstantiationError: If two instances of the class are created.
+        """
+        if ImportProfiler.__instance is None:
+            ImportProfiler()
+
+        return ImportProfiler.__instance
+
+    def __init__(self) -> None:
+        if ImportProfiler.__instance is not None:
+            raise InstantiationError("This class is a singleton!")
+        else:
+            self.timings: Dict[str, Tuple[float, float]] = {}
+            self._stack: List[List[float]] = []
+            self._start_time: Optional[float] = None
+            self._enabled: bool = False
+
+            ImportProfiler.__instance = self
+
+    def start(self) -> None:
+        """Start measuring the imported modules.
+
+        Returns:
+            None
+        """
+        if self._enabled:
+            return
+
+        self._enabled = True
+        self._start_time = time.perf_counter()
+        sys.meta_path.insert(0, self)
+
+    def stop(self) -> None:
+        """Stop measuring the imported modules.
+
+        Returns:
+            None
+        """
+        if not self._enabled:
+            return
+
+        self._enabled = False
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        """Find the module spec using the other finders and wrap its loader to measure the module execution.
+
+        Args:
+            fullname (str): The fully qualified name of the module.
+            path (Any): The path of the parent package, if any.
+            target (Any): The module object, passed when the module is reloaded.
+
+        Returns:
+            Any: The module spec, None if no other finder can find the module.
+        """
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            # Built-in and frozen importers are classes shared by all their modules, do not patch them
+            loader = spec.loader
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+                loader.exec_module = self._wrap_exec_module(fullname, loader.exec_module)
+
+            return spec
+
+        return None
+
+    def _wrap_exec_module(self, fullname: str, exec_module: Any) -> Any:
+        """Wrap the `exec_module` method of a loader to record the time spent executing the module.
+
+        Args:
+            fullname (str): The fully qualified name of the module.
+            exec_module (Any): The original `exec_module` method of the loader.
+
+        Returns:
+            Any: The wrapped method.
+        """
+
+        def timed_exec_module(module: Any) -> None:
+            # Each frame accumulates the cumulative time of the nested imports
+            self._stack.append([0.0])
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                cumulative = time.perf_counter() - start
+                (children,) = self._stack.pop()
+                if self._stack:
+                    self._stack[-1][0] += cumulative
+                self.timings[fullname] = (cumulative - children, cumulative)
+
+        return timed_exec_module
+
+    def get_packages_timings(self) -> Dict[str, float]:
+        """Return the time spent executing the modules of each top-level package.
+
+        Returns:
+            Dict[str, float]: Keys are top-level package names, values are the sum of the modules self times.
+        """
+        packages = {}
+        for name, (self_time, _) in self.timings.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + self_time
+
+        return packages
+
+    def print_report(self, size: int = DEFAULT_REPORT_SIZE, stream: Optional[TextIO] = None) -> None:
+        """Print the import-time breakdown.
+
+        Args:
+            size (int): The number of modules and packages to print.
+            stream (Optional[TextIO]): The stream where to print the report. Default is sys.stderr.
+
+        Returns:
+            None
+        """
+        stream = stream if stream else sys.stderr
+
+        total = sum(self_time for self_time, _ in self.timings.values())
+        elapsed = time.perf_counter() - self._start_time if self._start_time is not None else 0.0
+
+        stream.write(f"Imported {len(self.timings)} modules in {total * 1000:.1f} ms "
+                     f"({elapsed * 1000:.1f} ms since start).\n")
+
+        stream.write(f"\n{'self [ms]':>10} | package\n")
+        packages = sorted(self.get_packages_timings().items(), key=lambda x: x[1], reverse=True)
+        for package, self_time in packages[:size]:
+            stream.write(f"{self_time * 1000:>10.1f} | {package}\n")
+
+        stream.write(f"\n{'self [ms]':>10} | {'cumulative [ms]':>15} | module\n")
+        modules = sorted(self.timings.items(), key=lambda x: x[1][1], reverse=True)
+        for name, (self_time, cumulative) in modules[:size]:
+            stream.write(f"{self_time * 1000:>10.1f} | {cumulative * 1000:>15.1f} | {name}\n")
+
+        stream.flush()
@@ -0,0 +1,342 @@
+import json
+import logging
+import os
+import select
+import shlex
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional, Set
+
+from .TerminalBrokerClient import TerminalBrokerClient, BROKER_COMMAND, CLIENT_FDS, RESIZE_NOTIFICATION
+from .. import utils
+from ..foundation.cli.command.Command import Command
+from ..manager.Kathara import Kathara
+from ..setting.Setting import Setting
+
+# Printed by the broker on its stdout when it accepts connections
+READY_MESSAGE: bytes = b"ready"
+# Seconds to wait for the broker to be ready
+READY_TIMEOUT: float = 10.0
+# Seconds after which an idle broker exits, once the command that started it is terminated
+IDLE_TIMEOUT: float = 30.0
+# Seconds between two checks of the state of the broker
+POLL_INTERVAL: float = 1.0
+# Seconds to wait for the request of a client
+REQUEST_TIMEOUT: float = 5.0
+MAX_REQUEST_SIZE: int = 65536
+
+
+class TerminalBroker(object):
+    """Serve the terminals of the devices of a running network scenario from a single long-lived process.
+
+    Opening a terminal with `kathara connect` starts a full CLI for each device, that loads the settings and connects
+    to the manager from scratch. The broker pays this cost once: it listens on a Unix socket and, for each client
+    attached with `TerminalBrokerClient`, forks a session process that inherits the already initialized manager.
+    The session runs `connect` on the standard streams passed by the client, so the startup logs, the wait for the
+    startup commands and the TTY are handled exactly as in `kathara connect`.
+
+    The broker exits when the command that started it is terminated and no session is running.
+
+    Attributes:
+        lab_path (str): The path of the network scenario.
+        lab_hash (str): The hash of the network scenario.
+        socket_path (str): The path of the socket of the broker.
+    """
+    __slots__ = ['lab_path', 'lab_hash', 'socket_path', '_server', '_socket_inode', '_sessions', '_parent_pid']
+
+    def __init__(self, lab_path: str, lab_hash: str) -> None:
+        self.lab_path: str = lab_path
+        self.lab_hash: str = lab_hash
+        self.socket_path: str = TerminalBrokerClient.get_socket_path(lab_hash)
+
+        self._server: Optional[socket.socket] = None
+        self._socket_inode: Optional[int] = None
+        # PIDs of the running session processes
+        self._sessions: Set[int] = set()
+        self._parent_pid: int = os.getppid()
+
+    @staticmethod
+    def spawn(lab_path: str, lab_hash: str) -> bool:
+        """Start the terminal broker of a network scenario in background and wait until it is ready.
+
+        Args:
+            lab_path (str): The path of the network scenario.
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            bool: True if the broker is ready, else False.
+        """
+        executable_path = utils.get_executable_path(sys.argv[0])
+        if not executable_path:
+            return False
+
+        command = shlex.split(executable_path) + [BROKER_COMMAND, lab_path, lab_hash]
+        logging.debug(f"Starting terminal broker with command: {command}")
+        try:
+            process = subprocess.Popen(command, cwd=lab_path, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, start_new_session=True)
+        except OSError as e:
+            logging.debug(f"Cannot start the terminal broker: {str(e)}")
+            return False
+
+        with process.stdout:
+            (readable, _, _) = select.select([process.stdout], [], [], READY_TIMEOUT)
+            is_ready = bool(readable) and process.stdout.readline().strip() == READY_MESSAGE
+
+        if not is_ready:
+            logging.debug("Terminal broker not ready, terminals are opened with `kathara connect`.")
+
+        return is_ready
+
+    @staticmethod
+    def spawn_in_background(lab_path: str, lab_hash: str) -> threading.Thread:
+        """Start the terminal broker of a network scenario in background, without waiting until it is ready.
+
+        Terminals opened before the broker is ready are opened with `kathara connect`.
+
+        Args:
+            lab_path (str): The path of the network scenario.
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            threading.Thread: The thread waiting for the broker to be ready.
+        """
+        spawn_thread = threading.Thread(target=TerminalBroker.spawn, args=(lab_path, lab_hash), daemon=True)
+        spawn_thread.start()
+
+        return spawn_thread
+
+    def serve(self) -> None:
+        """Initialize the manager and serve the clients until the broker is idle.
+
+        Returns:
+            None
+        """
+        # Imported here since the broker dispatches the same events of `kathara connect`
+        from .ui.event.register import register_cli_events
+
+        Command._load_custom_configuration(self.lab_path)
+        # Sessions only look up the device, the events thread of the cache cannot survive the fork
+        Setting.get_instance().state_cache = False
+        Kathara.get_instance()
+        register_cli_events()
+
+        self._listen()
+        self._notify_ready()
+
+        try:
+            idle_since = None
+            while True:
+                self._reap_sessions()
+
+                try:
+                    (connection, _) = self._server.accept()
+                except socket.timeout:
+                    if self._sessions or os.getppid() == self._parent_pid:
+                        idle_since = None
+                    elif idle_since is None:
+                        idle_since = time.monotonic()
+                    elif time.monotonic() - idle_since > IDLE_TIMEOUT:
+                        break
+
+                    continue
+
+                idle_since = None
+                self._start_session(connection)
+        finally:
+            self._close()
+
+    def _listen(self) -> None:
+        """Bind the socket of the broker, replacing the one of a previous broker of the same network scenario.
+
+        Returns:
+            None
+
+        Raises:
+            PermissionError: If the socket directory is not private to the current user.
+        """
+        socket_directory = os.path.dirname(self.socket_path)
+        os.makedirs(socket_directory, mode=0o700, exist_ok=True)
+        directory_stat = os.lstat(socket_directory)
+        if not stat.S_ISDIR(directory_stat.st_mode) or directory_stat.st_uid != os.geteuid() or \
+                directory_stat.st_mode & 0o077:
+            raise PermissionError(f"Directory `{socket_directory}` is not private to the current user.")
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._socket_inode = os.stat(self.socket_path).st_ino
+        self._server.listen()
+        self._server.settimeout(POLL_INTERVAL)
+
+    @staticmethod
+    def _notify_ready() -> None:
+        """Notify the command that started the broker that it is ready, then detach the broker from its stdout.
+
+        Returns:
+            None
+        """
+        try:
+            os.write(sys.stdout.fileno(), READY_MESSAGE + b"\n")
+        except BrokenPipeError:
+            # The command that started the broker did not wait for it
+            pass
+
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+
+    def _start_session(self, connection: socket.socket) -> None:
+        """Receive the request of a client and serve it in a new session process.
+
+        Args:
+            connection (socket.socket): The connection with the client.
+
+        Returns:
+            None
+        """
+        fds = []
+        try:
+            connection.settimeout(REQUEST_TIMEOUT)
+            (data, fds, _, _) = socket.recv_fds(connection, MAX_REQUEST_SIZE, len(CLIENT_FDS))
+            argv = json.loads(data.decode("utf-8"))["argv"]
+            if len(fds) != len(CLIENT_FDS) or not isinstance(argv, list):
+                raise ValueError("Malformed terminal request.")
+            connection.settimeout(None)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.debug(f"Discarding terminal request: {str(e)}")
+            self._close_connection(connection, fds)
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                self._server.close()
+                exit_code = self._run_session(connection, fds, argv)
+            finally:
+                os._exit(exit_code)
+
+        logging.debug(f"Started terminal session {pid} with arguments {argv}.")
+        self._sessions.add(pid)
+        self._close_connection(connection, fds)
+
+    def _run_session(self, connection: socket.socket, fds: List[int], argv: List[str]) -> int:
+        """Run `connect` on the standard streams of the client. It runs in the session process.
+
+        Args:
+            connection (socket.socket): The connection with the client.
+            fds (List[int]): The standard streams of the client.
+            argv (List[str]): The arguments of the `connect` command.
+
+        Returns:
+            int: The exit code of the session.
+        """
+        # Imported here since the command is only needed to parse the arguments of the client
+        from .command.ConnectCommand import ConnectCommand
+
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+        for (std_fd, client_fd) in zip(CLIENT_FDS, fds):
+            os.dup2(client_fd, std_fd)
+            os.close(client_fd)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", buffering=1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+        threading.Thread(target=self._watch_client, args=(connection,), daemon=True).start()
+
+        # The connections pooled by the broker are inherited by all the sessions, so each session opens its own
+        Kathara.get_instance().manager.client.close()
+
+        exit_code = 0
+        try:
+            args = ConnectCommand().parser.parse_args(argv)
+            Kathara.get_instance().connect_tty(
+                machine_name=args.machine_name, lab_hash=self.lab_hash, shell=args.shell, logs=args.logs
+            )
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            if Setting.get_instance().debug_level == "EXCEPTION":
+                logging.exception(f"({type(e).__name__}) {str(e)}")
+            else:
+                logging.critical(f"({type(e).__name__}) {str(e)}")
+            exit_code = 1
+
+        try:
+            sys.stdout.flush()
+            connection.sendall(bytes([exit_code & 0xFF]))
+        except OSError:
+            pass
+
+        return exit_code
+
+    @staticmethod
+    def _watch_client(connection: socket.socket) -> None:
+        """Forward the resize events of the client terminal to the session, and end the session if the client exits.
+
+        Args:
+            connection (socket.socket): The connection with the client.
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                data = connection.recv(64)
+            except OSError:
+                data = b""
+
+            if not data:
+                os.kill(os.getpid(), signal.SIGHUP)
+                return
+
+            if RESIZE_NOTIFICATION in data:
+                os.kill(os.getpid(), signal.SIGWINCH)
+
+    def _reap_sessions(self) -> None:
+        """Collect the terminated session processes.
+
+        Returns:
+            None
+        """
+        for pid in list(self._sessions):
+            try:
+                (ended_pid, _) = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                ended_pid = pid
+
+            if ended_pid == pid:
+                logging.debug(f"Terminal session {pid} ended.")
+                self._sessions.remove(pid)
+
+    def _close(self) -> None:
+        """Stop listening and remove the socket, unless it has been replaced by another broker.
+
+        Returns:
+            None
+        """
+        if self._server is None:
+            return
+
+        try:
+            if os.stat(self.socket_path).st_ino == self._socket_inode:
+                os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+        self._server.close()
+        self._server = None
+
+    @staticmethod
+    def _close_connection(connection: socket.socket, fds: List[int]) -> None:
+        for fd in fds:
+            os.close(fd)
+        connection.close()
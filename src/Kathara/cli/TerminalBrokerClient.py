@@ -0,0 +1,155 @@
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from typing import List, Optional
+
+from .broker_commands import BROKER_COMMAND, ATTACH_COMMAND
+
+# Sent by the client when its terminal is resized
+RESIZE_NOTIFICATION: bytes = b"W"
+# The standard streams of the client, passed to the broker
+CLIENT_FDS: List[int] = [0, 1, 2]
+
+
+class TerminalBrokerClient(object):
+    """Attach the current terminal to a device through the terminal broker of its network scenario.
+
+    The client only passes its standard streams to the broker and forwards the resize events of its terminal, so it
+    does not load any Kathara module. See `TerminalBroker` for the server side.
+    """
+    __slots__ = []
+
+    @staticmethod
+    def get_socket_directory() -> str:
+        """Return the directory containing the sockets of the terminal brokers of the current user.
+
+        Returns:
+            str: The path of the directory.
+        """
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR", None)
+        if runtime_dir:
+            return os.path.join(runtime_dir, "kathara")
+
+        return os.path.join(tempfile.gettempdir(), f"kathara-{os.getuid()}")
+
+    @staticmethod
+    def get_socket_path(lab_hash: str) -> str:
+        """Return the path of the socket of the terminal broker of a network scenario.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            str: The path of the socket.
+        """
+        return os.path.join(TerminalBrokerClient.get_socket_directory(), f"{lab_hash}.sock")
+
+    @staticmethod
+    def get_trusted_socket_path(lab_hash: str) -> Optional[str]:
+        """Return the path of the socket of the terminal broker of a network scenario, if it can be trusted.
+
+        The socket is trusted only if it is owned by the current user and it is in a directory private to the current
+        user, so that no other user can replace it and receive the terminal of the client.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            Optional[str]: The path of the socket, None if the socket does not exist or it cannot be trusted.
+        """
+        socket_path = TerminalBrokerClient.get_socket_path(lab_hash)
+        try:
+            # Symlinks are not followed, so they are never trusted
+            directory_stat = os.lstat(os.path.dirname(socket_path))
+            socket_stat = os.lstat(socket_path)
+        except OSError:
+            return None
+
+        uid = os.getuid()
+        if not stat.S_ISDIR(directory_stat.st_mode) or directory_stat.st_uid != uid or \
+                stat.S_IMODE(directory_stat.st_mode) != 0o700:
+            return None
+
+        if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != uid:
+            return None
+
+        return socket_path
+
+    @staticmethod
+    def attach(lab_hash: str, connect_argv: List[str]) -> Optional[int]:
+        """Connect the current terminal to a device using the terminal broker of its network scenario.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+            connect_argv (List[str]): The arguments of the `connect` command to run in the broker.
+
+        Returns:
+            Optional[int]: The exit code of the `connect` command, None if the broker is not running or it cannot be
+                trusted.
+        """
+        socket_path = TerminalBrokerClient.get_trusted_socket_path(lab_hash)
+        if socket_path is None:
+            return None
+
+        broker_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            broker_socket.connect(socket_path)
+            if not TerminalBrokerClient._is_peer_trusted(broker_socket):
+                broker_socket.close()
+                return None
+
+            request = json.dumps({"argv": connect_argv}).encode("utf-8")
+            socket.send_fds(broker_socket, [request], CLIENT_FDS)
+        except OSError:
+            broker_socket.close()
+            return None
+
+        def _notify_resize(*_) -> None:
+            try:
+                broker_socket.send(RESIZE_NOTIFICATION)
+            except OSError:
+                pass
+
+        signal.signal(signal.SIGWINCH, _notify_resize)
+
+        # The broker sends the exit code of the session before closing the connection
+        exit_code = 1
+        with broker_socket:
+            while True:
+                try:
+                    data = broker_socket.recv(64)
+                except OSError:
+                    break
+
+                if not data:
+                    break
+                exit_code = data[-1]
+
+        signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+        sys.stdout.flush()
+
+        return exit_code
+
+    @staticmethod
+    def _is_peer_trusted(broker_socket: socket.socket) -> bool:
+        """Check that the process listening on the socket of the broker belongs to the current user.
+
+        Args:
+            broker_socket (socket.socket): The socket connected to the broker.
+
+        Returns:
+            bool: True if the broker runs as the current user, else False.
+        """
+        if not hasattr(socket, "SO_PEERCRED"):
+            # Credentials are not available, the socket is trusted since it is in a directory private to the user
+            return True
+
+        credentials = broker_socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        (_, uid, _) = struct.unpack("3i", credentials)
+
+        return uid == os.getuid()
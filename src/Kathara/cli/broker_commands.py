@@ -0,0 +1,4 @@
+# Internal CLI commands of the terminal broker, not listed in the help.
+# Kept in a module without dependencies, since the entry point checks them on every invocation.
+BROKER_COMMAND: str = "terminal-broker"
+ATTACH_COMMAND: str = "terminal-attach"
@@ -61,7 +61,7 @@ class ConnectCommand(Command):
         args = self.get_args()
 
         if args['vmachine']:
-            lab = Lab("kathara_vlab")
+            lab_hash = Lab("kathara_vlab").hash
         else:
             lab_path = args['directory'].replace('"', '').replace("'", '') if args['directory'] else current_path
             lab_path = utils.get_absolute_path(lab_path)
@@ -69,15 +69,13 @@ class ConnectCommand(Command):
             # Load custom 'kathara.conf' if it exists
             self._load_custom_configuration(lab_path)
 
-            try:
-                lab = LabParser.parse(lab_path)
-            except (Exception, IOError):
-                lab = Lab(None, path=lab_path)
+            # Only the hash is needed, so the topology is not parsed
+            lab_hash = LabParser.parse_hash(lab_path)
 
-        logging.debug(f"Executing `connect` command with hash `{lab.hash}`...")
+        logging.debug(f"Executing `connect` command with hash `{lab_hash}`...")
 
         Kathara.get_instance().connect_tty(
-            machine_name=args['machine_name'], lab_hash=lab.hash, shell=args['shell'], logs=args['logs']
+            machine_name=args['machine_name'], lab_hash=lab_hash, shell=args['shell'], logs=args['logs']
         )
 
         return 0
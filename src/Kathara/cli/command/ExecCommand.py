@@ -1,8 +1,6 @@
 import argparse
 import sys
-from typing import List
-
-import chardet
+from typing import List, Optional, Union, Dict, Any, Tuple
 
 from ... import utils
 from ...foundation.cli.command.Command import Command
@@ -61,6 +59,27 @@ class ExecCommand(Command):
             default=False,
             help='Wait until startup commands execution finishes.',
         )
+        devices_group = self.parser.add_mutually_exclusive_group(required=False)
+        devices_group.add_argument(
+            '--all',
+            dest="all",
+            action="store_true",
+            default=False,
+            help='Execute the command in all the running devices of the network scenario (omit DEVICE_NAME).',
+        )
+        devices_group.add_argument(
+            '-m', '--machines',
+            dest="machines",
+            metavar='DEVICE_NAME[,DEVICE_NAME...]',
+            help='Execute the command in the specified comma-separated devices (omit DEVICE_NAME).',
+        )
+        self.parser.add_argument(
+            '--concurrency',
+            dest="concurrency",
+            type=int,
+            default=None,
+            help='Maximum number of devices executing the command at the same time (with `--all` or `-m`).',
+        )
         self.parser.add_argument(
             'machine_name',
             metavar='DEVICE_NAME',
@@ -69,7 +88,7 @@ class ExecCommand(Command):
         self.parser.add_argument(
             'command',
             metavar='COMMAND',
-            nargs='+',
+            nargs='*',
             help='Shell command that will be executed inside the device.'
         )
 
@@ -78,7 +97,7 @@ class ExecCommand(Command):
         args = self.get_args()
 
         if args['vmachine']:
-            lab = Lab("kathara_vlab")
+            lab_hash = Lab("kathara_vlab").hash
         else:
             lab_path = args['directory'].replace('"', '').replace("'", '') if args['directory'] else current_path
             lab_path = utils.get_absolute_path(lab_path)
@@ -86,15 +105,23 @@ class ExecCommand(Command):
             # Load custom 'kathara.conf' if it exists
             self._load_custom_configuration(lab_path)
 
-            try:
-                lab = LabParser.parse(lab_path)
-            except (Exception, IOError):
-                lab = Lab(None, path=lab_path)
+            # Only the hash is needed, so the topology is not parsed
+            lab_hash = LabParser.parse_hash(lab_path)
+
+        if args['all'] or args['machines']:
+            # The first positional argument is part of the command, since no device name is specified
+            command = [args['machine_name']] + args['command']
+            machine_names = None if args['all'] else [x.strip() for x in args['machines'].split(',') if x.strip()]
+
+            return self._exec_many(lab_hash, machine_names, command if len(command) > 1 else command.pop(), args)
+
+        if not args['command']:
+            self.parser.error("the following arguments are required: COMMAND")
 
         exec_output = Kathara.get_instance().exec(
             args['machine_name'],
             args['command'] if len(args['command']) > 1 else args['command'].pop(),
-            lab_hash=lab.hash,
+            lab_hash=lab_hash,
             wait=args['wait']
         )
 
@@ -102,15 +129,45 @@ class ExecCommand(Command):
             while True:
                 (stdout, stderr) = next(exec_output)
 
-                if not args['no_stdout']:
-                    stdout_char_encoding = chardet.detect(stdout) if stdout else None
-                    stdout = stdout.decode(stdout_char_encoding['encoding']) if stdout else ""
-                    sys.stdout.write(stdout)
+                # Output is written as raw bytes, the terminal decodes it
+                if stdout and not args['no_stdout']:
+                    utils.write_output(sys.stdout, stdout)
                 if stderr and not args['no_stderr']:
-                    stderr_char_encoding = chardet.detect(stderr) if stderr else None
-                    stderr = stderr.decode(stderr_char_encoding['encoding']) if stderr else ""
-                    sys.stderr.write(stderr)
+                    utils.write_output(sys.stderr, stderr)
         except StopIteration:
             pass
 
         return exec_output.exit_code()
+
+    @staticmethod
+    def _exec_many(lab_hash: str, machine_names: Optional[List[str]], command: Union[List[str], str],
+                   args: Dict[str, Any]) -> int:
+        exec_output = Kathara.get_instance().exec_many(
+            machine_names, command, lab_hash=lab_hash, wait=args['wait'], concurrency=args['concurrency']
+        )
+
+        # Output is written line by line, tagged with the device name. Incomplete lines are kept until completed.
+        buffers = {}
+        for (machine_name, stdout, stderr) in exec_output:
+            if stdout and not args['no_stdout']:
+                ExecCommand._write_lines(sys.stdout, buffers, (machine_name, 'stdout'), stdout)
+            if stderr and not args['no_stderr']:
+                ExecCommand._write_lines(sys.stderr, buffers, (machine_name, 'stderr'), stderr)
+
+        for (machine_name, output_name), remaining in buffers.items():
+            if remaining:
+                ExecCommand._write_lines(getattr(sys, output_name), buffers, (machine_name, output_name), b"\n")
+
+        for machine_name, error in exec_output.errors.items():
+            utils.write_output(sys.stderr, f"[{machine_name}] {str(error)}\n".encode("utf-8"))
+
+        exit_codes = [exec_output.exit_codes.get(name, 1) for name in exec_output.machine_names]
+        return next((exit_code for exit_code in exit_codes if exit_code != 0), 0)
+
+    @staticmethod
+    def _write_lines(output: Any, buffers: Dict[Tuple[str, str], bytes], key: Tuple[str, str], data: bytes) -> None:
+        lines = (buffers.get(key, b"") + data).split(b"\n")
+        buffers[key] = lines.pop()
+        if lines:
+            prefix = f"[{key[0]}] ".encode("utf-8")
+            utils.write_output(output, b"".join(prefix + line + b"\n" for line in lines))
@@ -5,7 +5,6 @@ from ..ui.utils import create_panel
 from ... import utils
 from ...foundation.cli.command.Command import Command
 from ...manager.Kathara import Kathara
-from ...model.Lab import Lab
 from ...parser.netkit.LabParser import LabParser
 from ...strings import strings, wiki_description
 
@@ -58,15 +57,13 @@ class LcleanCommand(Command):
         # Load custom 'kathara.conf' if it exists
         self._load_custom_configuration(lab_path)
 
-        try:
-            lab = LabParser.parse(lab_path)
-        except (Exception, IOError):
-            lab = Lab(None, path=lab_path)
+        # Only the hash is needed, so the topology is not parsed
+        lab_hash = LabParser.parse_hash(lab_path)
 
         self.console.print(create_panel("Stopping Network Scenario", style="blue bold", justify="center"))
 
         Kathara.get_instance().undeploy_lab(
-            lab_hash=lab.hash,
+            lab_hash=lab_hash,
             selected_machines=set(args['machine_names']) if args['machine_names'] else None,
             excluded_machines=set(args['excluded_machines']) if args['excluded_machines'] else None,
         )
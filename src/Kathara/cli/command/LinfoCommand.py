@@ -3,10 +3,12 @@ from typing import List
 
 from rich.live import Live
 
+from ..ui.utils import create_boot_profile_tables
 from ..ui.utils import create_lab_table
 from ..ui.utils import create_panel, LabMetaHighlighter, create_topology_table
 from ... import utils
 from ...foundation.cli.command.Command import Command
+from ...foundation.manager.BootProfiler import BootProfiler
 from ...manager.Kathara import Kathara
 from ...model.Lab import Lab
 from ...model.Link import BRIDGE_LINK_NAME
@@ -54,6 +56,14 @@ class LinfoCommand(Command):
             help='Read static information from lab.conf.'
         )
 
+        group.add_argument(
+            '--boot-profile',
+            dest='boot_profile',
+            required=False,
+            action='store_true',
+            help='Show a summary of the boot profile saved by `kathara lstart --boot-profile`.'
+        )
+
         topology_group = self.parser.add_mutually_exclusive_group(required=False)
 
         topology_group.add_argument(
@@ -80,23 +90,26 @@ class LinfoCommand(Command):
         # Load custom 'kathara.conf' if it exists
         self._load_custom_configuration(lab_path)
 
-        try:
-            lab = LabParser.parse(lab_path)
-        except (Exception, IOError):
-            lab = Lab(None, path=lab_path)
+        # The topology is parsed only when it is shown, otherwise the hash is enough to query the running devices
+        lab_hash = LabParser.parse_hash(lab_path)
 
         if args['watch']:
             if args['name']:
-                self._get_machine_live_info(lab, args['name'])
+                self._get_machine_live_info(lab_hash, args['name'])
             elif args['topology']:
-                self._get_topology_live_info(lab)
+                self._get_topology_live_info(self._parse_lab(lab_path))
             else:
-                self._get_lab_live_info(lab)
+                self._get_lab_live_info(lab_hash)
 
             return 0
 
         if args['conf']:
-            self._get_conf_info(lab, machine_name=args['name'])
+            self._get_conf_info(self._parse_lab(lab_path), machine_name=args['name'])
+
+            return 0
+
+        if args['boot_profile']:
+            self._get_boot_profile_info(Lab(None, path=lab_path))
 
             return 0
 
@@ -105,26 +118,36 @@ class LinfoCommand(Command):
                 spinner="dots"
         ) as _:
             if args['name']:
-                machine_stats = next(Kathara.get_instance().get_machine_stats(args['name'], lab.hash))
+                machine_stats = next(Kathara.get_instance().get_machine_stats(args['name'], lab_hash))
                 message = str(machine_stats) if machine_stats else f"Device `{args['name']}` Not Found."
                 style = None if machine_stats else "red bold"
 
                 self.console.print(create_panel(message, title=f"{args['name']} Information", style=style))
             elif args['topology']:
+                lab = self._parse_lab(lab_path)
                 Kathara.get_instance().update_lab_from_api(lab)
                 self.console.print(create_topology_table(lab))
             else:
-                machines_stats = Kathara.get_instance().get_machines_stats(lab.hash)
+                machines_stats = Kathara.get_instance().get_machines_stats(lab_hash)
                 self.console.print(create_lab_table(machines_stats))
 
         return 0
 
-    def _get_machine_live_info(self, lab: Lab, machine_name: str) -> None:
+    @staticmethod
+    def _parse_lab(lab_path: str) -> Lab:
+        try:
+            return LabParser.parse(lab_path)
+        except (Exception, IOError):
+            return Lab(None, path=lab_path)
+
+    def _get_machine_live_info(self, lab_hash: str, machine_name: str) -> None:
+        machine_stats_stream = Kathara.get_instance().get_machine_stats(machine_name, lab_hash)
+
         with Live(None, refresh_per_second=12.5, screen=True) as live:
             live.update(self.console.status(f"Loading...", spinner="dots"))
             live.refresh_per_second = 1
             while True:
-                machine_stats = next(Kathara.get_instance().get_machine_stats(machine_name, lab.hash))
+                machine_stats = next(machine_stats_stream)
                 message = str(machine_stats) if machine_stats else f"Device `{machine_name}` Not Found."
                 style = None if machine_stats else "red bold"
 
@@ -141,8 +164,8 @@ class LinfoCommand(Command):
 
                 live.update(table)
 
-    def _get_lab_live_info(self, lab: Lab) -> None:
-        machines_stats = Kathara.get_instance().get_machines_stats(lab.hash)
+    def _get_lab_live_info(self, lab_hash: str) -> None:
+        machines_stats = Kathara.get_instance().get_machines_stats(lab_hash)
 
         with Live(None, refresh_per_second=12.5, screen=True) as live:
             live.update(self.console.status(f"Loading...", spinner="dots"))
@@ -154,6 +177,19 @@ class LinfoCommand(Command):
 
                 live.update(table)
 
+    def _get_boot_profile_info(self, lab: Lab) -> None:
+        trace = BootProfiler.load(lab.fs)
+        if not trace:
+            self.console.print(
+                create_panel(
+                    "No boot profile found. Start the network scenario with `kathara lstart --boot-profile`.",
+                    title="Boot Profile", style="red bold"
+                )
+            )
+            return
+
+        self.console.print(create_boot_profile_tables(trace))
+
     def _get_conf_info(self, lab: Lab, machine_name: str = None) -> None:
         if machine_name:
             self.console.print(
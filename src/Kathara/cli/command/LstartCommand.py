@@ -2,6 +2,7 @@ import argparse
 import os
 from typing import List
 
+from ..TerminalBroker import TerminalBroker
 from ..ui.utils import create_lab_table
 from ..ui.utils import create_panel, LabMetaHighlighter
 from ... import utils
@@ -97,6 +98,13 @@ class LstartCommand(Command):
             action='store_true',
             help='Open the lab.conf file and check if it is correct (dry run).'
         )
+        self.parser.add_argument(
+            '--boot-profile',
+            dest="boot_profile",
+            required=False,
+            action='store_true',
+            help='Profile the boot of the devices, saving a timeline in the network scenario directory.'
+        )
         hosthome_group = self.parser.add_mutually_exclusive_group(required=False)
         hosthome_group.add_argument(
             '--no-hosthome', '-H',
@@ -172,9 +180,9 @@ class LstartCommand(Command):
                 lab = FolderParser.parse(lab_path)
 
         # Reorder machines by lab.dep file, if present.
-        dependencies = DepParser.parse(lab_path)
+        dependencies = DepParser.parse_graph(lab_path)
         if dependencies:
-            lab.apply_dependencies(dependencies)
+            lab.apply_dependencies(DepParser.order(dependencies), graph=dependencies)
 
         lab_meta_information = str(lab)
         if lab_meta_information:
@@ -216,6 +224,7 @@ class LstartCommand(Command):
 
         lab.add_option('hosthome_mount', args['hosthome_mount'])
         lab.add_option('shared_mount', args['shared_mount'])
+        lab.add_option('boot_profile', args['boot_profile'])
 
         if args['privileged'] or any(x.is_privileged() for x in lab.machines.values()):
             if not utils.is_admin():
@@ -227,6 +236,12 @@ class LstartCommand(Command):
                     )
         lab.add_global_machine_metadata('privileged', args['privileged'])
 
+        # Terminals attach to a single broker process instead of starting a CLI for each device.
+        # The deploy does not wait for the broker, terminals opened before it is ready use `kathara connect`
+        if Setting.get_instance().open_terminals and Setting.get_instance().manager_type == "docker" and \
+                (utils.is_platform(utils.LINUX) or utils.is_platform(utils.LINUX2)):
+            TerminalBroker.spawn_in_background(lab_path, lab.hash)
+
         Kathara.get_instance().deploy_lab(
             lab, selected_machines=set(args['machine_name']), excluded_machines=set(args['excluded_machines'])
         )
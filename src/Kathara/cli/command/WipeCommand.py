@@ -36,6 +36,13 @@ class WipeCommand(Command):
             help='Force the wipe.'
         )
 
+        self.parser.add_argument(
+            '--fast',
+            required=False,
+            action='store_true',
+            help='Remove all the resources in bulk, without executing the shutdown commands of the devices.'
+        )
+
         group = self.parser.add_mutually_exclusive_group(required=False)
 
         group.add_argument(
@@ -65,6 +72,10 @@ class WipeCommand(Command):
             if args['all'] and not utils.is_admin():
                 raise PrivilegeError("You must be root in order to wipe all Kathara devices of all users.")
 
-            Kathara.get_instance().wipe(all_users=bool(args['all']))
+            if args['fast']:
+                report = Kathara.get_instance().wipe(all_users=bool(args['all']), fast=True)
+                self.console.print(str(report))
+            else:
+                Kathara.get_instance().wipe(all_users=bool(args['all']))
 
         return 0
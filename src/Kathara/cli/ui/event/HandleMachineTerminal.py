@@ -10,11 +10,12 @@ from ....setting.Setting import Setting
 class HandleMachineTerminal(object):
     """Listener fired when a device is deployed and started."""
 
-    def run(self, item: 'MachinePackage.Machine') -> None:
+    def run(self, item: 'MachinePackage.Machine', **kwargs) -> None:
         """If allowed, open a terminal, with the emulator specified in the settings, into the device.
 
         Args:
             item (Kathara.model.Machine): Device where open a terminal.
+            **kwargs: Additional information about the deployed device, ignored by the listener.
 
         Returns:
             None
@@ -13,11 +13,12 @@ class HandleProgressBar(object):
         self.progress_bar: Optional[Progress] = None
         self.task: Optional[TaskID] = None
 
-    def init(self, items: List[Any]) -> None:
+    def init(self, items: List[Any], **kwargs) -> None:
         """Initialize a progress bar on the items.
 
         Args:
             items (List[Any]): List of items on which init the progress bar.
+            **kwargs: Additional information about the items, ignored by the progress bar.
 
         Returns:
             None
@@ -34,11 +35,12 @@ class HandleProgressBar(object):
 
         self.task = self.progress_bar.add_task(f"[bold][{self.message}]", total=len(items))
 
-    def update(self, item: Any) -> None:
+    def update(self, item: Any, **kwargs) -> None:
         """Update the progress bar with the item.
 
         Args:
             item (Any): Item that triggered the progress bar update.
+            **kwargs: Additional information about the item, ignored by the progress bar.
 
         Returns:
             None
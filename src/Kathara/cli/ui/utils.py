@@ -17,6 +17,8 @@ from rich.table import Table
 from rich.text import Text
 
 from ... import utils
+from ..TerminalBrokerClient import TerminalBrokerClient, ATTACH_COMMAND
+from ...foundation.manager.BootProfiler import BootProfiler
 from ...foundation.manager.stats.IMachineStats import IMachineStats
 from ...model.Lab import Lab
 from ...setting.Setting import Setting
@@ -113,6 +115,24 @@ def create_topology_table(lab: Lab) -> Optional[RenderableType]:
     return table
 
 
+def create_boot_profile_tables(trace: Dict[str, Any]) -> RenderableType:
+    (devices, phases) = BootProfiler.summarize(trace)
+
+    devices_table = Table(title="Slowest Devices", show_lines=True, expand=True, box=box.SQUARE_DOUBLE_HEAD)
+    devices_table.add_column("DEVICE NAME", header_style="dark_orange3")
+    devices_table.add_column("BOOT TIME", header_style="dark_orange3", justify="right")
+    for (device_name, boot_time) in devices:
+        devices_table.add_row(device_name, f"{boot_time:.3f}s")
+
+    phases_table = Table(title="Slowest Phases", show_lines=True, expand=True, box=box.SQUARE_DOUBLE_HEAD)
+    for col in ["CATEGORY", "PHASE", "COUNT", "TOTAL TIME", "MAX TIME"]:
+        phases_table.add_column(col, header_style="dark_orange3")
+    for (category, name, count, total, longest) in phases:
+        phases_table.add_row(category, name, str(count), f"{total:.3f}s", f"{longest:.3f}s")
+
+    return Group(devices_table, phases_table)
+
+
 def open_machine_terminal(machine) -> None:
     """Connect to the device with the terminal specified in the settings.
 
@@ -130,11 +150,17 @@ def open_machine_terminal(machine) -> None:
         raise FileNotFoundError("Unable to find Kathara.")
 
     is_vmachine = "-v" if not machine.lab.has_host_path() else ""
-    connect_command = "%s connect %s -l %s" % (executable_path, is_vmachine, machine.name)
+    connect_args = "%s -l %s" % (is_vmachine, machine.name)
+    connect_command = "%s connect %s" % (executable_path, connect_args)
 
     logging.debug("Terminal will open in directory %s." % machine.lab.fs_path())
 
     def unix_connect() -> None:
+        nonlocal connect_command
+        # If the network scenario has a terminal broker, attach to it instead of starting a new CLI
+        if TerminalBrokerClient.get_trusted_socket_path(machine.lab.hash):
+            connect_command = "%s %s %s %s" % (executable_path, ATTACH_COMMAND, machine.lab.hash, connect_args)
+
         if terminal == "TMUX":
             from ...trdparty.libtmux.tmux import TMUX
 
@@ -0,0 +1,235 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from fs.base import FS
+
+BOOT_PROFILE_FILENAME: str = "kathara_boot_profile.json"
+
+# In-device file where the trace of the startup commands is written
+BOOT_TRACE_PATH: str = "/var/log/kathara_boot.trace"
+# Each `set -x` trace line starts with a timestamp. `EPOCHREALTIME` avoids forking `date` in bash
+BOOT_TRACE_PS4: str = "+ ${EPOCHREALTIME:-$(date +%s.%N)} "
+BOOT_TRACE_LINE_RE = re.compile(r"^\++ (\d+(?:[.,]\d+)?) (.*)$")
+
+# Categories of the recorded phases
+HOST_CATEGORY: str = "host"
+STARTUP_CATEGORY: str = "startup"
+SCRIPT_CATEGORY: str = "script"
+
+DEFAULT_SUMMARY_SIZE: int = 10
+
+# (device name, category, phase name, start timestamp, duration), times are in seconds
+BootEvent = Tuple[str, str, str, float, float]
+
+
+class BootProfiler(object):
+    """Record a timeline of the phases executed to boot the devices of a network scenario.
+
+    Phases executed by Kathara (e.g., container creation and start) are measured on the host, while the startup
+    commands and the lines of the startup scripts are measured inside the device, parsing the timestamped `set -x`
+    trace they produce. All the timestamps are Unix times, so both sources share the same timeline.
+
+    The timeline is exported in the Chrome trace event format, which can be opened with `chrome://tracing` or Perfetto.
+
+    Attributes:
+        events (List[BootEvent]): The recorded phases.
+    """
+    __slots__ = ['events', '_lock']
+
+    def __init__(self) -> None:
+        self.events: List[BootEvent] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, device_name: str, name: str, category: str = HOST_CATEGORY) -> Generator[None, None, None]:
+        """Measure the execution of the enclosed block as a phase of a device.
+
+        Args:
+            device_name (str): The name of the device.
+            name (str): The name of the phase.
+            category (str): The category of the phase.
+
+        Returns:
+            Generator[None, None, None]: A context manager measuring the enclosed block.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add_event(device_name, category, name, start, time.time() - start)
+
+    def add_event(self, device_name: str, category: str, name: str, start: float, duration: float) -> None:
+        """Add a phase to the timeline.
+
+        Args:
+            device_name (str): The name of the device.
+            category (str): The category of the phase.
+            name (str): The name of the phase.
+            start (float): The Unix timestamp of the beginning of the phase.
+            duration (float): The duration of the phase in seconds.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.events.append((device_name, category, name, start, max(duration, 0.0)))
+
+    def add_trace(self, device_name: str, category: str, lines: Iterable[str], end: Optional[float] = None) -> \
+            List[Tuple[float, str]]:
+        """Add the commands of a timestamped `set -x` trace to the timeline.
+
+        Each command lasts until the following one is traced. Lines without a timestamp (e.g., the output of the
+        commands) are ignored.
+
+        Args:
+            device_name (str): The name of the device.
+            category (str): The category of the traced commands.
+            lines (Iterable[str]): The lines of the trace.
+            end (Optional[float]): The Unix timestamp of the end of the trace, used as end of the last command.
+                If None, the last command has no duration.
+
+        Returns:
+            List[Tuple[float, str]]: The parsed (timestamp, command) pairs.
+        """
+        commands = self.parse_trace(lines)
+        for i, (start, command) in enumerate(commands):
+            command_end = commands[i + 1][0] if i + 1 < len(commands) else end
+            duration = command_end - start if command_end is not None else 0.0
+            # Device-specific paths are normalized, so the same phase of different devices can be compared
+            name = command.replace(f"/hostlab/{device_name}", "/hostlab/{device}")
+            self.add_event(device_name, category, name, start, duration)
+
+        return commands
+
+    @staticmethod
+    def parse_trace(lines: Iterable[str]) -> List[Tuple[float, str]]:
+        """Parse the lines of a timestamped `set -x` trace.
+
+        Args:
+            lines (Iterable[str]): The lines of the trace.
+
+        Returns:
+            List[Tuple[float, str]]: The (timestamp, command) pairs, in trace order.
+        """
+        commands = []
+        for line in lines:
+            matches = BOOT_TRACE_LINE_RE.match(line.strip())
+            if matches:
+                commands.append((float(matches.group(1).replace(",", ".")), matches.group(2)))
+
+        return commands
+
+    @staticmethod
+    def get_command_end(commands: List[Tuple[float, str]], prefix: str) -> Optional[float]:
+        """Return the end of the first traced command starting with the specified prefix.
+
+        Args:
+            commands (List[Tuple[float, str]]): The (timestamp, command) pairs of a trace.
+            prefix (str): The prefix of the command to find.
+
+        Returns:
+            Optional[float]: The Unix timestamp of the command following the found one, None if the command is not
+                found or it is the last one.
+        """
+        for i, (_, command) in enumerate(commands):
+            if command.startswith(prefix):
+                return commands[i + 1][0] if i + 1 < len(commands) else None
+
+        return None
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Export the timeline in the Chrome trace event format.
+
+        Each device is represented as a thread of the same process, so its phases are shown on a separate row.
+
+        Returns:
+            Dict[str, Any]: The Chrome trace object.
+        """
+        with self._lock:
+            events = sorted(self.events, key=lambda x: x[3])
+
+        device_ids = {}
+        trace_events = []
+        for (device_name, category, name, start, duration) in events:
+            if device_name not in device_ids:
+                device_ids[device_name] = len(device_ids) + 1
+                trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": device_ids[device_name],
+                                     "args": {"name": device_name}})
+
+            trace_events.append({"name": name, "cat": category, "ph": "X", "pid": 1, "tid": device_ids[device_name],
+                                 "ts": round(start * 1000000), "dur": round(duration * 1000000)})
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def save(self, lab_fs: FS) -> None:
+        """Write the timeline in the Chrome trace event format into the network scenario filesystem.
+
+        Args:
+            lab_fs (fs.base.FS): The filesystem of the network scenario.
+
+        Returns:
+            None
+        """
+        lab_fs.writetext(BOOT_PROFILE_FILENAME, json.dumps(self.to_chrome_trace()))
+
+    @staticmethod
+    def load(lab_fs: FS) -> Optional[Dict[str, Any]]:
+        """Read the timeline saved into the network scenario filesystem.
+
+        Args:
+            lab_fs (fs.base.FS): The filesystem of the network scenario.
+
+        Returns:
+            Optional[Dict[str, Any]]: The Chrome trace object, None if the network scenario has no boot profile.
+        """
+        if not lab_fs.exists(BOOT_PROFILE_FILENAME):
+            return None
+
+        return json.loads(lab_fs.readtext(BOOT_PROFILE_FILENAME))
+
+    @staticmethod
+    def summarize(trace: Dict[str, Any], size: int = DEFAULT_SUMMARY_SIZE) -> \
+            Tuple[List[Tuple[str, float]], List[Tuple[str, str, int, float, float]]]:
+        """Summarize a Chrome trace object, finding the slowest devices and phases.
+
+        Args:
+            trace (Dict[str, Any]): The Chrome trace object.
+            size (int): The maximum number of devices and phases to return.
+
+        Returns:
+            Tuple[List[Tuple[str, float]], List[Tuple[str, str, int, float, float]]]: The slowest devices, as
+                (device name, boot time) pairs, and the slowest phases, as (category, phase name, number of
+                executions, total time, max time) tuples. Times are in seconds.
+        """
+        device_names = {}
+        boundaries = {}
+        phases = {}
+        for event in trace.get("traceEvents", []):
+            if event["ph"] == "M":
+                device_names[event["tid"]] = event["args"]["name"]
+                continue
+
+            start = event["ts"] / 1000000
+            duration = event["dur"] / 1000000
+
+            (first, last) = boundaries.get(event["tid"], (start, start + duration))
+            boundaries[event["tid"]] = (min(first, start), max(last, start + duration))
+
+            key = (event["cat"], event["name"])
+            (count, total, longest) = phases.get(key, (0, 0.0, 0.0))
+            phases[key] = (count + 1, total + duration, max(longest, duration))
+
+        devices = sorted(
+            ((device_names.get(tid, str(tid)), last - first) for tid, (first, last) in boundaries.items()),
+            key=lambda x: x[1], reverse=True
+        )
+        phases = sorted(
+            ((category, name, count, total, longest) for (category, name), (count, total, longest) in phases.items()),
+            key=lambda x: x[3], reverse=True
+        )
+
+        return devices[:size], phases[:size]
@@ -0,0 +1,181 @@
+import logging
+import queue
+import time
+from multiprocessing.dummy import Pool
+from typing import Dict, List, Tuple, Callable, Iterable, Any, Optional
+
+from ... import utils
+from ...exceptions import MachineDependencyError
+from ...parser.netkit.DepParser import DepParser
+
+
+class DependencyScheduler(object):
+    """Deploy items on a bounded worker pool, starting each item as soon as all its dependencies are deployed.
+
+    Items without dependencies (or whose dependencies are not scheduled) are started immediately, so a scenario
+    without a lab.dep file is fully deployed in parallel.
+
+    Attributes:
+        graph (Dict[str, List[str]]): The dependencies among items. Keys are item names, values are the names of the
+            items they depend on.
+        pool_size (int): The maximum number of items deployed concurrently.
+        levels (Dict[str, int]): The level of each scheduled item, i.e., the length of the longest dependency chain
+            that precedes it.
+        level_timings (Dict[int, float]): The seconds elapsed from the beginning of the deploy to the moment in
+            which all the items of each level are deployed.
+    """
+    __slots__ = ['graph', 'pool_size', 'levels', 'level_timings']
+
+    def __init__(self, graph: Optional[Dict[str, List[str]]] = None, pool_size: Optional[int] = None) -> None:
+        self.graph: Dict[str, List[str]] = graph if graph else {}
+        self.pool_size: int = pool_size if pool_size else utils.get_pool_size()
+        self.levels: Dict[str, int] = {}
+        self.level_timings: Dict[int, float] = {}
+
+    @property
+    def critical_path_length(self) -> int:
+        """Return the number of levels of the scheduled items, i.e., the number of devices in the longest
+        dependency chain.
+
+        Returns:
+            int: The length of the critical path.
+        """
+        return max(self.levels.values()) + 1 if self.levels else 0
+
+    def _build_edges(self, names: Iterable[str]) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+        """Restrict the dependency graph to the specified items.
+
+        Args:
+            names (Iterable[str]): The names of the items to schedule.
+
+        Returns:
+            Tuple[Dict[str, int], Dict[str, List[str]]]: The number of unsatisfied dependencies of each item and
+                the items that depend on each item.
+        """
+        names = list(names)
+        selected = set(names)
+
+        pending = {}
+        dependents = {name: [] for name in names}
+        for name in names:
+            dependencies = set(dep for dep in self.graph.get(name, []) if dep in selected and dep != name)
+            pending[name] = len(dependencies)
+            for dep in dependencies:
+                dependents[dep].append(name)
+
+        return pending, dependents
+
+    def schedule(self, names: Iterable[str]) -> Dict[str, int]:
+        """Compute the level of each item. Dependencies on items that are not in `names` are considered satisfied.
+
+        Args:
+            names (Iterable[str]): The names of the items to schedule.
+
+        Returns:
+            Dict[str, int]: Keys are item names, values are their levels.
+
+        Raises:
+            MachineDependencyError: If there is a dependency loop among the scheduled items.
+        """
+        names = list(names)
+        pending, dependents = self._build_edges(names)
+
+        self.levels = {}
+        ready = [name for name in names if pending[name] == 0]
+        for name in ready:
+            self.levels[name] = 0
+
+        while ready:
+            name = ready.pop()
+            for dependent in dependents[name]:
+                self.levels[dependent] = max(self.levels.get(dependent, 0), self.levels[name] + 1)
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(self.levels) != len(names):
+            selected = set(names)
+            graph = {name: [dep for dep in self.graph.get(name, []) if dep in selected] for name in names}
+            loops = DepParser.find_loops(graph)
+            raise MachineDependencyError(
+                "Devices' dependency loop: %s." % "; ".join(" -> ".join(loop + [loop[0]]) for loop in loops)
+            )
+
+        self.level_timings = {}
+
+        return self.levels
+
+    def run(self, items: Iterable[Tuple[str, Any]], deploy: Callable[[Tuple[str, Any]], None],
+            callback: Optional[Callable[[Tuple[str, Any], int, float], None]] = None) -> None:
+        """Deploy the items, respecting their dependencies.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Tuples composed by the name of the item and the item to deploy.
+            deploy (Callable[[Tuple[str, Any]], None]): The function deploying a single item.
+            callback (Optional[Callable[[Tuple[str, Any], int, float], None]]): If specified, it is called after
+                each deployed item with the item, its level and the seconds elapsed from the beginning of the deploy.
+
+        Returns:
+            None
+
+        Raises:
+            MachineDependencyError: If there is a dependency loop among the scheduled items.
+            Exception: The first exception raised by `deploy`. Items already running are waited, the remaining ones
+                are not deployed.
+        """
+        items = dict(items)
+        if not self.levels or set(self.levels.keys()) != set(items.keys()):
+            self.schedule(items.keys())
+
+        pending, dependents = self._build_edges(items.keys())
+
+        remaining_per_level = {}
+        for level in self.levels.values():
+            remaining_per_level[level] = remaining_per_level.get(level, 0) + 1
+
+        completed = queue.Queue()
+        start_time = time.monotonic()
+
+        def deploy_item(name: str) -> None:
+            item = (name, items[name])
+            try:
+                deploy(item)
+                if callback:
+                    callback(item, self.levels[name], time.monotonic() - start_time)
+                completed.put((name, None))
+            except Exception as e:
+                completed.put((name, e))
+
+        error = None
+        with Pool(self.pool_size) as pool:
+            running = 0
+            for name in [name for name, count in pending.items() if count == 0]:
+                pool.apply_async(deploy_item, (name,))
+                running += 1
+
+            while running > 0:
+                (name, exception) = completed.get()
+                running -= 1
+
+                if exception is not None:
+                    error = error or exception
+                    continue
+
+                level = self.levels[name]
+                remaining_per_level[level] -= 1
+                if remaining_per_level[level] == 0:
+                    self.level_timings[level] = time.monotonic() - start_time
+                    logging.debug(f"Level {level} deployed in {self.level_timings[level]:.2f}s.")
+
+                # Stop scheduling new items if something went wrong
+                if error is not None:
+                    continue
+
+                for dependent in dependents[name]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        pool.apply_async(deploy_item, (dependent,))
+                        running += 1
+
+        if error is not None:
+            raise error
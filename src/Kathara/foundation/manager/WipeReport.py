@@ -0,0 +1,73 @@
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class WipeReport(object):
+    """Report of the resources reclaimed by a wipe.
+
+    Each kind of resource (e.g., devices, collision domains, namespaces) is removed in a separate step, so the report
+    stores the number of removed resources and the duration of each step.
+
+    Attributes:
+        fast (bool): True if the wipe skipped the shutdown commands of the devices.
+        steps (List[Tuple[str, int, float]]): The executed steps, as (resource kind, removed count, seconds) tuples.
+    """
+    __slots__ = ['fast', 'steps']
+
+    def __init__(self, fast: bool = False) -> None:
+        self.fast: bool = fast
+        self.steps: List[Tuple[str, int, float]] = []
+
+    def measure(self, kind: str, func: Callable[..., int], *args: Any, **kwargs: Any) -> int:
+        """Execute a removal step, recording the number of removed resources and its duration.
+
+        Args:
+            kind (str): The kind of the removed resources.
+            func (Callable[..., int]): The function removing the resources, returning how many have been removed.
+            *args (Any): Positional arguments of the function.
+            **kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+            int: The number of removed resources.
+        """
+        start = time.monotonic()
+        count = func(*args, **kwargs)
+        self.steps.append((kind, count, time.monotonic() - start))
+
+        return count
+
+    @property
+    def total_time(self) -> float:
+        """Return the seconds spent in all the steps.
+
+        Returns:
+            float: The duration of the wipe in seconds.
+        """
+        return sum(duration for (_, _, duration) in self.steps)
+
+    def get_count(self, kind: str) -> int:
+        """Return the number of removed resources of the specified kind.
+
+        Args:
+            kind (str): The kind of the resources.
+
+        Returns:
+            int: The number of removed resources, 0 if no step removed resources of that kind.
+        """
+        return sum(count for (step_kind, count, _) in self.steps if step_kind == kind)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Transform the report into a dict representation.
+
+        Returns:
+            Dict[str, Any]: Dict containing the report.
+        """
+        return {
+            "fast": self.fast,
+            "steps": [{"kind": kind, "count": count, "time": duration} for (kind, count, duration) in self.steps],
+            "total_time": self.total_time,
+        }
+
+    def __str__(self) -> str:
+        steps = ", ".join(f"{count} {kind} in {duration:.2f}s" for (kind, count, duration) in self.steps)
+        return f"Removed {steps or 'nothing'} (total {self.total_time:.2f}s)."
@@ -1,6 +1,9 @@
+import codecs
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
-from typing import Any, Generator
+from typing import Any, Generator, Optional, Tuple
+
+DEFAULT_ENCODING: str = "utf-8"
 
 
 class IExecStream(ABC):
@@ -34,6 +37,51 @@ class IExecStream(ABC):
         """
         raise NotImplementedError("You must implement `exit_code` method.")
 
+    def decode(self, encoding: Optional[str] = DEFAULT_ENCODING, errors: str = "replace") -> \
+            Generator[Tuple[str, str], None, None]:
+        """Consume the stream, decoding the stdout and the stderr chunks into strings.
+
+        Each output is decoded by an incremental decoder, so characters split between two chunks are decoded
+        correctly.
+
+        Args:
+            encoding (Optional[str]): The encoding of the output. If None, it is detected once, from the first
+                non-empty chunk of each output.
+            errors (str): The error handling scheme of the decoders (e.g., "strict", "replace", "ignore").
+
+        Returns:
+            Generator[Tuple[str, str], None, None]: A generator of (stdout, stderr) strings. Empty strings are
+                returned for missing outputs.
+        """
+        decoders = [None, None]
+
+        def decode_chunk(idx: int, chunk: Optional[bytes]) -> str:
+            if not chunk:
+                return ""
+
+            if decoders[idx] is None:
+                chunk_encoding = encoding
+                if not chunk_encoding:
+                    # chardet is slow to import, so it is loaded only if the encoding must be detected
+                    import chardet
+
+                    chunk_encoding = chardet.detect(chunk)['encoding'] or DEFAULT_ENCODING
+                decoders[idx] = codecs.getincrementaldecoder(chunk_encoding)(errors=errors)
+
+            return decoders[idx].decode(chunk)
+
+        try:
+            while True:
+                (stdout, stderr) = self.stream_next()
+                yield decode_chunk(0, stdout), decode_chunk(1, stderr)
+        except StopIteration:
+            pass
+
+        # Flush the characters left incomplete at the end of the outputs
+        remaining = tuple(decoder.decode(b"", final=True) if decoder else "" for decoder in decoders)
+        if any(remaining):
+            yield remaining
+
     def __next__(self) -> Iterator:
         """Return the next element from the stream.
         This magic method allows to keep compatibility with the previous API.
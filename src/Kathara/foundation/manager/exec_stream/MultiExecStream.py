@@ -0,0 +1,104 @@
+import logging
+import queue
+from multiprocessing.dummy import Pool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .IExecStream import IExecStream
+from .... import utils
+
+# Items are (device name, stdout, stderr) tuples
+MultiExecOutput = Tuple[str, Optional[bytes], Optional[bytes]]
+
+
+class MultiExecStream(object):
+    """Execute a command on multiple devices in parallel, streaming their output as it arrives.
+
+    Executions run on a bounded worker pool, started when the stream is first consumed. The output of all the devices
+    is merged into a single stream of chunks tagged with the device name, in the order in which they are produced.
+
+    Attributes:
+        machine_names (List[str]): The names of the devices executing the command.
+        concurrency (int): The maximum number of concurrent executions.
+        exit_codes (Dict[str, int]): The exit codes of the ended executions, keys are device names.
+        errors (Dict[str, Exception]): The errors of the failed executions (e.g., the device is not running),
+            keys are device names.
+    """
+    __slots__ = ['machine_names', 'concurrency', 'exit_codes', 'errors', '_exec_func', '_queue', '_pool', '_pending']
+
+    def __init__(self, machine_names: List[str], exec_func: Callable[[str], IExecStream],
+                 concurrency: Optional[int] = None) -> None:
+        self.machine_names: List[str] = list(machine_names)
+        self.concurrency: int = max(1, min(concurrency or utils.get_pool_size(), len(self.machine_names)))
+        self.exit_codes: Dict[str, int] = {}
+        self.errors: Dict[str, Exception] = {}
+
+        self._exec_func: Callable[[str], IExecStream] = exec_func
+        # Items are output chunks, None signals the end of an execution
+        self._queue: queue.Queue = queue.Queue()
+        self._pool: Optional[Pool] = None
+        self._pending: int = len(self.machine_names)
+
+    def __iter__(self) -> 'MultiExecStream':
+        return self
+
+    def __next__(self) -> MultiExecOutput:
+        """Return the next output chunk of any device.
+
+        Returns:
+            MultiExecOutput: A tuple containing the device name, its stdout and its stderr.
+
+        Raises:
+            StopIteration: If all the executions are ended.
+        """
+        if self._pool is None and self._pending > 0:
+            self._pool = Pool(self.concurrency)
+            self._pool.map_async(self._exec, self.machine_names)
+
+        while self._pending > 0:
+            output = self._queue.get()
+            if output is None:
+                self._pending -= 1
+                continue
+
+            return output
+
+        self.close()
+        raise StopIteration
+
+    def wait(self) -> Dict[str, int]:
+        """Consume the stream until all the executions are ended, discarding their output.
+
+        Returns:
+            Dict[str, int]: The exit codes of the executions, keys are device names.
+        """
+        for _ in self:
+            pass
+
+        return self.exit_codes
+
+    def close(self) -> None:
+        """Release the worker pool. Executions still running are not interrupted.
+
+        Returns:
+            None
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _exec(self, machine_name: str) -> None:
+        try:
+            exec_stream = self._exec_func(machine_name)
+            try:
+                while True:
+                    (stdout, stderr) = next(exec_stream)
+                    self._queue.put((machine_name, stdout, stderr))
+            except StopIteration:
+                pass
+
+            self.exit_codes[machine_name] = exec_stream.exit_code()
+        except Exception as e:
+            logging.debug(f"Cannot execute the command on device `{machine_name}`: {str(e)}")
+            self.errors[machine_name] = e
+        finally:
+            self._queue.put(None)
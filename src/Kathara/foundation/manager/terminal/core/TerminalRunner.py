@@ -5,6 +5,13 @@ from .IConsoleAdapter import IConsoleAdapter
 from .ITerminalSession import ITerminalSession
 from .....utils import exec_by_platform
 
+# Bounds of the size of the session reads, adapted to the amount of output
+MIN_READ_SIZE: int = 4096
+MAX_READ_SIZE: int = 262144
+# Bounds of the back-off between the reads of the sessions that return no data instead of blocking
+MIN_IDLE_DELAY: float = 0.001
+MAX_IDLE_DELAY: float = 0.03
+
 
 class TerminalRunner(object):
     """Bridge class between a console adapter and a terminal session.
@@ -16,8 +23,10 @@ class TerminalRunner(object):
         _closed (bool): Boolean flag indicating whether the runner is terminated.
         _tasks (list[asyncio.Task]): List of asyncio tasks created by the runner.
         _session_fd (Optional[int]): File descriptor from session.fileno() when available.
+        _read_size (int): Size of the next session read. It grows while reads fill the buffer (bulk output, written
+            to stdout with fewer and larger writes) and shrinks back when they do not (interactive output).
     """
-    __slots__ = ["console", "session", "_loop", "_closed", "_tasks", "_session_fd"]
+    __slots__ = ["console", "session", "_loop", "_closed", "_tasks", "_session_fd", "_read_size"]
 
     def __init__(self, console: IConsoleAdapter, session: ITerminalSession) -> None:
         self.console: IConsoleAdapter = console
@@ -29,6 +38,7 @@ class TerminalRunner(object):
 
         self._tasks: list[asyncio.Task] = []
         self._session_fd: Optional[int] = None
+        self._read_size: int = MIN_READ_SIZE
 
     def start(self) -> None:
         """Start the bridge and block until the runner stops.
@@ -106,7 +116,7 @@ class TerminalRunner(object):
             return
 
         try:
-            data = self.session.read(4096)
+            data = self.session.read(self._read_size)
         except Exception:
             self.close()
             return
@@ -115,6 +125,8 @@ class TerminalRunner(object):
             self.close()
             return
 
+        self._adapt_read_size(len(data))
+
         try:
             self.console.write_stdout(data)
         except Exception:
@@ -128,12 +140,16 @@ class TerminalRunner(object):
             - the session does not expose a file descriptor (fileno() is None), or
             - on Windows where fd-based readers are not unavailable.
 
+        Sessions whose reads block until data is available are read without any delay. Sessions returning no data
+        instead of blocking are polled with an exponential back-off, reset as soon as data arrives.
+
         Returns:
             None
         """
+        idle_delay = 0.0
         while not self._closed:
             try:
-                data = await self._loop.run_in_executor(None, self.session.read, 4096)
+                data = await self._loop.run_in_executor(None, self.session.read, self._read_size)
             except Exception:
                 self.close()
                 return
@@ -142,15 +158,33 @@ class TerminalRunner(object):
                 return
 
             if not data:
-                await asyncio.sleep(0.03)
+                idle_delay = min(MAX_IDLE_DELAY, max(MIN_IDLE_DELAY, idle_delay * 2))
+                await asyncio.sleep(idle_delay)
                 continue
 
+            idle_delay = 0.0
+            self._adapt_read_size(len(data))
+
             try:
                 self.console.write_stdout(data)
             except Exception:
                 self.close()
                 return
 
+    def _adapt_read_size(self, n_read: int) -> None:
+        """Update the size of the next session read given the size of the last one.
+
+        Args:
+            n_read (int): Number of bytes returned by the last read.
+
+        Returns:
+            None
+        """
+        if n_read >= self._read_size:
+            self._read_size = min(MAX_READ_SIZE, self._read_size * 2)
+        elif n_read < self._read_size // 4:
+            self._read_size = max(MIN_READ_SIZE, self._read_size // 2)
+
     def _start_stdout(self) -> None:
         """Start pumping session output to local stdout using an OS-specify strategy.
 
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple, Iterable, Iterator
+
+from fs.base import FS
+
+from ... import utils
+from ...exceptions import InstantiationError
+
+PACK_CACHE_PATH: str = os.path.join(utils.get_current_user_home(), ".cache", "kathara", "pack")
+PACK_CACHE_MAX_SIZE: int = 512 * 1024 * 1024
+
+# Changing the archive layout must change the keys, otherwise stale archives are reused
+PACK_CACHE_VERSION: str = "2"
+
+CHUNK_SIZE: int = 1024 * 1024
+
+
+class PackCache(object):
+    """Content-addressed cache of the archives containing the files of the devices.
+
+    An archive is identified by a key computed from the name of the device and the paths and contents of all the files
+    copied into it. To avoid reading unchanged files, the digest of each file is stored in a per-lab index together
+    with its size and modification time, and it is recomputed only if they change.
+
+    Archives are stored on disk and evicted in least recently used order when their total size exceeds `max_size`.
+
+    Attributes:
+        path (str): The directory where the cache is stored.
+        max_size (int): The maximum size (in bytes) of the cached archives.
+    """
+    __slots__ = ['path', 'max_size', '_indexes', '_lock']
+
+    __instance: PackCache = None
+
+    @staticmethod
+    def get_instance() -> PackCache:
+        """Get an instance of the PackCache.
+
+        Returns:
+            PackCache: An instance of the class.
+
+        Raises:
+            InstantiationError: If two instances of the class are created.
+        """
+        if PackCache.__instance is None:
+            PackCache()
+
+        return PackCache.__instance
+
+    def __init__(self, path: str = PACK_CACHE_PATH, max_size: int = PACK_CACHE_MAX_SIZE) -> None:
+        if PackCache.__instance is not None:
+            raise InstantiationError("This class is a singleton!")
+        else:
+            self.path: str = path
+            self.max_size: int = max_size
+
+            # Keys are lab hashes, values are indexes mapping file paths to (size, mtime, digest)
+            self._indexes: Dict[str, Dict[str, List]] = {}
+            self._lock: threading.Lock = threading.Lock()
+
+            PackCache.__instance = self
+
+    def get_key(self, lab_hash: str, machine_name: str, files: List[Tuple[str, FS, str]],
+                dirs: List[str] = None, compression: Optional[str] = None) -> str:
+        """Compute the key of an archive.
+
+        Args:
+            lab_hash (str): The hash of the network scenario of the device.
+            machine_name (str): The name of the device.
+            files (List[Tuple[str, FS, str]]): The files copied into the archive. Each tuple is composed by the
+                path of the file in the archive, the filesystem containing the file and its path in the filesystem.
+            dirs (List[str]): The paths in the archive of the directories copied into the archive.
+            compression (Optional[str]): The compression of the archive.
+
+        Returns:
+            str: The key of the archive.
+        """
+        key = hashlib.sha256()
+        key.update(f"{PACK_CACHE_VERSION}\0{machine_name}\0{compression}\0".encode('utf-8'))
+
+        for dir_path in sorted(dirs if dirs else []):
+            key.update(f"d\0{dir_path}\0".encode('utf-8'))
+
+        with self._lock:
+            index = self._load_index(lab_hash)
+
+        for (arc_path, file_fs, path) in sorted(files, key=lambda x: x[0]):
+            key.update(f"f\0{arc_path}\0{self._get_file_digest(index, file_fs, path)}\0".encode('utf-8'))
+
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the archive associated to the key, if cached.
+
+        Args:
+            key (str): The key of the archive.
+
+        Returns:
+            Optional[bytes]: The content of the archive, None if it is not cached.
+        """
+        archive_stream = self.get_stream(key)
+
+        return b"".join(archive_stream) if archive_stream is not None else None
+
+    def get_stream(self, key: str) -> Optional[Iterator[bytes]]:
+        """Return an iterator of chunks of the archive associated to the key, if cached.
+
+        Args:
+            key (str): The key of the archive.
+
+        Returns:
+            Optional[Iterator[bytes]]: An iterator of chunks of the archive, None if it is not cached.
+        """
+        archive_path = self._get_archive_path(key)
+        try:
+            archive_file = open(archive_path, 'rb')
+
+            # Mark the archive as recently used
+            os.utime(archive_path)
+        except OSError:
+            return None
+
+        logging.debug(f"Archive `{key}` found in pack cache.")
+
+        def read_chunks() -> Iterator[bytes]:
+            with archive_file:
+                for chunk in iter(lambda: archive_file.read(CHUNK_SIZE), b''):
+                    yield chunk
+
+        return read_chunks()
+
+    def put(self, lab_hash: str, key: str, data: bytes) -> None:
+        """Store an archive in the cache, evicting the least recently used ones if the cache is full.
+
+        Args:
+            lab_hash (str): The hash of the network scenario that generated the archive.
+            key (str): The key of the archive.
+            data (bytes): The content of the archive.
+
+        Returns:
+            None
+        """
+        for _ in self.put_stream(lab_hash, key, [data]):
+            pass
+
+    def put_stream(self, lab_hash: str, key: str, chunks: Iterable[bytes],
+                   max_entry_size: Optional[int] = None) -> Iterator[bytes]:
+        """Store an archive in the cache while it is consumed, returning the chunks unchanged.
+
+        The archive is added to the cache only when all the chunks are consumed. If it exceeds `max_size` or
+        max_entry_size, it is not cached at all.
+
+        Args:
+            lab_hash (str): The hash of the network scenario that generated the archive.
+            key (str): The key of the archive.
+            chunks (Iterable[bytes]): The chunks of the archive.
+            max_entry_size (Optional[int]): The maximum size (in bytes) of the archive to cache. If None, only
+                `max_size` is considered.
+
+        Returns:
+            Iterator[bytes]: An iterator of the chunks of the archive.
+        """
+        archive_path = self._get_archive_path(key)
+        temp_file = None
+        try:
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+            temp_file = tempfile.NamedTemporaryFile(dir=os.path.dirname(archive_path), delete=False)
+        except OSError as e:
+            logging.debug(f"Cannot write archive `{key}` in pack cache: {str(e)}")
+
+        max_entry_size = self.max_size if max_entry_size is None else min(self.max_size, max_entry_size)
+        size = 0
+        cacheable = temp_file is not None
+        completed = False
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                cacheable = cacheable and size <= max_entry_size
+                if cacheable:
+                    try:
+                        temp_file.write(chunk)
+                    except OSError as e:
+                        logging.debug(f"Cannot write archive `{key}` in pack cache: {str(e)}")
+                        cacheable = False
+
+                yield chunk
+
+            completed = True
+        finally:
+            if temp_file:
+                try:
+                    temp_file.close()
+                    if completed and cacheable:
+                        os.replace(temp_file.name, archive_path)
+
+                        with self._lock:
+                            self._save_index(lab_hash)
+                            self._evict()
+                    else:
+                        os.remove(temp_file.name)
+                except OSError as e:
+                    logging.debug(f"Cannot write archive `{key}` in pack cache: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove all the cached archives and indexes.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._indexes = {}
+            if os.path.isdir(self.path):
+                for root, _, files in os.walk(self.path):
+                    for name in files:
+                        os.remove(os.path.join(root, name))
+
+    def _get_file_digest(self, index: Dict[str, List], file_fs: FS, path: str) -> str:
+        """Return the digest of a file, reading it only if its size or modification time changed.
+
+        Args:
+            index (Dict[str, List]): The index of the network scenario of the file.
+            file_fs (FS): The filesystem containing the file.
+            path (str): The path of the file in the filesystem.
+
+        Returns:
+            str: The SHA-256 digest of the file content.
+        """
+        sys_path = file_fs.getsyspath(path) if file_fs.hassyspath(path) else None
+        if sys_path:
+            stat = os.stat(sys_path)
+            with self._lock:
+                cached = index.get(sys_path, None)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                return cached[2]
+
+        digest = hashlib.sha256()
+        with file_fs.openbin(path) as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+
+        if sys_path:
+            with self._lock:
+                index[sys_path] = [stat.st_size, stat.st_mtime_ns, digest]
+
+        return digest
+
+    def _get_archive_path(self, key: str) -> str:
+        return os.path.join(self.path, "archives", key)
+
+    def _get_index_path(self, lab_hash: str) -> str:
+        return os.path.join(self.path, "indexes", f"{lab_hash}.json")
+
+    def _load_index(self, lab_hash: str) -> Dict[str, List]:
+        """Load the index of a network scenario from disk, if not already loaded. Must be called holding the lock.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            Dict[str, List]: Keys are file paths, values are lists composed by size, modification time and digest.
+        """
+        if lab_hash not in self._indexes:
+            index = {}
+            try:
+                with open(self._get_index_path(lab_hash), 'r') as index_file:
+                    index = json.load(index_file)
+                if not isinstance(index, dict):
+                    index = {}
+            except (OSError, ValueError):
+                pass
+
+            self._indexes[lab_hash] = index
+
+        return self._indexes[lab_hash]
+
+    def _save_index(self, lab_hash: str) -> None:
+        """Save the index of a network scenario on disk. Must be called holding the lock.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            None
+        """
+        if lab_hash in self._indexes:
+            self._atomic_write(self._get_index_path(lab_hash),
+                               json.dumps(self._indexes[lab_hash]).encode('utf-8'))
+
+    def _evict(self) -> None:
+        """Remove the least recently used archives until the cache size is below `max_size`. Must be called holding
+        the lock.
+
+        Returns:
+            None
+        """
+        archives_path = os.path.join(self.path, "archives")
+        archives = []
+        for entry in os.scandir(archives_path):
+            if entry.is_file():
+                stat = entry.stat()
+                archives.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in archives)
+        for (_, size, archive_path) in sorted(archives):
+            if total_size <= self.max_size:
+                break
+
+            logging.debug(f"Evicting `{archive_path}` from pack cache...")
+            try:
+                os.remove(archive_path)
+            except OSError:
+                continue
+            total_size -= size
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        """Write a file atomically, so concurrent Kathara processes never read partial files.
+
+        Args:
+            path (str): The path of the file to write.
+            data (bytes): The content of the file.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        (fd, temp_path) = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -6,7 +6,9 @@ from typing import Set, Dict, Generator, Any, Tuple, List, Optional, Union
 from ..exceptions import InstantiationError
 from ..foundation.manager.IManager import IManager
 from ..foundation.manager.ManagerFactory import ManagerFactory
+from ..foundation.manager.WipeReport import WipeReport
 from ..foundation.manager.exec_stream.IExecStream import IExecStream
+from ..foundation.manager.exec_stream.MultiExecStream import MultiExecStream
 from ..foundation.manager.stats.ILinkStats import ILinkStats
 from ..foundation.manager.stats.IMachineStats import IMachineStats
 from ..model.Lab import Lab
@@ -180,17 +182,43 @@ class Kathara(IManager):
         """
         self.manager.undeploy_lab(lab_hash, lab_name, lab, selected_machines, excluded_machines, selected_links)
 
-    def wipe(self, all_users: bool = False) -> None:
+    def wipe(self, all_users: bool = False, fast: bool = False) -> WipeReport:
         """Undeploy all the running network scenarios.
 
         Args:
             all_users (bool): If false, undeploy only the current user network scenarios. If true, undeploy the
                 running network scenarios of all users.
+            fast (bool): If True, remove the resources in bulk without executing the shutdown commands of the devices.
 
         Returns:
-            None
+            Kathara.foundation.manager.WipeReport.WipeReport: The number of removed resources and the time spent.
+        """
+        return self.manager.wipe(all_users, fast)
+
+    def wait_ready(self, lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                   selected_machines: Optional[Set[str]] = None, timeout: Optional[float] = None,
+                   all_users: bool = False) -> Dict[str, bool]:
+        """Wait until the startup commands of the devices of a network scenario are executed.
+
+        Args:
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            selected_machines (Optional[Set[str]]): If not None, wait only the specified devices.
+            timeout (Optional[float]): The maximum seconds to wait. If None, wait indefinitely.
+            all_users (bool): If True, search the devices among all the users devices.
+
+        Returns:
+            Dict[str, bool]: Keys are device names, values are True if the startup commands of the device are
+                executed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
         """
-        self.manager.wipe(all_users)
+        return self.manager.wait_ready(lab_hash, lab_name, lab, selected_machines, timeout, all_users)
 
     def connect_tty(self, machine_name: str, lab_hash: Optional[str] = None, lab_name: Optional[str] = None,
                     lab: Optional[Lab] = None, shell: str = None, logs: bool = False,
@@ -273,6 +301,37 @@ class Kathara(IManager):
         """
         return self.manager.exec(machine_name, command, lab_hash, lab_name, lab, wait, stream)
 
+    def exec_many(self, machine_names: Optional[List[str]], command: Union[List[str], str],
+                  lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                  wait: Union[bool, Tuple[int, float]] = False, concurrency: Optional[int] = None) -> MultiExecStream:
+        """Exec a command on multiple devices of a running network scenario in parallel.
+
+        Args:
+            machine_names (Optional[List[str]]): The names of the devices to exec the command on.
+                If None, the command is executed on all the running devices of the network scenario.
+            command (Union[List[str], str]): The command to exec on the devices.
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            wait (Union[bool, Tuple[int, float]]): If True, wait indefinitely until the end of the startup commands
+                execution before executing the command. If a tuple is provided, the first value indicates the
+                number of retries before stopping waiting and the second value indicates the time interval to wait
+                for each retry. Default is False.
+            concurrency (Optional[int]): The maximum number of concurrent executions. If None, the default pool size
+                is used.
+
+        Returns:
+            MultiExecStream: A stream of the output chunks of the devices, tagged with the device name. Exit codes
+                are available in its `exit_codes` attribute once the stream is consumed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
+        """
+        return self.manager.exec_many(machine_names, command, lab_hash, lab_name, lab, wait, concurrency)
+
     def exec_obj(self, machine: Machine, command: Union[List[str], str], wait: Union[bool, Tuple[int, float]] = False,
                  stream: bool = True) -> Union[IExecStream, Tuple[bytes, bytes, int]]:
         """Exec a command on a device in a running network scenario.
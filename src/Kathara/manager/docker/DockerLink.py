@@ -2,14 +2,17 @@ import logging
 import os
 import re
 from multiprocessing.dummy import Pool
-from typing import List, Union, Dict, Generator, Set, Optional
+from typing import List, Union, Dict, Generator, Set, Optional, Tuple, Iterable
 
 import docker
+import docker.models.containers
 import docker.models.networks
 from docker import DockerClient
 from docker import types
+from docker.errors import APIError, NotFound
 
 from .DockerPlugin import DockerPlugin
+from .DockerStateCache import DockerStateCache
 from .stats.DockerLinkStats import DockerLinkStats
 from ... import utils
 from ...event.EventDispatcher import EventDispatcher
@@ -24,11 +27,16 @@ from ...types import SharedCollisionDomainsOption
 
 class DockerLink(object):
     """The class responsible for deploying Kathara collision domains as Docker networks and interact with them."""
-    __slots__ = ['client', 'docker_plugin']
+    __slots__ = ['client', 'docker_plugin', 'state_cache', '_networks_index']
 
-    def __init__(self, client: DockerClient, docker_plugin: DockerPlugin) -> None:
+    def __init__(self, client: DockerClient, docker_plugin: DockerPlugin,
+                 state_cache: Optional[DockerStateCache] = None) -> None:
         self.client: DockerClient = client
         self.docker_plugin: DockerPlugin = docker_plugin
+        self.state_cache: Optional[DockerStateCache] = state_cache
+
+        # Existing Docker networks of the network scenario being deployed, indexed by collision domain name
+        self._networks_index: Optional[Dict[str, docker.models.networks.Network]] = None
 
     def deploy_links(self, lab: Lab, selected_links: Set[str] = None, excluded_links: Set[str] = None) -> None:
         """Deploy all the network scenario collision domains as Docker networks.
@@ -61,11 +69,18 @@ class DockerLink(object):
             pool_size = utils.get_pool_size()
             items = utils.chunk_list(links, pool_size)
 
+            self.docker_plugin.ensure_plugin()
+
             EventDispatcher.get_instance().dispatch("links_deploy_started", items=links)
 
-            with Pool(pool_size) as links_pool:
-                for chunk in items:
-                    links_pool.map(func=self._deploy_link, iterable=chunk)
+            # Fetch the existing networks with a single call, instead of searching them for each collision domain
+            self._networks_index = self._build_networks_index(lab)
+            try:
+                with Pool(pool_size) as links_pool:
+                    for chunk in items:
+                        links_pool.map(func=self._deploy_link, iterable=chunk)
+            finally:
+                self._networks_index = None
 
             EventDispatcher.get_instance().dispatch("links_deploy_ended")
 
@@ -112,16 +127,14 @@ class DockerLink(object):
             return
 
         # If a network with the same name exists, return it instead of creating a new one.
-        filter_lab_hash = None
-        filter_user = None
-        if Setting.get_instance().shared_cds == SharedCollisionDomainsOption.NOT_SHARED:
-            filter_lab_hash = link.lab.hash
-        if Setting.get_instance().shared_cds != SharedCollisionDomainsOption.USERS:
-            filter_user = utils.get_current_user_name()
-
-        networks = self.get_links_api_objects_by_filters(
-            link_name=link.name, lab_hash=filter_lab_hash, user=filter_user
-        )
+        networks_index = self._networks_index
+        if networks_index is not None:
+            networks = [networks_index[link.name]] if link.name in networks_index else []
+        else:
+            (filter_lab_hash, filter_user) = self._get_networks_filters(link.lab)
+            networks = self.get_links_api_objects_by_filters(
+                link_name=link.name, lab_hash=filter_lab_hash, user=filter_user
+            )
         if networks:
             link.api_object = networks.pop()
         else:
@@ -147,61 +160,203 @@ class DockerLink(object):
                 }
             )
 
+            if networks_index is not None:
+                networks_index[link.name] = link.api_object
+
+            if self.state_cache:
+                self.state_cache.update_network(link.api_object)
+
             if link.external:
                 logging.debug("External Interfaces required, connecting them...")
                 self._attach_external_interfaces(link.external, link.api_object)
 
-    def undeploy(self, lab_hash: str, selected_links: Optional[Set[str]] = None) -> None:
+    @staticmethod
+    def _get_networks_filters(lab: Lab) -> Tuple[Optional[str], Optional[str]]:
+        """Return the filters to find the existing networks that can be reused by the network scenario, based on
+        the shared collision domains setting.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The lab_hash and the user filters.
+        """
+        filter_lab_hash = None
+        filter_user = None
+        if Setting.get_instance().shared_cds == SharedCollisionDomainsOption.NOT_SHARED:
+            filter_lab_hash = lab.hash
+        if Setting.get_instance().shared_cds != SharedCollisionDomainsOption.USERS:
+            filter_user = utils.get_current_user_name()
+
+        return filter_lab_hash, filter_user
+
+    def _build_networks_index(self, lab: Lab) -> Dict[str, docker.models.networks.Network]:
+        """Return the existing networks that can be reused by the network scenario, indexed by collision domain name.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario.
+
+        Returns:
+            Dict[str, docker.models.networks.Network]: Keys are collision domain names, values are Docker networks.
+        """
+        (filter_lab_hash, filter_user) = self._get_networks_filters(lab)
+        networks = self.get_links_api_objects_by_filters(lab_hash=filter_lab_hash, user=filter_user, greedy=False)
+
+        return {network.attrs["Labels"]["name"]: network for network in networks if "name" in network.attrs["Labels"]}
+
+    def undeploy(self, lab_hash: str, selected_links: Optional[Set[str]] = None, user: Optional[str] = None,
+                 containers: Optional[List[docker.models.containers.Container]] = None,
+                 removed_containers: Optional[Iterable[docker.models.containers.Container]] = None) -> None:
         """Undeploy all the collision domains of the scenario specified by lab_hash.
 
+        A network is deleted only when no container is attached to it. If the containers being removed are passed
+        in removed_containers, the undeploy is pipelined: each network is deleted as soon as its last attached
+        container is removed, while the other containers are still being removed.
+
         Args:
             lab_hash (str): The hash of the network scenario to undeploy.
             selected_links (Set[str]): If specified, delete only the collision domains contained in the set.
+            user (Optional[str]): If specified, delete only the collision domains of the user.
+            containers (Optional[List[docker.models.containers.Container]]): The containers that can be attached to
+                the networks, used to count the attached containers. If None, all the containers are listed.
+            removed_containers (Optional[Iterable[docker.models.containers.Container]]): An iterable yielding each
+                container as soon as it is removed.
 
         Returns:
             None
         """
-        networks = self.get_links_api_objects_by_filters(lab_hash=lab_hash)
+        networks = self.get_links_api_objects_by_filters(lab_hash=lab_hash, user=user, greedy=False)
         if selected_links is not None:
             networks = [item for item in networks if item.attrs["Labels"]["name"] in selected_links]
+        networks_by_id = {network.id: network for network in networks}
 
-        for item in networks:
-            item.reload()
-        networks = [item for item in networks if len(item.containers) <= 0]
-
-        if len(networks) > 0:
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(networks, pool_size)
-
-            EventDispatcher.get_instance().dispatch("links_undeploy_started", items=networks)
-
-            with Pool(pool_size) as links_pool:
-                for chunk in items:
-                    links_pool.map(func=self._undeploy_link, iterable=chunk)
-
-            EventDispatcher.get_instance().dispatch("links_undeploy_ended")
+        if containers is None:
+            # A single (sparse) listing instead of inspecting each network
+            containers = self.client.containers.list(all=True, sparse=True)
+        attached_containers = self.count_attached_containers(containers)
 
-    def wipe(self, user: str = None) -> None:
+        pool_size = min(utils.get_pool_size(), max(len(networks), 1))
+        with Pool(pool_size) as links_pool:
+            deletions = {}
+
+            def release(network_id: str) -> None:
+                if network_id in networks_by_id and network_id not in deletions:
+                    deletions[network_id] = links_pool.apply_async(self._delete_link, (networks_by_id[network_id],))
+
+            for network_id in networks_by_id:
+                if attached_containers.get(network_id, 0) <= 0:
+                    release(network_id)
+
+            for container in (removed_containers or []):
+                for network_id in self.get_attached_networks_ids(container):
+                    attached_containers[network_id] = attached_containers.get(network_id, 1) - 1
+                    if attached_containers[network_id] <= 0:
+                        release(network_id)
+
+            # Events are dispatched after the containers are removed, so progress is reported one phase at a time
+            released_networks = [networks_by_id[network_id] for network_id in deletions]
+            if len(released_networks) > 0:
+                EventDispatcher.get_instance().dispatch("links_undeploy_started", items=released_networks)
+
+                for network in released_networks:
+                    try:
+                        deletions[network.id].get()
+                    except APIError as e:
+                        logging.warning(f"Cannot delete collision domain `{network.attrs['Labels']['name']}`: "
+                                        f"{e.explanation}")
+                    EventDispatcher.get_instance().dispatch("link_undeployed", item=network)
+
+                EventDispatcher.get_instance().dispatch("links_undeploy_ended")
+
+    def wipe(self, user: str = None, fast: bool = False) -> int:
         """Undeploy all the Docker networks of the specified user. If user is None, it undeploy all the Docker networks.
 
         Args:
             user (str): The name of a current user on the host
+            fast (bool): If True, try to remove every network without counting the attached containers. Networks
+                still in use (e.g., shared with other users) are skipped.
 
         Returns:
-            None
+            int: The number of removed networks.
         """
         user_label = user if Setting.get_instance().shared_cds != SharedCollisionDomainsOption.USERS else None
-        networks = self.get_links_api_objects_by_filters(user=user_label)
-        for item in networks:
-            item.reload()
-        networks = [item for item in networks if len(item.containers) <= 0]
+        networks = self.get_links_api_objects_by_filters(user=user_label, greedy=False)
+        if not fast:
+            attached_containers = self.count_attached_containers(self.client.containers.list(all=True, sparse=True))
+            networks = [item for item in networks if attached_containers.get(item.id, 0) <= 0]
 
-        pool_size = utils.get_pool_size()
-        items = utils.chunk_list(networks, pool_size)
+        if len(networks) == 0:
+            return 0
 
+        pool_size = min(utils.get_pool_size(), len(networks))
         with Pool(pool_size) as links_pool:
-            for chunk in items:
-                links_pool.map(func=self._undeploy_link, iterable=chunk)
+            return sum(links_pool.imap_unordered(self._remove_link if fast else self._wipe_link, networks))
+
+    def _wipe_link(self, network: docker.models.networks.Network) -> bool:
+        """Undeploy a Docker network, skipping it if it is already removed.
+
+        Args:
+            network (docker.models.networks.Network): A Docker network.
+
+        Returns:
+            bool: True if the network is removed, else False.
+        """
+        try:
+            self._undeploy_link(network)
+        except NotFound:
+            return False
+        except APIError as e:
+            logging.warning(f"Cannot remove network `{network.name}`: {str(e)}")
+            return False
+
+        return True
+
+    def _remove_link(self, network: docker.models.networks.Network) -> bool:
+        """Delete a Docker network, skipping it if it is still in use.
+
+        Args:
+            network (docker.models.networks.Network): A Docker network.
+
+        Returns:
+            bool: True if the network is removed, else False.
+        """
+        try:
+            self._delete_link(network)
+        except APIError as e:
+            logging.debug(f"Cannot remove network `{network.name}`: {str(e)}")
+            return False
+
+        return True
+
+    @staticmethod
+    def get_attached_networks_ids(container: docker.models.containers.Container) -> List[str]:
+        """Return the IDs of the networks attached to a container, using the container data.
+
+        Args:
+            container (docker.models.containers.Container): A (possibly sparse) Docker container.
+
+        Returns:
+            List[str]: The IDs of the attached networks.
+        """
+        attached_networks = (container.attrs.get("NetworkSettings", None) or {}).get("Networks", None) or {}
+        return [network["NetworkID"] for network in attached_networks.values() if network and network.get("NetworkID")]
+
+    @staticmethod
+    def count_attached_containers(containers: Iterable[docker.models.containers.Container]) -> Dict[str, int]:
+        """Count the containers attached to each network, using the containers data.
+
+        Args:
+            containers (Iterable[docker.models.containers.Container]): The (possibly sparse) Docker containers.
+
+        Returns:
+            Dict[str, int]: Keys are network IDs, values are the number of attached containers.
+        """
+        attached_containers = {}
+        for container in containers:
+            for network_id in DockerLink.get_attached_networks_ids(container):
+                attached_containers[network_id] = attached_containers.get(network_id, 0) + 1
+
+        return attached_containers
 
     def _undeploy_link(self, network: docker.models.networks.Network) -> None:
         """Undeploy a Docker network.
@@ -225,14 +380,15 @@ class DockerLink(object):
         bridge_list = self.client.networks.list(names="bridge")
         return bridge_list.pop() if bridge_list else None
 
-    def get_links_api_objects_by_filters(self, lab_hash: str = None, link_name: str = None, user: str = None) -> \
-            List[docker.models.networks.Network]:
+    def get_links_api_objects_by_filters(self, lab_hash: str = None, link_name: str = None, user: str = None,
+                                         greedy: bool = True) -> List[docker.models.networks.Network]:
         """Return the Docker networks specified by lab_hash and user.
 
         Args:
             lab_hash (str): The hash of a network scenario. If specified, return all the networks in the scenario.
             link_name (str): The name of a network. If specified, return the specified network of the scenario.
             user (str): The name of a user on the host. If specified, return only the networks of the user.
+            greedy (bool): If True, inspect each network to fetch its attached containers. Default is True.
 
         Returns:
             List[docker.models.networks.Network]: A list of Docker networks.
@@ -245,7 +401,10 @@ class DockerLink(object):
         if link_name:
             filters["label"].append(f"name={link_name}")
 
-        return self.client.networks.list(filters=filters, greedy=True)
+        if self.state_cache and self.state_cache.is_synced():
+            return self.state_cache.get_networks(lab_hash=lab_hash, link_name=link_name, user=user)
+
+        return self.client.networks.list(filters=filters, greedy=greedy)
 
     def get_links_stats(self, lab_hash: str = None, link_name: str = None, user: str = None) -> \
             Generator[Dict[str, DockerLinkStats], None, None]:
@@ -314,6 +473,9 @@ class DockerLink(object):
 
         network.remove()
 
+        if self.state_cache:
+            self.state_cache.remove_network(network.id)
+
     def _attach_external_interfaces(self, external_links: List[ExternalLink],
                                     network: docker.models.networks.Network) -> None:
         """Attach external collision domains to a Docker network.
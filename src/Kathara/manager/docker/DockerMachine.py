@@ -1,3 +1,4 @@
+import json
 import logging
 import re
 import shlex
@@ -5,25 +6,31 @@ import sys
 import tarfile
 import tempfile
 import time
+from contextlib import nullcontext
 from itertools import islice
 from multiprocessing.dummy import Pool
-from typing import List, Dict, Generator, Optional, Set, Tuple, Union, Any
+from typing import List, Dict, Generator, Optional, Set, Tuple, Union, Any, Iterable, ContextManager
 
-import chardet
 import docker.models.containers
 from docker import DockerClient
-from docker.errors import APIError
+from docker.errors import APIError, NotFound
 from docker.types import Ulimit
 from docker.utils import version_lt, version_gte
 
 from .DockerImage import DockerImage
+from .DockerStartupWatcher import DockerStartupWatcher
+from .DockerStateCache import DockerStateCache
 from .exec_stream.DockerExecStream import DockerExecStream
 from .stats.DockerMachineStats import DockerMachineStats
+from .stats.DockerMachineStatsCollector import DockerMachineStatsCollector
 from ... import utils
 from ...decorators import privileged
 from ...event.EventDispatcher import EventDispatcher
 from ...exceptions import MountDeniedError, MachineAlreadyExistsError, DockerPluginError, \
     MachineBinaryError, MachineNotRunningError, PrivilegeError, InvocationError
+from ...foundation.manager.BootProfiler import BootProfiler, BOOT_TRACE_PATH, BOOT_TRACE_PS4, STARTUP_CATEGORY, \
+    SCRIPT_CATEGORY
+from ...foundation.manager.DependencyScheduler import DependencyScheduler
 from ...model.Interface import Interface
 from ...model.Lab import Lab
 from ...model.Link import Link, BRIDGE_LINK_NAME
@@ -38,6 +45,9 @@ OCI_RUNTIME_RE = re.compile(
 
 IFACE_SYSCTL_RE = re.compile(r"net\.ipv[4,6]\.(conf|neigh)\.eth\d+")
 
+# Maximum number of (lab_hash, user) filters whose inspected containers are kept, least recently used are dropped
+INSPECT_CACHE_MAX_FILTERS: int = 16
+
 # Known commands that each container should execute
 # Run order: shared.startup, machine.startup and machine.meta['exec_commands']
 STARTUP_COMMANDS = [
@@ -96,6 +106,14 @@ STARTUP_COMMANDS = [
     "touch /tmp/EOS"
 ]
 
+# Maximum seconds to wait for the end of the startup commands before collecting the boot profile of the devices
+BOOT_PROFILE_TIMEOUT: float = 600.0
+BOOT_PROFILE_SEPARATOR: str = "---KATHARA-BOOT-PROFILE---"
+
+# Bounds of the polling interval used to wait detached exec instances (e.g., shutdown commands with a timeout)
+EXEC_POLL_MIN_INTERVAL: float = 0.05
+EXEC_POLL_MAX_INTERVAL: float = 1.0
+
 SHUTDOWN_COMMANDS = [
     # If machine.shutdown file is present
     "if [ -f \"/hostlab/{machine_name}.shutdown\" ]; then "
@@ -111,12 +129,18 @@ SHUTDOWN_COMMANDS = [
 
 class DockerMachine(object):
     """The class responsible for deploying Kathara devices as Docker container and interact with them."""
-    __slots__ = ['client', '_engine_version', 'docker_image']
+    __slots__ = ['client', '_engine_version', 'docker_image', 'state_cache', '_inspect_cache']
 
-    def __init__(self, client: DockerClient, docker_image: DockerImage) -> None:
+    def __init__(self, client: DockerClient, docker_image: DockerImage,
+                 state_cache: Optional[DockerStateCache] = None) -> None:
         self.client: DockerClient = client
         self._engine_version: str = parse_docker_engine_version(client.version()['Version'])
         self.docker_image: DockerImage = docker_image
+        self.state_cache: Optional[DockerStateCache] = state_cache
+
+        # Keys are (lab_hash, user) filters, values map container ids to (fingerprint, inspected container)
+        self._inspect_cache: Dict[Tuple[Optional[str], Optional[str]],
+                                  Dict[str, Tuple[str, docker.models.containers.Container]]] = {}
 
     def deploy_machines(self, lab: Lab, selected_machines: Set[str] = None, excluded_machines: Set[str] = None) -> None:
         """Deploy all the network scenario devices as Docker containers.
@@ -166,26 +190,29 @@ class DockerMachine(object):
             else:
                 lab.create_shared_folder()
 
-        EventDispatcher.get_instance().dispatch("machines_deploy_started", items=machines)
-
         # Deploy all lab machines.
-        # If there is no lab.dep file, machines can be deployed using multithreading.
-        # If not, they're started sequentially
-        if not lab.has_dependencies:
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(machines, pool_size)
-
-            with Pool(pool_size) as machines_pool:
-                for chunk in items:
-                    machines_pool.map(func=self._deploy_and_start_machine, iterable=chunk)
-        else:
-            for item in machines:
-                self._deploy_and_start_machine(item)
+        # Each device is started as soon as the devices it depends on (specified in lab.dep) are started.
+        # If there is no lab.dep file, all the devices are deployed in parallel.
+        scheduler = DependencyScheduler(lab.dependencies if lab.has_dependencies else None)
+        scheduler.schedule(map(lambda x: x[0], machines))
+
+        boot_profiler = BootProfiler() if lab.general_options.get('boot_profile', False) else None
+        lab.add_option("_boot_profiler", boot_profiler)
+
+        EventDispatcher.get_instance().dispatch(
+            "machines_deploy_started", items=machines, critical_path_length=scheduler.critical_path_length
+        )
+
+        scheduler.run(machines, self._deploy_and_start_machine, callback=self._on_machine_deployed)
 
         EventDispatcher.get_instance().dispatch("machines_deploy_ended")
 
+        if boot_profiler:
+            self._collect_boot_profile(lab, machines, boot_profiler)
+
         # Delete to avoid keeping dirty state
         del lab.general_options['_mount_volumes']
+        lab.general_options.pop('_boot_profiler', None)
 
     def _deploy_and_start_machine(self, machine_item: Tuple[str, Machine]) -> None:
         """Deploy and start a Docker container from the device contained in machine_item.
@@ -198,10 +225,117 @@ class DockerMachine(object):
         """
         (_, machine) = machine_item
 
-        self.create(machine)
-        self.start(machine)
+        with self._profile_phase(machine, "create"):
+            self.create(machine)
+        with self._profile_phase(machine, "start"):
+            self.start(machine)
 
-        EventDispatcher.get_instance().dispatch("machine_deployed", item=machine)
+    @staticmethod
+    def _profile_phase(machine: Machine, name: str) -> ContextManager:
+        """Return a context manager measuring a boot phase of the device, if the boot profiling is enabled.
+
+        Args:
+            machine (Kathara.model.Machine.Machine): A Kathara device.
+            name (str): The name of the phase.
+
+        Returns:
+            ContextManager: A context manager measuring the enclosed block.
+        """
+        boot_profiler = DockerMachine._get_boot_profiler(machine)
+        return boot_profiler.phase(machine.name, name) if boot_profiler else nullcontext()
+
+    @staticmethod
+    def _get_boot_profiler(machine: Machine) -> Optional[BootProfiler]:
+        """Return the profiler of the deploy of the device, if the boot profiling is enabled.
+
+        Args:
+            machine (Kathara.model.Machine.Machine): A Kathara device.
+
+        Returns:
+            Optional[BootProfiler]: The profiler of the deploy, None if the boot profiling is not enabled.
+        """
+        boot_profiler = machine.lab.general_options.get('_boot_profiler', None) if machine.lab else None
+        return boot_profiler if isinstance(boot_profiler, BootProfiler) else None
+
+    def _collect_boot_profile(self, lab: Lab, machines: Iterable[Tuple[str, Machine]],
+                              boot_profiler: BootProfiler) -> None:
+        """Wait the end of the startup commands, add their traces to the boot profile and save it in the network
+        scenario filesystem.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario.
+            machines (Iterable[Tuple[str, Machine]]): The deployed devices.
+            boot_profiler (BootProfiler): The profiler of the deploy.
+
+        Returns:
+            None
+        """
+        machines = [machine for (_, machine) in machines if machine.api_object is not None]
+        if not machines:
+            return
+
+        logging.info("Waiting the startup commands to collect the boot profile...")
+        self.wait_ready(lab.hash, selected_machines={machine.name for machine in machines},
+                        user=utils.get_current_user_name(), timeout=BOOT_PROFILE_TIMEOUT)
+
+        pool_size = min(utils.get_pool_size(), len(machines))
+        with Pool(pool_size) as collect_pool:
+            collect_pool.map(func=lambda machine: self._collect_machine_boot_trace(machine, boot_profiler),
+                             iterable=machines)
+
+        boot_profiler.save(lab.fs)
+        logging.info("Boot profile saved in the network scenario directory.")
+
+    @privileged
+    def _collect_machine_boot_trace(self, machine: Machine, boot_profiler: BootProfiler) -> None:
+        """Add the traces of the startup commands and startup scripts of a device to the boot profile.
+
+        Args:
+            machine (Kathara.model.Machine.Machine): A Kathara device.
+            boot_profiler (BootProfiler): The profiler of the deploy.
+
+        Returns:
+            None
+        """
+        trace_files = [BOOT_TRACE_PATH, "/var/log/shared.log", "/var/log/startup.log"]
+        cat_command = "; ".join(f"cat {path} 2> /dev/null; echo {BOOT_PROFILE_SEPARATOR}" for path in trace_files)
+        try:
+            exec_result = self._exec_run(machine.api_object,
+                                         cmd=[machine.api_object.labels['shell'], '-c', cat_command],
+                                         stdout=True,
+                                         stderr=False,
+                                         privileged=False,
+                                         detach=False
+                                         )
+        except (APIError, MachineBinaryError) as e:
+            logging.debug(f"Cannot collect boot trace of device `{machine.name}`: {str(e)}")
+            return
+
+        output = exec_result['output'].decode('utf-8', errors='replace') if exec_result['output'] else ""
+        (boot_trace, shared_trace, startup_trace) = (output.split(BOOT_PROFILE_SEPARATOR) + ["", "", ""])[:3]
+
+        commands = boot_profiler.add_trace(machine.name, STARTUP_CATEGORY, boot_trace.splitlines())
+        # Each script lasts until the following startup command is traced
+        for (script_path, script_trace) in [("/hostlab/shared.startup", shared_trace),
+                                            (f"/hostlab/{machine.name}.startup", startup_trace)]:
+            boot_profiler.add_trace(machine.name, SCRIPT_CATEGORY, script_trace.splitlines(),
+                                    end=boot_profiler.get_command_end(commands, script_path))
+
+    @staticmethod
+    def _on_machine_deployed(machine_item: Tuple[str, Machine], level: int, elapsed: float) -> None:
+        """Notify that the device contained in machine_item is deployed and started.
+
+        Args:
+            machine_item (Tuple[str, Machine]): A tuple composed by the name of the device and a device object.
+            level (int): The level of the device in the dependency graph.
+            elapsed (float): The seconds elapsed from the beginning of the network scenario deploy.
+
+        Returns:
+            None
+        """
+        (_, machine) = machine_item
+
+        EventDispatcher.get_instance().dispatch("machine_deployed", item=machine, level=level, elapsed=elapsed)
 
     def create(self, machine: Machine) -> None:
         """Create a Docker container representing the device and assign it to machine.api_object.
@@ -386,12 +520,17 @@ class DockerMachine(object):
             raise e
 
         # Pack machine files into a tar.gz and extract its content inside `/`
-        tar_data = machine.pack_data()
-        if tar_data:
-            self.copy_files(machine_container, "/", tar_data)
+        # Docker extracts the archive locally, so it is streamed without compression
+        with self._profile_phase(machine, "copy_files"):
+            tar_data = machine.pack_data_stream()
+            if tar_data:
+                self.copy_files(machine_container, "/", tar_data)
 
         machine.api_object = machine_container
 
+        if self.state_cache:
+            self.state_cache.update_container(machine_container)
+
     def connect_interface(self, machine: Machine, interface: Interface) -> None:
         """Connect the Docker container representing the machine to a specified collision domain.
 
@@ -509,7 +648,8 @@ class DockerMachine(object):
         logging.debug("Starting device `%s`..." % machine.name)
 
         try:
-            machine.api_object.start()
+            with self._profile_phase(machine, "container_start"):
+                machine.api_object.start()
         except APIError as e:
             if e.response.status_code == 500 and e.explanation.startswith('Mounts denied'):
                 raise MountDeniedError("Host drive is not shared with Docker.")
@@ -519,20 +659,21 @@ class DockerMachine(object):
             else:
                 raise e
 
-        # Connect the container to its networks (starting from the second, the first is already connected in `create`)
-        # This should be done after the container start because Docker causes a non-deterministic order when attaching
-        # networks before container startup.
-        for (iface_num, machine_iface) in islice(machine.interfaces.items(), 1, None):
-            logging.debug(
-                f"Connecting device `{machine.name}` to collision domain `{machine_iface.link.name}` "
-                f"on interface {iface_num}..."
-            )
-            self.connect_interface(machine, machine_iface)
+        with self._profile_phase(machine, "network_attach"):
+            # Connect the container to its networks (starting from the second, the first is already connected in
+            # `create`). This should be done after the container start because Docker causes a non-deterministic order
+            # when attaching networks before container startup.
+            for (iface_num, machine_iface) in islice(machine.interfaces.items(), 1, None):
+                logging.debug(
+                    f"Connecting device `{machine.name}` to collision domain `{machine_iface.link.name}` "
+                    f"on interface {iface_num}..."
+                )
+                self.connect_interface(machine, machine_iface)
 
-        # Bridged connection required but not added in `deploy` method.
-        if "_bridge_connected" not in machine.meta and machine.is_bridged():
-            bridge_link = machine.lab.get_or_new_link(BRIDGE_LINK_NAME).api_object
-            bridge_link.connect(machine.api_object)
+            # Bridged connection required but not added in `deploy` method.
+            if "_bridge_connected" not in machine.meta and machine.is_bridged():
+                bridge_link = machine.lab.get_or_new_link(BRIDGE_LINK_NAME).api_object
+                bridge_link.connect(machine.api_object)
 
         # Append executed machine startup commands inside the /var/log/startup.log file
         if machine.meta['exec_commands']:
@@ -547,18 +688,21 @@ class DockerMachine(object):
             machine_name=machine.name,
             machine_commands="; ".join(machine.meta['exec_commands']) if machine.meta['exec_commands'] else ":"
         )
+        if self._get_boot_profiler(machine):
+            startup_commands_string = self._get_traced_startup_commands(startup_commands_string)
 
         logging.debug(f"Executing startup command on `{machine.name}`: {startup_commands_string}")
 
         try:
             # Execute the startup commands inside the container (without privileged flag so basic permissions are used)
-            self._exec_run(machine.api_object,
-                           cmd=[machine.api_object.labels['shell'], '-c', startup_commands_string],
-                           stdout=True,
-                           stderr=True,
-                           privileged=False,
-                           detach=True
-                           )
+            with self._profile_phase(machine, "startup_exec"):
+                self._exec_run(machine.api_object,
+                               cmd=[machine.api_object.labels['shell'], '-c', startup_commands_string],
+                               stdout=True,
+                               stderr=True,
+                               privileged=False,
+                               detach=True
+                               )
         except MachineBinaryError as e:
             machine.add_meta('num_terms', 0)
 
@@ -574,6 +718,27 @@ class DockerMachine(object):
         if '_bridge_connected' in machine.meta:
             del machine.meta['_bridge_connected']
 
+    @staticmethod
+    def _get_traced_startup_commands(startup_commands: str) -> str:
+        """Enable a timestamped trace of the startup commands and of the startup scripts, used for boot profiling.
+
+        The trace of the startup commands is written in the BOOT_TRACE_PATH file, while the trace of the startup
+        scripts is written in their logs (as for the `set -x` already added to them).
+
+        Args:
+            startup_commands (str): The startup commands string.
+
+        Returns:
+            str: The startup commands string with the timestamped trace enabled.
+        """
+        # PS4 is set inside the scripts, since shells running as root do not inherit it from the environment
+        script_ps4 = BOOT_TRACE_PS4.replace("$", "\\$")
+        startup_commands = startup_commands.replace(
+            '"1s;^;set -x\\n\\n;"', f'"1s;^;PS4=\'{script_ps4}\'\\nset -x\\n\\n;"'
+        )
+
+        return f"PS4='{BOOT_TRACE_PS4}'; exec 2> {BOOT_TRACE_PATH}; set -x; {startup_commands}"
+
     def undeploy(self, lab_hash: str, selected_machines: Set[str] = None, excluded_machines: Set[str] = None) -> None:
         """Undeploy the devices contained in the network scenario defined by the lab_hash.
 
@@ -587,47 +752,134 @@ class DockerMachine(object):
         Returns:
             None
 
+        Raises:
+            InvocationError: If both `selected_machines` and `excluded_machines` are specified.
+        """
+        for _ in self.undeploy_iter(lab_hash, selected_machines=selected_machines, excluded_machines=excluded_machines):
+            pass
+
+    def undeploy_iter(self, lab_hash: str, selected_machines: Set[str] = None, excluded_machines: Set[str] = None,
+                      containers: Optional[List[docker.models.containers.Container]] = None) -> \
+            Generator[docker.models.containers.Container, None, None]:
+        """Undeploy the devices contained in the network scenario defined by the lab_hash, yielding each Docker
+        container as soon as it is removed.
+
+        Devices are undeployed concurrently (see the `shutdown_concurrency` setting), so callers can release the
+        resources used by a container (e.g., its networks) while the other devices are still being undeployed.
+
+        Args:
+            lab_hash (str): The hash of the network scenario to undeploy.
+            selected_machines (Set[str]): A set containing the name of the devices to undeploy.
+            excluded_machines (Set[str]): A set containing the name of the devices to exclude.
+            containers (Optional[List[docker.models.containers.Container]]): The Docker containers of the network
+                scenario of the current user, if already fetched by the caller. If None, they are listed.
+
+        Returns:
+            Generator[docker.models.containers.Container, None, None]: A generator of the removed Docker containers.
+
         Raises:
             InvocationError: If both `selected_machines` and `excluded_machines` are specified.
         """
         if selected_machines is not None and excluded_machines is not None:
             raise InvocationError(f"You can either specify `selected_machines` or `excluded_machines`.")
 
-        containers = self.get_machines_api_objects_by_filters(lab_hash=lab_hash, user=utils.get_current_user_name())
+        if containers is None:
+            containers = self.get_machines_api_objects_by_filters(
+                lab_hash=lab_hash, user=utils.get_current_user_name()
+            )
         if selected_machines is not None:
             containers = [item for item in containers if item.labels["name"] in selected_machines]
         elif excluded_machines is not None:
             containers = [item for item in containers if item.labels["name"] not in excluded_machines]
 
         if len(containers) > 0:
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(containers, pool_size)
-
             EventDispatcher.get_instance().dispatch("machines_undeploy_started", items=containers)
 
-            with Pool(pool_size) as machines_pool:
-                for chunk in items:
-                    machines_pool.map(func=self._undeploy_machine, iterable=chunk)
+            yield from self._undeploy_containers(containers)
 
             EventDispatcher.get_instance().dispatch("machines_undeploy_ended")
 
-    def wipe(self, user: str = None) -> None:
+    def wipe(self, user: str = None, fast: bool = False) -> int:
         """Undeploy all the running devices of the specified user. If user is None, it undeploy all the running devices.
 
         Args:
             user (str): The name of a current user on the host.
+            fast (bool): If True, remove the containers without executing their shutdown commands.
 
         Returns:
-            None
+            int: The number of removed devices.
         """
+        if fast:
+            return self._remove_containers(self.get_machines_api_objects_by_filters(user=user, sparse=True))
+
         containers = self.get_machines_api_objects_by_filters(user=user)
 
-        pool_size = utils.get_pool_size()
-        items = utils.chunk_list(containers, pool_size)
+        for _ in self._undeploy_containers(containers):
+            pass
+
+        return len(containers)
+
+    def _remove_containers(self, containers: List[docker.models.containers.Container]) -> int:
+        """Forcefully remove the Docker containers concurrently, skipping the shutdown commands.
+
+        Args:
+            containers (List[docker.models.containers.Container]): The (possibly sparse) Docker containers to remove.
+
+        Returns:
+            int: The number of removed containers.
+        """
+        if not containers:
+            return 0
+
+        pool_size = min(Setting.get_instance().shutdown_concurrency or utils.get_pool_size(), len(containers))
+        with Pool(pool_size) as machines_pool:
+            return sum(machines_pool.imap_unordered(self._remove_container, containers))
+
+    def _remove_container(self, container: docker.models.containers.Container) -> bool:
+        """Forcefully remove a Docker container, killing it if it is running.
+
+        Args:
+            container (docker.models.containers.Container): The Docker container to remove.
+
+        Returns:
+            bool: True if the container is removed, False if it cannot be removed or it is already removed.
+        """
+        removed = True
+        try:
+            container.remove(v=True, force=True)
+        except NotFound:
+            removed = False
+        except APIError as e:
+            # Sparse containers have no name, so they are identified by their ID
+            logging.warning(f"Cannot remove container `{container.id}`: {str(e)}")
+            return False
+
+        if self.state_cache:
+            self.state_cache.remove_container(container.id)
+
+        return removed
+
+    def _undeploy_containers(self, containers: List[docker.models.containers.Container]) -> \
+            Generator[docker.models.containers.Container, None, None]:
+        """Undeploy the Docker containers concurrently, yielding each one as soon as it is removed.
+
+        Args:
+            containers (List[docker.models.containers.Container]): The Docker containers to undeploy.
 
+        Returns:
+            Generator[docker.models.containers.Container, None, None]: A generator of the removed Docker containers.
+        """
+        if not containers:
+            return
+
+        def undeploy_container(container: docker.models.containers.Container) -> docker.models.containers.Container:
+            self._undeploy_machine(container)
+            return container
+
+        # Containers are not chunked, so a slow shutdown does not delay the other devices
+        pool_size = min(Setting.get_instance().shutdown_concurrency or utils.get_pool_size(), len(containers))
         with Pool(pool_size) as machines_pool:
-            for chunk in items:
-                machines_pool.map(func=self._undeploy_machine, iterable=chunk)
+            yield from machines_pool.imap_unordered(undeploy_container, containers)
 
     def _undeploy_machine(self, machine_api_object: docker.models.containers.Container) -> None:
         """Undeploy a Docker container.
@@ -710,12 +962,11 @@ class DockerMachine(object):
                                          privileged=False,
                                          detach=False
                                          )
-            char_encoding = chardet.detect(exec_result['output']) if exec_result['output'] else None
-            startup_output = exec_result['output'].decode(char_encoding['encoding']) if exec_result['output'] else None
+            startup_output = exec_result['output']
 
             if startup_output:
                 sys.stdout.write("--- Startup Commands Log\n")
-                sys.stdout.write(startup_output)
+                utils.write_output(sys.stdout, startup_output)
                 sys.stdout.write("--- End Startup Commands Log\n")
 
                 if not startup_waited:
@@ -881,8 +1132,8 @@ class DockerMachine(object):
             exec_stdout = ""
             if stdout_out:
                 if type(stdout_out) is bytes:
-                    char_encoding = chardet.detect(stdout_out)
-                    exec_stdout = stdout_out.decode(char_encoding['encoding'])
+                    # The error message is ASCII, there is no need to detect the encoding
+                    exec_stdout = stdout_out.decode("utf-8", errors="replace")
                 else:
                     exec_stdout = stdout_out
             matches = OCI_RUNTIME_RE.search(exec_stdout)
@@ -894,10 +1145,108 @@ class DockerMachine(object):
 
         return {'exit_code': int(exit_code) if exit_code is not None else None, 'Id': resp['Id'], 'output': exec_output}
 
+    def wait_ready(self, lab_hash: str, selected_machines: Set[str] = None, user: str = None,
+                   timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Wait until the startup commands of the devices of a network scenario are executed.
+
+        The end of the startup commands is signaled by the Docker events stream, so each device is checked once and
+        then only when one of its exec instances ends, instead of periodically.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+            selected_machines (Set[str]): The names of the devices to wait. If None, wait all the devices.
+            user (str): The name of a user on the host. If specified, wait only the devices of the user.
+            timeout (Optional[float]): The maximum seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            Dict[str, bool]: Keys are device names, values are True if the startup commands are executed.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with DockerStartupWatcher(self.client, lab_hash=lab_hash, user=user) as watcher:
+            containers = self.get_machines_api_objects_by_filters(lab_hash=lab_hash, user=user)
+            if selected_machines:
+                containers = [x for x in containers if x.labels['name'] in selected_machines]
+
+            own_exec_ids = set()
+            ready = {container.labels['name']: False for container in containers}
+            pending = {}
+
+            def check_container(container: docker.models.containers.Container) -> None:
+                executed = self._check_startup_executed(container, own_exec_ids)
+                if executed is None:
+                    # The device cannot execute commands, so it will never be ready
+                    pending.pop(container.id, None)
+                elif executed:
+                    ready[container.labels['name']] = True
+                    pending.pop(container.id, None)
+
+            pending.update({container.id: container for container in containers})
+            if containers:
+                pool_size = min(utils.get_pool_size(), len(containers))
+                with Pool(pool_size) as check_pool:
+                    check_pool.map(func=check_container, iterable=containers)
+
+            while pending:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+
+                if not watcher.is_open:
+                    # Events are not available, fall back to polling
+                    time.sleep(min(1, remaining) if remaining is not None else 1)
+                    for container in list(pending.values()):
+                        check_container(container)
+                    continue
+
+                event = watcher.get(timeout=remaining)
+                if event is None:
+                    continue
+
+                (container_id, exec_id) = event
+                if container_id in pending and exec_id not in own_exec_ids:
+                    check_container(pending[container_id])
+
+        return ready
+
+    @privileged
+    def _check_startup_executed(self, container: docker.models.containers.Container,
+                                own_exec_ids: Optional[Set[str]] = None) -> Optional[bool]:
+        """Check if the startup commands of a device are executed.
+
+        Args:
+            container (docker.models.containers.Container): The Docker container to check.
+            own_exec_ids (Optional[Set[str]]): If specified, the ID of the exec instance used for the check is added,
+                so its end can be distinguished from the end of the startup commands.
+
+        Returns:
+            Optional[bool]: True if the startup commands are executed, False if not, None if the check cannot be
+                executed on the device.
+        """
+        try:
+            exec_result = self._exec_run(container,
+                                         cmd="cat /tmp/EOS",
+                                         stdout=True,
+                                         stderr=False,
+                                         privileged=False,
+                                         detach=False
+                                         )
+        except (APIError, MachineBinaryError) as e:
+            logging.debug(f"Cannot check startup of device `{container.labels['name']}`: {str(e)}")
+            return None
+
+        if own_exec_ids is not None:
+            own_exec_ids.add(exec_result['Id'])
+
+        return exec_result['exit_code'] == 0
+
     def _wait_startup_execution(self, container: docker.models.containers.Container,
                                 n_retries: Optional[int] = None, retry_interval: float = 1) -> int:
         """Wait until the startup commands are executed or until the user requests the control over the device.
 
+        The device is checked again only when one of its exec instances ends (or every `retry_interval` seconds if
+        the Docker events stream is not available).
+
         Args:
             container (docker.models.containers.Container): The Docker container to wait.
             n_retries (Optional[int]): Number of retries before stopping waiting. Default is None, waits indefinitely.
@@ -912,55 +1261,61 @@ class DockerMachine(object):
         n_retries = n_retries if n_retries is None or n_retries >= 0 else abs(n_retries)
         retry_interval = retry_interval if retry_interval >= 0 else 1
 
-        retries = 0
-        is_cmd_success = False
-        startup_waited = 1
-        printed = False
-        while not is_cmd_success:
-            try:
-                exec_result = self._exec_run(container,
-                                             cmd="cat /tmp/EOS",
-                                             stdout=True,
-                                             stderr=False,
-                                             privileged=False,
-                                             detach=False
-                                             )
-                is_cmd_success = exec_result['exit_code'] == 0
-
-                if not printed and not is_cmd_success:
-                    EventDispatcher.get_instance().dispatch("machine_startup_wait_started")
-                    printed = True
-
-                # If the user requests the control, break the while loop
-                if utils.exec_by_platform(utils.wait_user_input_linux,
-                                          utils.wait_user_input_windows,
-                                          utils.wait_user_input_linux):
-                    startup_waited = int(False or is_cmd_success)
-                    break
+        own_exec_ids = set()
+        with DockerStartupWatcher(self.client, lab_hash=container.labels['lab_hash'],
+                                  machine_name=container.labels['name'], user=container.labels['user']) as watcher:
+            retries = 0
+            should_check = True
+            is_cmd_success = False
+            printed = False
+            while True:
+                try:
+                    if should_check:
+                        is_cmd_success = self._check_startup_executed(container, own_exec_ids)
+                        if is_cmd_success is None:
+                            return 2
+                        if is_cmd_success:
+                            return 1
+
+                        if not printed:
+                            EventDispatcher.get_instance().dispatch("machine_startup_wait_started")
+                            printed = True
+
+                    # If the user requests the control, break the while loop
+                    if utils.exec_by_platform(utils.wait_user_input_linux,
+                                              utils.wait_user_input_windows,
+                                              utils.wait_user_input_linux):
+                        return int(False or is_cmd_success)
+
+                    if watcher.is_open:
+                        event = watcher.get(timeout=retry_interval)
+                        if event is not None:
+                            # Ignore the end of the exec instances used for checking
+                            should_check = event[1] not in own_exec_ids
+                            continue
+                        should_check = False
+                    else:
+                        time.sleep(retry_interval)
+                        should_check = True
 
-                if not is_cmd_success:
                     if n_retries is not None:
                         if retries == n_retries:
-                            break
+                            return 1
                         retries += 1
-
-                    time.sleep(retry_interval)
-            except KeyboardInterrupt:
-                # Disable the CTRL+C interrupt while waiting for startup, otherwise terminal will close.
-                pass
-            except APIError:
-                return 2
-
-        return startup_waited
+                except KeyboardInterrupt:
+                    # Disable the CTRL+C interrupt while waiting for startup, otherwise terminal will close.
+                    pass
 
     @staticmethod
-    def copy_files(machine_api_object: docker.models.containers.Container, path: str, tar_data: bytes) -> None:
+    def copy_files(machine_api_object: docker.models.containers.Container, path: str,
+                   tar_data: Union[bytes, Iterable[bytes]]) -> None:
         """Copy the files contained in tar_data in the Docker container path specified by the machine_api_object.
 
         Args:
             machine_api_object (docker.models.containers.Container): A Docker container.
             path (str): The path of the container where copy the tar_data.
-            tar_data (bytes): The data to copy in the container.
+            tar_data (Union[bytes, Iterable[bytes]]): The tar archive to copy in the container, optionally compressed.
+                It can be an iterable of chunks, streamed to the Docker daemon as they are generated.
 
         Returns:
             None
@@ -995,14 +1350,16 @@ class DockerMachine(object):
                 tar_file.extractall(path=dst)
 
     @privileged
-    def get_machines_api_objects_by_filters(self, lab_hash: str = None, machine_name: str = None, user: str = None) -> \
-            List[docker.models.containers.Container]:
+    def get_machines_api_objects_by_filters(self, lab_hash: str = None, machine_name: str = None, user: str = None,
+                                            sparse: bool = False) -> List[docker.models.containers.Container]:
         """Return the Docker containers objects specified by lab_hash and user.
 
         Args:
             lab_hash (str): The hash of a network scenario. If specified, return all the devices in the scenario.
             machine_name (str): The name of a device. If specified, return the specified container of the scenario.
             user (str): The name of a user on the host. If specified, return only the containers of the user.
+            sparse (bool): If True, do not inspect each container. Sparse objects only contain the attributes returned
+                by the list API (e.g., Names, Labels, Image, State and NetworkSettings).
 
         Returns:
             List[docker.models.containers.Container]: A list of Docker containers objects.
@@ -1015,8 +1372,101 @@ class DockerMachine(object):
         if machine_name:
             filters["label"].append(f"name={machine_name}")
 
+        if sparse:
+            return self.client.containers.list(all=True, filters=filters, sparse=True)
+
+        if self.state_cache and self.state_cache.is_synced():
+            return self.state_cache.get_containers(lab_hash=lab_hash, machine_name=machine_name, user=user)
+
         return self.client.containers.list(all=True, filters=filters, ignore_removed=True)
 
+    def get_inspected_machines_api_objects(self, lab_hash: str = None, user: str = None) -> \
+            List[docker.models.containers.Container]:
+        """Return the inspected Docker containers specified by lab_hash and user, inspecting only changed ones.
+
+        Containers are listed with a single call. A container is inspected (in parallel with the others) only if
+        the state or the networks returned by the list call changed since the previous call with the same filters,
+        otherwise the same object returned by the previous call is returned again.
+
+        Args:
+            lab_hash (str): The hash of a network scenario. If specified, return all the devices in the scenario.
+            user (str): The name of a user on the host. If specified, return only the containers of the user.
+
+        Returns:
+            List[docker.models.containers.Container]: A list of inspected Docker containers.
+        """
+        cache_key = (lab_hash, user)
+        cached_containers = self._inspect_cache.get(cache_key, {})
+
+        containers = self.get_machines_api_objects_by_filters(lab_hash=lab_hash, user=user, sparse=True)
+        fingerprints = {container.id: self._get_fingerprint(container) for container in containers}
+
+        changed_ids = []
+        for container in containers:
+            cached = cached_containers.get(container.id, None)
+            if cached is None or cached[0] != fingerprints[container.id]:
+                changed_ids.append(container.id)
+
+        inspected_containers = {}
+        if changed_ids:
+            pool_size = min(utils.get_pool_size(), len(changed_ids))
+            with Pool(pool_size) as inspect_pool:
+                for container in inspect_pool.map(func=self._inspect_container, iterable=changed_ids):
+                    if container is not None:
+                        inspected_containers[container.id] = container
+
+        result = []
+        updated_cache = {}
+        for container in containers:
+            if container.id in inspected_containers:
+                inspected = inspected_containers[container.id]
+            elif container.id in cached_containers and container.id not in changed_ids:
+                inspected = cached_containers[container.id][1]
+            else:
+                # Removed between the list and the inspect calls
+                continue
+
+            updated_cache[container.id] = (fingerprints[container.id], inspected)
+            result.append(inspected)
+
+        # Filters without containers (e.g., of undeployed network scenarios) are dropped
+        self._inspect_cache.pop(cache_key, None)
+        if updated_cache:
+            self._inspect_cache[cache_key] = updated_cache
+            while len(self._inspect_cache) > INSPECT_CACHE_MAX_FILTERS:
+                self._inspect_cache.pop(next(iter(self._inspect_cache)))
+
+        return result
+
+    @privileged
+    def _inspect_container(self, container_id: str) -> Optional[docker.models.containers.Container]:
+        """Inspect a Docker container.
+
+        Args:
+            container_id (str): The ID of the container.
+
+        Returns:
+            Optional[docker.models.containers.Container]: The inspected container, None if it does not exist anymore.
+        """
+        try:
+            return self.client.containers.get(container_id)
+        except NotFound:
+            return None
+
+    @staticmethod
+    def _get_fingerprint(container: docker.models.containers.Container) -> str:
+        """Return a fingerprint of the mutable state of a (sparse) Docker container.
+
+        Args:
+            container (docker.models.containers.Container): A Docker container.
+
+        Returns:
+            str: The fingerprint of the container state and networks.
+        """
+        return json.dumps(
+            [container.attrs.get("State"), container.attrs.get("NetworkSettings")], sort_keys=True, default=str
+        )
+
     def get_machines_stats(self, lab_hash: str = None, machine_name: str = None, user: str = None) -> \
             Generator[Dict[str, DockerMachineStats], None, None]:
         """Return a generator containing the Docker devices' stats.
@@ -1037,38 +1487,14 @@ class DockerMachine(object):
         if user is None and not utils.is_admin():
             raise PrivilegeError("You must be root to get devices statistics of all users.")
 
-        machines_stats = {}
-
-        @privileged
-        def load_machine_stats(machine):
-            if machine.name not in machines_stats:
-                machines_stats[machine.name] = DockerMachineStats(machine)
-
-        while True:
-            containers = self.get_machines_api_objects_by_filters(
-                lab_hash=lab_hash, machine_name=machine_name, user=user
-            )
-            if not containers:
-                yield dict()
-
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(containers, pool_size)
-            with Pool(pool_size) as machines_pool:
-                for chunk in items:
-                    machines_pool.map(func=load_machine_stats, iterable=chunk)
-
-            machines_to_remove = []
-            for machine_id, machine_stats in machines_stats.items():
-                try:
-                    machine_stats.update()
-                except StopIteration:
-                    machines_to_remove.append(machine_id)
-                    continue
-
-            for k in machines_to_remove:
-                machines_stats.pop(k, None)
+        collector = DockerMachineStatsCollector(
+            lambda: self.get_machines_api_objects_by_filters(
+                lab_hash=lab_hash, machine_name=machine_name, user=user, sparse=True
+            ),
+            one_shot=version_gte(self._engine_version, "20.10.0")
+        )
 
-            yield machines_stats
+        yield from collector.stream()
 
     @staticmethod
     def get_container_name(name: str, lab_hash: str) -> str:
@@ -1084,6 +1510,28 @@ class DockerMachine(object):
         lab_hash = lab_hash if "_%s" % lab_hash else ""
         return "%s_%s_%s_%s" % (Setting.get_instance().device_prefix, utils.get_current_user_name(), name, lab_hash)
 
+    def _wait_exec(self, exec_id: str, timeout: float) -> bool:
+        """Wait the end of a detached exec instance.
+
+        Args:
+            exec_id (str): The ID of the exec instance.
+            timeout (float): The maximum seconds to wait.
+
+        Returns:
+            bool: True if the exec instance ended, False if the timeout expired.
+        """
+        deadline = time.monotonic() + timeout
+        interval = EXEC_POLL_MIN_INTERVAL
+        while self.client.api.exec_inspect(exec_id)['Running']:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, EXEC_POLL_MAX_INTERVAL)
+
+        return True
+
     def _delete_machine(self, container: docker.models.containers.Container) -> None:
         """Remove a running Docker container.
 
@@ -1099,14 +1547,18 @@ class DockerMachine(object):
         logging.debug(f"Executing shutdown commands on `{container.labels['name']}`: {shutdown_commands_string}")
         # Execute the shutdown commands inside the container (only if it's running)
         if container.status == "running":
+            shutdown_timeout = Setting.get_instance().shutdown_timeout
             try:
-                self._exec_run(container,
-                               cmd=[container.labels['shell'], '-c', shutdown_commands_string],
-                               stdout=True,
-                               stderr=False,
-                               privileged=True,
-                               detach=False
-                               )
+                exec_result = self._exec_run(container,
+                                             cmd=[container.labels['shell'], '-c', shutdown_commands_string],
+                                             stdout=True,
+                                             stderr=False,
+                                             privileged=True,
+                                             detach=shutdown_timeout is not None
+                                             )
+                if shutdown_timeout is not None and not self._wait_exec(exec_result['Id'], shutdown_timeout):
+                    logging.warning(f"Shutdown commands of device `{container.labels['name']}` did not end in "
+                                    f"{shutdown_timeout} seconds, the device is removed anyway.")
             except MachineBinaryError as e:
                 logging.warning(f"Shell `{e.binary}` not found in "
                                 f"image `{container.image.tags[0]}` of device `{container.labels['name']}`. "
@@ -1114,3 +1566,6 @@ class DockerMachine(object):
                                 )
 
         container.remove(v=True, force=True)
+
+        if self.state_cache:
+            self.state_cache.remove_container(container.id)
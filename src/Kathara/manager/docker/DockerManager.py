@@ -12,6 +12,7 @@ from .DockerImage import DockerImage
 from .DockerLink import DockerLink
 from .DockerMachine import DockerMachine
 from .DockerPlugin import DockerPlugin
+from .DockerStateCache import DockerStateCache, SYNC_TIMEOUT
 from .exec_stream.DockerExecStream import DockerExecStream
 from .stats.DockerLinkStats import DockerLinkStats
 from .stats.DockerMachineStats import DockerMachineStats
@@ -21,6 +22,8 @@ from ...exceptions import DockerDaemonConnectionError, LinkNotFoundError, Machin
     InvocationError, LabNotFoundError, MachineNotRunningError
 from ...exceptions import MachineNotFoundError
 from ...foundation.manager.IManager import IManager
+from ...foundation.manager.WipeReport import WipeReport
+from ...foundation.manager.exec_stream.MultiExecStream import MultiExecStream
 from ...model.Lab import Lab
 from ...model.Link import Link
 from ...model.Machine import Machine
@@ -56,7 +59,7 @@ def check_docker_status(method):
 
 class DockerManager(IManager):
     """The class responsible to interact between Kathara and the Docker APIs."""
-    __slots__ = ['client', 'docker_image', 'docker_machine', 'docker_link']
+    __slots__ = ['client', 'docker_image', 'docker_machine', 'docker_link', 'state_cache']
 
     @check_docker_status
     def __init__(self) -> None:
@@ -72,13 +75,19 @@ class DockerManager(IManager):
         except DockerException as e:
             raise DockerDaemonConnectionError(str(e))
 
+        # The network plugin is checked only when networks are deployed
         docker_plugin = DockerPlugin(self.client)
-        docker_plugin.check_and_download_plugin()
 
         self.docker_image: DockerImage = DockerImage(self.client)
 
-        self.docker_machine: DockerMachine = DockerMachine(self.client, self.docker_image)
-        self.docker_link: DockerLink = DockerLink(self.client, docker_plugin)
+        # Queries are answered by the events-driven cache only while it is synced
+        self.state_cache: Optional[DockerStateCache] = None
+        if Setting.get_instance().state_cache:
+            self.state_cache = DockerStateCache(self.client)
+            self.state_cache.start(timeout=SYNC_TIMEOUT)
+
+        self.docker_machine: DockerMachine = DockerMachine(self.client, self.docker_image, self.state_cache)
+        self.docker_link: DockerLink = DockerLink(self.client, docker_plugin, self.state_cache)
 
     @privileged
     def deploy_machine(self, machine: Machine) -> None:
@@ -341,12 +350,17 @@ class DockerManager(IManager):
         if selected_machines and excluded_machines:
             raise InvocationError(f"You can either select or exclude devices.")
 
-        self.docker_machine.undeploy(lab_hash, selected_machines=selected_machines, excluded_machines=excluded_machines)
-
-        self.docker_link.undeploy(lab_hash, selected_links=selected_links)
+        # Networks are deleted as soon as their last container is removed, attachments are read from the containers
+        user = utils.get_current_user_name()
+        containers = self.docker_machine.get_machines_api_objects_by_filters(lab_hash=lab_hash, user=user)
+        removed_containers = self.docker_machine.undeploy_iter(
+            lab_hash, selected_machines=selected_machines, excluded_machines=excluded_machines, containers=containers
+        )
+        self.docker_link.undeploy(lab_hash, selected_links=selected_links, user=user, containers=containers,
+                                  removed_containers=removed_containers)
 
     @privileged
-    def wipe(self, all_users: bool = False) -> None:
+    def wipe(self, all_users: bool = False, fast: bool = False) -> WipeReport:
         """Undeploy all the running network scenarios.
 
         If multiuser scenarios are active, undeploy only current user devices.
@@ -354,9 +368,11 @@ class DockerManager(IManager):
         Args:
             all_users (bool): If false, undeploy only the current user network scenarios. If true, undeploy the
                 running network scenarios of all users.
+            fast (bool): If True, kill and remove the containers in parallel without executing their shutdown
+                commands, then remove the networks with bounded concurrency.
 
         Returns:
-            None
+            Kathara.foundation.manager.WipeReport.WipeReport: The number of removed resources and the time spent.
         """
         if Setting.get_instance().remote_url is not None and all_users:
             all_users = False
@@ -364,8 +380,48 @@ class DockerManager(IManager):
 
         user_name = utils.get_current_user_name() if not all_users else None
 
-        self.docker_machine.wipe(user=user_name)
-        self.docker_link.wipe(user=user_name)
+        report = WipeReport(fast)
+        report.measure("devices", self.docker_machine.wipe, user=user_name, fast=fast)
+        report.measure("collision domains", self.docker_link.wipe, user=user_name, fast=fast)
+
+        return report
+
+    @privileged
+    def wait_ready(self, lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                   selected_machines: Optional[Set[str]] = None, timeout: Optional[float] = None,
+                   all_users: bool = False) -> Dict[str, bool]:
+        """Wait until the startup commands of the devices of a network scenario are executed.
+
+        The end of the startup of each device is signaled by the Docker events stream, so devices are not polled.
+
+        Args:
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            selected_machines (Optional[Set[str]]): If not None, wait only the specified devices.
+            timeout (Optional[float]): The maximum seconds to wait. If None, wait indefinitely.
+            all_users (bool): If True, search the devices among all the users devices.
+
+        Returns:
+            Dict[str, bool]: Keys are device names, values are True if the startup commands of the device are
+                executed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
+        """
+        check_required_single_not_none_var(lab_hash=lab_hash, lab_name=lab_name, lab=lab)
+        if lab:
+            lab_hash = lab.hash
+        elif lab_name:
+            lab_hash = utils.generate_urlsafe_hash(lab_name)
+
+        user_name = utils.get_current_user_name() if not all_users else None
+
+        return self.docker_machine.wait_ready(lab_hash, selected_machines=selected_machines, user=user_name,
+                                              timeout=timeout)
 
     @privileged
     def connect_tty(self, machine_name: str, lab_hash: Optional[str] = None, lab_name: Optional[str] = None,
@@ -476,6 +532,49 @@ class DockerManager(IManager):
             lab_hash, machine_name, command, user=user_name, tty=False, wait=wait, stream=stream
         )
 
+    def exec_many(self, machine_names: Optional[List[str]], command: Union[List[str], str],
+                  lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                  wait: Union[bool, Tuple[int, float]] = False, concurrency: Optional[int] = None) -> MultiExecStream:
+        """Exec a command on multiple devices of a running network scenario in parallel.
+
+        Args:
+            machine_names (Optional[List[str]]): The names of the devices to exec the command on.
+                If None, the command is executed on all the running devices of the network scenario.
+            command (Union[List[str], str]): The command to exec on the devices.
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            wait (Union[bool, Tuple[int, float]]): If True, wait indefinitely until the end of the startup commands
+                execution before executing the command. If a tuple is provided, the first value indicates the
+                number of retries before stopping waiting and the second value indicates the time interval to wait
+                for each retry. Default is False.
+            concurrency (Optional[int]): The maximum number of concurrent executions. If None, the default pool size
+                is used.
+
+        Returns:
+            MultiExecStream: A stream of the output chunks of the devices, tagged with the device name. Exit codes
+                are available in its `exit_codes` attribute once the stream is consumed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
+        """
+        check_required_single_not_none_var(lab_hash=lab_hash, lab_name=lab_name, lab=lab)
+        if lab:
+            lab_hash = lab.hash
+        elif lab_name:
+            lab_hash = utils.generate_urlsafe_hash(lab_name)
+
+        if machine_names is None:
+            machine_names = sorted(container.labels['name'] for container in self.get_machines_api_objects(lab_hash))
+
+        return MultiExecStream(
+            machine_names, lambda machine_name: self.exec(machine_name, command, lab_hash=lab_hash, wait=wait),
+            concurrency=concurrency
+        )
+
     def exec_obj(self, machine: Machine, command: Union[List[str], str], wait: Union[bool, Tuple[int, float]] = False,
                  stream: bool = True) -> Union[DockerExecStream, Tuple[bytes, bytes, int]]:
         """Exec a command on a device in a running network scenario.
@@ -698,17 +797,12 @@ class DockerManager(IManager):
             reconstructed_lab = Lab("reconstructed_lab")
             reconstructed_lab.hash = lab_hash
 
-        lab_containers = self.get_machines_api_objects(lab_hash=reconstructed_lab.hash)
-        lab_networks = dict(
-            map(lambda x: (x.name, x), self.get_links_api_objects(
-                lab_hash=reconstructed_lab.hash \
-                    if Setting.get_instance().shared_cds == SharedCollisionDomainsOption.NOT_SHARED else None,
-                all_users=Setting.get_instance().shared_cds == SharedCollisionDomainsOption.USERS
-            ))
+        lab_containers = self.docker_machine.get_inspected_machines_api_objects(
+            lab_hash=reconstructed_lab.hash, user=utils.get_current_user_name()
         )
+        lab_networks = self._get_lab_networks(reconstructed_lab.hash)
 
         for container in lab_containers:
-            container.reload()
             device = reconstructed_lab.get_or_new_machine(container.labels["name"])
             device.api_object = container
 
@@ -739,14 +833,15 @@ class DockerManager(IManager):
             # Reassign sysctls directly
             device.meta["sysctls"] = container.attrs["HostConfig"]["Sysctls"]
 
-            if "none" not in container.attrs["NetworkSettings"]["Networks"]:
-                if "bridge" in container.attrs["NetworkSettings"]["Networks"].keys():
+            # Containers can be returned again by following calls, do not alter their attributes
+            container_networks = dict(container.attrs["NetworkSettings"]["Networks"])
+            if "none" not in container_networks:
+                if "bridge" in container_networks.keys():
                     device.add_meta("bridged", True)
                     device.add_meta("bridged_iface", int(container.labels['bridged_iface']))
-                    container.attrs["NetworkSettings"]["Networks"].pop("bridge")
+                    container_networks.pop("bridge")
 
-                networks = sorted(container.attrs["NetworkSettings"]["Networks"].items(),
-                                  key=lambda x: x[1]["DriverOpts"]["kathara.iface"])
+                networks = sorted(container_networks.items(), key=lambda x: x[1]["DriverOpts"]["kathara.iface"])
 
                 for network_name, network_options in networks:
                     network = lab_networks[network_name]
@@ -773,39 +868,35 @@ class DockerManager(IManager):
         Args:
             lab (Lab): The network scenario to update.
         """
-        running_containers = self.get_machines_api_objects(lab_hash=lab.hash)
-
-        deployed_networks = dict(
-            map(lambda x: (x.name, x), self.get_links_api_objects(
-                lab_hash=lab.hash \
-                    if Setting.get_instance().shared_cds == SharedCollisionDomainsOption.NOT_SHARED else None,
-                all_users=Setting.get_instance().shared_cds == SharedCollisionDomainsOption.USERS
-            ))
+        running_containers = self.docker_machine.get_inspected_machines_api_objects(
+            lab_hash=lab.hash, user=utils.get_current_user_name()
         )
-        for network in deployed_networks.values():
-            network.reload()
 
+        deployed_networks = self._get_lab_networks(lab.hash)
         deployed_networks_by_link_name = dict(
             map(lambda x: (x.attrs["Labels"]["name"], x), deployed_networks.values())
         )
 
         for container in running_containers:
-            container.reload()
             device = lab.get_or_new_machine(container.labels["name"])
+            # The same object is returned only if the container did not change since this lab was updated
+            if device.api_object is container:
+                continue
             device.api_object = container
 
             # Collision domains declared in the network scenario
             static_links = set([x.link for x in device.interfaces.values()])
             # Interfaces currently attached to the device
-            if "bridge" in container.attrs["NetworkSettings"]["Networks"].keys():
-                container.attrs["NetworkSettings"]["Networks"].pop("bridge")
+            container_networks = dict(container.attrs["NetworkSettings"]["Networks"])
+            if "bridge" in container_networks.keys():
+                container_networks.pop("bridge")
 
-            if "none" in container.attrs["NetworkSettings"]["Networks"].keys():
-                container.attrs["NetworkSettings"]["Networks"].pop("none")
+            if "none" in container_networks.keys():
+                container_networks.pop("none")
 
             current_ifaces = [
                 (lab.get_or_new_link(deployed_networks[name].attrs["Labels"]["name"]), options)
-                for name, options in sorted(container.attrs["NetworkSettings"]["Networks"].items(),
+                for name, options in sorted(container_networks.items(),
                                             key=lambda x: x[1]["DriverOpts"]["kathara.iface"])
             ]
 
@@ -839,6 +930,26 @@ class DockerManager(IManager):
             for link in deleted_links:
                 device.remove_interface(link)
 
+    def _get_lab_networks(self, lab_hash: str) -> Dict[str, docker.models.networks.Network]:
+        """Return the Docker networks that the devices of a network scenario can be attached to.
+
+        Networks are not inspected, since only their names and labels are needed to rebuild the network scenario.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+
+        Returns:
+            Dict[str, docker.models.networks.Network]: Keys are the names of the networks, values are the networks.
+        """
+        shared_cds = Setting.get_instance().shared_cds
+        networks = self.docker_link.get_links_api_objects_by_filters(
+            lab_hash=lab_hash if shared_cds == SharedCollisionDomainsOption.NOT_SHARED else None,
+            user=utils.get_current_user_name() if shared_cds != SharedCollisionDomainsOption.USERS else None,
+            greedy=False
+        )
+
+        return {network.name: network for network in networks}
+
     @privileged
     def get_machines_stats(self, lab_hash: Optional[str] = None, lab_name: Optional[str] = None,
                            lab: Optional[Lab] = None, machine_name: str = None, all_users: bool = False) \
@@ -902,12 +1013,13 @@ class DockerManager(IManager):
 
         machines_stats = self.get_machines_stats(lab_hash=lab_hash, lab_name=lab_name, lab=lab,
                                                  machine_name=machine_name, all_users=all_users)
-        machines_stats_next = next(machines_stats)
-        if machines_stats_next:
-            (_, machine_stats) = machines_stats_next.popitem()
-            yield machine_stats
-        else:
-            yield None
+        # Keep consuming the same stream, so refreshes reuse the same collector
+        for machines_stats_next in machines_stats:
+            if machines_stats_next:
+                (_, machine_stats) = machines_stats_next.popitem()
+                yield machine_stats
+            else:
+                yield None
 
     def get_machine_stats_obj(self, machine: Machine, all_users: bool = False) \
             -> Generator[Optional[DockerMachineStats], None, None]:
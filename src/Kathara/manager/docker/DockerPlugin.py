@@ -1,7 +1,8 @@
 import json
 import logging
 import os.path
-from typing import Callable, Any, Dict
+import time
+from typing import Callable, Any, Dict, Optional
 
 from docker import DockerClient
 from docker.errors import NotFound
@@ -18,16 +19,142 @@ HOSTTMP_KEY = "tmp"
 XTABLES_CONFIGURATION_KEY = "xtables_lock"
 XTABLES_LOCK_PATH = "/run/xtables.lock"
 
+PLUGIN_CACHE_FILENAME = "kathara_plugin.json"
+
 
 class DockerPlugin(object):
     """Class responsible for interacting with Docker Plugins."""
-    __slots__ = ['client', 'current_name']
+    __slots__ = ['client', 'current_name', '_checked']
 
     PLUGIN_STATE_PATH = "/run/docker/runtime-runc/plugins.moby/{id}/state.json"
+    PLUGIN_CACHE_PATH = os.path.join(utils.get_current_user_home(), ".config", PLUGIN_CACHE_FILENAME)
 
     def __init__(self, client: DockerClient):
         self.client: DockerClient = client
         self.current_name: str = f"{Setting.get_instance().network_plugin}:{utils.get_architecture()}"
+        self._checked: bool = False
+
+    def ensure_plugin(self) -> None:
+        """Ensure that the Kathara Network Plugin is installed, enabled and configured, at most once per instance.
+
+        The full check (which also looks for plugin updates on the registry) is performed only if the plugin state
+        cached on disk is older than the `plugin_check_ttl` setting. Otherwise, only verify that the cached plugin is
+        still installed and enabled, and that its xtables.lock mount still matches the host.
+
+        Returns:
+            None
+
+        Raises:
+            DockerPluginError: If the Kathara Network Plugin is not found on remote Docker connection.
+            DockerPluginError: If the Kathara Network Plugin is not enabled on remote Docker connection.
+        """
+        if self._checked:
+            return
+
+        cached_state = self._load_cached_state()
+        if cached_state and time.time() - cached_state['last_checked'] < Setting.get_instance().plugin_check_ttl:
+            try:
+                plugin = self.client.plugins.get(self.current_name)
+                if plugin.enabled and plugin.id == cached_state['digest'] and self._is_cached_mount_valid(cached_state):
+                    logging.debug("Plugin `%s` state is cached, skipping check..." % self.current_name)
+                    self._checked = True
+                    return
+            except NotFound:
+                pass
+
+        self.check_and_download_plugin()
+
+        plugin = self.client.plugins.get(self.current_name)
+        mount_obj = list(filter(lambda x: x["Name"] == XTABLES_CONFIGURATION_KEY,
+                                plugin.attrs["Settings"]["Mounts"])) if self.is_bridge() else []
+        self._save_cached_state({
+            'digest': plugin.id,
+            'enabled': plugin.enabled,
+            'mount_source': mount_obj.pop()["Source"] if mount_obj else None,
+            'last_checked': time.time()
+        })
+        self._checked = True
+
+    def _is_cached_mount_valid(self, cached_state: Dict[str, Any]) -> bool:
+        """Check if the xtables.lock mount of the cached plugin state matches the host (Linux bridge only).
+
+        The mount depends on the host iptables version, which may change (e.g., switching to iptables-nft) while
+        the plugin state is cached.
+
+        Args:
+            cached_state (Dict[str, Any]): The cached plugin state.
+
+        Returns:
+            bool: True if the cached mount is still valid, else False.
+        """
+        if not self.is_bridge() or Setting.get_instance().remote_url is not None:
+            return True
+
+        return cached_state.get('mount_source', None) == self._xtables_lock_mount()
+
+    def _get_cache_key(self) -> str:
+        """Return the key identifying the current plugin and Docker daemon in the plugin cache.
+
+        Returns:
+            str: The cache key in the format "|remote_url|@|plugin_name|".
+        """
+        return f"{Setting.get_instance().remote_url or 'local'}@{self.current_name}"
+
+    def _load_cached_state(self) -> Optional[Dict[str, Any]]:
+        """Load the cached state of the current plugin from disk.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached plugin state, None if it is not cached or the cache is not valid.
+        """
+        if not os.path.exists(self.PLUGIN_CACHE_PATH):
+            return None
+
+        try:
+            with open(self.PLUGIN_CACHE_PATH, 'r') as cache_file:
+                state = json.load(cache_file).get(self._get_cache_key(), None)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+        if not isinstance(state, dict) or not all(key in state for key in ['digest', 'enabled', 'last_checked']):
+            return None
+
+        return state
+
+    def _save_cached_state(self, state: Dict[str, Any]) -> None:
+        """Save the state of the current plugin in the plugin cache on disk.
+
+        Args:
+            state (Dict[str, Any]): The plugin state to save.
+
+        Returns:
+            None
+        """
+        cache = {}
+        try:
+            if os.path.exists(self.PLUGIN_CACHE_PATH):
+                with open(self.PLUGIN_CACHE_PATH, 'r') as cache_file:
+                    cache = json.load(cache_file)
+        except (OSError, ValueError):
+            cache = {}
+
+        cache[self._get_cache_key()] = state
+
+        try:
+            cache_dirname = os.path.dirname(self.PLUGIN_CACHE_PATH)
+            if not os.path.isdir(cache_dirname):
+                os.mkdir(cache_dirname)
+
+            with open(self.PLUGIN_CACHE_PATH, 'w') as cache_file:
+                cache_file.write(json.dumps(cache, indent=True))
+
+            def unix_permissions():
+                (uid, gid) = utils.get_current_user_uid_gid()
+                os.chown(self.PLUGIN_CACHE_PATH, uid, gid)
+
+            # If Linux or Mac, set the right ownership to the cache file (it may be written by root).
+            utils.exec_by_platform(unix_permissions, lambda: None, unix_permissions)
+        except OSError as e:
+            logging.debug("Cannot save plugin state cache: %s" % str(e))
 
     def check_and_download_plugin(self) -> None:
         """Check the presence of the Kathara Network Plugin and download it or upgrade it, if needed.
@@ -0,0 +1,124 @@
+import logging
+import queue
+import threading
+from typing import Optional, Tuple, Any, List
+
+from docker import DockerClient
+
+# The startup commands are executed by an exec instance, its end is signaled by this event
+EXEC_END_EVENT: str = "exec_die"
+
+
+class DockerStartupWatcher(object):
+    """Notify the end of the exec instances of Kathara containers, using the Docker events stream.
+
+    The startup commands of a device are executed by an exec instance, so the end of the startup is signaled by an
+    `exec_die` event of the container. The watcher is used as a context manager: the events stream is opened on enter,
+    so the events following the opening are never lost, and closed on exit.
+
+    Attributes:
+        client (DockerClient): The Docker client used to consume the events.
+        labels (List[str]): The label filters of the watched containers.
+    """
+    __slots__ = ['client', 'labels', '_events', '_thread', '_queue']
+
+    def __init__(self, client: DockerClient, lab_hash: str = None, machine_name: str = None, user: str = None) -> None:
+        self.client: DockerClient = client
+
+        self.labels: List[str] = ["app=kathara"]
+        if user:
+            self.labels.append(f"user={user}")
+        if lab_hash:
+            self.labels.append(f"lab_hash={lab_hash}")
+        if machine_name:
+            self.labels.append(f"name={machine_name}")
+
+        self._events: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+        # Items are (container_id, exec_id) tuples, None signals that the stream is closed
+        self._queue: queue.Queue = queue.Queue()
+
+    def __enter__(self) -> 'DockerStartupWatcher':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the events stream is being consumed.
+
+        Returns:
+            bool: True if the events stream is open, else False.
+        """
+        return self._events is not None
+
+    def open(self) -> bool:
+        """Open the events stream and start consuming it in a background thread.
+
+        Returns:
+            bool: True if the stream is opened, False if the Docker daemon does not provide it. In this case, callers
+                should fall back to polling.
+        """
+        try:
+            self._events = self.client.events(
+                decode=True, filters={"type": ["container"], "event": [EXEC_END_EVENT], "label": self.labels}
+            )
+        except Exception as e:
+            logging.debug(f"Cannot open Docker events stream: {str(e)}")
+            self._events = None
+            return False
+
+        self._thread = threading.Thread(target=self._consume, args=(self._events,), daemon=True)
+        self._thread.start()
+
+        return True
+
+    def close(self) -> None:
+        """Close the events stream.
+
+        Returns:
+            None
+        """
+        events = self._events
+        self._events = None
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                pass
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[str, Optional[str]]]:
+        """Wait the end of an exec instance.
+
+        Args:
+            timeout (Optional[float]): The seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: The ID of the container and the ID of the ended exec instance,
+                None if the timeout expired or the stream is closed.
+        """
+        if not self.is_open and self._queue.empty():
+            return None
+
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _consume(self, events: Any) -> None:
+        try:
+            for event in events:
+                actor = event.get("Actor", {})
+                attributes = actor.get("Attributes", None) or {}
+                self._queue.put((actor.get("ID", event.get("id", None)), attributes.get("execID", None)))
+        except Exception as e:
+            logging.debug(f"Docker events stream interrupted: {str(e)}")
+        finally:
+            self._events = None
+            self._queue.put(None)
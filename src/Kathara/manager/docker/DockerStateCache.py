@@ -0,0 +1,358 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Any
+
+import docker.models.containers
+import docker.models.networks
+from docker import DockerClient
+from docker.errors import NotFound
+
+SYNC_TIMEOUT: float = 10.0
+RESYNC_INTERVAL: float = 1.0
+# Events are requested starting slightly before the resync, replaying an event is harmless
+EVENTS_SINCE_MARGIN: float = 1.0
+
+CONTAINER_REFRESH_ACTIONS = {"create", "start", "restart", "die", "stop", "kill", "pause", "unpause", "rename",
+                             "update", "oom"}
+CONTAINER_REMOVE_ACTIONS = {"destroy"}
+NETWORK_REFRESH_ACTIONS = {"create", "connect", "disconnect"}
+NETWORK_REMOVE_ACTIONS = {"destroy"}
+
+IndexKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class DockerStateCache(object):
+    """Keep an in-memory index of Kathara containers and networks, updated by the Docker events stream.
+
+    The index is built with a full listing of the objects labeled with `app=kathara`, then it is updated by
+    inspecting only the objects referenced by each event. If the events stream is interrupted, some events may be
+    lost: the cache is marked as not synced (so queries should fall back to the Docker daemon) and a full listing
+    is repeated before consuming the stream again.
+
+    Attributes:
+        client (DockerClient): The Docker client used to list the objects and consume the events.
+    """
+    __slots__ = ['client', '_containers', '_networks', '_container_keys', '_network_keys', '_lock', '_synced',
+                 '_stopped', '_events', '_thread']
+
+    def __init__(self, client: DockerClient) -> None:
+        self.client: DockerClient = client
+
+        # Keys are (user, lab_hash, name) tuples, values are the inspected Docker objects
+        self._containers: Dict[IndexKey, docker.models.containers.Container] = {}
+        self._networks: Dict[IndexKey, docker.models.networks.Network] = {}
+        # Keys are the IDs of the indexed Docker objects, values are their keys in the index
+        self._container_keys: Dict[str, IndexKey] = {}
+        self._network_keys: Dict[str, IndexKey] = {}
+
+        self._lock: threading.Lock = threading.Lock()
+        self._synced: threading.Event = threading.Event()
+        self._stopped: threading.Event = threading.Event()
+        self._events: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, timeout: Optional[float] = None) -> bool:
+        """Start consuming the Docker events in a background thread.
+
+        Args:
+            timeout (Optional[float]): The seconds to wait for the first synchronization. If None, do not wait.
+
+        Returns:
+            bool: True if the cache is synced, else False.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="kathara-docker-state-cache", daemon=True)
+            self._thread.start()
+
+        if timeout is not None:
+            self._synced.wait(timeout)
+
+        return self.is_synced()
+
+    def stop(self) -> None:
+        """Stop consuming the Docker events.
+
+        Returns:
+            None
+        """
+        self._stopped.set()
+        self._synced.clear()
+        self._close_events()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_synced(self) -> bool:
+        """Return True if the index reflects the Docker daemon state, i.e., the events stream is being consumed.
+
+        Returns:
+            bool: True if the cache is synced, else False.
+        """
+        return self._synced.is_set()
+
+    def get_containers(self, lab_hash: str = None, machine_name: str = None, user: str = None) -> \
+            List[docker.models.containers.Container]:
+        """Return the indexed Docker containers matching the specified filters.
+
+        Args:
+            lab_hash (str): The hash of a network scenario. If specified, return all the devices in the scenario.
+            machine_name (str): The name of a device. If specified, return the specified container of the scenario.
+            user (str): The name of a user on the host. If specified, return only the containers of the user.
+
+        Returns:
+            List[docker.models.containers.Container]: A list of Docker containers objects.
+        """
+        with self._lock:
+            return self._filter_index(self._containers, lab_hash, machine_name, user)
+
+    def get_networks(self, lab_hash: str = None, link_name: str = None, user: str = None) -> \
+            List[docker.models.networks.Network]:
+        """Return the indexed Docker networks matching the specified filters.
+
+        Args:
+            lab_hash (str): The hash of a network scenario. If specified, return all the networks in the scenario.
+            link_name (str): The name of a network. If specified, return the specified network of the scenario.
+            user (str): The name of a user on the host. If specified, return only the networks of the user.
+
+        Returns:
+            List[docker.models.networks.Network]: A list of Docker networks.
+        """
+        with self._lock:
+            return self._filter_index(self._networks, lab_hash, link_name, user)
+
+    def update_container(self, container: docker.models.containers.Container) -> None:
+        """Add or replace a container in the index, so changes made by this process are visible immediately.
+
+        Args:
+            container (docker.models.containers.Container): An inspected Docker container.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._put(self._containers, self._container_keys, container, container.attrs["Config"]["Labels"])
+
+    def remove_container(self, container_id: str) -> None:
+        """Remove a container from the index.
+
+        Args:
+            container_id (str): The ID of the container.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._remove(self._containers, self._container_keys, container_id)
+
+    def update_network(self, network: docker.models.networks.Network) -> None:
+        """Add or replace a network in the index, so changes made by this process are visible immediately.
+
+        Args:
+            network (docker.models.networks.Network): An inspected Docker network.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._put(self._networks, self._network_keys, network, network.attrs["Labels"])
+
+    def remove_network(self, network_id: str) -> None:
+        """Remove a network from the index.
+
+        Args:
+            network_id (str): The ID of the network.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._remove(self._networks, self._network_keys, network_id)
+
+    def _run(self) -> None:
+        """Synchronize the index and consume the events stream, synchronizing it again if the stream is interrupted.
+
+        Returns:
+            None
+        """
+        while not self._stopped.is_set():
+            try:
+                since = self._resync()
+                # Network events do not carry labels, so they are filtered while handling them
+                self._events = self.client.events(
+                    decode=True, since=since, filters={"type": ["container", "network"]}
+                )
+                self._synced.set()
+
+                for event in self._events:
+                    self._handle_event(event)
+                    if self._stopped.is_set():
+                        break
+            except Exception as e:
+                logging.debug(f"Docker events stream interrupted: {str(e)}")
+            finally:
+                self._synced.clear()
+                self._close_events()
+
+            if not self._stopped.is_set():
+                logging.debug("Docker state cache is out of sync, resyncing...")
+                self._stopped.wait(RESYNC_INTERVAL)
+
+    def _resync(self) -> float:
+        """Rebuild the index listing all the Kathara containers and networks.
+
+        Returns:
+            float: The timestamp from which events must be consumed to not miss any change.
+        """
+        since = time.time() - EVENTS_SINCE_MARGIN
+
+        filters = {"label": ["app=kathara"]}
+        containers = self.client.containers.list(all=True, filters=filters, ignore_removed=True)
+        # The attached containers are read from the containers, so networks are not inspected
+        networks = self.client.networks.list(filters=filters, greedy=False)
+
+        with self._lock:
+            (self._containers, self._container_keys) = ({}, {})
+            for container in containers:
+                self._put(self._containers, self._container_keys, container, container.attrs["Config"]["Labels"])
+
+            (self._networks, self._network_keys) = ({}, {})
+            for network in networks:
+                self._put(self._networks, self._network_keys, network, network.attrs["Labels"])
+
+        logging.debug(f"Docker state cache synced with {len(containers)} containers and {len(networks)} networks.")
+
+        return since
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        """Update the index according to a Docker event.
+
+        Args:
+            event (Dict[str, Any]): A decoded Docker event.
+
+        Returns:
+            None
+        """
+        event_type = event.get("Type", None)
+        action = event.get("Action", "").split(":")[0]
+        actor = event.get("Actor", {})
+        attributes = actor.get("Attributes", None) or {}
+
+        if event_type == "container":
+            if attributes.get("app", None) != "kathara":
+                return
+
+            if action in CONTAINER_REMOVE_ACTIONS:
+                self.remove_container(actor["ID"])
+            elif action in CONTAINER_REFRESH_ACTIONS:
+                self._refresh_container(actor["ID"])
+        elif event_type == "network":
+            if action in NETWORK_REMOVE_ACTIONS:
+                self.remove_network(actor["ID"])
+                return
+
+            if action not in NETWORK_REFRESH_ACTIONS:
+                return
+
+            if action == "create" or self._is_indexed(self._network_keys, actor["ID"]):
+                self._refresh_network(actor["ID"])
+
+            # Attached networks are part of the container state
+            container_id = attributes.get("container", None)
+            if container_id and self._is_indexed(self._container_keys, container_id):
+                self._refresh_container(container_id)
+
+    def _refresh_container(self, container_id: str) -> None:
+        try:
+            container = self.client.containers.get(container_id)
+        except NotFound:
+            self.remove_container(container_id)
+            return
+
+        self.update_container(container)
+
+    def _refresh_network(self, network_id: str) -> None:
+        try:
+            network = self.client.networks.get(network_id)
+        except NotFound:
+            self.remove_network(network_id)
+            return
+
+        if (network.attrs["Labels"] or {}).get("app", None) == "kathara":
+            self.update_network(network)
+
+    def _close_events(self) -> None:
+        events = self._events
+        self._events = None
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                pass
+
+    def _is_indexed(self, keys: Dict[str, IndexKey], object_id: str) -> bool:
+        with self._lock:
+            return object_id in keys
+
+    @staticmethod
+    def _put(index: Dict[IndexKey, Any], keys: Dict[str, IndexKey], api_object: Any,
+             labels: Optional[Dict[str, str]]) -> None:
+        """Add an object to the index, replacing any object with the same key or ID. Must be called holding the lock.
+
+        Args:
+            index (Dict[IndexKey, Any]): The index to update.
+            keys (Dict[str, IndexKey]): The keys of the index, by object ID.
+            api_object (Any): The Docker object to add.
+            labels (Optional[Dict[str, str]]): The labels of the Docker object.
+
+        Returns:
+            None
+        """
+        labels = labels or {}
+        key = (labels.get("user", None), labels.get("lab_hash", None), labels.get("name", None))
+
+        DockerStateCache._remove(index, keys, api_object.id)
+        replaced = index.get(key, None)
+        if replaced is not None:
+            keys.pop(replaced.id, None)
+
+        index[key] = api_object
+        keys[api_object.id] = key
+
+    @staticmethod
+    def _remove(index: Dict[IndexKey, Any], keys: Dict[str, IndexKey], object_id: str) -> None:
+        """Remove an object from the index. Must be called holding the lock.
+
+        Args:
+            index (Dict[IndexKey, Any]): The index to update.
+            keys (Dict[str, IndexKey]): The keys of the index, by object ID.
+            object_id (str): The ID of the Docker object to remove.
+
+        Returns:
+            None
+        """
+        key = keys.pop(object_id, None)
+        if key is not None:
+            index.pop(key, None)
+
+    @staticmethod
+    def _filter_index(index: Dict[IndexKey, Any], lab_hash: Optional[str], name: Optional[str],
+                      user: Optional[str]) -> List[Any]:
+        """Return the objects of the index matching the filters. Must be called holding the lock.
+
+        Args:
+            index (Dict[IndexKey, Any]): The index to query.
+            lab_hash (Optional[str]): If specified, return only the objects of the network scenario.
+            name (Optional[str]): If specified, return only the objects with the specified name.
+            user (Optional[str]): If specified, return only the objects of the user.
+
+        Returns:
+            List[Any]: The matching Docker objects.
+        """
+        return [
+            api_object for (obj_user, obj_lab_hash, obj_name), api_object in index.items()
+            if (not user or obj_user == user) and (not lab_hash or obj_lab_hash == lab_hash) and
+               (not name or obj_name == name)
+        ]
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Generator, Optional
+from typing import Dict, Any, Optional
 
 from docker.errors import NotFound
 from docker.models.containers import Container
@@ -12,8 +12,9 @@ class DockerMachineStats(IMachineStats):
     """The class responsible to handle Docker Machine statistics.
 
     Attributes:
-        machine_api_object (Container): The Docker Container associated with this statistics.
-        stats (Generator[Dict[str, Any], None, None]): A generator containing dicts with the Docker statistics
+        machine_api_object (Container): The Docker Container associated with this statistics. It can be a sparse
+            object, obtained from a list call without inspecting the container.
+        stats (Optional[Dict[str, Any]]): The last Docker statistics of the container.
         lab_hash (str): The hash identifier of the network scenario of the Docker Container.
         name (str): The name of the device.
         container_name (str): The Docker Container Name.
@@ -30,16 +31,19 @@ class DockerMachineStats(IMachineStats):
     __slots__ = ['machine_api_object', 'stats', 'lab_hash', 'name', 'container_name', 'user', 'status', 'image',
                  'pids', 'cpu_usage', 'mem_usage', 'mem_percent', 'net_usage', '_prev_stats']
 
-    def __init__(self, machine_api_object: Container):
+    def __init__(self, machine_api_object: Container, stats: Optional[Dict[str, Any]] = None):
         self.machine_api_object: Container = machine_api_object
-        self.stats: Generator[Dict[str, Any], None, None] = machine_api_object.stats(stream=True, decode=True)
+        self.stats: Optional[Dict[str, Any]] = None
         self._prev_stats: Optional[Dict[str, Any]] = None
         # Static Information
-        self.lab_hash: str = machine_api_object.labels['lab_hash']
-        self.name: str = machine_api_object.labels['name']
-        self.container_name: str = machine_api_object.name
-        self.user: Optional[str] = machine_api_object.labels['user']
-        self.image: str = machine_api_object.image.tags[0]
+        labels = self.get_labels(machine_api_object)
+        self.lab_hash: str = labels['lab_hash']
+        self.name: str = labels['name']
+        self.container_name: str = self.get_container_name(machine_api_object)
+        self.user: Optional[str] = labels['user']
+        # Sparse objects contain the image name, avoid inspecting the image
+        self.image: str = machine_api_object.attrs['Image'] if self.is_sparse(machine_api_object) \
+            else machine_api_object.image.tags[0]
         # Dynamic Information
         self.status: Optional[str] = None
         self.pids: Optional[int] = None
@@ -49,36 +53,90 @@ class DockerMachineStats(IMachineStats):
         self.mem_percent: str = "-"
         self.net_usage: str = "-"
 
-        self.update()
+        self.update(stats=stats)
+
+    @staticmethod
+    def is_sparse(machine_api_object: Container) -> bool:
+        """Return True if the container object comes from a list call without inspecting the container.
+
+        Args:
+            machine_api_object (Container): A Docker container.
+
+        Returns:
+            bool: True if the container object is sparse, else False.
+        """
+        return 'Names' in machine_api_object.attrs
+
+    @staticmethod
+    def get_labels(machine_api_object: Container) -> Dict[str, str]:
+        """Return the labels of a (possibly sparse) Docker container.
+
+        Args:
+            machine_api_object (Container): A Docker container.
+
+        Returns:
+            Dict[str, str]: The labels of the container.
+        """
+        if DockerMachineStats.is_sparse(machine_api_object):
+            return machine_api_object.attrs['Labels'] or {}
+
+        return machine_api_object.labels
+
+    @staticmethod
+    def get_container_name(machine_api_object: Container) -> str:
+        """Return the name of a (possibly sparse) Docker container.
+
+        Args:
+            machine_api_object (Container): A Docker container.
+
+        Returns:
+            str: The name of the container.
+        """
+        if DockerMachineStats.is_sparse(machine_api_object):
+            return machine_api_object.attrs['Names'][0].lstrip('/')
+
+        return machine_api_object.name
 
     @privileged
-    def update(self) -> None:
+    def update(self, stats: Optional[Dict[str, Any]] = None, machine_api_object: Optional[Container] = None) -> None:
         """Update dynamic statistics with the current ones.
 
+        Args:
+            stats (Optional[Dict[str, Any]]): The current Docker statistics of the container. If None, they are
+                requested to the Docker daemon.
+            machine_api_object (Optional[Container]): An updated Docker container object. If None and stats are not
+                provided, the current one is reloaded.
+
         Returns:
             None
         """
-        updated_stats = next(self.stats)
-        try:
-            self.machine_api_object.reload()
-        except NotFound:
-            # Happens while deleting
-            pass
+        if machine_api_object is not None:
+            self.machine_api_object = machine_api_object
+        elif stats is None:
+            try:
+                self.machine_api_object.reload()
+            except NotFound:
+                # Happens while deleting
+                pass
+
+        updated_stats = stats if stats is not None else self.machine_api_object.stats(stream=False)
+        self.stats = updated_stats
 
         self.status = self.machine_api_object.status
         self.pids = updated_stats['pids_stats']['current'] if 'current' in updated_stats['pids_stats'] else 0
 
-        networks = self.machine_api_object.attrs['NetworkSettings']['Networks']
+        networks = dict(self.machine_api_object.attrs['NetworkSettings']['Networks'])
         if 'none' in networks:
             networks.pop('none')
         if 'bridge' in networks:
             networks.pop('bridge')
 
         # If the device is bridged, creates a dummy entry for the bridged interface for building the interfaces string
-        if 'bridged_iface' in self.machine_api_object.labels:
-            networks[self.machine_api_object.labels['bridged_iface']] = {
+        labels = self.get_labels(self.machine_api_object)
+        if 'bridged_iface' in labels:
+            networks[labels['bridged_iface']] = {
                 'DriverOpts': {
-                    'kathara.iface': self.machine_api_object.labels['bridged_iface'],
+                    'kathara.iface': labels['bridged_iface'],
                     'kathara.link': "Bridged",
                 }
             }
@@ -89,12 +147,13 @@ class DockerMachineStats(IMachineStats):
         else:
             self.interfaces = "-"
 
-        if self._prev_stats:
-            if "system_cpu_usage" in updated_stats["cpu_stats"] and "system_cpu_usage" in self._prev_stats["cpu_stats"]:
-                cpu_delta = updated_stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                            self._prev_stats["cpu_stats"]["cpu_usage"]["total_usage"]
-                system_delta = updated_stats["cpu_stats"]["system_cpu_usage"] - \
-                               self._prev_stats["cpu_stats"]["system_cpu_usage"]
+        # Without a previous sample, use the one computed by the daemon (empty for one-shot stats)
+        prev_cpu_stats = self._prev_stats["cpu_stats"] if self._prev_stats else updated_stats.get("precpu_stats", {})
+        if "system_cpu_usage" in updated_stats["cpu_stats"] and "system_cpu_usage" in prev_cpu_stats:
+            cpu_delta = updated_stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
+                        prev_cpu_stats["cpu_usage"]["total_usage"]
+            system_delta = updated_stats["cpu_stats"]["system_cpu_usage"] - prev_cpu_stats["system_cpu_usage"]
+            if system_delta > 0:
                 cpu_usage = (cpu_delta / system_delta) * updated_stats["cpu_stats"]["online_cpus"] * 100
                 self.cpu_usage = f"{cpu_usage:.2f}%"
 
@@ -0,0 +1,97 @@
+import logging
+import time
+from multiprocessing.dummy import Pool
+from typing import Dict, Any, Optional, Callable, List, Generator
+
+from docker.errors import APIError, NotFound
+from docker.models.containers import Container
+
+from .DockerMachineStats import DockerMachineStats
+from .... import utils
+from ....decorators import privileged
+
+STATS_INTERVAL: float = 1.0
+
+
+class DockerMachineStatsCollector(object):
+    """Collect the statistics of several Docker containers sharing the same workers across refreshes.
+
+    The Docker API has no endpoint returning the statistics of multiple containers, so a single non-streaming
+    request per container is issued on a worker pool that lives as long as the collector is consumed, instead of
+    opening a stats stream (and a thread) per container at each refresh. Containers are listed without inspecting
+    them, so each refresh costs one list request plus one stats request per container.
+
+    Attributes:
+        list_containers (Callable[[], List[Container]]): The function returning the (sparse) containers to monitor.
+        one_shot (bool): If True, request a single stats sample without waiting for the daemon to compute the CPU
+            delta (requires Docker Engine >= 20.10). The delta is computed using the previous sample.
+        interval (float): The seconds between two consecutive refreshes.
+        pool_size (int): The number of workers requesting statistics concurrently.
+    """
+    __slots__ = ['list_containers', 'one_shot', 'interval', 'pool_size']
+
+    def __init__(self, list_containers: Callable[[], List[Container]], one_shot: bool = True,
+                 interval: float = STATS_INTERVAL, pool_size: Optional[int] = None) -> None:
+        self.list_containers: Callable[[], List[Container]] = list_containers
+        self.one_shot: bool = one_shot
+        self.interval: float = interval
+        self.pool_size: int = pool_size if pool_size else utils.get_pool_size()
+
+    def stream(self) -> Generator[Dict[str, DockerMachineStats], None, None]:
+        """Return a generator yielding the statistics of the monitored containers at each refresh.
+
+        The first refresh is yielded immediately, the following ones every `interval` seconds, discounting the time
+        spent by the consumer.
+
+        Returns:
+            Generator[Dict[str, DockerMachineStats], None, None]: A generator containing container names as keys and
+                DockerMachineStats as values.
+        """
+        # Keys are container ids, so the previous sample is kept to compute the CPU usage
+        machines_stats = {}
+
+        with Pool(self.pool_size) as pool:
+            next_refresh = time.monotonic()
+            while True:
+                containers = self.list_containers()
+                samples = pool.map(func=self._get_container_stats, iterable=containers) if containers else []
+
+                current_stats = {}
+                for container, sample in zip(containers, samples):
+                    if sample is None:
+                        continue
+
+                    if container.id in machines_stats:
+                        machines_stats[container.id].update(stats=sample, machine_api_object=container)
+                    else:
+                        machines_stats[container.id] = DockerMachineStats(container, stats=sample)
+                    current_stats[container.id] = machines_stats[container.id]
+
+                # Forget removed containers
+                machines_stats = current_stats
+
+                yield {stats.container_name: stats for stats in machines_stats.values()}
+
+                next_refresh = max(next_refresh + self.interval, time.monotonic())
+                time.sleep(max(0.0, next_refresh - time.monotonic()))
+
+    @privileged
+    def _get_container_stats(self, container: Container) -> Optional[Dict[str, Any]]:
+        """Request a single stats sample of a container.
+
+        Args:
+            container (Container): A Docker container.
+
+        Returns:
+            Optional[Dict[str, Any]]: The stats of the container, None if the container was removed in the meantime.
+        """
+        try:
+            if self.one_shot:
+                return container.stats(stream=False, one_shot=True)
+
+            return container.stats(stream=False)
+        except NotFound:
+            return None
+        except APIError as e:
+            logging.debug(f"Cannot get stats of container `{container.id}`: {str(e)}")
+            return None
@@ -1,15 +1,32 @@
 import base64
-from typing import Optional
+import logging
+import math
+from functools import partial
+from multiprocessing.dummy import Pool
+from typing import Optional, List, Dict, Tuple
 
 from kubernetes import client
 from kubernetes.client.api import core_v1_api
 from kubernetes.client.rest import ApiException
 
+from ... import utils
 from ...exceptions import KubernetesConfigMapError
+from ...model.Lab import Lab
 from ...model.Machine import Machine
 from ...utils import human_readable_bytes
 
-MAX_FILE_SIZE = 3145728
+# Kubernetes rejects ConfigMaps bigger than 1 MiB, including the metadata
+MAX_CONFIG_MAP_SIZE = 1048576
+# Room left in each ConfigMap for its name, keys and the other fields of the object
+CONFIG_MAP_OVERHEAD = 4096
+# Maximum size of an archive stored in a single ConfigMap, once base64 encoded it fits in MAX_CONFIG_MAP_SIZE.
+# It is a multiple of 3 bytes, so the base64 encodings of consecutive shards can be concatenated without padding
+MAX_FILE_SIZE = (MAX_CONFIG_MAP_SIZE - CONFIG_MAP_OVERHEAD) * 3 // 4 // 3 * 3
+# Archives bigger than MAX_FILE_SIZE are split in shards, each one stored in a separate ConfigMap
+MAX_SHARDS = 32
+
+# Files of the network scenario copied in every device, stored once in the ConfigMap of the network scenario
+SHARED_FILES = ["shared.startup", "shared.shutdown"]
 
 
 class KubernetesConfigMap(object):
@@ -19,38 +36,79 @@ class KubernetesConfigMap(object):
     def __init__(self) -> None:
         self.client: core_v1_api.CoreV1Api = core_v1_api.CoreV1Api()
 
-    def deploy_for_machine(self, machine: Machine) -> Optional[client.V1ConfigMap]:
-        """Deploy and return a Kubernetes ConfigMap for the device.
+    def deploy_for_machine(self, machine: Machine) -> List[client.V1ConfigMap]:
+        """Deploy and return the Kubernetes ConfigMaps for the device.
 
         Args:
             machine (Kathara.model.Machine.Machine): A Kathara device.
 
         Returns:
-            Optional[client.V1ConfigMap]: A Kubernetes ConfigMap.
+            List[client.V1ConfigMap]: The Kubernetes ConfigMaps, more than one if the device folder is split in
+                shards. Empty if the device has no files.
         """
-        config_map = self._build_for_machine(machine)
+        return [self.client.create_namespaced_config_map(body=config_map, namespace=machine.lab.hash)
+                for config_map in self._build_for_machine(machine)]
 
-        if config_map is None:
-            return None
+    def deploy_for_lab(self, lab: Lab, machines: List[Machine]) -> \
+            Tuple[Optional[client.V1ConfigMap], Dict[str, List[client.V1ConfigMap]]]:
+        """Deploy the Kubernetes ConfigMaps of a network scenario and of the specified devices.
+
+        The shared files of the network scenario are stored once, in a ConfigMap mounted into every device, while the
+        ConfigMap of each device only contains its own files. All the ConfigMaps are built and their size is checked
+        before creating any of them, then they are created in parallel.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario.
+            machines (List[Kathara.model.Machine.Machine]): The devices to deploy.
+
+        Returns:
+            Tuple[Optional[client.V1ConfigMap], Dict[str, List[client.V1ConfigMap]]]: The ConfigMap of the shared
+                files, None if the network scenario has no shared files, and the ConfigMaps of the devices. Keys are
+                device names, devices without files have no ConfigMaps.
+
+        Raises:
+            KubernetesConfigMapError: If the size of a ConfigMap exceeds the maximum supported size.
+        """
+        shared_config_map = self._build_for_lab(lab)
+        config_maps = {}
+        for machine in machines:
+            machine_config_maps = self._build_for_machine(machine, shared=False)
+            if machine_config_maps:
+                config_maps[machine.name] = machine_config_maps
+
+        self._log_size_budget(shared_config_map, config_maps)
 
-        return self.client.create_namespaced_config_map(body=config_map, namespace=machine.lab.hash)
+        if shared_config_map is not None:
+            self._create(shared_config_map, lab.hash, replace=True)
 
-    def delete_for_machine(self, machine_name: str, machine_namespace: str) -> None:
-        """Delete the Kubernetes ConfigMap associated with the device, if it exists.
+        items = [config_map for machine_config_maps in config_maps.values() for config_map in machine_config_maps]
+        if items:
+            pool_size = utils.get_pool_size()
+            with Pool(pool_size) as config_maps_pool:
+                for chunk in utils.chunk_list(items, pool_size):
+                    config_maps_pool.map(func=partial(self._create, namespace=lab.hash), iterable=chunk)
+
+        return shared_config_map, config_maps
+
+    def delete_for_machine(self, machine_name: str, machine_namespace: str, shards: int = 1) -> None:
+        """Delete the Kubernetes ConfigMaps associated with the device, if they exist.
 
         Args:
             machine_name (str): The name of a Kathara device.
             machine_namespace (str): the name of the namespace the device belongs to.
+            shards (int): The number of ConfigMaps of the device.
 
         Returns:
             None
         """
-        try:
-            self.client.delete_namespaced_config_map(name=self.build_name_for_machine(machine_name, machine_namespace),
-                                                     namespace=machine_namespace
-                                                     )
-        except ApiException:
-            return
+        name = self.build_name_for_machine(machine_name, machine_namespace)
+        for shard in range(max(shards, 1)):
+            try:
+                self.client.delete_namespaced_config_map(name=self.build_name_for_shard(name, shard),
+                                                         namespace=machine_namespace
+                                                         )
+            except ApiException:
+                continue
 
     @staticmethod
     def build_name_for_machine(machine_name: str, machine_namespace: str) -> str:
@@ -65,45 +123,205 @@ class KubernetesConfigMap(object):
         """
         return "%s-%s-files" % (machine_name, machine_namespace)
 
-    def _build_for_machine(self, machine: Machine) -> Optional[client.V1ConfigMap]:
-        """Build and return a Kubernetes ConfigMap for the device.
+    @staticmethod
+    def build_name_for_shard(name: str, shard: int) -> str:
+        """Return the name for a shard of a Kubernetes ConfigMap.
+
+        Args:
+            name (str): The name of the ConfigMap.
+            shard (int): The index of the shard.
+
+        Returns:
+            str: The name of the ConfigMap for the first shard, '|name|-|shard|' for the following ones.
+        """
+        return name if shard == 0 else "%s-%d" % (name, shard)
+
+    @staticmethod
+    def build_name_for_lab(lab_hash: str) -> str:
+        """Return the name for the Kubernetes ConfigMap of the shared files of a network scenario.
+
+        Names of the device ConfigMaps contain the device prefix, so this name never collides with them.
+
+        Args:
+            lab_hash (str): The hash of a Kathara network scenario.
+
+        Returns:
+            str: The name for the ConfigMap in the format 'shared-|lab_hash|-files'.
+        """
+        return "shared-%s-files" % lab_hash.lower()
+
+    @staticmethod
+    def get_size(config_map: Optional[client.V1ConfigMap]) -> int:
+        """Return the size of the data stored in a Kubernetes ConfigMap.
+
+        Args:
+            config_map (Optional[client.V1ConfigMap]): A Kubernetes ConfigMap.
+
+        Returns:
+            int: The size of the data in bytes, 0 if the ConfigMap is None.
+        """
+        if config_map is None or not config_map.data:
+            return 0
+
+        return sum(len(value) for value in config_map.data.values())
+
+    def _create(self, config_map: client.V1ConfigMap, namespace: str, replace: bool = False) -> \
+            Optional[client.V1ConfigMap]:
+        """Create a Kubernetes ConfigMap.
+
+        Args:
+            config_map (client.V1ConfigMap): The Kubernetes ConfigMap to create.
+            namespace (str): The namespace of the ConfigMap.
+            replace (bool): If True, an already existing ConfigMap is replaced, otherwise it is kept.
+
+        Returns:
+            Optional[client.V1ConfigMap]: The created (or replaced) Kubernetes ConfigMap, None if it already exists
+                and it is kept.
+        """
+        try:
+            return self.client.create_namespaced_config_map(body=config_map, namespace=namespace)
+        except ApiException as e:
+            if e.status != 409:
+                raise e
+
+            if not replace:
+                # The device already exists, its deployment reports the conflict
+                logging.debug(f"ConfigMap `{config_map.metadata.name}` already exists.")
+                return None
+
+            return self.client.replace_namespaced_config_map(name=config_map.metadata.name, namespace=namespace,
+                                                             body=config_map
+                                                             )
+
+    @staticmethod
+    def _log_size_budget(shared_config_map: Optional[client.V1ConfigMap],
+                         config_maps: Dict[str, List[client.V1ConfigMap]]) -> None:
+        """Log the size of the ConfigMaps to deploy, compared to the maximum supported size.
+
+        Args:
+            shared_config_map (Optional[client.V1ConfigMap]): The ConfigMap of the shared files.
+            config_maps (Dict[str, List[client.V1ConfigMap]]): The ConfigMaps of the devices, keys are device names.
+
+        Returns:
+            None
+        """
+        sizes = {
+            name: sum(KubernetesConfigMap.get_size(config_map) for config_map in machine_config_maps)
+            for name, machine_config_maps in config_maps.items()
+        }
+        largest = max(sizes.items(), key=lambda x: x[1]) if sizes else None
+
+        logging.info(
+            "ConfigMaps size budget: shared files %s, %d device ConfigMaps for a total of %s%s (limit %s each)." % (
+                human_readable_bytes(KubernetesConfigMap.get_size(shared_config_map)),
+                sum(len(machine_config_maps) for machine_config_maps in config_maps.values()),
+                human_readable_bytes(sum(sizes.values())),
+                f", largest `{largest[0]}` {human_readable_bytes(largest[1])}" if largest else "",
+                human_readable_bytes(MAX_CONFIG_MAP_SIZE)
+            )
+        )
+
+    def _build_for_lab(self, lab: Lab) -> Optional[client.V1ConfigMap]:
+        """Build and return a Kubernetes ConfigMap for the shared files of the network scenario.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario.
+
+        Returns:
+            Optional[client.V1ConfigMap]: The Kubernetes ConfigMap, None if the network scenario has no shared files.
+
+        Raises:
+            KubernetesConfigMapError: If the shared files size exceeds the maximum supported size.
+        """
+        if not lab.fs:
+            return None
+
+        files = [(f"hostlab/{name}", lab.fs, name) for name in SHARED_FILES if lab.fs.exists(name)]
+        if not files:
+            return None
+
+        tar_data = b"".join(utils.stream_tar(utils.pack_fs_entries_for_tar(["hostlab"], files), compression="gz"))
+
+        return self._build(self.build_name_for_lab(lab.hash), "shared.b64", tar_data, "shared files")
+
+    def _build_for_machine(self, machine: Machine, shared: bool = True) -> List[client.V1ConfigMap]:
+        """Build and return the Kubernetes ConfigMaps for the device.
+
+        Small archives are stored in a single ConfigMap. Archives bigger than MAX_FILE_SIZE are split in shards, each
+        one stored in a separate ConfigMap with the base64 of its part, which are concatenated in the postStart hook.
 
         Args:
             machine (Kathara.model.Machine.Machine): A Kathara device.
+            shared (bool): If True, the shared files of the network scenario are included in the ConfigMaps.
 
         Returns:
-            Optional[client.V1ConfigMap]: The Kubernetes ConfigMap for the device.
+            List[client.V1ConfigMap]: The Kubernetes ConfigMaps for the device, empty if the device has no files.
 
         Raises:
             KubernetesConfigMapError: If the device folder size exceeds the maximum supported size.
         """
-        tar_data = machine.pack_data()
+        tar_data = machine.pack_data(shared=shared)
+        if not tar_data:
+            return []
 
-        # Create a ConfigMap on the cluster containing the base64 of the .tar.gz file
-        # This will be decoded and extracted in the postStart hook of the pod
-        if tar_data:
-            # Before creating the .tar.gz file, check if it is bigger than the maximum allowed size.
-            tar_data_size = len(tar_data)
-            if tar_data_size > MAX_FILE_SIZE:
-                raise KubernetesConfigMapError(
-                    'Unable to upload device folder. Maximum supported size: %s. Current: %s.' % (
-                        human_readable_bytes(MAX_FILE_SIZE),
-                        human_readable_bytes(tar_data_size)
-                    )
+        name = self.build_name_for_machine(machine.meta['real_name'], machine.lab.hash)
+        tar_data_size = len(tar_data)
+        if tar_data_size <= MAX_FILE_SIZE:
+            return [self._build(name, "hostlab.b64", tar_data, "device folder")]
+
+        if tar_data_size > MAX_FILE_SIZE * MAX_SHARDS:
+            raise KubernetesConfigMapError(
+                'Unable to upload device folder. Maximum supported size: %s. Current: %s.' % (
+                    human_readable_bytes(MAX_FILE_SIZE * MAX_SHARDS),
+                    human_readable_bytes(tar_data_size)
                 )
+            )
 
-            data = {"hostlab.b64": base64.b64encode(tar_data).decode('utf-8')}
-            metadata = client.V1ObjectMeta(name=self.build_name_for_machine(machine.meta['real_name'],
-                                                                            machine.lab.hash),
-                                           deletion_grace_period_seconds=0
-                                           )
+        # Shards must be a multiple of 3 bytes long, so their base64 encodings can be concatenated without padding
+        shard_size = MAX_FILE_SIZE - MAX_FILE_SIZE % 3
+        shards = math.ceil(tar_data_size / shard_size)
+        logging.debug(f"Device folder of `{machine.name}` is split in {shards} ConfigMaps.")
 
-            config_map = client.V1ConfigMap(api_version="v1",
-                                            kind="ConfigMap",
-                                            data=data,
-                                            metadata=metadata
-                                            )
+        return [
+            self._build(self.build_name_for_shard(name, shard), "hostlab.b64.%03d" % shard,
+                        tar_data[shard * shard_size:(shard + 1) * shard_size], "device folder")
+            for shard in range(shards)
+        ]
+
+    @staticmethod
+    def _build(name: str, key: str, tar_data: bytes, description: str) -> client.V1ConfigMap:
+        """Build and return a Kubernetes ConfigMap containing the base64 of a .tar.gz file.
+
+        Args:
+            name (str): The name of the ConfigMap.
+            key (str): The key of the base64 data in the ConfigMap.
+            tar_data (bytes): The content of the .tar.gz file.
+            description (str): The description of the content, used in the error message.
+
+        Returns:
+            client.V1ConfigMap: The Kubernetes ConfigMap.
+
+        Raises:
+            KubernetesConfigMapError: If the .tar.gz file size exceeds the maximum supported size.
+        """
+        # Create a ConfigMap on the cluster containing the base64 of the .tar.gz file
+        # This will be decoded and extracted in the postStart hook of the pod
+        # Before creating the ConfigMap, check if the .tar.gz file is bigger than the maximum allowed size.
+        tar_data_size = len(tar_data)
+        if tar_data_size > MAX_FILE_SIZE:
+            raise KubernetesConfigMapError(
+                'Unable to upload %s. Maximum supported size: %s. Current: %s.' % (
+                    description,
+                    human_readable_bytes(MAX_FILE_SIZE),
+                    human_readable_bytes(tar_data_size)
+                )
+            )
 
-            return config_map
+        data = {key: base64.b64encode(tar_data).decode('utf-8')}
+        metadata = client.V1ObjectMeta(name=name, deletion_grace_period_seconds=0)
 
-        return None
+        return client.V1ConfigMap(api_version="v1",
+                                  kind="ConfigMap",
+                                  data=data,
+                                  metadata=metadata
+                                  )
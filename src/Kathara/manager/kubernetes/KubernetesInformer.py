@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import watch
+
+# Keys are (namespace, name) tuples
+ObjectKey = Tuple[Optional[str], Optional[str]]
+
+# Seconds after which the server closes a watch, then it is resumed from the last seen resource version
+WATCH_TIMEOUT: int = 300
+# Minimum seconds between two watch (or resync) attempts
+RETRY_INTERVAL: float = 1.0
+HTTP_STATUS_GONE: int = 410
+
+
+class KubernetesInformer(object):
+    """Local cache of the Kathara resources of a kind, kept up to date by watching the cluster.
+
+    The cache is filled with a single cluster-wide list call filtered by label selector. Then, a background thread
+    watches the resources starting from the returned resource version and applies the received events to the cache.
+    If the resource version expires (HTTP 410 Gone) or the watch fails, the cache is filled again with a new list call.
+
+    The watch runs only while the informer has users (see `start` and `stop`), so one-shot operations never pay for it.
+
+    Attributes:
+        list_func (Callable[..., Any]): The API function listing the resources in all the namespaces.
+        label_selector (str): The label selector of the cached resources.
+    """
+    __slots__ = ['list_func', 'label_selector', '_lock', '_objects', '_resource_version', '_synced', '_users',
+                 '_watch']
+
+    def __init__(self, list_func: Callable[..., Any], label_selector: str = "app=kathara") -> None:
+        self.list_func: Callable[..., Any] = list_func
+        self.label_selector: str = label_selector
+
+        self._lock: threading.Lock = threading.Lock()
+        self._objects: Dict[ObjectKey, Any] = {}
+        self._resource_version: Optional[str] = None
+        self._synced: bool = False
+        self._users: int = 0
+        # The watch of the running thread, None if the informer is stopped
+        self._watch: Optional[watch.Watch] = None
+
+    @property
+    def is_synced(self) -> bool:
+        """Return True if the cache reflects the state of the cluster, so it can be used to serve reads.
+
+        Returns:
+            bool: True if the cache is synced, else False.
+        """
+        with self._lock:
+            return self._synced
+
+    def start(self) -> bool:
+        """Register a user of the informer. The first user fills the cache and starts watching the resources.
+
+        Returns:
+            bool: True if the cache is synced, False if the resources cannot be listed.
+        """
+        with self._lock:
+            self._users += 1
+            if self._watch is not None:
+                return self._synced
+
+        try:
+            self.resync()
+        except Exception as e:
+            logging.debug(f"Cannot list resources with selector `{self.label_selector}`: {str(e)}")
+            return False
+
+        with self._lock:
+            if self._watch is None and self._users > 0:
+                self._watch = watch.Watch()
+                threading.Thread(target=self._run, args=(self._watch,), daemon=True).start()
+
+            return self._synced
+
+    def stop(self) -> None:
+        """Unregister a user of the informer. When the last user stops, the watch is stopped and the cache cleared.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users > 0:
+                return
+
+            if self._watch is not None:
+                self._watch.stop()
+            self._watch = None
+            self._objects = {}
+            self._resource_version = None
+            self._synced = False
+
+    def resync(self) -> None:
+        """Replace the content of the cache with the resources currently in the cluster.
+
+        Returns:
+            None
+
+        Raises:
+            ApiException: If the resources cannot be listed.
+        """
+        (items, resource_version) = self._parse_list(
+            self.list_func(label_selector=self.label_selector, timeout_seconds=9999)
+        )
+
+        objects = {}
+        for item in items:
+            (namespace, name, _, _) = self.get_metadata(item)
+            objects[(namespace, name)] = item
+
+        with self._lock:
+            self._objects = objects
+            self._resource_version = resource_version
+            self._synced = True
+
+    def list(self, namespace: Optional[str] = None, labels: Optional[Dict[str, str]] = None) -> List[Any]:
+        """Return the cached resources matching the specified filters.
+
+        Args:
+            namespace (Optional[str]): If specified, return only the resources in this namespace.
+            labels (Optional[Dict[str, str]]): If specified, return only the resources having all these labels.
+
+        Returns:
+            List[Any]: A list of Kubernetes API objects.
+        """
+        with self._lock:
+            objects = list(self._objects.items())
+
+        labels = labels or {}
+        result = []
+        for ((object_namespace, _), api_object) in objects:
+            if namespace and object_namespace != namespace:
+                continue
+
+            object_labels = self.get_metadata(api_object)[2]
+            if all(object_labels.get(key, None) == value for key, value in labels.items()):
+                result.append(api_object)
+
+        return result
+
+    def _run(self, current_watch: watch.Watch) -> None:
+        """Watch the resources and apply the received events to the cache, until the informer is stopped.
+
+        Args:
+            current_watch (watch.Watch): The watch owned by this thread.
+
+        Returns:
+            None
+        """
+        while True:
+            with self._lock:
+                if self._watch is not current_watch:
+                    return
+                resource_version = self._resource_version
+
+            start = time.monotonic()
+            try:
+                for event in current_watch.stream(self.list_func, label_selector=self.label_selector,
+                                                  resource_version=resource_version, timeout_seconds=WATCH_TIMEOUT):
+                    if not self._apply(current_watch, event):
+                        return
+            except Exception as e:
+                if isinstance(e, ApiException) and e.status == HTTP_STATUS_GONE:
+                    logging.debug(f"Resource version `{resource_version}` expired, resyncing the informer...")
+                else:
+                    logging.debug(f"Watch with selector `{self.label_selector}` failed: {str(e)}")
+                    time.sleep(max(0.0, RETRY_INTERVAL - (time.monotonic() - start)))
+
+                with self._lock:
+                    if self._watch is not current_watch:
+                        return
+                    self._synced = False
+
+                try:
+                    self.resync()
+                except Exception as e:
+                    logging.debug(f"Cannot resync the informer: {str(e)}")
+
+                continue
+
+            # Avoid a busy loop if the server keeps closing the watch
+            time.sleep(max(0.0, RETRY_INTERVAL - (time.monotonic() - start)))
+
+    def _apply(self, current_watch: watch.Watch, event: Optional[Dict[str, Any]]) -> bool:
+        """Apply a watch event to the cache.
+
+        Args:
+            current_watch (watch.Watch): The watch that received the event.
+            event (Optional[Dict[str, Any]]): The watch event.
+
+        Returns:
+            bool: False if the watch is stale and must be stopped, else True.
+        """
+        if not event:
+            return True
+
+        (namespace, name, _, resource_version) = self.get_metadata(event['object'])
+        with self._lock:
+            if self._watch is not current_watch:
+                return False
+
+            if event['type'] == 'DELETED':
+                self._objects.pop((namespace, name), None)
+            elif event['type'] in ('ADDED', 'MODIFIED'):
+                self._objects[(namespace, name)] = event['object']
+
+            if resource_version:
+                self._resource_version = resource_version
+
+        return True
+
+    @staticmethod
+    def get_metadata(api_object: Any) -> Tuple[Optional[str], Optional[str], Dict[str, str], Optional[str]]:
+        """Return the metadata of a Kubernetes API object, either a model (e.g., Pods) or a dict (custom objects).
+
+        Args:
+            api_object (Any): A Kubernetes API object.
+
+        Returns:
+            Tuple[Optional[str], Optional[str], Dict[str, str], Optional[str]]: The namespace, the name, the labels and
+                the resource version of the object.
+        """
+        if isinstance(api_object, dict):
+            metadata = api_object.get('metadata', None) or {}
+            return (metadata.get('namespace', None), metadata.get('name', None), metadata.get('labels', None) or {},
+                    metadata.get('resourceVersion', None))
+
+        metadata = api_object.metadata
+        return metadata.namespace, metadata.name, metadata.labels or {}, metadata.resource_version
+
+    @staticmethod
+    def _parse_list(result: Any) -> Tuple[List[Any], Optional[str]]:
+        """Return the items and the resource version of a list call result.
+
+        Args:
+            result (Any): The result of a list call, either a model (e.g., V1PodList) or a dict (custom objects).
+
+        Returns:
+            Tuple[List[Any], Optional[str]]: The listed items and the resource version of the list.
+        """
+        if isinstance(result, dict):
+            return result.get('items', None) or [], (result.get('metadata', None) or {}).get('resourceVersion', None)
+
+        return result.items or [], result.metadata.resource_version
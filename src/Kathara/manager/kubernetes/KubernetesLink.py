@@ -1,9 +1,7 @@
 import hashlib
-import json
 import logging
 import re
 from functools import partial
-from multiprocessing import Manager
 from multiprocessing.dummy import Pool
 from typing import Dict, Optional, Set, Any, List, Generator
 
@@ -12,7 +10,9 @@ from kubernetes.client.api import custom_objects_api
 from kubernetes.client.rest import ApiException
 
 from .KubernetesConfig import KubernetesConfig
+from .KubernetesInformer import KubernetesInformer
 from .KubernetesNamespace import KubernetesNamespace
+from .KubernetesVniAllocator import KubernetesVniAllocator
 from .stats.KubernetesLinkStats import KubernetesLinkStats
 from ... import utils
 from ...event.EventDispatcher import EventDispatcher
@@ -21,8 +21,6 @@ from ...model.Lab import Lab
 from ...model.Link import Link
 from ...setting.Setting import Setting
 
-MAX_K8S_LINK_NUMBER = (1 << 24) - 10
-
 K8S_NET_GROUP = "k8s.cni.cncf.io"
 K8S_NET_VERSION = "v1"
 K8S_NET_PLURAL = "network-attachment-definitions"
@@ -30,7 +28,7 @@ K8S_NET_PLURAL = "network-attachment-definitions"
 
 class KubernetesLink(object):
     """The class responsible for deploying Kathara collision domains as Kubernetes networks and interact with them."""
-    __slots__ = ['client', 'kubernetes_namespace', 'seed']
+    __slots__ = ['client', 'kubernetes_namespace', 'seed', 'vni_allocator', 'informer']
 
     def __init__(self, kubernetes_namespace: KubernetesNamespace) -> None:
         self.client: custom_objects_api.CustomObjectsApi = custom_objects_api.CustomObjectsApi()
@@ -39,6 +37,13 @@ class KubernetesLink(object):
 
         self.seed: str = KubernetesConfig.get_cluster_user()
 
+        self.vni_allocator: KubernetesVniAllocator = KubernetesVniAllocator(self.seed)
+
+        self.informer: KubernetesInformer = KubernetesInformer(
+            partial(self.client.list_cluster_custom_object, group=K8S_NET_GROUP, version=K8S_NET_VERSION,
+                    plural=K8S_NET_PLURAL)
+        )
+
     def deploy_links(self, lab: Lab, selected_links: Set[str] = None, excluded_links: Set[str] = None) -> None:
         """Deploy all the links contained in lab.links.
 
@@ -72,24 +77,19 @@ class KubernetesLink(object):
 
             EventDispatcher.get_instance().dispatch("links_deploy_started", items=links)
 
-            with Manager() as manager:
-                # Read already existing VNIs before creating new networks. This will avoid VNI collisions.
-                network_ids = manager.dict({
-                    network_id: 1 for network_id in self._get_existing_network_ids()
-                })
+            # Read already existing VNIs before creating new networks. This will avoid VNI collisions.
+            self.vni_allocator.sync(self._get_all_networks())
 
-                with Pool(pool_size) as links_pool:
-                    for chunk in items:
-                        links_pool.map(func=partial(self._deploy_link, network_ids), iterable=chunk)
+            with Pool(pool_size) as links_pool:
+                for chunk in items:
+                    links_pool.map(func=self._deploy_link, iterable=chunk)
 
             EventDispatcher.get_instance().dispatch("links_deploy_ended")
 
-    def _deploy_link(self, network_ids: Dict, link_item: (str, Link)) -> None:
+    def _deploy_link(self, link_item: (str, Link)) -> None:
         """Deploy the Link contained in the link_item.
 
         Args:
-            network_ids (Dict): A Dict for reserving network IDs. The Key is the network_id, value is 1 if it
-                is currently used.
             link_item (Tuple[str, Link]): A tuple composed by the name of the collision domain and a Link object
 
         Returns:
@@ -97,8 +97,21 @@ class KubernetesLink(object):
         """
         (_, link) = link_item
 
-        network_id = self._get_unique_network_id(link.name, network_ids)
-        self.create(link, network_id)
+        # The allocator view already contains the deployed networks, so they are reused without listing them again
+        network = self.vni_allocator.get_network(link.lab.hash, link.name)
+        if network:
+            link.api_object = network
+        else:
+            network_id = self.vni_allocator.allocate(link.name)
+            try:
+                self._create_network(link, network_id)
+            except ApiException as e:
+                self.vni_allocator.release(network_id)
+                if e.status != 409:
+                    raise
+
+                # The network has been created after reading the deployed ones, reuse it
+                self.create(link, network_id)
 
         EventDispatcher.get_instance().dispatch("link_deployed", item=link)
 
@@ -118,6 +131,18 @@ class KubernetesLink(object):
             link.api_object = networks.pop()
             return
 
+        self._create_network(link, network_id)
+
+    def _create_network(self, link: Link, network_id: int) -> None:
+        """Create a Kubernetes Network representing the collision domain object, without checking if it exists.
+
+        Args:
+            link (Kathara.model.Link.Link): A Kathara collision domain.
+            network_id (int): The Network ID.
+
+        Returns:
+            None
+        """
         link.api_object = self.client.create_namespaced_custom_object(group=K8S_NET_GROUP,
                                                                       version=K8S_NET_VERSION,
                                                                       namespace=link.lab.hash,
@@ -206,10 +231,24 @@ class KubernetesLink(object):
         Returns:
             List[Any]: A list of Kubernetes networks.
         """
+        if self.informer.is_synced:
+            return self.informer.list(namespace=lab_hash, labels={"name": link_name} if link_name else None)
+
         filters = ["app=kathara"]
         if link_name:
             filters.append(f"name={link_name}")
 
+        if not lab_hash:
+            try:
+                return self.client.list_cluster_custom_object(group=K8S_NET_GROUP,
+                                                              version=K8S_NET_VERSION,
+                                                              plural=K8S_NET_PLURAL,
+                                                              label_selector=",".join(filters),
+                                                              timeout_seconds=9999
+                                                              )["items"]
+            except ApiException as e:
+                logging.debug(f"Cannot list networks cluster-wide, listing them by namespace: {str(e)}")
+
         # Get all Kathara namespaces if lab_hash is None
         namespaces = list(map(lambda x: x.metadata.name, self.kubernetes_namespace.get_all())) \
             if not lab_hash else [lab_hash]
@@ -247,29 +286,41 @@ class KubernetesLink(object):
             if network['metadata']['name'] not in networks_stats:
                 networks_stats[network['metadata']['name']] = KubernetesLinkStats(network)
 
-        while True:
-            networks = self.get_links_api_objects_by_filters(lab_hash=lab_hash, link_name=link_name)
-            if not networks:
-                yield dict()
+        # The first refresh lists the networks, so one-shot reads never start the informer. Then, networks are read
+        # from the informer cache, so each refresh does not query the cluster
+        informer_started = False
+        try:
+            while True:
+                networks = self.get_links_api_objects_by_filters(lab_hash=lab_hash, link_name=link_name)
+                if not networks:
+                    yield dict()
 
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(networks, pool_size)
-            with Pool(pool_size) as links_pool:
-                for chunk in items:
-                    links_pool.map(func=load_link_stats, iterable=chunk)
+                pool_size = utils.get_pool_size()
+                items = utils.chunk_list(networks, pool_size)
+                with Pool(pool_size) as links_pool:
+                    for chunk in items:
+                        links_pool.map(func=load_link_stats, iterable=chunk)
 
-            networks_to_remove = []
-            for network_id, network_stats in networks_stats.items():
-                try:
-                    network_stats.update()
-                except StopIteration:
-                    networks_to_remove.append(network_id)
-                    continue
+                network_names = set(map(lambda x: x['metadata']['name'], networks))
+                networks_to_remove = [network_id for network_id in networks_stats if network_id not in network_names]
+                for network_id, network_stats in networks_stats.items():
+                    try:
+                        network_stats.update()
+                    except StopIteration:
+                        networks_to_remove.append(network_id)
+                        continue
 
-            for k in networks_to_remove:
-                networks_stats.pop(k, None)
+                for k in networks_to_remove:
+                    networks_stats.pop(k, None)
 
-            yield networks_stats
+                yield networks_stats
+
+                if not informer_started:
+                    self.informer.start()
+                    informer_started = True
+        finally:
+            if informer_started:
+                self.informer.stop()
 
     def _build_definition(self, link: Link, network_id: int) -> Dict[str, str]:
         """Return a Dict containing the network definition for Kubernetes API corresponding to link.
@@ -302,28 +353,6 @@ class KubernetesLink(object):
             }
         }
 
-    def _get_unique_network_id(self, name: str, network_ids: Dict[int, int]) -> int:
-        """Return a unique network id.
-
-        Args:
-            name (str): The name of the network.
-            network_ids (Dict[int, int]): A Dict for reserving network IDs. The Key is the network_id, value is 1 if it
-                is currently used.
-
-        Returns:
-            int: A network ID.
-
-        """
-        network_id = self._get_network_id(name)
-        offset = 1
-        while network_id in network_ids:
-            network_id = self._get_network_id(name, offset)
-            offset += 1
-
-        network_ids[network_id] = 1
-
-        return network_id
-
     def _get_network_id(self, name: str, offset: int = 0) -> int:
         """Return the Kubernetes network ID from a Kathara collision domain name.
 
@@ -334,22 +363,18 @@ class KubernetesLink(object):
         Returns:
             int: The Kubernetes network ID.
         """
-        network_name = self.seed + name
-        return (offset + int(hashlib.sha256(network_name.encode('utf-8')).hexdigest(), 16)) % MAX_K8S_LINK_NUMBER
+        return self.vni_allocator.get_candidate(name, offset)
 
-    def _get_existing_network_ids(self) -> List[int]:
-        """Retrieve already deployed Kubernetes network IDs (reading the network definition).
+    def _get_all_networks(self) -> List[Any]:
+        """Return all the Kathara Kubernetes networks of the cluster.
+
+        Networks are listed with a single cluster-wide call. If it is not allowed, they are listed namespace by
+        namespace.
 
         Returns:
-            List[int]: List with all deployed Kubernetes network IDs.
+            List[Any]: A list of Kubernetes networks.
         """
-        network_ids = []
-
-        for network in self.get_links_api_objects_by_filters():
-            network_config = json.loads(network['spec']['config'])
-            network_ids.append(int(network_config['vxlanId']))
-
-        return network_ids
+        return self.get_links_api_objects_by_filters()
 
     @staticmethod
     def get_network_name(name: str) -> str:
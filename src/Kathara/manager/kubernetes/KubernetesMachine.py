@@ -1,6 +1,7 @@
 import hashlib
 import json
 import logging
+import math
 import os
 import re
 import shlex
@@ -11,9 +12,8 @@ import tempfile
 import threading
 import uuid
 from multiprocessing.dummy import Pool
-from typing import Optional, Set, List, Union, Generator, Tuple, Dict, Any
+from typing import Optional, Set, List, Union, Generator, Tuple, Dict, Any, Iterable
 
-import chardet
 from kubernetes import client
 from kubernetes.client.api import apps_v1_api
 from kubernetes.client.api import core_v1_api
@@ -22,6 +22,8 @@ from kubernetes.stream import stream
 from kubernetes.watch import watch
 
 from .KubernetesConfigMap import KubernetesConfigMap
+from .KubernetesInformer import KubernetesInformer
+from .KubernetesMetricsCollector import KubernetesMetricsCollector
 from .KubernetesNamespace import KubernetesNamespace
 from .exec_stream.KubernetesExecStream import KubernetesExecStream
 from .stats.KubernetesMachineStats import KubernetesMachineStats
@@ -29,6 +31,7 @@ from ... import utils
 from ...event.EventDispatcher import EventDispatcher
 from ...exceptions import MachineAlreadyExistsError, MachineNotReadyError, MachineNotRunningError, MachineBinaryError, \
     InvocationError, MountDeniedError
+from ...foundation.manager.DependencyScheduler import DependencyScheduler
 from ...model.Lab import Lab
 from ...model.Machine import Machine
 from ...setting.Setting import Setting
@@ -37,6 +40,9 @@ RP_FILTER_NAMESPACE = "net.ipv4.conf.%s.rp_filter"
 MAX_RESTART_COUNT = 3
 MAX_TIME_ERROR = 180
 
+# Pod annotation storing the number of ConfigMaps of a device whose folder is split in shards
+CONFIG_MAP_SHARDS_ANNOTATION = "kathara.config-map-shards"
+
 OCI_RUNTIME_RE = re.compile(
     r"OCI runtime exec failed"
 )
@@ -58,6 +64,13 @@ STARTUP_COMMANDS = [
     "umount /etc/resolv.conf",
     "umount /etc/hosts",
 
+    # Parse shared.b64 of the network scenario (if present)
+    "if [ -f \"/tmp/kathara-shared/shared.b64\" ]; then "
+    "base64 -d /tmp/kathara-shared/shared.b64 > /shared.tar.gz",
+    # Extract shared.tar.gz data into /
+    "tar xmfz /shared.tar.gz -C /; rm -f /shared.tar.gz",
+    "fi",
+
     # Parse hostlab.b64 (if present)
     "if [ -f \"/tmp/kathara/hostlab.b64\" ]; then "
     "base64 -d /tmp/kathara/hostlab.b64 > /hostlab.tar.gz",
@@ -65,6 +78,13 @@ STARTUP_COMMANDS = [
     "tar xmfz /hostlab.tar.gz -C /; rm -f hostlab.tar.gz",
     "fi",
 
+    # Reassemble hostlab.b64 from its shards (if present), shards are named in order
+    "if [ -f \"/tmp/kathara/hostlab.b64.000\" ]; then "
+    "cat /tmp/kathara/hostlab.b64.* | base64 -d > /hostlab.tar.gz",
+    # Extract hostlab.tar.gz data into /
+    "tar xmfz /hostlab.tar.gz -C /; rm -f hostlab.tar.gz",
+    "fi",
+
     # Copy the machine folder (if present) from the hostlab directory into the root folder of the container
     # In this way, files are all replaced in the container root folder
     "if [ -d \"/hostlab/{machine_name}\" ]; then "
@@ -133,7 +153,8 @@ SHUTDOWN_COMMANDS = [
 
 class KubernetesMachine(object):
     """Class responsible for managing Kathara devices representation in Kubernetes."""
-    __slots__ = ['client', 'core_client', 'kubernetes_config_map', 'kubernetes_namespace']
+    __slots__ = ['client', 'core_client', 'kubernetes_config_map', 'kubernetes_namespace', 'informer',
+                 'metrics_collector']
 
     def __init__(self, kubernetes_namespace: KubernetesNamespace) -> None:
         self.client: apps_v1_api.AppsV1Api = apps_v1_api.AppsV1Api()
@@ -143,6 +164,10 @@ class KubernetesMachine(object):
 
         self.kubernetes_namespace: KubernetesNamespace = kubernetes_namespace
 
+        self.informer: KubernetesInformer = KubernetesInformer(self.core_client.list_pod_for_all_namespaces)
+
+        self.metrics_collector: KubernetesMetricsCollector = KubernetesMetricsCollector()
+
     def deploy_machines(self, lab: Lab, selected_machines: Set[str] = None, excluded_machines: Set[str] = None) -> None:
         """Deploy all the devices contained in lab.machines.
 
@@ -173,6 +198,9 @@ class KubernetesMachine(object):
         # Do not open terminals on Megalos
         Setting.get_instance().open_terminals = False
 
+        if lab.general_options.get('boot_profile', False):
+            logging.warning("Boot profiling is not supported by Megalos, the network scenario is deployed without it.")
+
         policy = Setting.get_instance().volume_mount_policy
         lab.add_option("_mount_volumes", policy in ['Prompt', 'Always'])
         machines_with_volumes = dict(filter(lambda x: len(x[1].meta['volumes']) > 0, machines))
@@ -181,6 +209,13 @@ class KubernetesMachine(object):
                 "machines_with_volumes", lab=lab, machines_with_volumes=machines_with_volumes
             )
 
+        # Shared files are deployed once in a ConfigMap of the network scenario, mounted into every device
+        for _, machine in machines:
+            machine.add_meta('real_name', self.get_deployment_name(machine.name))
+        shared_config_map, config_maps = self.kubernetes_config_map.deploy_for_lab(lab, [m for _, m in machines])
+        lab.add_option("_shared_config_map", shared_config_map)
+        lab.add_option("_config_maps", config_maps)
+
         wait_thread = threading.Thread(
             target=self._wait_machines_startup,
             args=(lab, set([k for k, _ in machines]) if selected_machines or excluded_machines else None)
@@ -188,23 +223,17 @@ class KubernetesMachine(object):
         wait_thread.start()
 
         # Deploy all lab machines.
-        # If there is no lab.dep file, machines can be deployed using multithreading.
-        # If not, they're started sequentially
-        if not lab.has_dependencies:
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(machines, pool_size)
-
-            with Pool(pool_size) as machines_pool:
-                for chunk in items:
-                    machines_pool.map(func=self._deploy_machine, iterable=chunk)
-        else:
-            for item in machines:
-                self._deploy_machine(item)
+        # Each device is created as soon as the devices it depends on (specified in lab.dep) are created.
+        # If there is no lab.dep file, all the devices are deployed in parallel.
+        scheduler = DependencyScheduler(lab.dependencies if lab.has_dependencies else None)
+        scheduler.run(machines, self._deploy_machine)
 
         wait_thread.join()
 
         # Delete to avoid keeping dirty state
         del lab.general_options['_mount_volumes']
+        lab.general_options.pop('_shared_config_map', None)
+        del lab.general_options['_config_maps']
 
     def _wait_machines_startup(self, lab: Lab, selected_machines: Set[str]) -> None:
         """Wait the startup of the selected machines. Return when the selected machines become `Ready`.
@@ -281,6 +310,52 @@ class KubernetesMachine(object):
         if machines_ready == len(machines):
             EventDispatcher.get_instance().dispatch("machines_deploy_ended")
 
+    def wait_ready(self, lab_hash: str, selected_machines: Set[str] = None,
+                   timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Wait until the startup commands of the devices of a network scenario are executed.
+
+        The startup commands are executed by the postStart hook, so a device is ready when its Pod is `Ready`.
+        Pods are watched, so they are not polled.
+
+        Args:
+            lab_hash (str): The hash of the network scenario.
+            selected_machines (Set[str]): The names of the devices to wait. If None, wait all the devices.
+            timeout (Optional[float]): The maximum seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            Dict[str, bool]: Keys are device names, values are True if the startup commands are executed.
+        """
+
+        def is_pod_ready(pod: client.V1Pod) -> bool:
+            return bool(pod.status and pod.status.container_statuses and pod.status.container_statuses[0].ready)
+
+        def is_selected(machine_name: str) -> bool:
+            return not selected_machines or machine_name in selected_machines
+
+        # Selected devices without a Pod yet are not ready
+        ready = {machine_name: False for machine_name in selected_machines} if selected_machines else {}
+        pods = self.get_machines_api_objects_by_filters(lab_hash=lab_hash)
+        ready.update({
+            pod.metadata.labels['name']: is_pod_ready(pod) for pod in pods if is_selected(pod.metadata.labels['name'])
+        })
+        # If no Pod is found, the network scenario is not ready (yet)
+        if ready and all(ready.values()):
+            return ready
+
+        watch_args = {'timeout_seconds': max(1, math.ceil(timeout))} if timeout is not None else {}
+        w = watch.Watch()
+        for event in w.stream(self.core_client.list_namespaced_pod, namespace=lab_hash, label_selector="app=kathara",
+                              **watch_args):
+            machine_name = event['object'].metadata.labels['name']
+            if not is_selected(machine_name) or event['type'] == "DELETED":
+                continue
+
+            ready[machine_name] = is_pod_ready(event['object'])
+            if all(ready.values()):
+                w.stop()
+
+        return ready
+
     def _deploy_machine(self, machine_item: Tuple[str, Machine]) -> None:
         """Deploy a Kubernetes deployment from the Kathara device contained in machine_item.
 
@@ -357,8 +432,15 @@ class KubernetesMachine(object):
         machine.add_meta('real_name', self.get_deployment_name(machine.name))
 
         try:
-            config_map = self.kubernetes_config_map.deploy_for_machine(machine)
-            machine_definition = self._build_definition(machine, config_map)
+            # If the ConfigMaps have been deployed with the network scenario, shared files are in a separate one
+            config_maps = machine.lab.general_options.get('_config_maps', None)
+            if config_maps is not None:
+                machine_config_maps = config_maps.get(machine.name, [])
+                shared_config_map = machine.lab.general_options.get('_shared_config_map', None)
+            else:
+                machine_config_maps = self.kubernetes_config_map.deploy_for_machine(machine)
+                shared_config_map = None
+            machine_definition = self._build_definition(machine, machine_config_maps, shared_config_map)
 
             machine.api_object = self.client.create_namespaced_deployment(body=machine_definition,
                                                                           namespace=machine.lab.hash
@@ -369,20 +451,26 @@ class KubernetesMachine(object):
             else:
                 raise e
 
-    def _build_definition(self, machine: Machine, config_map: client.V1ConfigMap) -> client.V1Deployment:
-        """Return a Kubernetes deployment from a Kathara device and a Kubernetes ConfigMap.
+    def _build_definition(self, machine: Machine, config_maps: Optional[List[client.V1ConfigMap]],
+                          shared_config_map: client.V1ConfigMap = None) -> client.V1Deployment:
+        """Return a Kubernetes deployment from a Kathara device and its Kubernetes ConfigMaps.
 
         Args:
             machine (Kathara.model.Machine.Machine): A Kathara device.
-            config_map (client.V1ConfigMap): A Kubernetes ConfigMap containing the tar data to upload on the deployment.
+            config_maps (Optional[List[client.V1ConfigMap]]): The Kubernetes ConfigMaps containing the tar data to
+                upload on the deployment. More than one if the tar data is split in shards.
+            shared_config_map (client.V1ConfigMap): A Kubernetes ConfigMap containing the tar data of the shared files
+                of the network scenario.
 
         Returns:
             client.V1Deployment: A Kubernetes deployment.
         """
         volume_mounts = []
-        if config_map:
+        if config_maps:
             # Define volume mounts for hostlab if a ConfigMap is defined.
             volume_mounts.append(client.V1VolumeMount(name="hostlab", mount_path="/tmp/kathara"))
+        if shared_config_map:
+            volume_mounts.append(client.V1VolumeMount(name="hostlab-shared", mount_path="/tmp/kathara-shared"))
 
         if Setting.get_instance().host_shared:
             volume_mounts.append(client.V1VolumeMount(name="shared", mount_path="/shared"))
@@ -495,6 +583,8 @@ class KubernetesMachine(object):
                 **additional_data
             })
         pod_annotations["k8s.v1.cni.cncf.io/networks"] = json.dumps(network_interfaces)
+        if config_maps and len(config_maps) > 1:
+            pod_annotations[CONFIG_MAP_SHARDS_ANNOTATION] = str(len(config_maps))
 
         # Create labels (so Deployment can match them)
         pod_labels = {"name": machine.name,
@@ -510,13 +600,33 @@ class KubernetesMachine(object):
         dns_config = client.V1PodDNSConfig(nameservers=["127.0.0.1"])
 
         volumes = []
-        if config_map:
+        if config_maps and len(config_maps) == 1:
             # Hostlab is the lab base64 encoded .tar.gz of the machine files, deployed as a ConfigMap in the cluster
             # The base64 file is mounted into /tmp and it's extracted by the postStart hook
             volumes.append(client.V1Volume(
                 name="hostlab",
                 config_map=client.V1ConfigMapVolumeSource(
-                    name=config_map.metadata.name
+                    name=config_maps[0].metadata.name
+                )
+            ))
+        elif config_maps:
+            # Shards of a big hostlab are deployed as separate ConfigMaps, projected into the same directory
+            volumes.append(client.V1Volume(
+                name="hostlab",
+                projected=client.V1ProjectedVolumeSource(
+                    sources=[
+                        client.V1VolumeProjection(
+                            config_map=client.V1ConfigMapProjection(name=config_map.metadata.name)
+                        ) for config_map in config_maps
+                    ]
+                )
+            ))
+        if shared_config_map:
+            # The shared files of the network scenario are deployed once, in a ConfigMap mounted in every device
+            volumes.append(client.V1Volume(
+                name="hostlab-shared",
+                config_map=client.V1ConfigMapVolumeSource(
+                    name=shared_config_map.metadata.name
                 )
             ))
 
@@ -690,7 +800,10 @@ class KubernetesMachine(object):
             pass
 
         deployment_name = self.get_deployment_name(machine_name)
-        self.kubernetes_config_map.delete_for_machine(deployment_name, machine_namespace)
+        pod_annotations = pod_api_object.metadata.annotations or {}
+        self.kubernetes_config_map.delete_for_machine(
+            deployment_name, machine_namespace, shards=int(pod_annotations.get(CONFIG_MAP_SHARDS_ANNOTATION, 1))
+        )
         self.client.delete_namespaced_deployment(name=deployment_name, namespace=machine_namespace)
 
     def connect(self, lab_hash: str, machine_name: str, shell: Union[str, List[str]] = None, logs: bool = False) \
@@ -736,10 +849,8 @@ class KubernetesMachine(object):
                 while True:
                     (stdout, _) = next(exec_output)
 
-                    char_encoding = chardet.detect(stdout) if stdout else None
-
-                    stdout = stdout.decode(char_encoding['encoding']) if stdout else ""
-                    sys.stdout.write(stdout)
+                    if stdout:
+                        utils.write_output(sys.stdout, stdout)
             except StopIteration:
                 print("\n--- End Startup Commands Log\n")
                 pass
@@ -789,7 +900,7 @@ class KubernetesMachine(object):
         return None
 
     def exec(self, lab_hash: str, machine_name: str, command: Union[str, List], tty: bool = False, stdin: bool = False,
-             stdin_buffer: List[Union[str, bytes]] = None, stderr: bool = False, is_stream: bool = True) \
+             stdin_buffer: Iterable[Union[str, bytes]] = None, stderr: bool = False, is_stream: bool = True) \
             -> Union[KubernetesExecStream, Tuple[bytes, bytes, int]]:
         """Execute the command on the Kubernetes Pod specified by the lab_hash and the machine_name.
 
@@ -799,7 +910,7 @@ class KubernetesMachine(object):
             command (Union[str, List]): The command to execute.
             tty (bool): If True, open a new tty.
             stdin (bool): If True, open the stdin channel.
-            stdin_buffer (List[Union[str, bytes]]): List of command to pass to the stdin.
+            stdin_buffer (Iterable[Union[str, bytes]]): Chunks of data to pass to the stdin, consumed lazily.
             stderr (bool): If True, return the stderr.
             is_stream (bool): If True, return a KubernetesExecStream object.
                 If False, returns a tuple containing the complete stdout, the stderr, and the return code of the command.
@@ -846,19 +957,21 @@ class KubernetesMachine(object):
             return self._exec_all(response, machine_name, command, stdin, stdin_buffer, stderr)
 
     @staticmethod
-    def _exec_stream(response: Any, stdin: bool = False, stdin_buffer: List[Union[str, bytes]] = None,
+    def _exec_stream(response: Any, stdin: bool = False, stdin_buffer: Iterable[Union[str, bytes]] = None,
                      has_stderr: bool = False) -> Generator[Tuple[bytes, bytes], None, None]:
         """Execute the command on the Kubernetes Pod, returning a generator.
 
         Args:
             response (Any): The stream response from Kubernetes API.
             stdin (bool): If True, open the stdin channel.
-            stdin_buffer (List[Union[str, bytes]]): List of command to pass to the stdin.
+            stdin_buffer (Iterable[Union[str, bytes]]): Chunks of data to pass to the stdin, consumed lazily.
             has_stderr (bool): If True, return the stderr.
 
         Returns:
             Generator[Tuple[bytes, bytes]]: A generator of tuples containing the stdout and stderr in bytes.
         """
+        stdin_chunks = iter(stdin_buffer if stdin_buffer else [])
+        param = next(stdin_chunks, None)
         while response.is_open():
             stdout = None
             stderr = None
@@ -866,10 +979,10 @@ class KubernetesMachine(object):
                 stdout = response.read_stdout()
             if has_stderr and response.peek_stderr():
                 stderr = response.read_stderr()
-            if stdin and stdin_buffer:
-                param = stdin_buffer.pop(0)
+            if stdin and param is not None:
                 response.write_stdin(param)
-                if len(stdin_buffer) <= 0:
+                param = next(stdin_chunks, None)
+                if param is None:
                     break
 
             yield stdout.encode('utf-8') if stdout else None, stderr.encode('utf-8') if stderr else None
@@ -878,7 +991,7 @@ class KubernetesMachine(object):
 
     @staticmethod
     def _exec_all(response: Any, machine_name: str, command: List, stdin: bool = False,
-                  stdin_buffer: List[Union[str, bytes]] = None, has_stderr: bool = False) -> Tuple[bytes, bytes, int]:
+                  stdin_buffer: Iterable[Union[str, bytes]] = None, has_stderr: bool = False) -> Tuple[bytes, bytes, int]:
         """Execute the command on the Kubernetes Pod, returning the full output.
 
         Args:
@@ -886,7 +999,7 @@ class KubernetesMachine(object):
             machine_name (str): The name of the device.
             command (List): The command to execute.
             stdin (bool): If True, open the stdin channel.
-            stdin_buffer (List[Union[str, bytes]]): List of command to pass to the stdin.
+            stdin_buffer (Iterable[Union[str, bytes]]): Chunks of data to pass to the stdin, consumed lazily.
             has_stderr (bool): If True, return the stderr.
 
         Returns:
@@ -897,15 +1010,17 @@ class KubernetesMachine(object):
         """
         result = {'stdout': '', 'stderr': ''}
 
+        stdin_chunks = iter(stdin_buffer if stdin_buffer else [])
+        param = next(stdin_chunks, None)
         while response.is_open():
             if response.peek_stdout():
                 result['stdout'] += response.read_stdout()
             if has_stderr and response.peek_stderr():
                 result['stderr'] += response.read_stderr()
-            if stdin and stdin_buffer:
-                param = stdin_buffer.pop(0)
+            if stdin and param is not None:
                 response.write_stdin(param)
-                if len(stdin_buffer) <= 0:
+                param = next(stdin_chunks, None)
+                if param is None:
                     break
 
         response.close()
@@ -919,13 +1034,15 @@ class KubernetesMachine(object):
 
         return result['stdout'].encode('utf-8'), result['stderr'].encode('utf-8'), exit_code
 
-    def copy_files(self, machine_api_object: client.V1Deployment, path: str, tar_data: bytes) -> None:
+    def copy_files(self, machine_api_object: client.V1Deployment, path: str,
+                   tar_data: Union[bytes, Iterable[bytes]]) -> None:
         """Copy the files contained in tar_data in the Kubernetes deployment path specified by the machine_api_object.
 
         Args:
             machine_api_object (client.V1Deployment): A Kubernetes deployment.
             path (str): The path of where copy the tar_data.
-            tar_data (bytes): The data to copy in the deployment.
+            tar_data (Union[bytes, Iterable[bytes]]): The uncompressed tar archive to copy in the deployment. It can
+                be an iterable of chunks, written to the stdin of the Pod as they are generated.
 
         Returns:
             None
@@ -935,13 +1052,15 @@ class KubernetesMachine(object):
 
         exec_output = self.exec(machine_namespace,
                                 machine_name,
-                                command=['tar', 'xvfz', '-', '-C', path],
+                                command=['tar', 'xvf', '-', '-C', path],
                                 stdin=True,
-                                stdin_buffer=[tar_data]
+                                stdin_buffer=[tar_data] if isinstance(tar_data, bytes) else tar_data
                                 )
 
+        # Consume the output until all the chunks are written
         try:
-            next(exec_output)
+            while True:
+                next(exec_output)
         except StopIteration:
             pass
 
@@ -983,6 +1102,10 @@ class KubernetesMachine(object):
     def get_machines_api_objects_by_filters(self, lab_hash: str = None, machine_name: str = None) -> List[client.V1Pod]:
         """Return the List of Kubernetes Pods.
 
+        While the informer is running (e.g., during the stats generators), Pods are read from its cache. Otherwise,
+        Pods of all the network scenarios are listed with a single cluster-wide call, falling back to a call per
+        namespace if it is not allowed.
+
         Args:
             lab_hash (str): The hash of a network scenario. If specified, return all the Kubernetes Pod in the scenario.
             machine_name (str): The name of a device. If specified, return the specified Kubernetes Pod of the scenario.
@@ -990,10 +1113,21 @@ class KubernetesMachine(object):
         Returns:
             List[client.V1Pod]: A list of Kubernetes Pods objects.
         """
+        if self.informer.is_synced:
+            return self.informer.list(namespace=lab_hash, labels={"name": machine_name} if machine_name else None)
+
         filters = ["app=kathara"]
         if machine_name:
             filters.append(f"name={machine_name}")
 
+        if not lab_hash:
+            try:
+                return self.core_client.list_pod_for_all_namespaces(label_selector=",".join(filters),
+                                                                    timeout_seconds=9999
+                                                                    ).items
+            except ApiException as e:
+                logging.debug(f"Cannot list pods cluster-wide, listing them by namespace: {str(e)}")
+
         # Get all Kathara namespaces if lab_hash is None
         namespaces = list(map(lambda x: x.metadata.name, self.kubernetes_namespace.get_all())) \
             if not lab_hash else [lab_hash]
@@ -1027,29 +1161,49 @@ class KubernetesMachine(object):
             if pod.metadata.name not in machines_stats:
                 machines_stats[pod.metadata.name] = KubernetesMachineStats(pod)
 
-        while True:
-            pods = self.get_machines_api_objects_by_filters(lab_hash=lab_hash, machine_name=machine_name)
-            if not pods:
-                yield dict()
-
-            pool_size = utils.get_pool_size()
-            items = utils.chunk_list(pods, pool_size)
-            with Pool(pool_size) as machines_pool:
-                for chunk in items:
-                    machines_pool.map(func=load_machine_stats, iterable=chunk)
-
-            machines_to_remove = []
-            for machine_id, machine_stats in machines_stats.items():
-                try:
-                    machine_stats.update()
-                except StopIteration:
-                    machines_to_remove.append(machine_id)
-                    continue
-
-            for k in machines_to_remove:
-                machines_stats.pop(k, None)
-
-            yield machines_stats
+        # The first refresh lists the Pods, so one-shot reads never start the informer. Then, Pods are read from the
+        # informer cache, so each refresh only queries the metrics API
+        informer_started = False
+        try:
+            while True:
+                pods = self.get_machines_api_objects_by_filters(lab_hash=lab_hash, machine_name=machine_name)
+                if not pods:
+                    yield dict()
+
+                pool_size = utils.get_pool_size()
+                items = utils.chunk_list(pods, pool_size)
+                with Pool(pool_size) as machines_pool:
+                    for chunk in items:
+                        machines_pool.map(func=load_machine_stats, iterable=chunk)
+
+                # The resource usage of all the Pods is read with a single call
+                usage = self.metrics_collector.collect(lab_hash=lab_hash, machine_name=machine_name) if pods else {}
+
+                pods = {pod.metadata.name: pod for pod in pods}
+                machines_to_remove = []
+                for machine_id, machine_stats in machines_stats.items():
+                    if machine_id not in pods:
+                        machines_to_remove.append(machine_id)
+                        continue
+
+                    try:
+                        machine_stats.update(machine_api_object=pods[machine_id],
+                                             usage=usage.get((machine_stats.lab_hash, machine_stats.pod_name), None))
+                    except StopIteration:
+                        machines_to_remove.append(machine_id)
+                        continue
+
+                for k in machines_to_remove:
+                    machines_stats.pop(k, None)
+
+                yield machines_stats
+
+                if not informer_started:
+                    self.informer.start()
+                    informer_started = True
+        finally:
+            if informer_started:
+                self.informer.stop()
 
     @staticmethod
     def get_deployment_name(name: str) -> str:
@@ -18,6 +18,8 @@ from ... import utils
 from ...exceptions import NotSupportedError, MachineNotFoundError, LinkNotFoundError, LabAlreadyExistsError, \
     InvocationError, LabNotFoundError
 from ...foundation.manager.IManager import IManager
+from ...foundation.manager.WipeReport import WipeReport
+from ...foundation.manager.exec_stream.MultiExecStream import MultiExecStream
 from ...model.Lab import Lab
 from ...model.Link import Link
 from ...model.Machine import Machine
@@ -353,20 +355,59 @@ class KubernetesManager(IManager):
             logging.debug("Waiting for namespace deletion...")
             self.k8s_namespace.undeploy(lab_hash=lab_hash)
 
-    def wipe(self, all_users: bool = False) -> None:
+    def wipe(self, all_users: bool = False, fast: bool = False) -> WipeReport:
         """Undeploy all the running network scenarios.
 
         Args:
             all_users (bool): If false, undeploy only the current user network scenarios. If true, undeploy the
                 running network scenarios of all users.
+            fast (bool): If True, delete the namespaces without waiting their termination.
 
         Returns:
-            None
+            Kathara.foundation.manager.WipeReport.WipeReport: The number of removed resources and the time spent.
         """
         if all_users:
             logging.warning("User-specific options have no effect on Megalos.")
 
-        self.k8s_namespace.wipe()
+        report = WipeReport(fast)
+        report.measure("namespaces", self.k8s_namespace.wipe, fast=fast)
+
+        return report
+
+    def wait_ready(self, lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                   selected_machines: Optional[Set[str]] = None, timeout: Optional[float] = None,
+                   all_users: bool = False) -> Dict[str, bool]:
+        """Wait until the startup commands of the devices of a network scenario are executed.
+
+        The startup commands are executed by the postStart hook, so a device is ready when its Pod is ready.
+
+        Args:
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            selected_machines (Optional[Set[str]]): If not None, wait only the specified devices.
+            timeout (Optional[float]): The maximum seconds to wait. If None, wait indefinitely.
+            all_users (bool): Not supported in Megalos, it is ignored.
+
+        Returns:
+            Dict[str, bool]: Keys are device names, values are True if the startup commands of the device are
+                executed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
+        """
+        check_required_single_not_none_var(lab_hash=lab_hash, lab_name=lab_name, lab=lab)
+        if lab:
+            lab_hash = lab.hash
+        elif lab_name:
+            lab_hash = utils.generate_urlsafe_hash(lab_name)
+
+        lab_hash = lab_hash.lower()
+
+        return self.k8s_machine.wait_ready(lab_hash, selected_machines=selected_machines, timeout=timeout)
 
     def connect_tty(self, machine_name: str, lab_hash: Optional[str] = None, lab_name: Optional[str] = None,
                     lab: Optional[Lab] = None, shell: str = None, logs: bool = False,
@@ -475,6 +516,55 @@ class KubernetesManager(IManager):
 
         return self.k8s_machine.exec(lab_hash, machine_name, command, stderr=True, tty=False, is_stream=stream)
 
+    def exec_many(self, machine_names: Optional[List[str]], command: Union[List[str], str],
+                  lab_hash: Optional[str] = None, lab_name: Optional[str] = None, lab: Optional[Lab] = None,
+                  wait: Union[bool, Tuple[int, float]] = False, concurrency: Optional[int] = None) -> MultiExecStream:
+        """Exec a command on multiple devices of a running network scenario in parallel.
+
+        Args:
+            machine_names (Optional[List[str]]): The names of the devices to exec the command on.
+                If None, the command is executed on all the running devices of the network scenario.
+            command (Union[List[str], str]): The command to exec on the devices.
+            lab_hash (Optional[str]): The hash of the network scenario.
+                Can be used as an alternative to lab_name and lab. If None, lab_name or lab should be set.
+            lab_name (Optional[str]): The name of the network scenario.
+                Can be used as an alternative to lab_hash and lab. If None, lab_hash or lab should be set.
+            lab (Optional[Kathara.model.Lab]): The network scenario object.
+                Can be used as an alternative to lab_hash and lab_name. If None, lab_hash or lab_name should be set.
+            wait (Union[bool, Tuple[int, float]]): If True, wait indefinitely until the end of the startup commands
+                execution before executing the command. If a tuple is provided, the first value indicates the
+                number of retries before stopping waiting and the second value indicates the time interval to wait
+                for each retry. Default is False.
+            concurrency (Optional[int]): The maximum number of concurrent executions. If None, the default pool size
+                is used.
+
+        Returns:
+            MultiExecStream: A stream of the output chunks of the devices, tagged with the device name. Exit codes
+                are available in its `exit_codes` attribute once the stream is consumed.
+
+        Raises:
+            InvocationError: If a running network scenario hash or name is not specified.
+        """
+        check_required_single_not_none_var(lab_hash=lab_hash, lab_name=lab_name, lab=lab)
+        if lab:
+            lab_hash = lab.hash
+        elif lab_name:
+            lab_hash = utils.generate_urlsafe_hash(lab_name)
+
+        lab_hash = lab_hash.lower()
+
+        if wait:
+            logging.warning("Wait option has no effect on Megalos.")
+
+        if machine_names is None:
+            machine_names = sorted(pod.metadata.labels['name'] for pod in self.get_machines_api_objects(lab_hash))
+
+        return MultiExecStream(
+            machine_names,
+            lambda machine_name: self.k8s_machine.exec(lab_hash, machine_name, command, stderr=True, tty=False),
+            concurrency=concurrency
+        )
+
     def exec_obj(self, machine: Machine, command: Union[List[str], str], wait: Union[bool, Tuple[int, float]] = False,
                  stream: bool = True) -> Union[KubernetesExecStream, Tuple[bytes, bytes, int]]:
         """Exec a command on a device in a running network scenario.
@@ -0,0 +1,87 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+from kubernetes.client.api import custom_objects_api
+from kubernetes.client.rest import ApiException
+from kubernetes.utils import parse_quantity
+
+K8S_METRICS_GROUP = "metrics.k8s.io"
+K8S_METRICS_VERSION = "v1beta1"
+K8S_METRICS_PLURAL = "pods"
+
+# Keys are (namespace, Pod name) tuples
+PodKey = Tuple[str, str]
+# (used CPU cores, used memory bytes)
+PodUsage = Tuple[float, int]
+
+
+class KubernetesMetricsCollector(object):
+    """Collect the resource usage of the Kathara Pods from the Kubernetes metrics API (`metrics.k8s.io`).
+
+    The usage of all the Pods of a network scenario (or of all the scenarios) is read with a single list call of the
+    PodMetrics objects, instead of a call for each Pod.
+
+    Attributes:
+        client (custom_objects_api.CustomObjectsApi): The Kubernetes API client used to read the metrics.
+        is_available (bool): False if the metrics API is not served by the cluster (or it is not allowed), in that case
+            it is not queried anymore.
+    """
+    __slots__ = ['client', 'is_available']
+
+    def __init__(self) -> None:
+        self.client: custom_objects_api.CustomObjectsApi = custom_objects_api.CustomObjectsApi()
+        self.is_available: bool = True
+
+    def collect(self, lab_hash: Optional[str] = None, machine_name: Optional[str] = None) -> Dict[PodKey, PodUsage]:
+        """Return the current resource usage of the Kathara Pods.
+
+        Args:
+            lab_hash (Optional[str]): The hash of a network scenario. If specified, return only the usage of the Pods
+                in the scenario.
+            machine_name (Optional[str]): The name of a device. If specified, return only the usage of its Pods.
+
+        Returns:
+            Dict[PodKey, PodUsage]: Keys are (namespace, Pod name) tuples, values are (used CPU cores, used memory
+                bytes) tuples. Empty if the metrics are not available.
+        """
+        if not self.is_available:
+            return {}
+
+        filters = ["app=kathara"]
+        if machine_name:
+            filters.append(f"name={machine_name}")
+
+        try:
+            if lab_hash:
+                pods_metrics = self.client.list_namespaced_custom_object(group=K8S_METRICS_GROUP,
+                                                                         version=K8S_METRICS_VERSION,
+                                                                         namespace=lab_hash,
+                                                                         plural=K8S_METRICS_PLURAL,
+                                                                         label_selector=",".join(filters))
+            else:
+                pods_metrics = self.client.list_cluster_custom_object(group=K8S_METRICS_GROUP,
+                                                                      version=K8S_METRICS_VERSION,
+                                                                      plural=K8S_METRICS_PLURAL,
+                                                                      label_selector=",".join(filters))
+        except ApiException as e:
+            if e.status in (403, 404):
+                logging.debug(f"Kubernetes metrics API not available: {str(e)}")
+                self.is_available = False
+            else:
+                logging.debug(f"Cannot read Kubernetes metrics: {str(e)}")
+
+            return {}
+
+        usage = {}
+        for pod_metrics in pods_metrics.get("items", None) or []:
+            cpu = 0.0
+            memory = 0
+            for container in pod_metrics.get("containers", None) or []:
+                container_usage = container.get("usage", None) or {}
+                cpu += float(parse_quantity(container_usage.get("cpu", "0")))
+                memory += int(parse_quantity(container_usage.get("memory", "0")))
+
+            metadata = pod_metrics["metadata"]
+            usage[(metadata["namespace"], metadata["name"])] = (cpu, memory)
+
+        return usage
@@ -52,18 +52,29 @@ class KubernetesNamespace(object):
         except ApiException:
             return
 
-    def wipe(self) -> None:
+    def wipe(self, fast: bool = False) -> int:
         """Delete all the Kathara Kubernetes namespaces.
 
+        Args:
+            fast (bool): If True, do not wait the termination of the namespaces, their resources are deleted in
+                background by Kubernetes.
+
         Returns:
-            None
+            int: The number of deleted namespaces.
         """
         namespaces = self.get_all()
 
         for namespace in namespaces:
-            self.client.delete_namespace(namespace.metadata.name)
+            if fast:
+                self.client.delete_namespace(namespace.metadata.name, propagation_policy="Background",
+                                             grace_period_seconds=0)
+            else:
+                self.client.delete_namespace(namespace.metadata.name)
+
+        if not fast:
+            self._wait_namespaces_deletion(label_selector="app=kathara")
 
-        self._wait_namespaces_deletion(label_selector="app=kathara")
+        return len(namespaces)
 
     def get_all(self) -> Iterable[client.V1Namespace]:
         """Return an Iterable containing all the Kubernetes namespaces related to Kathara.
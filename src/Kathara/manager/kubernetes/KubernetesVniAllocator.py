@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+MAX_K8S_LINK_NUMBER = (1 << 24) - 10
+
+# Keys are (namespace, collision domain name) tuples
+NetworkKey = Tuple[Optional[str], Optional[str]]
+
+
+class KubernetesVniAllocator(object):
+    """Allocate unique VXLAN Network Identifiers (VNIs) to the Kubernetes networks, within the process.
+
+    The first candidate VNI of a collision domain is derived from the SHA-256 of its name (computed once per name),
+    collisions are solved probing the following VNIs. The allocator is shared by the threads deploying the networks:
+    the set of used VNIs is protected by a lock, so no server process is needed to share it.
+
+    Used VNIs are read from the deployed network definitions. Definitions are indexed by namespace and collision
+    domain name, and each one is parsed only when its resource version changes.
+
+    Attributes:
+        seed (str): The seed prepended to the collision domain names before hashing them.
+    """
+    __slots__ = ['seed', '_lock', '_networks', '_used', '_allocated', '_hashes']
+
+    def __init__(self, seed: str) -> None:
+        self.seed: str = seed
+
+        self._lock: threading.Lock = threading.Lock()
+        # Values are (resource version, VNI, network definition) tuples
+        self._networks: Dict[NetworkKey, Tuple[Optional[str], Optional[int], Any]] = {}
+        self._used: Set[int] = set()
+        # VNIs allocated by this process that are not deployed yet
+        self._allocated: Set[int] = set()
+        self._hashes: Dict[str, int] = {}
+
+    def sync(self, networks: Iterable[Any]) -> None:
+        """Rebuild the view of the used VNIs from the deployed network definitions.
+
+        VNIs allocated by this process are kept reserved until their network is deployed or they are released.
+
+        Args:
+            networks (Iterable[Any]): The deployed Kubernetes network definitions.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            cached_networks = self._networks
+
+        networks_index = {}
+        for network in networks:
+            metadata = network["metadata"]
+            key = (metadata.get("namespace", None), (metadata.get("labels", None) or {}).get("name", None))
+            version = metadata.get("resourceVersion", None)
+
+            cached = cached_networks.get(key, None)
+            if version is not None and cached is not None and cached[0] == version:
+                network_id = cached[1]
+            else:
+                network_id = self.parse_network_id(network)
+            networks_index[key] = (version, network_id, network)
+
+        with self._lock:
+            self._networks = networks_index
+            deployed = {network_id for (_, network_id, _) in networks_index.values() if network_id is not None}
+            self._allocated -= deployed
+            self._used = deployed | self._allocated
+
+    def get_network(self, namespace: str, link_name: str) -> Optional[Any]:
+        """Return the deployed network definition of a collision domain, according to the last sync.
+
+        Args:
+            namespace (str): The namespace of the network scenario.
+            link_name (str): The name of the collision domain.
+
+        Returns:
+            Optional[Any]: The Kubernetes network definition, None if the network is not deployed.
+        """
+        with self._lock:
+            cached = self._networks.get((namespace, link_name), None)
+
+        return cached[2] if cached else None
+
+    def get_used_ids(self) -> Set[int]:
+        """Return the VNIs that cannot be allocated.
+
+        Returns:
+            Set[int]: The deployed VNIs and the ones allocated by this process.
+        """
+        with self._lock:
+            return set(self._used)
+
+    def allocate(self, name: str) -> int:
+        """Allocate a unique VNI to a collision domain.
+
+        Args:
+            name (str): The name of the collision domain.
+
+        Returns:
+            int: The allocated VNI.
+        """
+        network_id = self.get_candidate(name)
+        with self._lock:
+            while network_id in self._used:
+                network_id = (network_id + 1) % MAX_K8S_LINK_NUMBER
+
+            self._used.add(network_id)
+            self._allocated.add(network_id)
+
+        return network_id
+
+    def release(self, network_id: int) -> None:
+        """Release a VNI allocated by this process, e.g., because its network has not been deployed.
+
+        Args:
+            network_id (int): The VNI to release.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if network_id in self._allocated:
+                self._allocated.discard(network_id)
+                self._used.discard(network_id)
+
+    def get_candidate(self, name: str, offset: int = 0) -> int:
+        """Return a candidate VNI for a collision domain.
+
+        Args:
+            name (str): The name of the collision domain.
+            offset (int): The probing offset, the first candidate has offset 0.
+
+        Returns:
+            int: The candidate VNI.
+        """
+        name_hash = self._hashes.get(name, None)
+        if name_hash is None:
+            name_hash = int(hashlib.sha256((self.seed + name).encode('utf-8')).hexdigest(), 16)
+            self._hashes[name] = name_hash
+
+        return (offset + name_hash) % MAX_K8S_LINK_NUMBER
+
+    @staticmethod
+    def parse_network_id(network: Any) -> Optional[int]:
+        """Return the VNI of a Kubernetes network, reading its definition.
+
+        Args:
+            network (Any): A Kubernetes network definition.
+
+        Returns:
+            Optional[int]: The VNI of the network, None if the definition cannot be parsed.
+        """
+        try:
+            return int(json.loads(network['spec']['config'])['vxlanId'])
+        except (KeyError, TypeError, ValueError) as e:
+            logging.debug(f"Cannot read the VNI of network `{network['metadata']['name']}`: {str(e)}")
+            return None
@@ -1,9 +1,11 @@
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from kubernetes.client import V1Pod
+from kubernetes.utils import parse_quantity
 
 from ....foundation.manager.stats.IMachineStats import IMachineStats
+from ....utils import human_readable_bytes
 
 
 class KubernetesMachineStats(IMachineStats):
@@ -18,8 +20,12 @@ class KubernetesMachineStats(IMachineStats):
         interfaces (str): The interfaces connected to this Kubernetes Pod.
         status (Optional[str]): The status of the Kubernetes Pod.
         assigned_node (Optional[str]): The cluster node assigned to this Kubernetes Pod.
+        cpu_usage (str): The cpu usage of the Kubernetes Pod, as a percentage of a CPU core.
+        mem_usage (str): The memory usage of the Kubernetes Pod.
+        mem_percent (str): The memory usage of the Kubernetes Pod as a percentage of its limit.
     """
-    __slots__ = ['machine_api_object', 'lab_hash', 'name', 'pod_name', 'image', 'status', 'assigned_node']
+    __slots__ = ['machine_api_object', 'lab_hash', 'name', 'pod_name', 'image', 'status', 'assigned_node',
+                 'interfaces', 'cpu_usage', 'mem_usage', 'mem_percent']
 
     def __init__(self, machine_api_object: V1Pod):
         self.machine_api_object: V1Pod = machine_api_object
@@ -41,18 +47,53 @@ class KubernetesMachineStats(IMachineStats):
         # Dynamic Information
         self.status: Optional[str] = None
         self.assigned_node: Optional[str] = None
+        self.cpu_usage: str = "-"
+        self.mem_usage: str = "- / -"
+        self.mem_percent: str = "-"
 
         self.update()
 
-    def update(self) -> None:
+    def update(self, machine_api_object: Optional[V1Pod] = None, usage: Optional[Tuple[float, int]] = None) -> None:
         """Update dynamic statistics with the current ones.
 
+        Args:
+            machine_api_object (Optional[V1Pod]): An updated Kubernetes Pod object. If None, the current one is used.
+            usage (Optional[Tuple[float, int]]): The current (used CPU cores, used memory bytes) of the Pod, read
+                from the Kubernetes metrics API. If None, the resource usage is not updated.
+
         Returns:
             None
         """
+        if machine_api_object is not None:
+            self.machine_api_object = machine_api_object
+
         self.status = self._get_detailed_machine_status(self.machine_api_object)
         self.assigned_node = self.machine_api_object.spec.node_name
 
+        if usage is not None:
+            (cpu, memory) = usage
+            self.cpu_usage = f"{(cpu * 100):.2f}%"
+
+            limit = self._get_memory_limit(self.machine_api_object)
+            self.mem_usage = human_readable_bytes(memory) + " / " + (human_readable_bytes(limit) if limit else "-")
+            self.mem_percent = f"{((memory / limit) * 100):.2f} %" if limit else "-"
+
+    @staticmethod
+    def _get_memory_limit(pod_api_object: V1Pod) -> Optional[int]:
+        """Return the memory limit of the Kubernetes Pod.
+
+        Args:
+            pod_api_object (client.V1Pod): A Kubernetes Pod.
+
+        Returns:
+            Optional[int]: The memory limit in bytes, None if the Pod has no memory limit.
+        """
+        try:
+            limits = pod_api_object.spec.containers[0].resources.limits
+            return int(parse_quantity(limits["memory"])) if limits and "memory" in limits else None
+        except (AttributeError, IndexError, TypeError, ValueError):
+            return None
+
     @staticmethod
     def _get_detailed_machine_status(pod_api_object: V1Pod) -> str:
         """Return a string containing the Kubernetes Pod status.
@@ -93,6 +134,9 @@ class KubernetesMachineStats(IMachineStats):
             "image": self.image,
             "status": self.status,
             "assigned_node": self.assigned_node,
+            "cpu_usage": self.cpu_usage,
+            "mem_usage": self.mem_usage,
+            "mem_percent": self.mem_percent,
             "interfaces": self.interfaces,
         }
 
@@ -110,7 +154,9 @@ class KubernetesMachineStats(IMachineStats):
         formatted_stats += f"Pod Name: {self.pod_name}\n"
         formatted_stats += f"Image: {self.image}\n"
         formatted_stats += f"Status: {self.status}\n"
-        formatted_stats += f"Assigned Node: {self.assigned_node}"
+        formatted_stats += f"Assigned Node: {self.assigned_node}\n"
+        formatted_stats += f"CPU Usage: {self.cpu_usage}\n"
+        formatted_stats += f"Memory Usage: {self.mem_usage}\n"
         formatted_stats += f"Interfaces: {self.interfaces}\n"
 
         return formatted_stats
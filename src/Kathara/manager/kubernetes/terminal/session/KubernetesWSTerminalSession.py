@@ -1,54 +1,85 @@
 import json
+import logging
+import os
+import threading
 from typing import Any, Optional
 
 from kubernetes.stream.ws_client import RESIZE_CHANNEL
 
 from .....foundation.manager.terminal.core.ITerminalSession import ITerminalSession
 
+# Maximum seconds the output pump waits for new frames before checking if the session is closed
+PUMP_TIMEOUT: float = 1.0
+
 
 class KubernetesWSTerminalSession(ITerminalSession):
+    """Terminal session over the WebSocket of a Kubernetes exec.
+
+    The WebSocket cannot be polled directly, since complete frames may already be buffered by the client (or by the
+    TLS layer). A background thread blocks on the WebSocket and pumps the output of the exec, stdout and stderr in
+    arrival order, into a pipe whose read end is the session file descriptor.
+
+    Attributes:
+        _read_fd (int): Read end of the output pipe.
+        _write_fd (int): Write end of the output pipe, closed by the pump when the exec output ends.
+    """
+    __slots__ = ['_read_fd', '_write_fd']
+
     def __init__(self, handler: Any, client: Any = None) -> None:
         super().__init__(handler, client)
 
+        (self._read_fd, self._write_fd) = os.pipe()
+        threading.Thread(target=self._pump_output, daemon=True).start()
+
     def fileno(self) -> Optional[int]:
         """Return an OS-level file descriptor for the session, if available.
 
         Returns:
             Optional[int]: The file descriptor, or None if the session cannot be polled via fd-based readiness APIs.
         """
-        return None
+        return self._read_fd
 
     def read(self, n: int = 4096) -> bytes:
-        """Read up to n bytes from the session output stream.
+        """Read up to n bytes from the session output stream, blocking until some output is available.
 
         Args:
             n (int): Maximum number of bytes to read.
 
         Returns:
             bytes: Data read from the session.
+
+        Raises:
+            EOFError: If the exec output is ended.
         """
         if self._closed:
             return b""
 
-        if not self._handler.is_open():
-            raise Exception
+        data = os.read(self._read_fd, n)
+        if not data:
+            raise EOFError("The exec output is ended.")
 
-        data = None
-        try:
-            if self._handler.peek_stdout():
-                data = self._handler.read_stdout()
-            elif self._handler.peek_stderr():
-                data = self._handler.read_stderr()
-        except Exception:
-            return b""
+        return data
 
-        if data is None:
-            return b""
+    def _pump_output(self) -> None:
+        """Copy the output of the exec into the output pipe, until the WebSocket or the session is closed.
 
+        Returns:
+            None
+        """
         try:
-            return data.encode("utf-8")
-        except Exception:
-            return b""
+            while not self._closed and self._handler.is_open():
+                self._handler.update(timeout=PUMP_TIMEOUT)
+                data = self._handler.read_all()
+                if not data:
+                    continue
+
+                data = memoryview(data.encode("utf-8") if isinstance(data, str) else data)
+                while data:
+                    data = data[os.write(self._write_fd, data):]
+        except Exception as e:
+            logging.debug(f"Terminal output pump stopped: {str(e)}")
+        finally:
+            os.close(self._write_fd)
 
     def write(self, data: bytes) -> None:
         """Write bytes to the session input stream.
@@ -97,3 +128,4 @@ class KubernetesWSTerminalSession(ITerminalSession):
 
         self._closed = True
         self._handler.close()
+        os.close(self._read_fd)
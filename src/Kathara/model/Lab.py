@@ -37,11 +37,14 @@ class Lab(LabFilesystemMixin):
         global_machine_metadata (Dict[str, Any]): Metadata to apply to all the devices of the network scenario at
             the startup.
         has_dependencies (bool): True if there are dependencies among the devices boot.
+        dependencies (Dict[str, List[str]]): The boot dependencies among the devices. Keys are device names, values
+            are the names of the devices that must be started before them.
         shared_path (str): Path to shared folder of the network scenario, if the network scenario has a real OS path.
         fs (fs.FS): The filesystem of the network scenario. Contains files and configurations associated to it.
     """
     __slots__ = ['_name', 'description', 'version', 'author', 'email', 'web', 'hash',
-                 'machines', 'links', 'general_options', 'global_machine_metadata', 'has_dependencies', 'shared_path']
+                 'machines', 'links', 'general_options', 'global_machine_metadata', 'has_dependencies', 'dependencies',
+                 'shared_path']
 
     def __init__(self, name: Optional[str], path: Optional[str] = None) -> None:
         """Create a new instance of a Kathara network scenario.
@@ -70,6 +73,7 @@ class Lab(LabFilesystemMixin):
         self.global_machine_metadata: Dict[str, Any] = {}
 
         self.has_dependencies: bool = False
+        self.dependencies: Dict[str, List[str]] = {}
 
         self.shared_path: Optional[str] = None
 
@@ -233,25 +237,27 @@ class Lab(LabFilesystemMixin):
 
         return selected_links
 
-    def apply_dependencies(self, dependencies: List[str]) -> None:
+    def apply_dependencies(self, dependencies: List[str], graph: Optional[Dict[str, List[str]]] = None) -> None:
         """Order the list of devices of the network scenario to satisfy the boot dependencies.
 
         Args:
             dependencies (List[str]): If not empty, dependencies are applied.
+            graph (Optional[Dict[str, List[str]]]): The boot dependencies among the devices. Keys are device names,
+                values are the names of the devices that must be started before them. If None, each device in
+                `dependencies` depends on the previous one, so they are started sequentially.
 
         Returns:
             None
         """
+        positions = {name: position for position, name in enumerate(dependencies, start=1)}
 
-        def dep_sort(item: str) -> int:
-            try:
-                return dependencies.index(item) + 1
-            except ValueError:
-                return 0
-
-        self.machines = collections.OrderedDict(sorted(self.machines.items(), key=lambda t: dep_sort(t[0])))
+        self.machines = collections.OrderedDict(sorted(self.machines.items(), key=lambda t: positions.get(t[0], 0)))
         self.has_dependencies = True
 
+        if graph is None:
+            graph = {name: [previous] for previous, name in zip(dependencies, dependencies[1:])}
+        self.dependencies = graph
+
     def get_machine(self, name: str) -> 'MachinePackage.Machine':
         """Get the specified device.
 
@@ -2,16 +2,10 @@ import collections
 import logging
 import os
 import re
-from io import BytesIO
-from typing import Dict, Any, Tuple, Optional, List, OrderedDict, TextIO, Union, BinaryIO
+from typing import Dict, Any, Tuple, Optional, List, OrderedDict, TextIO, Union, BinaryIO, Iterator
 
-# noinspection PyUnresolvedReferences
-from fs._bulk import Copier
 from fs.base import FS
-from fs.copy import copy_fs, copy_file
-from fs.tarfs import WriteTarFS
-# noinspection PyUnresolvedReferences
-from fs.tempfs import TempFS
+from fs.errors import FSError
 from fs.walk import Walker
 
 from . import Interface as InterfacePackage
@@ -21,6 +15,7 @@ from .. import utils
 from ..exceptions import NonSequentialMachineInterfaceError, MachineOptionError, MachineCollisionDomainError, \
     MountDeniedError
 from ..foundation.model.FilesystemMixin import FilesystemMixin
+from ..foundation.model.PackCache import PackCache
 from ..setting.Setting import Setting
 from ..trdparty.strtobool.strtobool import strtobool
 
@@ -378,44 +373,99 @@ class Machine(FilesystemMixin):
         logging.debug("`%s` interfaces are %s." % (self.name, sorted_interfaces))
         self.interfaces = collections.OrderedDict(sorted_interfaces)
 
-    def pack_data(self) -> Optional[bytes]:
+    def pack_data(self, compression: Optional[str] = "gz", shared: bool = True) -> Optional[bytes]:
         """Pack machine data into a .tar.gz file and returns the tar content as a byte array.
 
         While packing files, it also applies the win2linux patch in order to remove UTF-8 BOM.
 
+        Args:
+            compression (Optional[str]): "gz" to compress the archive with gzip, None for a plain tar archive.
+            shared (bool): If True, the shared startup and shutdown files of the network scenario are packed.
+
         Returns:
             bytes: the tar content.
         """
-        is_empty = True
-
-        file = BytesIO()
-        with WriteTarFS(file, compression="gz") as tar:
-            hostlab_tar_dir = tar.makedir('hostlab')
-            machine_tar_dir = hostlab_tar_dir.makedir(self.name)
-            if self.fs and not self.fs.isempty(''):
-                copy_fs(
-                    self.fs,
-                    machine_tar_dir,
-                    on_copy=lambda src_fs, src_path, dst_fs, dst_path: utils.convert_win_2_linux(
-                        dst_fs.getsyspath(dst_path), write=True
-                    ),
-                    walker=Walker(exclude=utils.EXCLUDED_FILES)
-                )
+        tar_stream = self.pack_data_stream(compression=compression, shared=shared)
 
-                is_empty = False
+        return b"".join(tar_stream) if tar_stream is not None else None
 
-            for name in [f"{self.name}.startup", f"{self.name}.shutdown", "shared.startup", "shared.shutdown"]:
-                if self.lab.fs.exists(name):
-                    copy_file(self.lab.fs, name, hostlab_tar_dir, name)
-                    utils.convert_win_2_linux(hostlab_tar_dir.getsyspath(name), write=True)
-                    is_empty = False
+    def pack_data_stream(self, compression: Optional[str] = None, shared: bool = True) -> Optional[Iterator[bytes]]:
+        """Pack machine data into a tar archive, returning an iterator of chunks of the archive.
 
-        if not is_empty:
-            file.seek(0)
-            return file.read()
+        Files are read while the archive is consumed, so the whole archive is never kept in memory.
+        Archives are cached by content, so unchanged devices reuse the archive built by a previous deploy. Archives
+        whose files exceed the `pack_cache_max_entry_size` setting (or all of them, if `pack_cache` is disabled) are
+        not cached.
 
-        # If no machine files are found, return None.
-        return None
+        Args:
+            compression (Optional[str]): "gz" to compress the archive with gzip, None for a plain tar archive.
+            shared (bool): If True, the shared startup and shutdown files of the network scenario are packed.
+
+        Returns:
+            Optional[Iterator[bytes]]: An iterator of chunks of the archive. None if the device has no files.
+        """
+        lab_files = [name for name in self._get_lab_files_names(shared=shared) if self.lab.fs.exists(name)]
+        if (not self.fs or self.fs.isempty('')) and not lab_files:
+            # If no machine files are found, return None.
+            return None
+
+        files, dirs = self._get_pack_entries(lab_files)
+
+        pack_cache = PackCache.get_instance()
+        setting = Setting.get_instance()
+        max_entry_size = setting.pack_cache_max_entry_size
+        key = None
+        try:
+            # Large archives are not cached, so their files are neither hashed nor copied on disk
+            if setting.pack_cache and \
+                    sum(file_fs.getsize(path) for (_, file_fs, path) in files) <= max_entry_size:
+                key = pack_cache.get_key(self.lab.hash, self.name, files, dirs, compression=compression)
+                tar_stream = pack_cache.get_stream(key)
+                if tar_stream is not None:
+                    return tar_stream
+        except (OSError, FSError) as e:
+            logging.debug(f"Cannot compute pack cache key of device `{self.name}`: {str(e)}")
+            key = None
+
+        tar_stream = utils.stream_tar(utils.pack_fs_entries_for_tar(dirs, files), compression=compression)
+
+        return pack_cache.put_stream(self.lab.hash, key, tar_stream, max_entry_size=max_entry_size) \
+            if key is not None else tar_stream
+
+    def _get_lab_files_names(self, shared: bool = True) -> List[str]:
+        """Return the names of the network scenario files copied in the device.
+
+        Args:
+            shared (bool): If True, the shared startup and shutdown files are included.
+
+        Returns:
+            List[str]: The names of the startup and shutdown files of the device and, if requested, the shared ones.
+        """
+        names = [f"{self.name}.startup", f"{self.name}.shutdown"]
+        if shared:
+            names.extend(["shared.startup", "shared.shutdown"])
+
+        return names
+
+    def _get_pack_entries(self, lab_files: List[str]) -> Tuple[List[Tuple[str, FS, str]], List[str]]:
+        """Return the files and the directories packed in the device archive.
+
+        Args:
+            lab_files (List[str]): The names of the existing network scenario files copied in the device.
+
+        Returns:
+            Tuple[List[Tuple[str, FS, str]], List[str]]: The files, as tuples composed by the path in the archive,
+                the filesystem containing the file and its path in the filesystem, and the paths of the directories
+                in the archive (each one after its parent).
+        """
+        files = [(f"hostlab/{name}", self.lab.fs, name) for name in lab_files]
+        dirs = ["hostlab", f"hostlab/{self.name}"]
+        if self.fs and not self.fs.isempty(''):
+            walker = Walker(exclude=utils.EXCLUDED_FILES)
+            dirs.extend(sorted(f"hostlab/{self.name}{path}" for path in walker.dirs(self.fs)))
+            files.extend((f"hostlab/{self.name}{path}", self.fs, path) for path in walker.files(self.fs))
+
+        return files, dirs
 
     def is_privileged(self) -> bool:
         """Return True if the device is privileged, else return False.
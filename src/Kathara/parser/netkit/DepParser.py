@@ -2,10 +2,14 @@ import logging
 import mmap
 import os
 import re
-from typing import List, Optional
+from typing import List, Optional, Dict
 
+from .LabCache import LabCache
 from ...exceptions import MachineDependencyError
-from ...trdparty.depgen import depgen
+
+# E.g. MACHINE: MACHINE1 MACHINE2 MACHINE3
+# Or MACHINE:MACHINE1 MACHINE2 MACHINE3
+DEPENDENCY_RE = re.compile(r"^(?P<key>\w+):\s?(?P<deps>(\w+ ?)+)$")
 
 
 class DepParser(object):
@@ -23,6 +27,173 @@ class DepParser(object):
             Optional[List[str]]: A List of string containing the names of the device ordered considering the
                 dependencies.
 
+        Raises:
+            IOError: If there is an error while opening lab.dep file.
+            SyntaxError: If there is a syntax error in lab.dep file.
+            MachineDependencyError: If there is a Machines dependency loop in lab.dep file.
+        """
+        dependencies = DepParser.parse_graph(path)
+
+        return DepParser.order(dependencies) if dependencies else None
+
+    @staticmethod
+    def order(dependencies: Dict[str, List[str]]) -> List[str]:
+        """Return the names of the devices in the dependency graph, ordered considering the dependencies.
+
+        Args:
+            dependencies (Dict[str, List[str]]): Keys are device names, values are the names of the devices they
+                depend on.
+
+        Returns:
+            List[str]: A List of string containing the names of the device ordered considering the dependencies.
+        """
+        return [name for level in DepParser.levels(dependencies) for name in level]
+
+    @staticmethod
+    def levels(dependencies: Dict[str, List[str]]) -> List[List[str]]:
+        """Group the devices in the dependency graph by level, using a topological sort (Kahn's algorithm).
+
+        Devices in the same level only depend on devices of the previous levels, so they can be started in parallel.
+        Inside each level, devices keep the order in which they first appear in the dependency graph.
+
+        Args:
+            dependencies (Dict[str, List[str]]): Keys are device names, values are the names of the devices they
+                depend on.
+
+        Returns:
+            List[List[str]]: The i-th element contains the names of the devices of level i.
+
+        Raises:
+            MachineDependencyError: If there is a dependency loop among the devices.
+        """
+        # Assign an index to each device, following the order of first appearance
+        positions = {}
+        for (name, deps) in dependencies.items():
+            positions.setdefault(name, len(positions))
+            for dep in deps:
+                positions.setdefault(dep, len(positions))
+
+        pending = dict.fromkeys(positions, 0)
+        dependents = {name: [] for name in positions}
+        for (name, deps) in dependencies.items():
+            for dep in set(deps):
+                pending[name] += 1
+                dependents[dep].append(name)
+
+        levels = []
+        current_level = [name for name, count in pending.items() if count == 0]
+        while current_level:
+            levels.append(current_level)
+
+            next_level = []
+            for name in current_level:
+                for dependent in dependents[name]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        next_level.append(dependent)
+            current_level = sorted(next_level, key=lambda x: positions[x])
+
+        if sum(len(level) for level in levels) != len(positions):
+            loops = DepParser.find_loops(dependencies)
+            raise MachineDependencyError(
+                "Machines' dependency loop in lab.dep file: %s." %
+                "; ".join(" -> ".join(loop + [loop[0]]) for loop in loops)
+            )
+
+        return levels
+
+    @staticmethod
+    def find_loops(dependencies: Dict[str, List[str]]) -> List[List[str]]:
+        """Find the dependency loops in the dependency graph, using Tarjan's strongly connected components algorithm.
+
+        Args:
+            dependencies (Dict[str, List[str]]): Keys are device names, values are the names of the devices they
+                depend on.
+
+        Returns:
+            List[List[str]]: A list of loops, each one containing the names of the devices that form it in
+                dependency order (each device depends on the next one, and the last one on the first one).
+        """
+        index = {}
+        low_link = {}
+        on_stack = set()
+        stack = []
+        components = []
+
+        # Iterative version of Tarjan's algorithm, to avoid hitting the recursion limit on large graphs
+        for root in dependencies.keys():
+            if root in index:
+                continue
+
+            work = [(root, iter(dependencies.get(root, [])))]
+            index[root] = low_link[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                (node, successors) = work[-1]
+                pushed = False
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = low_link[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(dependencies.get(successor, []))))
+                        pushed = True
+                        break
+                    elif successor in on_stack:
+                        low_link[node] = min(low_link[node], index[successor])
+
+                if pushed:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+
+                if low_link[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        loops = []
+        for component in components:
+            members = set(component)
+            start = min(component, key=lambda x: index[x])
+            if len(component) == 1 and start not in dependencies.get(start, []):
+                continue
+
+            # Walk the component to extract a loop passing through its first visited device
+            loop = [start]
+            visited = {start: 0}
+            node = start
+            while True:
+                node = next(dep for dep in dependencies.get(node, []) if dep in members)
+                if node in visited:
+                    loop = loop[visited[node]:]
+                    break
+                visited[node] = len(loop)
+                loop.append(node)
+            loops.append(loop)
+
+        return loops
+
+    @staticmethod
+    def parse_graph(path: str) -> Optional[Dict[str, List[str]]]:
+        """Parse the lab.dep file and return the dependency graph among the devices.
+
+        Args:
+            path (str): The path to the lab.dep file.
+
+        Returns:
+            Optional[Dict[str, List[str]]]: Keys are device names, values are the names of the devices they depend on.
+
         Raises:
             IOError: If there is an error while opening lab.dep file.
             SyntaxError: If there is a syntax error in lab.dep file.
@@ -37,6 +208,18 @@ class DepParser(object):
             logging.warning("lab.dep file is empty. Ignoring...")
             return None
 
+        return LabCache.get_instance().load("dep", path, ['lab.dep'], lambda: DepParser._parse_graph(lab_dep_path))
+
+    @staticmethod
+    def _parse_graph(lab_dep_path: str) -> Dict[str, List[str]]:
+        """Parse the lab.dep file and return the dependency graph among the devices, without looking up the lab cache.
+
+        Args:
+            lab_dep_path (str): The path of the lab.dep file.
+
+        Returns:
+            Dict[str, List[str]]: Keys are device names, values are the names of the devices they depend on.
+        """
         dependencies = {}
 
         # Reads lab.dep in memory, so it is faster.
@@ -51,11 +234,7 @@ class DepParser(object):
         while line:
             line = line.strip()
             if line and not line.startswith('#'):
-                # E.g. MACHINE: MACHINE1 MACHINE2 MACHINE3
-                # Or MACHINE:MACHINE1 MACHINE2 MACHINE3
-                matches = re.search(r"^(?P<key>\w+):\s?(?P<deps>(\w+ ?)+)$",
-                                    line
-                                    )
+                matches = DEPENDENCY_RE.search(line)
 
                 if matches:
                     key = matches.group("key").strip()
@@ -69,7 +248,7 @@ class DepParser(object):
             line_number += 1
             line = dep_mem_file.readline().decode('utf-8')
 
-        if depgen.has_loop(dependencies):
-            raise MachineDependencyError("Machines' dependency loop in lab.dep file.")
+        # Raises a MachineDependencyError if there is a loop
+        DepParser.levels(dependencies)
 
-        return depgen.flatten(dependencies)
+        return dependencies
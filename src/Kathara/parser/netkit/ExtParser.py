@@ -4,6 +4,7 @@ import os
 import re
 from typing import Dict, List, Optional
 
+from .LabCache import LabCache
 from ...model.ExternalLink import ExternalLink
 
 
@@ -36,6 +37,29 @@ class ExtParser(object):
             logging.warning("lab.ext file is empty. Ignoring...")
             return None
 
+        return LabCache.get_instance().load(
+            "ext", path, ['lab.ext'], lambda: ExtParser._parse(lab_ext_path),
+            encode=lambda external_links: {
+                link_name: [[external_link.interface, external_link.vlan] for external_link in link_external_links]
+                for link_name, link_external_links in external_links.items()
+            },
+            decode=lambda data: {
+                link_name: [ExternalLink(interface, vlan) for interface, vlan in link_external_links]
+                for link_name, link_external_links in data.items()
+            }
+        )
+
+    @staticmethod
+    def _parse(lab_ext_path: str) -> Dict[str, List[ExternalLink]]:
+        """Parse the lab.ext file, without looking up the lab cache.
+
+        Args:
+            lab_ext_path (str): The path of the lab.ext file.
+
+        Returns:
+            Dict[str, List[ExternalLink]]: Keys are name of collision domain and values are List of ExternalLink
+                attached to that interface.
+        """
         # Reads lab.ext in memory so it is faster.
         try:
             with open(lab_ext_path, 'r') as ext_file:
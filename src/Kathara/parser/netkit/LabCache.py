@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ... import utils
+from ...exceptions import InstantiationError
+
+LAB_CACHE_PATH: str = os.path.join(utils.get_current_user_home(), ".cache", "kathara", "labs")
+LAB_CACHE_MAX_SIZE: int = 128 * 1024 * 1024
+
+# Changing the parsers or the model classes must change the version, otherwise stale entries are loaded
+LAB_CACHE_VERSION: str = "2"
+
+CHUNK_SIZE: int = 1024 * 1024
+
+# Files modified in the last seconds can change again without changing their modification time (that has the
+# granularity of the filesystem clock), so their content is always checked
+RACY_INTERVAL: float = 2.0
+
+
+class LabCache(object):
+    """Persistent cache of the results of the parsers of the network scenario files.
+
+    Each entry is a JSON file storing the result of a parser, converted in plain data by the parser itself (e.g., the
+    devices, collision domains and metas of the `Lab` built from lab.conf), together with the size, the modification
+    time and the digest of the parsed files. Entries never contain code or objects, so a tampered entry can only
+    describe a network scenario. An entry is reused while the size and modification time
+    of the files are unchanged. If they change, the files are hashed and the entry is reused only if their content is
+    unchanged. Entries of `Lab` objects also store the sub-directories of the network scenario, since they determine
+    which devices have a folder.
+
+    Entries are evicted in least recently used order when their total size exceeds `max_size`.
+
+    Attributes:
+        path (str): The directory where the cache is stored.
+        max_size (int): The maximum size (in bytes) of the cached entries.
+    """
+    __slots__ = ['path', 'max_size']
+
+    __instance: LabCache = None
+
+    @staticmethod
+    def get_instance() -> LabCache:
+        """Get an instance of the LabCache.
+
+        Returns:
+            LabCache: An instance of the class.
+
+        Raises:
+            InstantiationError: If two instances of the class are created.
+        """
+        if LabCache.__instance is None:
+            LabCache()
+
+        return LabCache.__instance
+
+    def __init__(self, path: str = LAB_CACHE_PATH, max_size: int = LAB_CACHE_MAX_SIZE) -> None:
+        if LabCache.__instance is not None:
+            raise InstantiationError("This class is a singleton!")
+        else:
+            self.path: str = path
+            self.max_size: int = max_size
+
+            LabCache.__instance = self
+
+    def load(self, kind: str, lab_path: str, file_names: List[str], parse: Callable[[], Any],
+             encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None, track_dirs: bool = False) -> Any:
+        """Return the result of a parser of the network scenario files, parsing them only if they changed.
+
+        Args:
+            kind (str): The name of the parser, it identifies the entry together with the path and the files.
+            lab_path (str): The path of the network scenario directory.
+            file_names (List[str]): The names of the files read by the parser, relative to lab_path.
+            parse (Callable[[], Any]): The parser, called if there is no valid entry. Exceptions are propagated and
+                nothing is cached.
+            encode (Callable[[Any], Any]): Convert the result of the parser in JSON serializable data. If None, the
+                result is stored as is.
+            decode (Callable[[Any], Any]): Rebuild the result of the parser from the data returned by encode. If None,
+                the data is returned as is.
+            track_dirs (bool): If True, the entry is valid only if the sub-directories of lab_path are unchanged.
+
+        Returns:
+            Any: The result of the parser.
+        """
+        entry_path = self._get_entry_path(kind, lab_path, file_names)
+        try:
+            stats = [os.stat(os.path.join(lab_path, name)) for name in file_names]
+            dirs = self._get_dirs(lab_path) if track_dirs else None
+        except OSError:
+            return parse()
+
+        entry = self._read_entry(entry_path)
+        if entry is not None:
+            (header, data) = entry
+            digests = self._validate(header, lab_path, file_names, stats, dirs)
+            if digests is not None:
+                try:
+                    value = decode(data) if decode else data
+                except Exception as e:
+                    logging.debug(f"Cannot load `{kind}` of `{lab_path}` from lab cache: {str(e)}")
+                else:
+                    logging.debug(f"`{kind}` of `{lab_path}` found in lab cache.")
+                    if digests != header['files']:
+                        self._write_entry(entry_path, dict(header, files=digests), data)
+                    else:
+                        self._touch(entry_path)
+                    return value
+
+        # Files are fingerprinted before parsing, so changes made while parsing invalidate the entry
+        digests = [
+            [name, stat.st_size, self._get_stable_mtime(stat), self._get_file_digest(os.path.join(lab_path, name))]
+            for name, stat in zip(file_names, stats)
+        ]
+        value = parse()
+
+        try:
+            data = encode(value) if encode else value
+        except Exception as e:
+            logging.debug(f"Cannot store `{kind}` of `{lab_path}` in lab cache: {str(e)}")
+            return value
+
+        self._write_entry(entry_path, {'version': LAB_CACHE_VERSION, 'files': digests, 'dirs': dirs}, data)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all the cached entries.
+
+        Returns:
+            None
+        """
+        if os.path.isdir(self.path):
+            for entry in os.scandir(self.path):
+                if entry.is_file():
+                    os.remove(entry.path)
+
+    def _validate(self, header: Dict[str, Any], lab_path: str, file_names: List[str], stats: List[os.stat_result],
+                  dirs: Optional[List[str]]) -> Optional[List[List]]:
+        """Check if an entry matches the current state of the network scenario files.
+
+        Args:
+            header (Dict[str, Any]): The header of the entry.
+            lab_path (str): The path of the network scenario directory.
+            file_names (List[str]): The names of the files read by the parser.
+            stats (List[os.stat_result]): The current stats of the files.
+            dirs (Optional[List[str]]): The current sub-directories of the network scenario, if tracked.
+
+        Returns:
+            Optional[List[List]]: The fingerprints of the files (name, size, modification time and digest),
+                None if the entry is stale.
+        """
+        if header.get('version', None) != LAB_CACHE_VERSION or header.get('dirs', None) != dirs:
+            return None
+
+        cached_files = header.get('files', None) or []
+        if not isinstance(cached_files, list) or \
+                not all(isinstance(cached, list) and len(cached) == 4 for cached in cached_files):
+            return None
+
+        if [cached[0] for cached in cached_files] != file_names:
+            return None
+
+        digests = []
+        for (cached, stat) in zip(cached_files, stats):
+            (name, size, mtime, digest) = cached
+            if size != stat.st_size:
+                return None
+
+            if mtime != stat.st_mtime_ns:
+                # The file was touched, it is still valid if its content is unchanged
+                if self._get_file_digest(os.path.join(lab_path, name)) != digest:
+                    return None
+
+            digests.append([name, stat.st_size, self._get_stable_mtime(stat), digest])
+
+        return digests
+
+    @staticmethod
+    def _read_entry(entry_path: str) -> Optional[tuple]:
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except Exception:
+            return None
+
+        if not isinstance(entry, dict) or 'data' not in entry or not isinstance(entry.get('header', None), dict):
+            return None
+
+        return entry['header'], entry['data']
+
+    def _write_entry(self, entry_path: str, header: Dict[str, Any], data: Any) -> None:
+        """Write an entry atomically, so concurrent Kathara processes never read partial entries.
+
+        Args:
+            entry_path (str): The path of the entry.
+            header (Dict[str, Any]): The header of the entry.
+            data (Any): The encoded result of the parser.
+
+        Returns:
+            None
+        """
+        temp_path = None
+        try:
+            entry = json.dumps({'header': header, 'data': data})
+        except (TypeError, ValueError) as e:
+            logging.debug(f"Cannot serialize `{entry_path}` in lab cache: {str(e)}")
+            return
+
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            (fd, temp_path) = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+                temp_file.write(entry)
+            os.replace(temp_path, entry_path)
+            temp_path = None
+
+            self._evict()
+        except OSError as e:
+            logging.debug(f"Cannot write `{entry_path}` in lab cache: {str(e)}")
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache size is below `max_size`.
+
+        Returns:
+            None
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for (_, size, entry_path) in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            logging.debug(f"Evicting `{entry_path}` from lab cache...")
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
+
+    def _get_entry_path(self, kind: str, lab_path: str, file_names: List[str]) -> str:
+        # The path is kept as specified, since the hash of a network scenario without a name depends on it
+        key = hashlib.sha256(
+            f"{kind}\0{lab_path}\0{os.path.abspath(lab_path)}\0{chr(0).join(file_names)}".encode('utf-8')
+        )
+        return os.path.join(self.path, key.hexdigest())
+
+    @staticmethod
+    def _touch(entry_path: str) -> None:
+        # Mark the entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _get_stable_mtime(stat: os.stat_result) -> Optional[int]:
+        # A missing modification time forces the check of the content at the next lookup
+        return stat.st_mtime_ns if time.time() - stat.st_mtime > RACY_INTERVAL else None
+
+    @staticmethod
+    def _get_dirs(lab_path: str) -> List[str]:
+        with os.scandir(lab_path) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+
+    @staticmethod
+    def _get_file_digest(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
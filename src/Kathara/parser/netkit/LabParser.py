@@ -2,10 +2,16 @@ import logging
 import mmap
 import os
 import re
+from typing import Any, Dict, List, Optional
 
+from .LabCache import LabCache
+from ... import utils
 from ...model.Lab import Lab, LAB_METADATA
 from ...utils import parse_cd_mac_address, RESERVED_MACHINE_NAMES
 
+LAB_NAME_RE = re.compile(rb"^LAB_NAME=([^\r\n]*)", re.MULTILINE)
+LAB_CACHED_METADATA: List[str] = [key.replace("LAB_", "").lower() for key in LAB_METADATA]
+
 
 class LabParser(object):
     """Class responsible for parsing the lab.conf file."""
@@ -29,6 +35,25 @@ class LabParser(object):
         if os.stat(lab_conf_path).st_size == 0:
             raise IOError(f"{conf_name} file is empty.")
 
+        # The result also depends on the device folders, since they are the filesystems of the devices
+        return LabCache.get_instance().load(
+            "lab", path, [conf_name], lambda: LabParser._parse(path, conf_name),
+            encode=LabParser._encode, decode=lambda data: LabParser._decode(path, data), track_dirs=True
+        )
+
+    @staticmethod
+    def _parse(path: str, conf_name: str) -> Lab:
+        """Parse the lab configuration identified by conf_name, without looking up the lab cache.
+
+        Args:
+            path (str): The path to the directory containing the configuration file.
+            conf_name (str): The name of the network scenario configuration file.
+
+        Returns:
+            Kathara.model.Lab.Lab: A Kathara network scenario.
+        """
+        lab_conf_path = os.path.join(path, conf_name)
+
         # Reads lab.conf in memory, so it is faster.
         try:
             with open(lab_conf_path, 'r') as lab_file:
@@ -92,3 +117,110 @@ class LabParser(object):
         lab.check_integrity()
 
         return lab
+
+    @staticmethod
+    def _encode(lab: Lab) -> Dict[str, Any]:
+        """Convert a parsed network scenario in plain data, to be stored in the lab cache.
+
+        Args:
+            lab (Kathara.model.Lab.Lab): A Kathara network scenario returned by `_parse`.
+
+        Returns:
+            Dict[str, Any]: The metadata, the devices and the collision domains of the network scenario.
+        """
+        machines = []
+        for machine in lab.machines.values():
+            # Ports are indexed by (host_port, protocol) tuples, that are not valid JSON keys
+            meta = dict(machine.meta, ports=[
+                [host_port, protocol, guest_port] for (host_port, protocol), guest_port in machine.meta['ports'].items()
+            ])
+            interfaces = [
+                [number, interface.link.name, interface.mac_address]
+                for number, interface in machine.interfaces.items()
+            ]
+            machines.append([machine.name, meta, interfaces])
+
+        return {
+            'metadata': {key: getattr(lab, key) for key in LAB_CACHED_METADATA},
+            'machines': machines,
+            'links': [[link.name, list(link.machines)] for link in lab.links.values()],
+        }
+
+    @staticmethod
+    def _decode(path: str, data: Dict[str, Any]) -> Lab:
+        """Rebuild a network scenario from the data returned by `_encode`.
+
+        Args:
+            path (str): The path to the directory containing the configuration file.
+            data (Dict[str, Any]): The data returned by `_encode`.
+
+        Returns:
+            Kathara.model.Lab.Lab: A Kathara network scenario.
+        """
+        lab = Lab(None, path=path)
+        for (key, value) in data['metadata'].items():
+            if key in LAB_CACHED_METADATA and value is not None:
+                setattr(lab, key, value)
+
+        for (link_name, _) in data['links']:
+            lab.get_or_new_link(link_name)
+
+        for (machine_name, meta, interfaces) in data['machines']:
+            machine = lab.get_or_new_machine(machine_name)
+            meta['ports'] = {(host_port, protocol): guest_port for host_port, protocol, guest_port in meta['ports']}
+            machine.meta = meta
+            for (number, link_name, mac_address) in interfaces:
+                machine.add_interface(lab.links[link_name], number=number, mac_address=mac_address)
+
+        # Devices are attached to the collision domains in the order of lab.conf
+        for (link_name, machine_names) in data['links']:
+            link = lab.links[link_name]
+            link.machines = {name: link.machines[name] for name in machine_names}
+
+        return lab
+
+    @staticmethod
+    def parse_name(path: str, conf_name: str = "lab.conf") -> Optional[str]:
+        """Read the name of the network scenario (`LAB_NAME`) from the configuration file, without parsing devices
+        and collision domains.
+
+        Args:
+            path (str): The path to the directory containing the configuration file.
+            conf_name (str): The name of the network scenario configuration file (default is 'lab.conf').
+
+        Returns:
+            Optional[str]: The name of the network scenario, None if the file does not exist or does not specify it.
+        """
+        try:
+            with open(os.path.join(path, conf_name), 'rb') as lab_file:
+                names = LAB_NAME_RE.findall(lab_file.read())
+        except OSError:
+            return None
+
+        if not names:
+            return None
+
+        # As in `parse`, the last occurrence wins and values containing `=` are not valid
+        value = names[-1].decode('utf-8', errors='replace')
+        if "=" in value:
+            return None
+
+        return value.replace('"', '').replace("'", '').strip()
+
+    @staticmethod
+    def parse_hash(path: str, conf_name: str = "lab.conf") -> str:
+        """Return the hash of the network scenario in the specified directory, without parsing its topology.
+
+        The hash is the same of the network scenario returned by `parse`: it is derived from `LAB_NAME` if specified,
+        from the path of the directory otherwise.
+
+        Args:
+            path (str): The path to the directory containing the configuration file.
+            conf_name (str): The name of the network scenario configuration file (default is 'lab.conf').
+
+        Returns:
+            str: The hash of the network scenario.
+        """
+        name = LabParser.parse_name(path, conf_name)
+
+        return utils.generate_urlsafe_hash(name if name is not None else path)
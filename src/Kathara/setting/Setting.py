@@ -12,7 +12,6 @@ from ..exceptions import HTTPConnectionError, SettingsError, SettingsNotFoundErr
 from ..exceptions import InstantiationError
 from ..foundation.setting.SettingsAddon import SettingsAddon
 from ..foundation.setting.SettingsAddonFactory import SettingsAddonFactory
-from ..webhooks.GitHubApi import GitHubApi
 
 AVAILABLE_DEBUG_LEVELS: List[str] = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "EXCEPTION"]
 AVAILABLE_MANAGERS: List[str] = ["docker", "kubernetes"]
@@ -31,6 +30,8 @@ DEFAULTS: Dict[str, Any] = {
     "print_startup_log": True,
     "enable_ipv6": False,
     "volume_mount_policy": "Always",
+    "pack_cache": True,
+    "pack_cache_max_entry_size": 64 * 1024 * 1024,
 }
 SETTINGS_FILENAME = "kathara.conf"
 DEFAULT_SETTINGS_PATH: str = os.path.join(utils.get_current_user_home(), ".config", SETTINGS_FILENAME)
@@ -41,7 +42,7 @@ class Setting(object):
 
     __slots__ = ['image', 'manager_type', 'terminal', 'open_terminals', 'device_shell', 'net_prefix',
                  'device_prefix', 'debug_level', 'print_startup_log', 'enable_ipv6', 'volume_mount_policy',
-                 'last_checked', 'addons']
+                 'pack_cache', 'pack_cache_max_entry_size', 'last_checked', 'addons']
 
     __instance: Setting = None
 
@@ -197,6 +198,9 @@ class Setting(object):
             try:
                 logging.debug("Checking Kathara release...")
 
+                # Imported here since `requests` is only needed when checking for updates
+                from ..webhooks.GitHubApi import GitHubApi
+
                 latest_remote_release = GitHubApi.get_release_information()
                 latest_version = latest_remote_release["tag_name"]
 
@@ -234,10 +238,8 @@ class Setting(object):
         Raises:
             SettingsError: If the Manager Type is not allowed.
         """
-        from ..manager.Kathara import Kathara
-        managers = Kathara.get_available_managers_name()
-
-        if self.manager_type not in managers.keys():
+        # Do not load the manager classes (and their SDKs) just to validate the name
+        if self.manager_type not in AVAILABLE_MANAGERS:
             raise SettingsError("Manager Type not allowed.")
 
     def check_image(self, image: str = None) -> None:
@@ -316,5 +318,7 @@ class Setting(object):
             "print_startup_log": self.print_startup_log,
             "enable_ipv6": self.enable_ipv6,
             "volume_mount_policy": self.volume_mount_policy,
+            "pack_cache": self.pack_cache,
+            "pack_cache_max_entry_size": self.pack_cache_max_entry_size,
             "last_checked": self.last_checked
         }
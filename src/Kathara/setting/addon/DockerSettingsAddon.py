@@ -10,13 +10,18 @@ DEFAULTS = {
     "shared_cds": SharedCollisionDomainsOption.NOT_SHARED,
     "remote_url": None,
     "cert_path": None,
-    "network_plugin": "kathara/katharanp_vde"
+    "network_plugin": "kathara/katharanp_vde",
+    "plugin_check_ttl": 86400,
+    "state_cache": False,
+    "shutdown_timeout": None,
+    "shutdown_concurrency": None
 }
 
 
 class DockerSettingsAddon(SettingsAddon):
     __slots__ = ['hosthome_mount', 'shared_mount', 'image_update_policy', 'shared_cds',
-                 'remote_url', 'cert_path', 'network_plugin']
+                 'remote_url', 'cert_path', 'network_plugin', 'plugin_check_ttl', 'state_cache',
+                 'shutdown_timeout', 'shutdown_concurrency']
 
     def __init__(self) -> None:
         self.hosthome_mount: bool = False
@@ -26,6 +31,10 @@ class DockerSettingsAddon(SettingsAddon):
         self.remote_url: Optional[str] = None
         self.cert_path: Optional[str] = None
         self.network_plugin: Optional[str] = "kathara/katharanp_vde"
+        self.plugin_check_ttl: int = 86400
+        self.state_cache: bool = False
+        self.shutdown_timeout: Optional[float] = None
+        self.shutdown_concurrency: Optional[int] = None
 
     def _to_dict(self) -> Dict[str, Any]:
         return {
@@ -35,5 +44,9 @@ class DockerSettingsAddon(SettingsAddon):
             'shared_cds': self.shared_cds,
             'remote_url': self.remote_url,
             'cert_path': self.cert_path,
-            'network_plugin': self.network_plugin
+            'network_plugin': self.network_plugin,
+            'plugin_check_ttl': self.plugin_check_ttl,
+            'state_cache': self.state_cache,
+            'shutdown_timeout': self.shutdown_timeout,
+            'shutdown_concurrency': self.shutdown_concurrency
         }
@@ -1,6 +1,3 @@
-from rich.console import Console
-from rich.table import Table
-
 strings = {
     "vstart": "Start a new Kathara device",
     "vclean": "Stop a single Kathara device",
@@ -22,6 +19,10 @@ wiki_description = "For examples and further information visit: https://github.c
 
 
 def formatted_strings() -> str:
+    # Imported here since the formatted strings are only needed to print the CLI help
+    from rich.console import Console
+    from rich.table import Table
+
     console = Console(record=True)
     commands_table = Table(show_header=False, show_edge=False, show_lines=False, box=None)
     for item in strings.items():
@@ -13,15 +13,16 @@ import os
 import re
 import shutil
 import tarfile
-import tempfile
+import time
 import unicodedata
+import zlib
 
-from binaryornot.check import is_binary
+from binaryornot.check import is_binary, is_binary_string
 from io import BytesIO
 from platform import node, machine
 
 from types import ModuleType
-from typing import Any, Optional, Match, Generator, List, Callable, Union, Dict, Iterable, Tuple
+from typing import Any, Optional, Match, Generator, List, Callable, Union, Dict, Iterable, Tuple, BinaryIO
 
 from .exceptions import HostArchitectureError, InvocationError
 
@@ -34,6 +35,12 @@ LINUX2: str = "linux2"
 # List of ignored files
 EXCLUDED_FILES: List[str] = ['.DS_Store']
 
+# Number of bytes read by binaryornot to guess if a file is binary
+BINARY_CHECK_SIZE: int = 1024
+
+# Size of the chunks read from files and yielded by tar streams
+TAR_CHUNK_SIZE: int = 1024 * 1024
+
 # Reserved names for devices
 RESERVED_MACHINE_NAMES: List[str] = ['shared', '_test']
 
@@ -198,6 +205,19 @@ def convert_win_2_linux(filename: str, write: bool = False) -> Optional[bytes]:
         return open(filename, mode='rb').read()
 
 
+def convert_win_2_linux_content(content: bytes) -> bytes:
+    """Apply the win2linux patch to the content of a file, as `convert_win_2_linux` does on files."""
+    if not is_binary_string(content[:BINARY_CHECK_SIZE]):
+        try:
+            # Universal newlines, as when the file is opened in text mode
+            with io.TextIOWrapper(BytesIO(content), encoding='utf-8-sig') as text_content:
+                return text_content.read().replace("\n\r", "\n").replace("\r\n", "\n").encode('utf-8')
+        except Exception:
+            pass
+
+    return content
+
+
 def is_admin() -> bool:
     def unix_root():
         return os.getuid() == 0
@@ -425,6 +445,30 @@ def human_readable_bytes(size_bytes: int) -> str:
     return "%s %s" % (s, size_name[i])
 
 
+def write_output(output: Any, data: bytes) -> None:
+    """Write raw bytes to a text stream (e.g., sys.stdout), without decoding them.
+
+    Bytes are written to the binary buffer of the stream, so the terminal receives them as they are produced. If the
+    stream has no binary buffer, bytes are decoded as UTF-8 replacing invalid sequences.
+
+    Args:
+        output (Any): The text stream to write into.
+        data (bytes): The bytes to write.
+
+    Returns:
+        None
+    """
+    buffer = getattr(output, "buffer", None)
+    if buffer is None:
+        output.write(data.decode("utf-8", errors="replace"))
+        return
+
+    # Flush the text already written, so the order of the output is preserved
+    output.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
 # Lab Functions
 def pack_file_for_tar(file_obj: Union[str, io.IOBase], arc_name: str) -> (tarfile.TarInfo, bytes):
     if isinstance(file_obj, str):
@@ -446,18 +490,118 @@ def pack_file_for_tar(file_obj: Union[str, io.IOBase], arc_name: str) -> (tarfil
     return tarinfo, file_content
 
 
-def pack_files_for_tar(guest_to_host: Dict) -> bytes:
-    with tempfile.NamedTemporaryFile(mode='wb+', suffix='.tar.gz') as temp_file:
-        with tarfile.open(fileobj=temp_file, mode='w:gz') as tar_file:
-            for path, file_obj in guest_to_host.items():
-                tar_info, file_content = pack_file_for_tar(file_obj, arc_name=path)
-                tar_file.addfile(tar_info, file_content)
+def pack_files_for_tar(guest_to_host: Dict, compression: Optional[str] = None) -> bytes:
+    entries = (pack_file_for_tar(file_obj, arc_name=path) for path, file_obj in guest_to_host.items())
 
-        temp_file.seek(0)
+    return b"".join(stream_tar(entries, compression=compression))
 
-        tar_data = temp_file.read()
 
-    return tar_data
+def pack_fs_entries_for_tar(dirs: Iterable[str], files: Iterable[Tuple[str, Any, str]]) \
+        -> Generator[Tuple[tarfile.TarInfo, Optional[BinaryIO]], None, None]:
+    """Generate the tar entries of directories and files read from pyfilesystem2 filesystems.
+
+    Text files are patched with the win2linux patch, binary files are streamed as they are. Entries must be consumed
+    before requesting the next one, since the file objects are closed afterwards.
+
+    Args:
+        dirs (Iterable[str]): The paths in the archive of the directories.
+        files (Iterable[Tuple[str, Any, str]]): The files, as tuples composed by the path in the archive, the
+            filesystem containing the file and its path in the filesystem.
+
+    Returns:
+        Generator[Tuple[tarfile.TarInfo, Optional[BinaryIO]], None, None]: A generator of tar entries.
+    """
+    mtime = int(time.time())
+    uid, gid = (os.geteuid(), os.getegid()) if hasattr(os, "geteuid") else (0, 0)
+
+    def build_tar_info(arc_name: str, mode: int) -> tarfile.TarInfo:
+        tar_info = tarfile.TarInfo(arc_name)
+        tar_info.mode = mode
+        tar_info.mtime = mtime
+        tar_info.uid = uid
+        tar_info.gid = gid
+        return tar_info
+
+    for dir_path in dirs:
+        tar_info = build_tar_info(dir_path, 0o755)
+        tar_info.type = tarfile.DIRTYPE
+        yield tar_info, None
+
+    for (arc_name, file_fs, path) in files:
+        tar_info = build_tar_info(arc_name, 0o644)
+        with file_fs.openbin(path) as file:
+            head = file.read(BINARY_CHECK_SIZE)
+            if not is_binary_string(head):
+                content = convert_win_2_linux_content(head + file.read())
+                tar_info.size = len(content)
+                yield tar_info, BytesIO(content)
+            else:
+                file.seek(0)
+                tar_info.size = file_fs.getsize(path)
+                yield tar_info, file
+
+
+def stream_tar(entries: Iterable[Tuple[tarfile.TarInfo, Optional[BinaryIO]]], compression: Optional[str] = None,
+               chunk_size: int = TAR_CHUNK_SIZE) -> Generator[bytes, None, None]:
+    """Build a tar archive, yielding it in chunks while the entries are read.
+
+    Files are read in chunks of `chunk_size` bytes, so the whole archive (or a whole file) is never kept in memory.
+
+    Args:
+        entries (Iterable[Tuple[tarfile.TarInfo, Optional[BinaryIO]]]): The entries of the archive. Each entry is
+            composed by its TarInfo and, for regular files, a binary file object with (at least) `size` bytes.
+        compression (Optional[str]): "gz" to compress the archive with gzip, None for a plain tar archive.
+        chunk_size (int): The maximum number of bytes read at once from each file.
+
+    Returns:
+        Generator[bytes, None, None]: A generator of chunks of the archive.
+
+    Raises:
+        ValueError: If the compression is not supported.
+        OSError: If a file ends before `size` bytes are read.
+    """
+    if compression not in [None, "gz"]:
+        raise ValueError(f"Compression `{compression}` not supported.")
+
+    # wbits=31 produces a gzip stream, as tarfile does in "w:gz" mode
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31) if compression == "gz" else None
+    offset = 0
+
+    def output(data: bytes) -> bytes:
+        nonlocal offset
+        offset += len(data)
+        return compressor.compress(data) if compressor else data
+
+    for (tar_info, file_obj) in entries:
+        chunk = output(tar_info.tobuf(tarfile.DEFAULT_FORMAT, "utf-8", "surrogateescape"))
+        if chunk:
+            yield chunk
+
+        if file_obj is not None and tar_info.size > 0:
+            remaining = tar_info.size
+            while remaining > 0:
+                data = file_obj.read(min(chunk_size, remaining))
+                if not data:
+                    raise OSError(f"Unexpected end of data while packing `{tar_info.name}`.")
+                remaining -= len(data)
+
+                chunk = output(data)
+                if chunk:
+                    yield chunk
+
+            padding = (-tar_info.size) % tarfile.BLOCKSIZE
+            if padding:
+                chunk = output(tarfile.NUL * padding)
+                if chunk:
+                    yield chunk
+
+    # End of archive marker, padded to the record size as tarfile does
+    end = tarfile.NUL * (tarfile.BLOCKSIZE * 2)
+    end += tarfile.NUL * ((-(offset + len(end))) % tarfile.RECORDSIZE)
+    chunk = output(end)
+    if compressor:
+        chunk += compressor.flush()
+    yield chunk
 
 
 def parse_cd_mac_address(value) -> Tuple[str, str]:
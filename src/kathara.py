@@ -6,29 +6,97 @@ import multiprocessing
 import os
 import sys
 
-from rich.logging import RichHandler
+if os.environ.get("KATHARA_IMPORT_PROFILE", None):
+    from Kathara.cli.ImportProfiler import ImportProfiler
 
-from Kathara import utils
-from Kathara.auth.PrivilegeHandler import PrivilegeHandler
-from Kathara.cli.ui.event.register import register_cli_events, unregister_cli_events
+    ImportProfiler.get_instance().start()
+
+from Kathara.cli.broker_commands import BROKER_COMMAND, ATTACH_COMMAND
 from Kathara.exceptions import SettingsError, DockerDaemonConnectionError, ClassNotFoundError, SettingsNotFoundError
-from Kathara.foundation.cli.command.CommandFactory import CommandFactory
-from Kathara.setting.Setting import Setting
-from Kathara.strings import formatted_strings
 from Kathara.version import CURRENT_VERSION
 
-description_msg = """kathara [-h] [-v] <command> [<args>]
+# Commands that do not dispatch any event, so the CLI event handlers (and their UI dependencies) are not loaded
+COMMANDS_WITHOUT_EVENTS = ['list', 'settings']
+
+
+def get_description_msg() -> str:
+    from Kathara.strings import formatted_strings
+
+    return """kathara [-h] [-v] <command> [<args>]
 
 Possible Kathara commands are:\n
 %s
 """ % formatted_strings()
 
 
+class KatharaArgumentParser(argparse.ArgumentParser):
+    """Argument parser that builds the list of the available commands only when the usage is printed."""
+
+    def format_usage(self) -> str:
+        self.usage = get_description_msg()
+        return super().format_usage()
+
+    def format_help(self) -> str:
+        self.usage = get_description_msg()
+        return super().format_help()
+
+
+def print_import_profile() -> None:
+    if os.environ.get("KATHARA_IMPORT_PROFILE", None):
+        from Kathara.cli.ImportProfiler import ImportProfiler
+
+        profiler = ImportProfiler.get_instance()
+        profiler.stop()
+        try:
+            size = int(os.environ["KATHARA_IMPORT_PROFILE"])
+        except ValueError:
+            size = 25
+        profiler.print_report(size=size)
+
+
+def exit_entry_point(exit_code: int) -> None:
+    if "Kathara.cli.ui.event.register" in sys.modules:
+        from Kathara.cli.ui.event.register import unregister_cli_events
+
+        unregister_cli_events()
+
+    print_import_profile()
+
+    sys.exit(exit_code)
+
+
+def init_environment() -> None:
+    from rich.logging import RichHandler
+
+    from Kathara import utils
+    from Kathara.auth.PrivilegeHandler import PrivilegeHandler
+    from Kathara.setting.Setting import Setting
+
+    try:
+        Setting.get_instance().load_from_disk()
+    except SettingsNotFoundError:
+        Setting.get_instance().save_to_disk()
+
+    try:
+        debug_level = Setting.get_instance().debug_level
+        debug_level = debug_level if debug_level != "EXCEPTION" else "DEBUG"
+    except SettingsError:
+        debug_level = "DEBUG"
+
+    logging.basicConfig(
+        level=debug_level, format="%(message)s",
+        handlers=[RichHandler(rich_tracebacks=True, show_time=False, show_path=False)]
+    )
+
+    utils.check_python_version()
+
+    utils.exec_by_platform(PrivilegeHandler.get_instance().drop_effective_privileges, lambda: None, lambda: None)
+
+
 class KatharaEntryPoint(object):
     def __init__(self) -> None:
-        parser = argparse.ArgumentParser(
+        parser = KatharaArgumentParser(
             description='A network emulation tool.',
-            usage=description_msg,
             add_help=False
         )
 
@@ -58,13 +126,31 @@ class KatharaEntryPoint(object):
 
         if args.version:
             print('Current version: %s' % CURRENT_VERSION)
-            unregister_cli_events()
-            sys.exit(0)
+            exit_entry_point(0)
 
         if args.command is None or not args.command.islower():
             parser.print_help()
-            unregister_cli_events()
-            sys.exit(1)
+            exit_entry_point(1)
+
+        if args.command == ATTACH_COMMAND:
+            from Kathara.cli.TerminalBrokerClient import TerminalBrokerClient
+
+            if len(sys.argv) <= 2:
+                parser.print_help()
+                exit_entry_point(1)
+
+            exit_code = TerminalBrokerClient.attach(sys.argv[2], sys.argv[3:])
+            if exit_code is not None:
+                exit_entry_point(exit_code)
+
+            # The terminal broker is not running, connect to the device directly
+            args.command = "connect"
+            sys.argv = [sys.argv[0], args.command] + sys.argv[3:]
+
+        init_environment()
+
+        from Kathara.foundation.cli.command.CommandFactory import CommandFactory
+        from Kathara.setting.Setting import Setting
 
         try:
             # Check settings only if the user is not executing "settings" command.
@@ -72,65 +158,52 @@ class KatharaEntryPoint(object):
                 Setting.get_instance().check()
         except (SettingsError, DockerDaemonConnectionError) as e:
             logging.critical(f"({type(e).__name__}) {str(e)}")
-            unregister_cli_events()
-            sys.exit(1)
+            exit_entry_point(1)
+
+        if args.command == BROKER_COMMAND:
+            from Kathara.cli.TerminalBroker import TerminalBroker
+
+            try:
+                TerminalBroker(*sys.argv[2:4]).serve()
+            except Exception as e:
+                logging.debug(f"({type(e).__name__}) {str(e)}")
+                exit_entry_point(1)
+            exit_entry_point(0)
 
         try:
             command_object = CommandFactory().create_instance(class_args=(args.command.capitalize(),))
         except ClassNotFoundError:
             logging.error(f"Unrecognized command `{args.command}`.")
             parser.print_help()
-            unregister_cli_events()
-            sys.exit(1)
+            exit_entry_point(1)
         except ImportError as e:
             logging.critical(f"({type(e).__name__}) `{e.name}` is not installed in your system")
-            unregister_cli_events()
-            sys.exit(1)
+            exit_entry_point(1)
+
+        if args.command not in COMMANDS_WITHOUT_EVENTS:
+            from Kathara.cli.ui.event.register import register_cli_events
+
+            register_cli_events()
 
         try:
             current_path = os.getcwd()
             exit_code = command_object.run(current_path, sys.argv[2:])
-            unregister_cli_events()
 
-            sys.exit(exit_code)
+            exit_entry_point(exit_code)
         except KeyboardInterrupt:
             if args.command not in ['exec', 'linfo', 'list', 'settings']:
                 logging.warning("You interrupted Kathara during a command. The system may be in an inconsistent "
                                 "state! If you encounter any problem please run `kathara wipe`.")
-            unregister_cli_events()
-            sys.exit(0)
+            exit_entry_point(0)
         except Exception as e:
             if Setting.get_instance().debug_level == "EXCEPTION":
                 logging.exception(f"({type(e).__name__}) {str(e)}")
             else:
                 logging.critical(f"({type(e).__name__}) {str(e)}")
-            unregister_cli_events()
-            sys.exit(1)
+            exit_entry_point(1)
 
 
 if __name__ == '__main__':
-    try:
-        Setting.get_instance().load_from_disk()
-    except SettingsNotFoundError:
-        Setting.get_instance().save_to_disk()
-
-    try:
-        debug_level = Setting.get_instance().debug_level
-        debug_level = debug_level if debug_level != "EXCEPTION" else "DEBUG"
-    except SettingsError:
-        debug_level = "DEBUG"
-
-    logging.basicConfig(
-        level=debug_level, format="%(message)s",
-        handlers=[RichHandler(rich_tracebacks=True, show_time=False, show_path=False)]
-    )
-
     multiprocessing.freeze_support()
 
-    register_cli_events()
-
-    utils.check_python_version()
-
-    utils.exec_by_platform(PrivilegeHandler.get_instance().drop_effective_privileges, lambda: None, lambda: None)
-
     KatharaEntryPoint()
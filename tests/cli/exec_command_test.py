@@ -8,6 +8,7 @@ sys.path.insert(0, './')
 
 from src.Kathara.manager.docker.exec_stream.DockerExecStream import DockerExecStream
 from src.Kathara.cli.command.ExecCommand import ExecCommand
+from src.Kathara.foundation.manager.exec_stream.MultiExecStream import MultiExecStream
 from src.Kathara.model.Lab import Lab
 
 
@@ -22,164 +23,214 @@ def exec_output(client_mock):
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_no_params(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_no_params(mock_stderr, mock_stdout, mock_parse_hash,
                        mock_docker_manager, mock_manager_get_instance, exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_error_exit_code(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_error_exit_code(mock_stderr, mock_stdout, mock_parse_hash,
                              mock_docker_manager, mock_manager_get_instance, exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     exec_output._client.api.exec_inspect.return_value = {'ExitCode': 1}
     command = ExecCommand()
     code = command.run('.', ['pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
     assert code == 1
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_with_directory_absolute_path(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_with_directory_absolute_path(mock_stderr, mock_stdout, mock_parse_hash,
                                           mock_docker_manager, mock_manager_get_instance,
                                           exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['-d', os.path.join('/test', 'path'), 'pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.path.abspath(os.path.join('/test', 'path')))
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_parse_hash.assert_called_once_with(os.path.abspath(os.path.join('/test', 'path')))
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_with_directory_relative_path(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_with_directory_relative_path(mock_stderr, mock_stdout, mock_parse_hash,
                                           mock_docker_manager, mock_manager_get_instance,
                                           exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['-d', os.path.join('test', 'path'), 'pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.path.join(os.getcwd(), 'test', 'path'))
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_parse_hash.assert_called_once_with(os.path.join(os.getcwd(), 'test', 'path'))
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_with_v_option(mock_stderr_write, mock_stdout_write, mock_parse_lab, mock_docker_manager,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_with_v_option(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
                            mock_manager_get_instance, exec_output):
     mock_manager_get_instance.return_value = mock_docker_manager
     lab = Lab('kathara_vlab')
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['-v', 'pc1', 'test command'])
-    assert not mock_parse_lab.called
+    assert not mock_parse_hash.called
     mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_no_stdout(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab, mock_docker_manager,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_no_stdout(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
                        mock_manager_get_instance, exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['--no-stdout', 'pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    assert not mock_stdout_write.called
-    mock_stderr_write.assert_called_once_with('stderr')
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    assert not mock_stdout.buffer.write.called
+    mock_stderr.buffer.write.assert_called_once_with(b'stderr')
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_no_stderr(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab, mock_docker_manager,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_no_stderr(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
                        mock_manager_get_instance, exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['--no-stderr', 'pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    mock_stdout_write.assert_called_once_with('stdout')
-    assert not mock_stderr_write.called
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    mock_stdout.buffer.write.assert_called_once_with(b'stdout')
+    assert not mock_stderr.buffer.write.called
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-@mock.patch("src.Kathara.model.Lab.Lab")
-@mock.patch('sys.stdout.write')
-@mock.patch('sys.stderr.write')
-def test_run_no_stdout_no_stderr(mock_stderr_write, mock_stdout_write, mock_lab, mock_parse_lab, mock_docker_manager,
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_no_stdout_no_stderr(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
                                  mock_manager_get_instance,
                                  exec_output):
-    mock_parse_lab.return_value = mock_lab
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     mock_docker_manager.exec.return_value = exec_output
     command = ExecCommand()
     command.run('.', ['--no-stdout', '--no-stderr', 'pc1', 'test command'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash=mock_lab.hash, wait=False)
-    assert not mock_stdout_write.called
-    assert not mock_stderr_write.called
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.exec.assert_called_once_with("pc1", 'test command', lab_hash="lab_hash", wait=False)
+    assert not mock_stdout.buffer.write.called
+    assert not mock_stderr.buffer.write.called
     exec_output._client.api.exec_inspect.assert_called_once_with('id')
+
+
+@pytest.fixture
+def multi_exec_output():
+    streams = {
+        "pc1": DockerExecStream(iter([(b"line1\nli", None), (b"ne2\n", b"error\n")]), "pc1_id", mock.Mock()),
+        "pc2": DockerExecStream(iter([(b"line3", None)]), "pc2_id", mock.Mock()),
+    }
+    streams["pc1"]._client.api.exec_inspect.return_value = {'ExitCode': 0}
+    streams["pc2"]._client.api.exec_inspect.return_value = {'ExitCode': 3}
+
+    return MultiExecStream(["pc1", "pc2"], lambda name: streams[name], concurrency=1)
+
+
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_all(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
+                 mock_manager_get_instance, multi_exec_output):
+    mock_parse_hash.return_value = "lab_hash"
+    mock_manager_get_instance.return_value = mock_docker_manager
+    mock_docker_manager.exec_many.return_value = multi_exec_output
+    command = ExecCommand()
+    code = command.run('.', ['--all', '--', 'ls', '-l'])
+    mock_docker_manager.exec_many.assert_called_once_with(None, ['ls', '-l'], lab_hash="lab_hash", wait=False,
+                                                          concurrency=None)
+    assert mock_stdout.buffer.write.call_args_list == [
+        mock.call(b"[pc1] line1\n"), mock.call(b"[pc1] line2\n"), mock.call(b"[pc2] line3\n")
+    ]
+    mock_stderr.buffer.write.assert_called_once_with(b"[pc1] error\n")
+    assert code == 3
+
+
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+@mock.patch('sys.stdout')
+@mock.patch('sys.stderr')
+def test_run_machines(mock_stderr, mock_stdout, mock_parse_hash, mock_docker_manager,
+                      mock_manager_get_instance, multi_exec_output):
+    mock_parse_hash.return_value = "lab_hash"
+    mock_manager_get_instance.return_value = mock_docker_manager
+    mock_docker_manager.exec_many.return_value = multi_exec_output
+    command = ExecCommand()
+    command.run('.', ['-m', 'pc1, pc2', '--concurrency', '5', '--no-stderr', 'test command'])
+    mock_docker_manager.exec_many.assert_called_once_with(['pc1', 'pc2'], 'test command', lab_hash="lab_hash",
+                                                          wait=False, concurrency=5)
+    assert mock_stdout.buffer.write.call_count == 3
+    assert not mock_stderr.buffer.write.called
+
+
+def test_run_missing_command():
+    command = ExecCommand()
+    with pytest.raises(SystemExit):
+        command.run('.', ['pc1'])
@@ -0,0 +1,53 @@
+import io
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, './')
+
+from src.Kathara.cli.ImportProfiler import ImportProfiler
+
+
+def test_import_profiler_records_modules(tmp_path):
+    with open(os.path.join(tmp_path, "kathara_profiled_parent.py"), "w") as module_file:
+        module_file.write("import kathara_profiled_child\n")
+    with open(os.path.join(tmp_path, "kathara_profiled_child.py"), "w") as module_file:
+        module_file.write("import time\ntime.sleep(0.01)\n")
+
+    sys.path.insert(0, str(tmp_path))
+    profiler = ImportProfiler.get_instance()
+    try:
+        profiler.start()
+        import kathara_profiled_parent
+    finally:
+        profiler.stop()
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("kathara_profiled_parent", None)
+        sys.modules.pop("kathara_profiled_child", None)
+
+    assert profiler not in sys.meta_path
+    (child_self, child_cumulative) = profiler.timings["kathara_profiled_child"]
+    (parent_self, parent_cumulative) = profiler.timings["kathara_profiled_parent"]
+    assert child_self >= 0.01
+    assert parent_cumulative >= child_cumulative
+    assert parent_self < child_self
+
+    packages = profiler.get_packages_timings()
+    assert packages["kathara_profiled_child"] == child_self
+
+    stream = io.StringIO()
+    profiler.print_report(stream=stream)
+    assert "kathara_profiled_child" in stream.getvalue()
+
+
+def test_version_does_not_import_dependencies():
+    result = subprocess.run(
+        [sys.executable, os.path.join("src", "kathara.py"), "--version"],
+        env=dict(os.environ, KATHARA_IMPORT_PROFILE="1000"), capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0
+    assert "Current version" in result.stdout
+    assert "Imported" in result.stderr
+    for dependency in ["rich", "docker", "kubernetes", "requests", "fs"]:
+        assert f"| {dependency}\n" not in result.stderr
@@ -8,6 +8,7 @@ import pytest
 sys.path.insert(0, './')
 
 from src.Kathara.cli.command.LinfoCommand import LinfoCommand
+from src.Kathara.foundation.manager.BootProfiler import BootProfiler
 from src.Kathara.model.Lab import Lab
 
 
@@ -22,58 +23,58 @@ def test_lab():
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_no_params(mock_parse_lab, mock_docker_manager, mock_manager_get_instance, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_no_params(mock_parse_hash, mock_docker_manager, mock_manager_get_instance):
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     command = LinfoCommand()
     command.run('.', [])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.get_machines_stats.assert_called_once_with(test_lab.hash)
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.get_machines_stats.assert_called_once_with("lab_hash")
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_with_directory_absolute_path(mock_parse_lab, mock_docker_manager, mock_manager_get_instance, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_with_directory_absolute_path(mock_parse_hash, mock_docker_manager, mock_manager_get_instance):
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     command = LinfoCommand()
     command.run('.', ['-d', os.path.join('/test' 'path')])
-    mock_parse_lab.assert_called_once_with(os.path.abspath(os.path.join('/test' 'path')))
-    mock_docker_manager.get_machines_stats.assert_called_once_with(test_lab.hash)
+    mock_parse_hash.assert_called_once_with(os.path.abspath(os.path.join('/test' 'path')))
+    mock_docker_manager.get_machines_stats.assert_called_once_with("lab_hash")
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_with_directory_relative_path(mock_parse_lab, mock_docker_manager, mock_manager_get_instance, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_with_directory_relative_path(mock_parse_hash, mock_docker_manager, mock_manager_get_instance):
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     command = LinfoCommand()
     command.run('.', ['-d', os.path.join('test', 'path')])
-    mock_parse_lab.assert_called_once_with(os.path.join(os.getcwd(), os.path.join('test', 'path')))
-    mock_docker_manager.get_machines_stats.assert_called_once_with(test_lab.hash)
+    mock_parse_hash.assert_called_once_with(os.path.join(os.getcwd(), os.path.join('test', 'path')))
+    mock_docker_manager.get_machines_stats.assert_called_once_with("lab_hash")
 
 
 @mock.patch("src.Kathara.cli.command.LinfoCommand.LinfoCommand._get_lab_live_info")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_watch(mock_parse_lab, mock_get_lab_live_info, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_watch(mock_parse_hash, mock_get_lab_live_info):
+    mock_parse_hash.return_value = "lab_hash"
     command = LinfoCommand()
     command.run('.', ['-w'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_get_lab_live_info.assert_called_once_with(test_lab)
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_get_lab_live_info.assert_called_once_with("lab_hash")
 
 
 @mock.patch("src.Kathara.cli.command.LinfoCommand.LinfoCommand._get_machine_live_info")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_watch_with_name(mock_parse_lab, mock_get_machine_live_info, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_watch_with_name(mock_parse_hash, mock_get_machine_live_info):
+    mock_parse_hash.return_value = "lab_hash"
     command = LinfoCommand()
     command.run('.', ['-w', '-n', 'pc1'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_get_machine_live_info.assert_called_once_with(test_lab, 'pc1')
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_get_machine_live_info.assert_called_once_with("lab_hash", 'pc1')
 
 
 @mock.patch("src.Kathara.cli.command.LinfoCommand.create_topology_table")
@@ -111,6 +112,29 @@ def test_run_with_conf(mock_parse_lab, mock_get_conf_info, test_lab):
     mock_get_conf_info.assert_called_once_with(test_lab, machine_name=None)
 
 
+@mock.patch("src.Kathara.cli.command.LinfoCommand.LinfoCommand._get_boot_profile_info")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
+def test_run_with_boot_profile(mock_parse_lab, mock_get_boot_profile_info, test_lab):
+    command = LinfoCommand()
+    with mock.patch("src.Kathara.cli.command.LinfoCommand.Lab", return_value=test_lab) as mock_lab:
+        command.run('.', ['--boot-profile'])
+    assert not mock_parse_lab.called
+    mock_lab.assert_called_once_with(None, path=os.getcwd())
+    mock_get_boot_profile_info.assert_called_once_with(test_lab)
+
+
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
+def test_run_with_boot_profile_saved(mock_parse_lab, test_lab):
+    boot_profiler = BootProfiler()
+    boot_profiler.add_event("pc1", "host", "create", 1.0, 0.5)
+    boot_profiler.save(test_lab.fs)
+    command = LinfoCommand()
+    command.console = MagicMock()
+    with mock.patch("src.Kathara.cli.command.LinfoCommand.Lab", return_value=test_lab):
+        command.run('.', ['--boot-profile'])
+    command.console.print.assert_called_once()
+
+
 @mock.patch("src.Kathara.cli.command.LinfoCommand.LinfoCommand._get_conf_info")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 def test_run_with_conf_and_name(mock_parse_lab, mock_get_conf_info, test_lab):
@@ -123,14 +147,14 @@ def test_run_with_conf_and_name(mock_parse_lab, mock_get_conf_info, test_lab):
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
-def test_run_with_name(mock_parse_lab, mock_docker_manager, mock_manager_get_instance, test_lab):
-    mock_parse_lab.return_value = test_lab
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse_hash")
+def test_run_with_name(mock_parse_hash, mock_docker_manager, mock_manager_get_instance):
+    mock_parse_hash.return_value = "lab_hash"
     mock_manager_get_instance.return_value = mock_docker_manager
     command = LinfoCommand()
     command.run('.', ['-n', 'pc1'])
-    mock_parse_lab.assert_called_once_with(os.getcwd())
-    mock_docker_manager.get_machine_stats.assert_called_once_with('pc1', test_lab.hash)
+    mock_parse_hash.assert_called_once_with(os.getcwd())
+    mock_docker_manager.get_machine_stats.assert_called_once_with('pc1', "lab_hash")
 
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
@@ -141,7 +165,7 @@ def test_get_machine_live_info(mock_update, mock_docker_manager, mock_manager_ge
     mock_manager_get_instance.return_value = mock_docker_manager
     command = LinfoCommand()
     with pytest.raises(KeyboardInterrupt):
-        command._get_machine_live_info(test_lab, 'pc1')
+        command._get_machine_live_info(test_lab.hash, 'pc1')
     mock_docker_manager.get_machine_stats.assert_called_once_with('pc1', test_lab.hash)
     assert mock_update.call_count == 2
 
@@ -156,7 +180,7 @@ def test_get_lab_live_info(mock_update, mock_docker_manager, mock_manager_get_in
     machine_stats = map(lambda x: x, [{"A": MagicMock()}])
     mock_docker_manager.get_machines_stats.return_value = machine_stats
     with pytest.raises(KeyboardInterrupt):
-        LinfoCommand()._get_lab_live_info(test_lab)
+        LinfoCommand()._get_lab_live_info(test_lab.hash)
     mock_docker_manager.get_machines_stats.assert_called_once_with(test_lab.hash)
     assert mock_update.call_count == 2
 
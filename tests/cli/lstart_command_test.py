@@ -33,7 +33,7 @@ def mock_setting(mock_setting_class):
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_no_params(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -59,7 +59,25 @@ def test_run_no_params(mock_setting_get_instance, mock_parse_lab, mock_parse_dep
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_run_with_boot_profile(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
+                               mock_manager_get_instance, test_lab, mock_setting):
+    mock_parse_lab.return_value = test_lab
+    mock_manager_get_instance.return_value = mock_docker_manager
+    mock_setting_get_instance.return_value = mock_setting
+    command = LstartCommand()
+    command.run('.', ['--boot-profile'])
+    assert test_lab.general_options['boot_profile']
+    mock_docker_manager.deploy_lab.assert_called_once_with(
+        test_lab, selected_machines=set(), excluded_machines=set()
+    )
+
+
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_directory_absolute_path(mock_setting_get_instance, mock_parse_lab, mock_parse_dep,
@@ -86,7 +104,7 @@ def test_run_with_directory_absolute_path(mock_setting_get_instance, mock_parse_
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_directory_relative_path(mock_setting_get_instance, mock_parse_lab, mock_parse_dep,
@@ -113,7 +131,7 @@ def test_run_with_directory_relative_path(mock_setting_get_instance, mock_parse_
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_no_terminals(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -140,7 +158,7 @@ def test_run_with_no_terminals(mock_setting_get_instance, mock_parse_lab, mock_p
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_terminals(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -166,9 +184,51 @@ def test_run_with_terminals(mock_setting_get_instance, mock_parse_lab, mock_pars
             )
 
 
+@mock.patch("src.Kathara.cli.TerminalBroker.TerminalBroker.spawn_in_background")
+@mock.patch("src.Kathara.utils.is_platform")
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_run_terminal_broker(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
+                             mock_manager_get_instance, mock_is_platform, mock_spawn, test_lab, mock_setting):
+    mock_setting.manager_type = "docker"
+    mock_is_platform.return_value = True
+    mock_parse_lab.return_value = test_lab
+    mock_manager_get_instance.return_value = mock_docker_manager
+    mock_setting_get_instance.return_value = mock_setting
+    command = LstartCommand()
+    command.run('.', [])
+    mock_spawn.assert_called_once_with(os.getcwd(), test_lab.hash)
+    mock_docker_manager.deploy_lab.assert_called_once_with(
+        test_lab, selected_machines=set(), excluded_machines=set()
+    )
+
+
+@mock.patch("src.Kathara.cli.TerminalBroker.TerminalBroker.spawn_in_background")
+@mock.patch("src.Kathara.utils.is_platform")
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
+@mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_run_no_terminals_no_terminal_broker(mock_setting_get_instance, mock_parse_lab, mock_parse_dep,
+                                             mock_docker_manager, mock_manager_get_instance, mock_is_platform,
+                                             mock_spawn, test_lab, mock_setting):
+    mock_setting.manager_type = "docker"
+    mock_is_platform.return_value = True
+    mock_parse_lab.return_value = test_lab
+    mock_manager_get_instance.return_value = mock_docker_manager
+    mock_setting_get_instance.return_value = mock_setting
+    command = LstartCommand()
+    command.run('.', ['--noterminals'])
+    assert not mock_spawn.called
+
+
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.utils.is_admin")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
@@ -197,7 +257,7 @@ def test_run_with_privileged(mock_setting_get_instance, mock_is_admin, mock_pars
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.utils.is_admin")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
@@ -220,7 +280,7 @@ def test_run_with_privileged_no_root(mock_setting_get_instance, mock_is_admin, m
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.utils.is_admin")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
@@ -250,7 +310,7 @@ def test_run_with_one_machine_privileged(mock_setting_get_instance, mock_is_admi
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.utils.is_admin")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
@@ -276,7 +336,7 @@ def test_run_with_one_machine_privileged_no_root(mock_setting_get_instance, mock
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.FolderParser.FolderParser.parse")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse", side_effect=IOError)
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
@@ -305,7 +365,7 @@ def test_run_with_force_lab(mock_setting_get_instance, mock_parse_lab, mock_pars
 @mock.patch("src.Kathara.cli.command.LstartCommand.create_lab_table")
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_list(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -335,7 +395,7 @@ def test_run_with_list(mock_setting_get_instance, mock_parse_lab, mock_parse_dep
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_one_general_option(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -364,7 +424,7 @@ def test_run_with_one_general_option(mock_setting_get_instance, mock_parse_lab,
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_two_general_option(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -393,7 +453,7 @@ def test_run_with_two_general_option(mock_setting_get_instance, mock_parse_lab,
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_terminal_emu(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -420,7 +480,7 @@ def test_run_with_terminal_emu(mock_setting_get_instance, mock_parse_lab, mock_p
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_dry_mode(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -443,7 +503,7 @@ def test_run_with_dry_mode(mock_setting_get_instance, mock_parse_lab, mock_parse
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_no_hosthome(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -470,7 +530,7 @@ def test_run_with_no_hosthome(mock_setting_get_instance, mock_parse_lab, mock_pa
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_hosthome(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -497,7 +557,7 @@ def test_run_with_hosthome(mock_setting_get_instance, mock_parse_lab, mock_parse
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_shared(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -524,7 +584,7 @@ def test_run_with_shared(mock_setting_get_instance, mock_parse_lab, mock_parse_d
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_no_shared(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -551,7 +611,7 @@ def test_run_with_no_shared(mock_setting_get_instance, mock_parse_lab, mock_pars
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_one_device(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -578,7 +638,7 @@ def test_run_with_one_device(mock_setting_get_instance, mock_parse_lab, mock_par
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_with_two_device(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -605,7 +665,7 @@ def test_run_with_two_device(mock_setting_get_instance, mock_parse_lab, mock_par
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_exclude_one_device(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
@@ -632,7 +692,7 @@ def test_run_exclude_one_device(mock_setting_get_instance, mock_parse_lab, mock_
 
 @mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
-@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse")
+@mock.patch("src.Kathara.parser.netkit.DepParser.DepParser.parse_graph")
 @mock.patch("src.Kathara.parser.netkit.LabParser.LabParser.parse")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_run_exclude_two_device(mock_setting_get_instance, mock_parse_lab, mock_parse_dep, mock_docker_manager,
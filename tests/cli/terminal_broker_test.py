@@ -0,0 +1,234 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.cli.TerminalBroker import TerminalBroker
+from src.Kathara.cli.TerminalBrokerClient import TerminalBrokerClient, ATTACH_COMMAND
+
+
+@pytest.fixture()
+def runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture()
+def broker(runtime_dir):
+    broker = TerminalBroker("/lab/path", "lab_hash")
+    yield broker
+    broker._close()
+
+
+def send_request(client_socket, argv, fds):
+    socket.send_fds(client_socket, [json.dumps({"argv": argv}).encode("utf-8")], fds)
+
+
+def test_get_socket_path(runtime_dir):
+    assert TerminalBrokerClient.get_socket_path("lab_hash") == os.path.join(runtime_dir, "kathara", "lab_hash.sock")
+
+
+def test_attach_no_broker(runtime_dir):
+    assert TerminalBrokerClient.attach("lab_hash", ["-l", "pc1"]) is None
+
+
+def test_attach(broker):
+    broker._listen()
+    requests = []
+
+    def serve():
+        (connection, _) = broker._server.accept()
+        with connection:
+            (data, fds, _, _) = socket.recv_fds(connection, 1024, 3)
+            requests.append((json.loads(data), len(fds)))
+            for fd in fds:
+                os.close(fd)
+            connection.sendall(bytes([3]))
+
+    server_thread = threading.Thread(target=serve)
+    server_thread.start()
+
+    assert TerminalBrokerClient.attach("lab_hash", ["-l", "pc1"]) == 3
+    server_thread.join()
+    assert requests == [({"argv": ["-l", "pc1"]}, 3)]
+
+
+def test_get_trusted_socket_path(broker):
+    broker._listen()
+    assert TerminalBrokerClient.get_trusted_socket_path("lab_hash") == broker.socket_path
+
+
+def test_get_trusted_socket_path_no_broker(runtime_dir):
+    assert TerminalBrokerClient.get_trusted_socket_path("lab_hash") is None
+
+
+def test_get_trusted_socket_path_public_directory(broker, runtime_dir):
+    broker._listen()
+    os.chmod(os.path.join(runtime_dir, "kathara"), 0o755)
+
+    assert TerminalBrokerClient.get_trusted_socket_path("lab_hash") is None
+    assert TerminalBrokerClient.attach("lab_hash", ["-l", "pc1"]) is None
+
+
+def test_get_trusted_socket_path_symlink_directory(broker, runtime_dir, tmp_path):
+    broker.socket_path = os.path.join(tmp_path, "private", "lab_hash.sock")
+    broker._listen()
+    os.symlink(os.path.join(tmp_path, "private"), os.path.join(runtime_dir, "kathara"))
+
+    assert TerminalBrokerClient.get_trusted_socket_path("lab_hash") is None
+
+
+def test_get_trusted_socket_path_other_owner(broker):
+    broker._listen()
+
+    with mock.patch("src.Kathara.cli.TerminalBrokerClient.os.getuid", return_value=os.getuid() + 1):
+        assert TerminalBrokerClient.get_trusted_socket_path("lab_hash") is None
+
+
+def test_attach_untrusted_peer(broker):
+    broker._listen()
+
+    with mock.patch.object(TerminalBrokerClient, "_is_peer_trusted", return_value=False) as mock_is_peer_trusted:
+        assert TerminalBrokerClient.attach("lab_hash", ["-l", "pc1"]) is None
+        mock_is_peer_trusted.assert_called_once()
+
+
+def test_is_peer_trusted(broker):
+    broker._listen()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(broker.socket_path)
+        assert TerminalBrokerClient._is_peer_trusted(client_socket)
+        with mock.patch("src.Kathara.cli.TerminalBrokerClient.os.getuid", return_value=os.getuid() + 1):
+            assert not TerminalBrokerClient._is_peer_trusted(client_socket)
+
+
+def test_listen_and_close(broker, runtime_dir):
+    broker._listen()
+    assert os.path.exists(broker.socket_path)
+    assert os.stat(os.path.join(runtime_dir, "kathara")).st_mode & 0o777 == 0o700
+
+    broker._close()
+    assert not os.path.exists(broker.socket_path)
+
+
+def test_close_replaced_socket(broker):
+    broker._listen()
+    new_broker = TerminalBroker("/lab/path", "lab_hash")
+    new_broker._listen()
+
+    broker._close()
+    assert os.path.exists(new_broker.socket_path)
+
+    new_broker._close()
+    assert not os.path.exists(new_broker.socket_path)
+
+
+def test_start_session_malformed_request(broker):
+    (client_socket, broker_socket) = socket.socketpair()
+    client_socket.sendall(b"not json")
+
+    with mock.patch("os.fork") as mock_fork:
+        broker._start_session(broker_socket)
+
+    assert not mock_fork.called
+    assert not broker._sessions
+    assert client_socket.recv(1) == b""
+    client_socket.close()
+
+
+@mock.patch("src.Kathara.cli.TerminalBroker.Kathara.get_instance")
+def test_start_session(mock_get_instance, broker):
+    mock_get_instance.return_value.connect_tty.side_effect = \
+        lambda **kwargs: print(kwargs['machine_name'], kwargs['lab_hash'], kwargs['shell'], kwargs['logs'])
+    broker._listen()
+    (client_socket, broker_socket) = socket.socketpair()
+    (stdin_read, stdin_write) = os.pipe()
+    (stdout_read, stdout_write) = os.pipe()
+    send_request(client_socket, ["--shell", "bash", "pc1"], [stdin_read, stdout_write, stdout_write])
+    for fd in (stdin_read, stdout_write):
+        os.close(fd)
+
+    broker._start_session(broker_socket)
+    assert len(broker._sessions) == 1
+
+    with client_socket:
+        assert client_socket.recv(1) == bytes([0])
+    with os.fdopen(stdout_read) as session_stdout:
+        assert session_stdout.read() == "pc1 lab_hash bash False\n"
+    os.close(stdin_write)
+
+    start = time.monotonic()
+    while broker._sessions and time.monotonic() - start < 5:
+        broker._reap_sessions()
+        time.sleep(0.01)
+    assert not broker._sessions
+
+
+@mock.patch("src.Kathara.cli.TerminalBroker.subprocess.Popen")
+@mock.patch("src.Kathara.utils.get_executable_path")
+def test_spawn(mock_get_executable_path, mock_popen):
+    mock_get_executable_path.return_value = "\"/usr/bin/kathara\""
+    (ready_read, ready_write) = os.pipe()
+    os.write(ready_write, b"ready\n")
+    os.close(ready_write)
+    mock_popen.return_value.stdout = os.fdopen(ready_read, "rb")
+
+    assert TerminalBroker.spawn("/lab/path", "lab_hash")
+    assert mock_popen.call_args.args[0] == ["/usr/bin/kathara", "terminal-broker", "/lab/path", "lab_hash"]
+    assert mock_popen.call_args.kwargs["start_new_session"]
+
+
+@mock.patch("src.Kathara.cli.TerminalBroker.TerminalBroker.spawn")
+def test_spawn_in_background(mock_spawn):
+    started = threading.Event()
+    mock_spawn.side_effect = lambda lab_path, lab_hash: started.wait(5)
+
+    spawn_thread = TerminalBroker.spawn_in_background("/lab/path", "lab_hash")
+
+    # The caller does not wait for the broker to be ready
+    assert spawn_thread.is_alive()
+    started.set()
+    spawn_thread.join(5)
+    mock_spawn.assert_called_once_with("/lab/path", "lab_hash")
+
+
+def test_notify_ready_closed_stdout():
+    (ready_read, ready_write) = os.pipe()
+    os.close(ready_read)
+
+    with mock.patch("sys.stdout") as mock_stdout, mock.patch("os.dup2") as mock_dup2:
+        mock_stdout.fileno.return_value = ready_write
+        TerminalBroker._notify_ready()
+
+    assert mock_dup2.called
+    os.close(ready_write)
+
+
+def test_attach_no_arguments():
+    result = subprocess.run([sys.executable, os.path.join("src", "kathara.py"), ATTACH_COMMAND],
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 1
+    assert "Traceback" not in result.stderr
+    assert "usage" in result.stdout
+
+
+@mock.patch("src.Kathara.cli.TerminalBroker.READY_TIMEOUT", 0.01)
+@mock.patch("src.Kathara.cli.TerminalBroker.subprocess.Popen")
+@mock.patch("src.Kathara.utils.get_executable_path")
+def test_spawn_not_ready(mock_get_executable_path, mock_popen):
+    mock_get_executable_path.return_value = "\"/usr/bin/kathara\""
+    (ready_read, ready_write) = os.pipe()
+    mock_popen.return_value.stdout = os.fdopen(ready_read, "rb")
+
+    assert not TerminalBroker.spawn("/lab/path", "lab_hash")
+    os.close(ready_write)
@@ -65,3 +65,14 @@ def test_run_with_all_no_root(mock_confirmation_prompt, mock_is_admin, mock_wipe
         command.run('.', ['-a'])
     mock_confirmation_prompt.assert_called_once()
     assert not mock_wipe.called
+
+
+@mock.patch("src.Kathara.cli.command.WipeCommand.confirmation_prompt")
+@mock.patch("src.Kathara.manager.Kathara.Kathara.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager")
+def test_run_with_fast(mock_docker_manager, mock_manager_get_instance, mock_confirmation_prompt):
+    mock_manager_get_instance.return_value = mock_docker_manager
+    command = WipeCommand()
+    command.run('.', ['-f', '--fast'])
+    assert not mock_confirmation_prompt.called
+    mock_docker_manager.wipe.assert_called_once_with(all_users=False, fast=True)
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.model.PackCache import PackCache
+from src.Kathara.parser.netkit.LabCache import LabCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    # Tests must never read or write the persistent caches in the home of the user running them
+    monkeypatch.setattr(LabCache.get_instance(), "path", os.path.join(tmp_path, "kathara_cache", "labs"))
+    pack_cache = PackCache.get_instance()
+    monkeypatch.setattr(pack_cache, "path", os.path.join(tmp_path, "kathara_cache", "pack"))
+    monkeypatch.setattr(pack_cache, "_indexes", {})
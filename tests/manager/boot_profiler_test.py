@@ -0,0 +1,96 @@
+import sys
+
+from fs import open_fs
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.manager.BootProfiler import BootProfiler
+
+
+#
+# TEST: phase
+#
+def test_phase():
+    boot_profiler = BootProfiler()
+    with boot_profiler.phase("pc1", "create"):
+        pass
+
+    [(device_name, category, name, start, duration)] = boot_profiler.events
+    assert (device_name, category, name) == ("pc1", "host", "create")
+    assert start > 0 and duration >= 0
+
+
+def test_phase_exception():
+    boot_profiler = BootProfiler()
+    try:
+        with boot_profiler.phase("pc1", "start"):
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert len(boot_profiler.events) == 1
+
+
+#
+# TEST: add_trace
+#
+def test_parse_trace():
+    lines = ["+ 1700000000.123456 umount /etc/hosts", "output", "++ 1700000001,5 echo hi", "+ $(date) ls"]
+    assert BootProfiler.parse_trace(lines) == [(1700000000.123456, "umount /etc/hosts"), (1700000001.5, "echo hi")]
+
+
+def test_add_trace():
+    boot_profiler = BootProfiler()
+    commands = boot_profiler.add_trace("pc1", "startup", ["+ 10.0 tar xf -", "+ 12.0 /hostlab/pc1.startup"], end=15.0)
+
+    assert BootProfiler.get_command_end(commands, "/hostlab/pc1.startup") is None
+    assert BootProfiler.get_command_end(commands, "tar") == 12.0
+    assert boot_profiler.events == [
+        ("pc1", "startup", "tar xf -", 10.0, 2.0), ("pc1", "startup", "/hostlab/{device}.startup", 12.0, 3.0)
+    ]
+
+
+#
+# TEST: to_chrome_trace
+#
+def test_to_chrome_trace():
+    boot_profiler = BootProfiler()
+    boot_profiler.add_event("pc2", "host", "create", 2.0, 1.0)
+    boot_profiler.add_event("pc1", "host", "create", 1.0, 0.5)
+
+    assert boot_profiler.to_chrome_trace() == {
+        "traceEvents": [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "pc1"}},
+            {"name": "create", "cat": "host", "ph": "X", "pid": 1, "tid": 1, "ts": 1000000, "dur": 500000},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "pc2"}},
+            {"name": "create", "cat": "host", "ph": "X", "pid": 1, "tid": 2, "ts": 2000000, "dur": 1000000},
+        ],
+        "displayTimeUnit": "ms"
+    }
+
+
+def test_save_and_load():
+    lab_fs = open_fs("mem://")
+    assert BootProfiler.load(lab_fs) is None
+
+    boot_profiler = BootProfiler()
+    boot_profiler.add_event("pc1", "host", "create", 1.0, 0.5)
+    boot_profiler.save(lab_fs)
+
+    assert BootProfiler.load(lab_fs) == boot_profiler.to_chrome_trace()
+
+
+#
+# TEST: summarize
+#
+def test_summarize():
+    boot_profiler = BootProfiler()
+    boot_profiler.add_event("pc1", "host", "create", 0.0, 1.0)
+    boot_profiler.add_event("pc1", "script", "sleep 5", 1.0, 5.0)
+    boot_profiler.add_event("pc2", "host", "create", 0.0, 2.0)
+    boot_profiler.add_event("pc2", "script", "ip link set eth0 up", 2.0, 0.5)
+
+    (devices, phases) = BootProfiler.summarize(boot_profiler.to_chrome_trace(), size=2)
+
+    assert devices == [("pc1", 6.0), ("pc2", 2.5)]
+    assert phases == [("script", "sleep 5", 1, 5.0, 5.0), ("host", "create", 2, 3.0, 2.0)]
@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.manager.DependencyScheduler import DependencyScheduler
+from src.Kathara.exceptions import MachineDependencyError
+
+
+#
+# TEST: schedule
+#
+def test_schedule_no_dependencies():
+    scheduler = DependencyScheduler()
+    levels = scheduler.schedule(["pc1", "pc2", "pc3"])
+    assert levels == {"pc1": 0, "pc2": 0, "pc3": 0}
+    assert scheduler.critical_path_length == 1
+
+
+def test_schedule_diamond():
+    scheduler = DependencyScheduler({"pc2": ["pc1"], "pc3": ["pc1"], "pc4": ["pc2", "pc3"]})
+    levels = scheduler.schedule(["pc1", "pc2", "pc3", "pc4", "pc5"])
+    assert levels == {"pc1": 0, "pc2": 1, "pc3": 1, "pc4": 2, "pc5": 0}
+    assert scheduler.critical_path_length == 3
+
+
+def test_schedule_longest_chain():
+    scheduler = DependencyScheduler({"pc2": ["pc1"], "pc3": ["pc2"], "pc4": ["pc1", "pc3"]})
+    levels = scheduler.schedule(["pc4", "pc3", "pc2", "pc1"])
+    assert levels == {"pc1": 0, "pc2": 1, "pc3": 2, "pc4": 3}
+
+
+def test_schedule_ignores_not_selected_dependencies():
+    scheduler = DependencyScheduler({"pc2": ["pc1"], "pc3": ["pc2"]})
+    levels = scheduler.schedule(["pc2", "pc3"])
+    assert levels == {"pc2": 0, "pc3": 1}
+
+
+def test_schedule_empty():
+    scheduler = DependencyScheduler({"pc2": ["pc1"]})
+    assert scheduler.schedule([]) == {}
+    assert scheduler.critical_path_length == 0
+
+
+def test_schedule_loop():
+    scheduler = DependencyScheduler({"pc1": ["pc2"], "pc2": ["pc3"], "pc3": ["pc1"], "pc4": ["pc5"]})
+    with pytest.raises(MachineDependencyError) as e:
+        scheduler.schedule(["pc1", "pc2", "pc3", "pc4", "pc5"])
+    assert "pc1 -> pc2 -> pc3 -> pc1" in str(e.value)
+    assert "pc4" not in str(e.value)
+
+
+#
+# TEST: run
+#
+def test_run_respects_dependencies():
+    scheduler = DependencyScheduler({"pc2": ["pc1"], "pc3": ["pc1"], "pc4": ["pc2", "pc3"]}, pool_size=4)
+    deployed = []
+    lock = threading.Lock()
+
+    def deploy(item):
+        time.sleep(0.01)
+        with lock:
+            deployed.append(item[0])
+
+    items = [("pc4", "d4"), ("pc3", "d3"), ("pc2", "d2"), ("pc1", "d1")]
+    scheduler.run(items, deploy)
+
+    assert deployed[0] == "pc1"
+    assert set(deployed[1:3]) == {"pc2", "pc3"}
+    assert deployed[3] == "pc4"
+    assert set(scheduler.level_timings.keys()) == {0, 1, 2}
+    assert scheduler.level_timings[0] <= scheduler.level_timings[1] <= scheduler.level_timings[2]
+
+
+def test_run_parallel_independent_devices():
+    scheduler = DependencyScheduler(pool_size=4)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def deploy(_):
+        # Fails with BrokenBarrierError if devices are not deployed concurrently
+        barrier.wait()
+
+    scheduler.run([(f"pc{i}", i) for i in range(4)], deploy)
+
+
+def test_run_callback():
+    scheduler = DependencyScheduler({"pc2": ["pc1"]})
+    callback = Mock()
+
+    scheduler.run([("pc1", "d1"), ("pc2", "d2")], Mock(), callback=callback)
+
+    assert callback.call_count == 2
+    (first_item, first_level, _), _ = callback.call_args_list[0]
+    (second_item, second_level, _), _ = callback.call_args_list[1]
+    assert first_item == ("pc1", "d1") and first_level == 0
+    assert second_item == ("pc2", "d2") and second_level == 1
+
+
+def test_run_error_stops_dependents():
+    scheduler = DependencyScheduler({"pc2": ["pc1"]})
+    deploy = Mock(side_effect=ValueError("error"))
+
+    with pytest.raises(ValueError):
+        scheduler.run([("pc1", "d1"), ("pc2", "d2")], deploy)
+
+    deploy.assert_called_once_with(("pc1", "d1"))
+
+
+def test_run_loop():
+    scheduler = DependencyScheduler({"pc1": ["pc2"], "pc2": ["pc1"]})
+    deploy = Mock()
+
+    with pytest.raises(MachineDependencyError):
+        scheduler.run([("pc1", "d1"), ("pc2", "d2")], deploy)
+
+    assert not deploy.called
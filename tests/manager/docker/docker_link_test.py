@@ -1,9 +1,11 @@
 import sys
+import threading
 from unittest import mock
 from unittest.mock import Mock, call
 
 import docker.types
 import pytest
+from docker.errors import APIError, NotFound
 
 sys.path.insert(0, './')
 
@@ -350,6 +352,42 @@ def test_deploy_links(mock_deploy_link, docker_link):
     assert mock_deploy_link.call_count == 3
 
 
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+@mock.patch("src.Kathara.utils.get_current_user_name")
+def test_deploy_links_single_networks_lookup(mock_get_current_user_name, mock_setting_get_instance, docker_link):
+    mock_get_current_user_name.return_value = 'user'
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{
+        'shared_cds': SharedCollisionDomainsOption.NOT_SHARED,
+        'net_prefix': 'kathara',
+        'remote_url': None,
+        'network_plugin': 'kathara/katharanp'
+    })
+    mock_setting_get_instance.return_value = setting_mock
+
+    lab = Lab("Default scenario")
+    link_a = lab.get_or_new_link("A")
+    link_b = lab.get_or_new_link("B")
+    link_c = lab.get_or_new_link("C")
+
+    existing_network = Mock()
+    existing_network.attrs = {"Labels": {"name": "A"}}
+    docker_link.client.networks.list.side_effect = [[existing_network], []]
+
+    docker_link.deploy_links(lab)
+
+    docker_link.client.networks.list.assert_any_call(
+        filters={"label": ["app=kathara", "user=user", f"lab_hash={lab.hash}"]}, greedy=False
+    )
+    # One call for the existing networks, one for the Docker bridge
+    assert docker_link.client.networks.list.call_count == 2
+    assert docker_link.client.networks.create.call_count == 2
+    assert link_a.api_object == existing_network
+    assert link_b.api_object == docker_link.client.networks.create.return_value
+    assert link_c.api_object == docker_link.client.networks.create.return_value
+    assert docker_link._networks_index is None
+
+
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._deploy_link")
 def test_deploy_links_no_link(mock_deploy_link, docker_link):
     lab = Lab("Default scenario")
@@ -446,79 +484,168 @@ def test_get_links_by_filters_only_user_name(docker_link):
 #
 # TEST: undeploy
 #
-@mock.patch("docker.models.networks.Network")
-@mock.patch("docker.models.networks.Network")
-@mock.patch("docker.models.networks.Network")
-@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._undeploy_link")
+def network_object(network_id, name):
+    network = Mock()
+    network.id = network_id
+    network.attrs = {"Labels": {"name": name}}
+    return network
+
+
+def container_object(container_id, *network_ids):
+    container = Mock()
+    container.id = container_id
+    container.attrs = {
+        "NetworkSettings": {"Networks": {f"net_{x}": {"NetworkID": x} for x in network_ids}}
+    }
+    return container
+
+
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
-def test_undeploy(mock_get_links_by_filters, mock_undeploy_link, mock_net1, mock_net2, mock_net3,
-                  docker_link):
-    lab = Lab("Default scenario")
-    lab.get_or_new_link("A")
-    lab.get_or_new_link("B")
-    lab.get_or_new_link("C")
-    mock_get_links_by_filters.return_value = [mock_net1, mock_net2, mock_net3]
+def test_undeploy(mock_get_links_by_filters, mock_delete_link, docker_link):
+    net1, net2, net3 = network_object("id1", "A"), network_object("id2", "B"), network_object("id3", "C")
+    mock_get_links_by_filters.return_value = [net1, net2, net3]
+    docker_link.client.containers.list.return_value = []
     docker_link.undeploy("lab_hash")
-    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash")
-    assert mock_net1.reload.call_count == 1
-    assert mock_net2.reload.call_count == 1
-    assert mock_net3.reload.call_count == 1
-    assert mock_undeploy_link.call_count == 3
+    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash", user=None, greedy=False)
+    docker_link.client.containers.list.assert_called_once_with(all=True, sparse=True)
+    assert not net1.reload.called
+    assert mock_delete_link.call_count == 3
 
 
-@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._undeploy_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
-def test_undeploy_empty_lab(mock_get_links_by_filters, mock_undeploy_link, docker_link):
-    lab = Lab("Default scenario")
+def test_undeploy_empty_lab(mock_get_links_by_filters, mock_delete_link, docker_link):
     mock_get_links_by_filters.return_value = []
+    docker_link.client.containers.list.return_value = []
     docker_link.undeploy("lab_hash")
-    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash")
-    assert not mock_undeploy_link.called
+    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash", user=None, greedy=False)
+    assert not mock_delete_link.called
 
 
-@mock.patch("docker.models.networks.Network")
-@mock.patch("docker.models.networks.Network")
-@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._undeploy_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
-def test_undeploy_selected_links(mock_get_links_by_filters, mock_undeploy_link, mock_net1, mock_net2, docker_link):
-    lab = Lab("Default scenario")
-    lab.get_or_new_link("A")
-    lab.get_or_new_link("B")
+def test_undeploy_selected_links(mock_get_links_by_filters, mock_delete_link, docker_link):
+    net1, net2 = network_object("id1", "A"), network_object("id2", "B")
+    mock_get_links_by_filters.return_value = [net1, net2]
+    docker_link.client.containers.list.return_value = []
 
-    mock_net1.attrs = {"Labels": {"name": "A"}}
-    mock_net2.attrs = {"Labels": {"name": "B"}}
+    docker_link.undeploy("lab_hash", selected_links={"B"})
+    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash", user=None, greedy=False)
+    mock_delete_link.assert_called_once_with(net2)
 
-    mock_get_links_by_filters.return_value = [mock_net1, mock_net2]
 
-    docker_link.undeploy("lab_hash", selected_links={"B"})
-    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash")
-    assert mock_net1.reload.call_count == 0
-    assert mock_net2.reload.call_count == 1
-    assert mock_undeploy_link.call_count == 1
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_undeploy_attached_networks(mock_get_links_by_filters, mock_delete_link, docker_link):
+    net1, net2 = network_object("id1", "A"), network_object("id2", "B")
+    mock_get_links_by_filters.return_value = [net1, net2]
+    docker_link.client.containers.list.return_value = [container_object("c1", "id1")]
+
+    docker_link.undeploy("lab_hash")
+    mock_delete_link.assert_called_once_with(net2)
+
+
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_undeploy_pipelined(mock_get_links_by_filters, mock_delete_link, docker_link):
+    net1, net2, net3 = network_object("id1", "A"), network_object("id2", "B"), network_object("id3", "C")
+    mock_get_links_by_filters.return_value = [net1, net2, net3]
+    # c3 is not removed (e.g., an excluded device), so its network is kept
+    c1, c2, c3 = container_object("c1", "id1", "id2"), container_object("c2", "id2"), container_object("c3", "id3")
+    net1_deleted = threading.Event()
+    mock_delete_link.side_effect = lambda network: net1_deleted.set() if network is net1 else None
+    deleted_while_removing = []
+
+    def removed_containers():
+        yield c1
+        deleted_while_removing.append(net1_deleted.wait(timeout=5))
+        yield c2
+
+    docker_link.undeploy("lab_hash", user="user", containers=[c1, c2, c3], removed_containers=removed_containers())
+
+    mock_get_links_by_filters.assert_called_once_with(lab_hash="lab_hash", user="user", greedy=False)
+    assert not docker_link.client.containers.list.called
+    assert mock_delete_link.call_count == 2
+    mock_delete_link.assert_any_call(net1)
+    mock_delete_link.assert_any_call(net2)
+    # The network attached only to the first container is released before the second container is removed
+    assert deleted_while_removing == [True]
+
+
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_undeploy_delete_error(mock_get_links_by_filters, mock_delete_link, docker_link):
+    response = mock.Mock()
+    response.status_code = 403
+    mock_delete_link.side_effect = APIError("error", response=response, explanation="has active endpoints")
+    mock_get_links_by_filters.return_value = [network_object("id1", "A")]
+    docker_link.client.containers.list.return_value = []
+
+    docker_link.undeploy("lab_hash")
+    mock_delete_link.assert_called_once()
+
+
+#
+# TEST: count_attached_containers
+#
+def test_count_attached_containers():
+    containers = [container_object("c1", "id1", "id2"), container_object("c2", "id2"), Mock(attrs={})]
+    assert DockerLink.count_attached_containers(containers) == {"id1": 1, "id2": 2}
 
 
 #
 # TEST: wipe
 #
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._undeploy_link")
-@mock.patch("docker.models.networks.Network")
-@mock.patch("docker.models.networks.Network")
-@mock.patch("docker.models.networks.Network")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
-def test_wipe(mock_get_links_by_filters, mock_net1, mock_net2, mock_net3, mock_undeploy_link, docker_link):
-    lab = Lab("Default scenario")
-    lab.get_or_new_link("A")
-    lab.get_or_new_link("B")
-    lab.get_or_new_link("C")
-    mock_get_links_by_filters.return_value = [mock_net1, mock_net2, mock_net3]
-    docker_link.wipe()
-    mock_get_links_by_filters.assert_called_once_with(user=None)
-    assert mock_net1.reload.call_count == 1
-    assert mock_net2.reload.call_count == 1
-    assert mock_net3.reload.call_count == 1
+def test_wipe(mock_get_links_by_filters, mock_undeploy_link, docker_link):
+    net1, net2, net3 = network_object("id1", "A"), network_object("id2", "B"), network_object("id3", "C")
+    mock_get_links_by_filters.return_value = [net1, net2, net3]
+    docker_link.client.containers.list.return_value = [container_object("c1", "id3")]
+    assert docker_link.wipe() == 2
+    mock_get_links_by_filters.assert_called_once_with(user=None, greedy=False)
+    docker_link.client.containers.list.assert_called_once_with(all=True, sparse=True)
+    assert mock_undeploy_link.call_count == 2
+    assert call(net3) not in mock_undeploy_link.mock_calls
+
+
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._undeploy_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_wipe_count_removed(mock_get_links_by_filters, mock_undeploy_link, docker_link):
+    net1, net2, net3 = network_object("id1", "A"), network_object("id2", "B"), network_object("id3", "C")
+    mock_get_links_by_filters.return_value = [net1, net2, net3]
+    docker_link.client.containers.list.return_value = []
+
+    def undeploy_link(network):
+        if network == net2:
+            raise NotFound("removed")
+        if network == net3:
+            raise APIError("network has active endpoints")
+
+    mock_undeploy_link.side_effect = undeploy_link
+
+    assert docker_link.wipe() == 1
     assert mock_undeploy_link.call_count == 3
 
 
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink._delete_link")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_wipe_fast(mock_get_links_by_filters, mock_delete_link, docker_link):
+    net1, net2 = network_object("id1", "A"), network_object("id2", "B")
+    mock_get_links_by_filters.return_value = [net1, net2]
+
+    def delete_link(network):
+        if network == net2:
+            raise APIError("network has active endpoints")
+
+    mock_delete_link.side_effect = delete_link
+
+    assert docker_link.wipe(fast=True) == 1
+    assert not docker_link.client.containers.list.called
+    assert mock_delete_link.call_count == 2
+
+
 #
 # TEST: get_links_stats
 #
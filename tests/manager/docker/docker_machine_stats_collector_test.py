@@ -0,0 +1,77 @@
+import sys
+from unittest.mock import Mock
+
+from docker.errors import NotFound
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.docker.stats.DockerMachineStatsCollector import DockerMachineStatsCollector
+
+
+def sparse_container(container_id, name, stats):
+    container = Mock()
+    container.id = container_id
+    container.status = "running"
+    container.attrs = {
+        "Names": [f"/{name}"],
+        "Labels": {"lab_hash": "lab_hash", "name": name.split("_")[-1], "user": "user"},
+        "Image": "kathara/base",
+        "State": "running",
+        "NetworkSettings": {"Networks": {}},
+    }
+    container.stats.side_effect = stats
+    return container
+
+
+def sample(total_usage, system_cpu_usage):
+    return {
+        'pids_stats': {'current': 2},
+        'cpu_stats': {'cpu_usage': {'total_usage': total_usage}, 'system_cpu_usage': system_cpu_usage,
+                      'online_cpus': 1},
+        'memory_stats': {'usage': 512, 'limit': 1024},
+    }
+
+
+def test_stream_reuses_workers_and_stats():
+    pc1 = sparse_container("id1", "kathara_user_pc1", [sample(10, 100), sample(30, 200)])
+    pc2 = sparse_container("id2", "kathara_user_pc2", [sample(0, 100), sample(50, 200)])
+    list_containers = Mock(return_value=[pc1, pc2])
+
+    stream = DockerMachineStatsCollector(list_containers, interval=0).stream()
+    first = next(stream)
+    second = next(stream)
+
+    assert list_containers.call_count == 2
+    assert set(second.keys()) == {"kathara_user_pc1", "kathara_user_pc2"}
+    assert first["kathara_user_pc1"] is second["kathara_user_pc1"]
+    assert second["kathara_user_pc1"].name == "pc1"
+    assert second["kathara_user_pc1"].image == "kathara/base"
+    assert second["kathara_user_pc1"].pids == 2
+    assert second["kathara_user_pc1"].cpu_usage == "20.00%"
+    assert second["kathara_user_pc2"].cpu_usage == "50.00%"
+    pc1.stats.assert_called_with(stream=False, one_shot=True)
+    assert not pc1.reload.called
+
+
+def test_stream_without_one_shot():
+    pc1 = sparse_container("id1", "kathara_user_pc1", [sample(10, 100)])
+
+    next(DockerMachineStatsCollector(Mock(return_value=[pc1]), one_shot=False, interval=0).stream())
+
+    pc1.stats.assert_called_once_with(stream=False)
+
+
+def test_stream_forgets_removed_containers():
+    pc1 = sparse_container("id1", "kathara_user_pc1", [sample(10, 100), NotFound("removed")])
+    pc2 = sparse_container("id2", "kathara_user_pc2", [sample(0, 100), sample(50, 200)])
+    list_containers = Mock(side_effect=[[pc1, pc2], [pc1, pc2], [pc2]])
+
+    stream = DockerMachineStatsCollector(list_containers, interval=0).stream()
+    assert set(next(stream).keys()) == {"kathara_user_pc1", "kathara_user_pc2"}
+    assert set(next(stream).keys()) == {"kathara_user_pc2"}
+
+
+def test_stream_no_containers():
+    list_containers = Mock(return_value=[])
+
+    assert next(DockerMachineStatsCollector(list_containers, interval=0).stream()) == {}
@@ -1,11 +1,12 @@
 import os
 import shlex
 import sys
+import time
 from unittest import mock
 from unittest.mock import Mock, call
 
 import pytest
-from docker.errors import APIError
+from docker.errors import APIError, NotFound
 from requests import Response
 
 sys.path.insert(0, './')
@@ -14,7 +15,8 @@ from src.Kathara.manager.docker.exec_stream.DockerExecStream import DockerExecSt
 from src.Kathara.model.Lab import Lab
 from src.Kathara.model.Link import Link
 from src.Kathara.model.Machine import Machine
-from src.Kathara.manager.docker.DockerMachine import DockerMachine
+from src.Kathara.manager.docker.DockerMachine import DockerMachine, BOOT_PROFILE_SEPARATOR
+from src.Kathara.foundation.manager.BootProfiler import BootProfiler, BOOT_TRACE_PATH, BOOT_TRACE_PS4
 from src.Kathara.exceptions import DockerPluginError, MachineBinaryError, PrivilegeError, InvocationError
 from src.Kathara.types import SharedCollisionDomainsOption
 from src.Kathara.event.EventDispatcher import EventDispatcher
@@ -1131,6 +1133,22 @@ def test_start_plugin_error_network_connect(default_device, default_link, defaul
         docker_machine.start(default_device)
 
 
+def test_start_boot_profile(docker_machine, default_device, default_link, default_link_b):
+    default_device.add_interface(default_link)
+    default_device.add_interface(default_link_b)
+    boot_profiler = BootProfiler()
+    default_device.lab.add_option("_boot_profiler", boot_profiler)
+    docker_machine.client.api.exec_create.return_value = {"Id": "1234"}
+    docker_machine.client.api.exec_inspect.return_value = {"ExitCode": 0}
+
+    docker_machine.start(default_device)
+
+    startup_commands = docker_machine.client.api.exec_create.call_args.args[1][2]
+    assert startup_commands.startswith(f"PS4='{BOOT_TRACE_PS4}'; exec 2> {BOOT_TRACE_PATH}; set -x; ")
+    assert "set -x\\n\\n;" in startup_commands
+    assert [event[2] for event in boot_profiler.events] == ["container_start", "network_attach", "startup_exec"]
+
+
 #
 # TEST: _deploy_and_start_machine
 #
@@ -1175,6 +1193,37 @@ def test_deploy_machines(mock_deploy_and_start, mock_setting_get_instance, docke
     mock_deploy_and_start.assert_any_call(('pc2', pc2))
 
 
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._collect_boot_profile")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._deploy_and_start_machine")
+def test_deploy_machines_boot_profile(mock_deploy_and_start, mock_collect_boot_profile, mock_setting_get_instance,
+                                      docker_machine):
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{
+        'shared_cds': SharedCollisionDomainsOption.NOT_SHARED,
+        'device_prefix': 'dev_prefix',
+        "device_shell": '/bin/bash',
+        'enable_ipv6': False,
+        "hosthome_mount": False,
+        "shared_mount": False,
+        'remote_url': None
+    })
+    mock_setting_get_instance.return_value = setting_mock
+
+    lab = Lab("Default scenario")
+    lab.get_or_new_machine("pc1", **{'image': 'kathara/test1'})
+    lab.add_option("boot_profile", True)
+    profilers = []
+    mock_deploy_and_start.side_effect = lambda _: profilers.append(lab.general_options['_boot_profiler'])
+
+    docker_machine.deploy_machines(lab)
+
+    assert isinstance(profilers[0], BootProfiler)
+    mock_collect_boot_profile.assert_called_once()
+    assert mock_collect_boot_profile.call_args.args[2] is profilers[0]
+    assert '_boot_profiler' not in lab.general_options
+
+
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._deploy_and_start_machine")
 def test_deploy_machines_selected_machines(mock_deploy_and_start, mock_setting_get_instance, docker_machine):
@@ -1252,6 +1301,49 @@ def test_deploy_machines_selected_and_excluded_machines(mock_deploy_and_start, m
     assert not mock_deploy_and_start.called
 
 
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._deploy_and_start_machine")
+def test_deploy_machines_dependencies(mock_deploy_and_start, mock_setting_get_instance, docker_machine):
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{
+        'shared_cds': SharedCollisionDomainsOption.NOT_SHARED,
+        'device_prefix': 'dev_prefix',
+        "device_shell": '/bin/bash',
+        'enable_ipv6': False,
+        "hosthome_mount": False,
+        "shared_mount": False,
+        'remote_url': None
+    })
+    mock_setting_get_instance.return_value = setting_mock
+
+    lab = Lab("Default scenario")
+    pc1 = lab.get_or_new_machine("pc1", **{'image': 'kathara/test1'})
+    pc2 = lab.get_or_new_machine("pc2", **{'image': 'kathara/test2'})
+    pc3 = lab.get_or_new_machine("pc3", **{'image': 'kathara/test2'})
+    lab.apply_dependencies(["pc1", "pc2", "pc3"], graph={"pc2": ["pc1"], "pc3": ["pc1"]})
+
+    started_callback = Mock()
+    deployed_callback = Mock()
+    EventDispatcher.get_instance().register("machines_deploy_started", started_callback)
+    EventDispatcher.get_instance().register("machine_deployed", deployed_callback)
+
+    docker_machine.docker_image.check_from_list.return_value = None
+    mock_deploy_and_start.return_value = None
+    docker_machine.deploy_machines(lab)
+
+    EventDispatcher.get_instance().unregister("machines_deploy_started")
+    EventDispatcher.get_instance().unregister("machine_deployed")
+
+    assert mock_deploy_and_start.call_count == 3
+    assert mock_deploy_and_start.call_args_list[0] == call(('pc1', pc1))
+    mock_deploy_and_start.assert_any_call(('pc2', pc2))
+    mock_deploy_and_start.assert_any_call(('pc3', pc3))
+    assert started_callback.run.call_args.kwargs['critical_path_length'] == 2
+    assert deployed_callback.run.call_count == 3
+    assert deployed_callback.run.call_args_list[0].kwargs['item'] == pc1
+    assert deployed_callback.run.call_args_list[0].kwargs['level'] == 0
+
+
 @mock.patch("src.Kathara.cli.ui.event.MountDevicesVolumes.confirmation_prompt")
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._deploy_and_start_machine")
@@ -1476,6 +1568,20 @@ def test_undeploy_three_devices(mock_get_machines_api_objects_by_filters, mock_u
     mock_undeploy_machine.assert_any_call(default_device_c.api_object)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._undeploy_machine")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_undeploy_iter_yields_containers(mock_get_machines_api_objects_by_filters, mock_undeploy_machine,
+                                         docker_machine, default_device, default_device_b):
+    default_device.api_object.labels = {'name': "test_device"}
+    default_device_b.api_object.labels = {'name': "test_device_b"}
+    containers = [default_device.api_object, default_device_b.api_object]
+
+    removed = list(docker_machine.undeploy_iter("lab_hash", selected_machines={"test_device"}, containers=containers))
+    assert not mock_get_machines_api_objects_by_filters.called
+    assert removed == [default_device.api_object]
+    mock_undeploy_machine.assert_called_once_with(default_device.api_object)
+
+
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._undeploy_machine")
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 def test_undeploy_no_devices(mock_get_machines_api_objects_by_filters, mock_undeploy_machine, docker_machine):
@@ -1568,6 +1674,29 @@ def test_wipe_three_devices(mock_get_machines_api_objects_by_filters, mock_undep
     assert mock_undeploy_machine.call_count == 3
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._undeploy_machine")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_wipe_fast(mock_get_machines_api_objects_by_filters, mock_undeploy_machine, docker_machine,
+                   default_device, default_device_b):
+    default_device_b.api_object.remove.side_effect = NotFound("removed")
+    mock_get_machines_api_objects_by_filters.return_value = [default_device.api_object, default_device_b.api_object]
+
+    assert docker_machine.wipe(user="user", fast=True) == 1
+    mock_get_machines_api_objects_by_filters.assert_called_once_with(user="user", sparse=True)
+    assert not mock_undeploy_machine.called
+    assert not default_device.api_object.exec_run.called
+    default_device.api_object.remove.assert_called_once_with(v=True, force=True)
+
+
+def test_remove_container_error(docker_machine):
+    container = Mock(id="container_id", attrs={"Names": ["/kathara_user_pc1"]})
+    container.remove.side_effect = APIError("cannot kill container")
+
+    with mock.patch("src.Kathara.manager.docker.DockerMachine.logging.warning") as mock_warning:
+        assert not docker_machine._remove_container(container)
+
+    assert "`container_id`" in mock_warning.call_args.args[0]
+
 #
 # TEST: _undeploy_machine
 #
@@ -1578,6 +1707,153 @@ def test_undeploy_machine(mock_delete_machine, docker_machine, default_device):
     mock_delete_machine.assert_called_once()
 
 
+#
+# TEST: _collect_machine_boot_trace
+#
+def test_collect_machine_boot_trace(docker_machine, default_device):
+    default_device.api_object.labels = {"name": "test_device", "shell": "/bin/bash"}
+    output = "\n".join([
+        "+ 100.0 umount /etc/resolv.conf",
+        "+ 100.5 /hostlab/test_device.startup",
+        "+ 103.0 touch /tmp/EOS",
+        BOOT_PROFILE_SEPARATOR,
+        BOOT_PROFILE_SEPARATOR,
+        "++ 100.6 ip link set eth0 up",
+        "output of the command",
+        "++ 101.0 sleep 2",
+        BOOT_PROFILE_SEPARATOR,
+    ])
+    docker_machine.client.api.exec_create.return_value = {"Id": "1234"}
+    docker_machine.client.api.exec_start.return_value = output.encode()
+    docker_machine.client.api.exec_inspect.return_value = {"ExitCode": 0}
+    boot_profiler = BootProfiler()
+
+    docker_machine._collect_machine_boot_trace(default_device, boot_profiler)
+
+    assert boot_profiler.events == [
+        ("test_device", "startup", "umount /etc/resolv.conf", 100.0, 0.5),
+        ("test_device", "startup", "/hostlab/{device}.startup", 100.5, 2.5),
+        ("test_device", "startup", "touch /tmp/EOS", 103.0, 0.0),
+        ("test_device", "script", "ip link set eth0 up", 100.6, pytest.approx(0.4)),
+        ("test_device", "script", "sleep 2", 101.0, 2.0),
+    ]
+
+
+def test_collect_machine_boot_trace_not_running(docker_machine, default_device):
+    default_device.api_object.labels = {"name": "test_device", "shell": "/bin/bash"}
+    docker_machine.client.api.exec_create.side_effect = APIError("container not running")
+    boot_profiler = BootProfiler()
+
+    docker_machine._collect_machine_boot_trace(default_device, boot_profiler)
+
+    assert boot_profiler.events == []
+
+
+#
+# TEST: wait_ready
+#
+class FakeEventStream(object):
+    def __init__(self, events):
+        self.events = list(events)
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            yield event
+        # Keep the stream open until closed, as the Docker daemon does
+        while not self.closed:
+            time.sleep(0.01)
+
+    def close(self):
+        self.closed = True
+
+
+def exec_die_event(container_id, exec_id):
+    return {"Type": "container", "Action": "exec_die", "Actor": {"ID": container_id, "Attributes": {"execID": exec_id}}}
+
+
+def waiting_container(name):
+    container = Mock()
+    container.id = f"{name}_id"
+    container.labels = {"name": name, "lab_hash": "lab_hash", "user": "user"}
+    return container
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_already_ready(mock_get_machines_api_objects_by_filters, mock_exec_run, docker_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [waiting_container("pc1"), waiting_container("pc2")]
+    mock_exec_run.return_value = {'exit_code': 0, 'Id': 'check', 'output': b''}
+    docker_machine.client.events.return_value = FakeEventStream([])
+
+    assert docker_machine.wait_ready("lab_hash", user="user") == {"pc1": True, "pc2": True}
+    assert mock_exec_run.call_count == 2
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_signaled_by_events(mock_get_machines_api_objects_by_filters, mock_exec_run, docker_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [waiting_container("pc1")]
+    mock_exec_run.side_effect = [{'exit_code': 1, 'Id': 'check1', 'output': b''},
+                                 {'exit_code': 0, 'Id': 'check2', 'output': b''}]
+    # The end of the first check is ignored, the end of the startup commands triggers a new check
+    docker_machine.client.events.return_value = FakeEventStream(
+        [exec_die_event("pc1_id", "check1"), exec_die_event("pc1_id", "startup")]
+    )
+
+    assert docker_machine.wait_ready("lab_hash", user="user", timeout=5) == {"pc1": True}
+    assert mock_exec_run.call_count == 2
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_selected_machines_timeout(mock_get_machines_api_objects_by_filters, mock_exec_run,
+                                             docker_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [waiting_container("pc1"), waiting_container("pc2")]
+    mock_exec_run.return_value = {'exit_code': 1, 'Id': 'check', 'output': b''}
+    docker_machine.client.events.return_value = FakeEventStream([])
+
+    assert docker_machine.wait_ready("lab_hash", selected_machines={"pc1"}, user="user", timeout=0.1) == \
+           {"pc1": False}
+    mock_exec_run.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_not_running(mock_get_machines_api_objects_by_filters, mock_exec_run, docker_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [waiting_container("pc1")]
+    mock_exec_run.side_effect = APIError("container not running")
+    docker_machine.client.events.return_value = FakeEventStream([])
+
+    assert docker_machine.wait_ready("lab_hash", user="user") == {"pc1": False}
+
+
+@mock.patch("src.Kathara.utils.exec_by_platform")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+def test_wait_startup_execution_signaled_by_events(mock_exec_run, mock_exec_by_platform, docker_machine):
+    mock_exec_by_platform.return_value = False
+    mock_exec_run.side_effect = [{'exit_code': 1, 'Id': 'check1', 'output': b''},
+                                 {'exit_code': 0, 'Id': 'check2', 'output': b''}]
+    docker_machine.client.events.return_value = FakeEventStream(
+        [exec_die_event("pc1_id", "check1"), exec_die_event("pc1_id", "startup")]
+    )
+
+    assert docker_machine._wait_startup_execution(waiting_container("pc1"), retry_interval=5) == 1
+    assert mock_exec_run.call_count == 2
+
+
+@mock.patch("src.Kathara.utils.exec_by_platform")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._exec_run")
+def test_wait_startup_execution_retries(mock_exec_run, mock_exec_by_platform, docker_machine):
+    mock_exec_by_platform.return_value = False
+    mock_exec_run.return_value = {'exit_code': 1, 'Id': 'check', 'output': b''}
+    docker_machine.client.events.return_value = FakeEventStream([])
+
+    assert docker_machine._wait_startup_execution(waiting_container("pc1"), n_retries=2, retry_interval=0.01) == 1
+    # Without events the device is checked only once
+    mock_exec_run.assert_called_once()
+
+
 #
 # TEST: exec
 #
@@ -1921,6 +2197,87 @@ def test_get_machines_api_objects_by_filters_user_filter(docker_machine):
     docker_machine.client.containers.list.assert_called_once_with(all=True, filters=filters, ignore_removed=True)
 
 
+def test_get_machines_api_objects_by_filters_sparse(docker_machine):
+    docker_machine.client.containers.list.return_value = []
+    docker_machine.get_machines_api_objects_by_filters("lab_hash_value", None, None, sparse=True)
+    filters = {"label": ["app=kathara", "lab_hash=lab_hash_value"]}
+    docker_machine.client.containers.list.assert_called_once_with(all=True, filters=filters, sparse=True)
+
+
+#
+# TEST: get_inspected_machines_api_objects
+#
+def sparse_container(container_id, state="running"):
+    container = Mock()
+    container.id = container_id
+    container.attrs = {"State": state, "NetworkSettings": {"Networks": {}}}
+    return container
+
+
+def inspected_container(container_id):
+    container = Mock()
+    container.id = container_id
+    return container
+
+
+def test_get_inspected_machines_api_objects(docker_machine):
+    docker_machine.client.containers.list.return_value = [sparse_container("id1"), sparse_container("id2")]
+    docker_machine.client.containers.get.side_effect = inspected_container
+
+    containers = docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value")
+
+    filters = {"label": ["app=kathara", "user=user_name_value", "lab_hash=lab_hash_value"]}
+    docker_machine.client.containers.list.assert_called_once_with(all=True, filters=filters, sparse=True)
+    assert [container.id for container in containers] == ["id1", "id2"]
+    assert docker_machine.client.containers.get.call_count == 2
+
+
+def test_get_inspected_machines_api_objects_skip_unchanged(docker_machine):
+    docker_machine.client.containers.list.return_value = [sparse_container("id1"), sparse_container("id2")]
+    docker_machine.client.containers.get.side_effect = inspected_container
+    first = docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value")
+
+    docker_machine.client.containers.list.return_value = [sparse_container("id1"),
+                                                          sparse_container("id2", state="exited")]
+    docker_machine.client.containers.get.reset_mock()
+    second = docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value")
+
+    docker_machine.client.containers.get.assert_called_once_with("id2")
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+
+
+def test_get_inspected_machines_api_objects_removed(docker_machine):
+    docker_machine.client.containers.list.return_value = [sparse_container("id1"), sparse_container("id2")]
+    docker_machine.client.containers.get.side_effect = [inspected_container("id1"), NotFound("removed")]
+
+    containers = docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value")
+
+    assert [container.id for container in containers] == ["id1"]
+
+
+def test_get_inspected_machines_api_objects_drop_empty_filter(docker_machine):
+    docker_machine.client.containers.list.return_value = [sparse_container("id1")]
+    docker_machine.client.containers.get.side_effect = inspected_container
+    docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value")
+    assert ("lab_hash_value", "user_name_value") in docker_machine._inspect_cache
+
+    docker_machine.client.containers.list.return_value = []
+    assert docker_machine.get_inspected_machines_api_objects("lab_hash_value", "user_name_value") == []
+    assert not docker_machine._inspect_cache
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.INSPECT_CACHE_MAX_FILTERS", 2)
+def test_get_inspected_machines_api_objects_max_filters(docker_machine):
+    docker_machine.client.containers.list.return_value = [sparse_container("id1")]
+    docker_machine.client.containers.get.side_effect = inspected_container
+
+    for lab_hash in ["lab_hash_1", "lab_hash_2", "lab_hash_1", "lab_hash_3"]:
+        docker_machine.get_inspected_machines_api_objects(lab_hash, "user_name_value")
+
+    assert list(docker_machine._inspect_cache) == [("lab_hash_1", "user_name_value"),
+                                                   ("lab_hash_3", "user_name_value")]
+
 #
 # TEST: get_container_name
 #
@@ -1992,6 +2349,38 @@ def test_delete_machine_not_running(docker_machine, default_device):
     default_device.api_object.remove.assert_called_once_with(v=True, force=True)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine._wait_exec")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_delete_machine_shutdown_timeout(mock_setting_get_instance, mock_wait_exec, docker_machine, default_device):
+    mock_setting_get_instance.return_value = Mock(shutdown_timeout=5)
+    docker_machine.client.api.exec_create.return_value = {"Id": "1234"}
+    docker_machine.client.api.exec_start.return_value = b""
+    docker_machine.client.api.exec_inspect.return_value = {"ExitCode": None}
+    mock_wait_exec.return_value = False
+    default_device.api_object.status = "running"
+
+    docker_machine._delete_machine(default_device.api_object)
+    assert docker_machine.client.api.exec_start.call_args.kwargs['detach']
+    mock_wait_exec.assert_called_once_with("1234", 5)
+    default_device.api_object.remove.assert_called_once_with(v=True, force=True)
+
+
+#
+# TEST: _wait_exec
+#
+def test_wait_exec_ended(docker_machine):
+    docker_machine.client.api.exec_inspect.side_effect = [{"Running": True}, {"Running": False}]
+
+    assert docker_machine._wait_exec("1234", 5)
+    assert docker_machine.client.api.exec_inspect.call_count == 2
+
+
+def test_wait_exec_timeout(docker_machine):
+    docker_machine.client.api.exec_inspect.return_value = {"Running": True}
+
+    assert not docker_machine._wait_exec("1234", 0.1)
+
+
 #
 # TEST: get_machines_stats
 #
@@ -1999,12 +2388,12 @@ def test_delete_machine_not_running(docker_machine, default_device):
 def test_get_machines_stats_lab_hash(mock_get_machines_api_objects_by_filters, docker_machine, default_device):
     default_device.api_object.name = "test_device"
     mock_get_machines_api_objects_by_filters.return_value = [default_device.api_object]
-    default_device.api_object.stats.return_value = iter([{'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}])
+    default_device.api_object.stats.return_value = {'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}
     next(docker_machine.get_machines_stats(lab_hash="lab_hash", user='user'))
 
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name=None,
-                                                                     user='user')
-    default_device.api_object.stats.assert_called_once()
+                                                                     user='user', sparse=True)
+    default_device.api_object.stats.assert_called_once_with(stream=False, one_shot=True)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
@@ -2012,12 +2401,12 @@ def test_get_machines_stats_lab_hash_device_name(mock_get_machines_api_objects_b
                                                  default_device):
     default_device.api_object.name = "test_device"
     mock_get_machines_api_objects_by_filters.return_value = [default_device.api_object]
-    default_device.api_object.stats.return_value = iter([{'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}])
+    default_device.api_object.stats.return_value = {'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}
     next(docker_machine.get_machines_stats(lab_hash="lab_hash", machine_name="test_device", user="user"))
 
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name="test_device",
-                                                                     user="user")
-    default_device.api_object.stats.assert_called_once()
+                                                                     user="user", sparse=True)
+    default_device.api_object.stats.assert_called_once_with(stream=False, one_shot=True)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
@@ -2025,12 +2414,12 @@ def test_get_machines_stats_lab_hash_device_name_user(mock_get_machines_api_obje
                                                       default_device):
     default_device.api_object.name = "test_device"
     mock_get_machines_api_objects_by_filters.return_value = [default_device.api_object]
-    default_device.api_object.stats.return_value = iter([{'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}])
+    default_device.api_object.stats.return_value = {'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}
     next(docker_machine.get_machines_stats(lab_hash="lab_hash", machine_name="test_device", user="user"))
 
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name="test_device",
-                                                                     user="user")
-    default_device.api_object.stats.assert_called_once()
+                                                                     user="user", sparse=True)
+    default_device.api_object.stats.assert_called_once_with(stream=False, one_shot=True)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
@@ -2040,7 +2429,7 @@ def test_get_machines_stats_lab_hash_device_not_found(mock_get_machines_api_obje
     assert next(docker_machine.get_machines_stats(lab_hash="lab_hash", user="user")) == {}
 
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name=None,
-                                                                     user="user")
+                                                                     user="user", sparse=True)
     assert not default_device.api_object.stats.called
 
 
@@ -2050,7 +2439,7 @@ def test_get_machines_stats_lab_hash_and_name_device_not_found(mock_get_machines
     mock_get_machines_api_objects_by_filters.return_value = []
     assert next(docker_machine.get_machines_stats(lab_hash="lab_hash", machine_name="test_device", user="user")) == {}
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name="test_device",
-                                                                     user="user")
+                                                                     user="user", sparse=True)
     assert not default_device.api_object.stats.called
 
 
@@ -2061,11 +2450,11 @@ def test_get_machines_stats_lab_hash_no_user(mock_get_machines_api_objects_by_fi
     default_device.api_object.name = "test_device"
     mock_get_machines_api_objects_by_filters.return_value = [default_device.api_object]
     mock_is_admin.return_value = True
-    default_device.api_object.stats.return_value = iter([{'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}])
+    default_device.api_object.stats.return_value = {'pids_stats': {}, 'cpu_stats': {}, 'memory_stats': {}}
     next(docker_machine.get_machines_stats(lab_hash="lab_hash", user=None))
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash="lab_hash", machine_name=None,
-                                                                     user=None)
-    default_device.api_object.stats.assert_called_once()
+                                                                     user=None, sparse=True)
+    default_device.api_object.stats.assert_called_once_with(stream=False, one_shot=True)
 
 
 @mock.patch("src.Kathara.utils.is_admin")
@@ -596,93 +596,148 @@ def test_undeploy_link_no_lab(docker_manager, default_link):
 #
 # TEST: undeploy_lab
 #
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab(mock_undeploy_machine, mock_undeploy_link, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab(mock_undeploy_machine, mock_undeploy_link, mock_get_machines, docker_manager):
     docker_manager.undeploy_lab(lab_hash='lab_hash')
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines=None, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines=None, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_selected_machines(mock_undeploy_machine, mock_undeploy_link, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_selected_machines(mock_undeploy_machine, mock_undeploy_link, mock_get_machines, docker_manager):
     docker_manager.undeploy_lab(lab_hash='lab_hash', selected_machines={'pc1', 'pc2'})
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines={'pc1', 'pc2'}, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines={'pc1', 'pc2'}, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_excluded_machines(mock_undeploy_machine, mock_undeploy_link, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_excluded_machines(mock_undeploy_machine, mock_undeploy_link, mock_get_machines, docker_manager):
     docker_manager.undeploy_lab(lab_hash='lab_hash', excluded_machines={'pc2'})
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines=None, excluded_machines={'pc2'})
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines=None, excluded_machines={'pc2'},
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_selected_link(mock_undeploy_machine, mock_undeploy_link, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_selected_link(mock_undeploy_machine, mock_undeploy_link, mock_get_machines, docker_manager):
     docker_manager.undeploy_lab(lab_hash='lab_hash', selected_links={'A'})
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines=None, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links={'A'})
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines=None, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links={'A'}, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_selected_and_excluded_machines(mock_undeploy_machine, mock_undeploy_link, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_selected_and_excluded_machines(mock_undeploy_machine, mock_undeploy_link, mock_get_machines,
+                                                     docker_manager):
     with pytest.raises(InvocationError):
         docker_manager.undeploy_lab(lab_hash='lab_hash', selected_machines={'pc1', 'pc2'}, excluded_machines={'pc2'})
     assert not mock_undeploy_machine.called
     assert not mock_undeploy_link.called
 
 
+@mock.patch("src.Kathara.utils.get_current_user_name")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
 @mock.patch("src.Kathara.utils.generate_urlsafe_hash")
-def test_undeploy_lab_lab_name(mock_generate_urlsafe_hash, mock_undeploy_machine, mock_undeploy_link, docker_manager):
+def test_undeploy_lab_lab_name(mock_generate_urlsafe_hash, mock_undeploy_machine, mock_undeploy_link, mock_get_machines,
+                               mock_get_current_user_name, docker_manager):
+    mock_get_current_user_name.return_value = "kathara_user"
     mock_generate_urlsafe_hash.return_value = "lab_hash"
 
     docker_manager.undeploy_lab(lab_name='lab_name')
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines=None, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines=None, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None, user="kathara_user",
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
     mock_generate_urlsafe_hash.assert_called_once_with("lab_name")
 
 
+@mock.patch("src.Kathara.utils.get_current_user_name")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
 @mock.patch("src.Kathara.utils.generate_urlsafe_hash")
 def test_undeploy_lab_lab_name_selected_machines(mock_generate_urlsafe_hash,
-                                                 mock_undeploy_machine, mock_undeploy_link, docker_manager):
+                                                 mock_undeploy_machine, mock_undeploy_link, mock_get_machines,
+                                                 mock_get_current_user_name, docker_manager):
+    mock_get_current_user_name.return_value = "kathara_user"
     mock_generate_urlsafe_hash.return_value = "lab_hash"
 
     docker_manager.undeploy_lab(lab_name='lab_name', selected_machines={'pc1', 'pc2'})
-    mock_undeploy_machine.assert_called_once_with('lab_hash', selected_machines={'pc1', 'pc2'}, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        'lab_hash', selected_machines={'pc1', 'pc2'}, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with('lab_hash', selected_links=None, user="kathara_user",
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
     mock_generate_urlsafe_hash.assert_called_once_with("lab_name")
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_lab_obj(mock_undeploy_machine, mock_undeploy_link, docker_manager, two_device_scenario):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_lab_obj(mock_undeploy_machine, mock_undeploy_link, mock_get_machines, docker_manager,
+                              two_device_scenario):
     expected_hash = two_device_scenario.hash
 
     docker_manager.undeploy_lab(lab=two_device_scenario)
-    mock_undeploy_machine.assert_called_once_with(expected_hash, selected_machines=None, excluded_machines=None)
-    mock_undeploy_link.assert_called_once_with(expected_hash, selected_links=None)
+    mock_undeploy_machine.assert_called_once_with(
+        expected_hash, selected_machines=None, excluded_machines=None,
+        containers=mock_get_machines.return_value
+    )
+    mock_undeploy_link.assert_called_once_with(expected_hash, selected_links=None, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_machines_api_objects_by_filters")
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.undeploy")
-@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy")
-def test_undeploy_lab_lab_obj_selected_machines(mock_undeploy_machine, mock_undeploy_link, docker_manager,
-                                                two_device_scenario):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.undeploy_iter")
+def test_undeploy_lab_lab_obj_selected_machines(mock_undeploy_machine, mock_undeploy_link, mock_get_machines,
+                                                docker_manager, two_device_scenario):
     expected_hash = two_device_scenario.hash
 
     docker_manager.undeploy_lab(lab=two_device_scenario, selected_machines={'pc1', 'pc2'})
     mock_undeploy_machine.assert_called_once_with(
-        expected_hash, selected_machines={'pc1', 'pc2'}, excluded_machines=None
+        expected_hash, selected_machines={'pc1', 'pc2'}, excluded_machines=None,
+        containers=mock_get_machines.return_value
     )
-    mock_undeploy_link.assert_called_once_with(expected_hash, selected_links=None)
+    mock_undeploy_link.assert_called_once_with(expected_hash, selected_links=None, user=mock.ANY,
+                                               containers=mock_get_machines.return_value,
+                                               removed_containers=mock_undeploy_machine.return_value)
 
 
 def test_undeploy_lab_lab_hash_lab_obj(docker_manager, two_device_scenario):
@@ -700,8 +755,8 @@ def test_wipe(mock_get_current_user_name, mock_wipe_machines, mock_wipe_links, d
     mock_get_current_user_name.return_value = "kathara_user"
     docker_manager.wipe()
     mock_get_current_user_name.assert_called_once()
-    mock_wipe_machines.assert_called_once_with(user="kathara_user")
-    mock_wipe_links.assert_called_once_with(user="kathara_user")
+    mock_wipe_machines.assert_called_once_with(user="kathara_user", fast=False)
+    mock_wipe_links.assert_called_once_with(user="kathara_user", fast=False)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.wipe")
@@ -719,8 +774,8 @@ def test_wipe_all_users(mock_setting_get_instance, mock_get_current_user_name, m
 
     docker_manager.wipe(all_users=True)
     assert not mock_get_current_user_name.called
-    mock_wipe_machines.assert_called_once_with(user=None)
-    mock_wipe_links.assert_called_once_with(user=None)
+    mock_wipe_machines.assert_called_once_with(user=None, fast=False)
+    mock_wipe_links.assert_called_once_with(user=None, fast=False)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.wipe")
@@ -739,8 +794,8 @@ def test_wipe_all_users_remote(mock_setting_get_instance, mock_get_current_user_
 
     docker_manager.wipe(all_users=True)
     mock_get_current_user_name.assert_called_once()
-    mock_wipe_machines.assert_called_once_with(user="kathara_user")
-    mock_wipe_links.assert_called_once_with(user="kathara_user")
+    mock_wipe_machines.assert_called_once_with(user="kathara_user", fast=False)
+    mock_wipe_links.assert_called_once_with(user="kathara_user", fast=False)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.wipe")
@@ -759,8 +814,8 @@ def test_wipe_all_users_and_shared_cd_lab(mock_setting_get_instance, mock_get_cu
 
     docker_manager.wipe(all_users=True)
     assert not mock_get_current_user_name.called
-    mock_wipe_machines.assert_called_once_with(user=None)
-    mock_wipe_links.assert_called_once_with(user=None)
+    mock_wipe_machines.assert_called_once_with(user=None, fast=False)
+    mock_wipe_links.assert_called_once_with(user=None, fast=False)
 
 
 @mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.wipe")
@@ -779,8 +834,25 @@ def test_wipe_all_users_and_shared_cd_user(mock_setting_get_instance, mock_get_c
 
     docker_manager.wipe(all_users=True)
     assert not mock_get_current_user_name.called
-    mock_wipe_machines.assert_called_once_with(user=None)
-    mock_wipe_links.assert_called_once_with(user=None)
+    mock_wipe_machines.assert_called_once_with(user=None, fast=False)
+    mock_wipe_links.assert_called_once_with(user=None, fast=False)
+
+
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.wipe")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.wipe")
+@mock.patch("src.Kathara.utils.get_current_user_name")
+def test_wipe_fast(mock_get_current_user_name, mock_wipe_machines, mock_wipe_links, docker_manager):
+    mock_get_current_user_name.return_value = "kathara_user"
+    mock_wipe_machines.return_value = 3
+    mock_wipe_links.return_value = 2
+
+    report = docker_manager.wipe(fast=True)
+    mock_wipe_machines.assert_called_once_with(user="kathara_user", fast=True)
+    mock_wipe_links.assert_called_once_with(user="kathara_user", fast=True)
+    assert report.fast
+    assert report.get_count("devices") == 3
+    assert report.get_count("collision domains") == 2
+    assert [kind for (kind, _, _) in report.steps] == ["devices", "collision domains"]
 
 
 #
@@ -1000,6 +1072,42 @@ def test_exec_invocation_error(mock_exec, mock_get_current_user_name, docker_man
     assert not mock_exec.called
 
 
+#
+# TEST: exec_many
+#
+@mock.patch("src.Kathara.utils.get_current_user_name")
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.exec")
+def test_exec_many(mock_exec, mock_get_current_user_name, docker_manager, default_device):
+    mock_get_current_user_name.return_value = "kathara_user"
+    mock_exec.return_value.__next__ = Mock(side_effect=StopIteration)
+    mock_exec.return_value.exit_code.return_value = 0
+
+    exec_output = docker_manager.exec_many(["pc1", "pc2"], "ls", lab_hash=default_device.lab.hash, concurrency=2)
+
+    assert exec_output.wait() == {"pc1": 0, "pc2": 0}
+    mock_exec.assert_any_call(default_device.lab.hash, "pc1", "ls", user="kathara_user", tty=False, wait=False,
+                              stream=True)
+    mock_exec.assert_any_call(default_device.lab.hash, "pc2", "ls", user="kathara_user", tty=False, wait=False,
+                              stream=True)
+
+
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.exec")
+def test_exec_many_all_devices(mock_exec, mock_get_machines_api_objects, docker_manager, default_device):
+    mock_get_machines_api_objects.return_value = [Mock(labels={"name": "pc2"}), Mock(labels={"name": "pc1"})]
+
+    exec_output = docker_manager.exec_many(None, "ls", lab_hash=default_device.lab.hash)
+
+    mock_get_machines_api_objects.assert_called_once_with(default_device.lab.hash)
+    assert exec_output.machine_names == ["pc1", "pc2"]
+    assert not mock_exec.called
+
+
+def test_exec_many_invocation_error(docker_manager):
+    with pytest.raises(InvocationError):
+        docker_manager.exec_many(["pc1"], "ls")
+
+
 #
 # TEST: exec_obj
 #
@@ -1382,11 +1490,11 @@ def test_get_links_api_objects_not_found(mock_get_links_api_objects, docker_mana
 #
 # TESTS: get_lab_from_api
 #
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_get_lab_from_api_lab_name_all_info(mock_get_links_api_objects, mock_get_machines_api_objects, docker_container,
-                                            docker_network, docker_manager):
-    mock_get_machines_api_objects.return_value = [docker_container]
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_get_lab_from_api_lab_name_all_info(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                            docker_container, docker_network, docker_manager):
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
     mock_get_links_api_objects.return_value = [docker_network]
     lab = docker_manager.get_lab_from_api(lab_name="lab_test")
     assert len(lab.machines) == 1
@@ -1406,13 +1514,16 @@ def test_get_lab_from_api_lab_name_all_info(mock_get_links_api_objects, mock_get
     assert docker_network.attrs["Labels"]["name"] in lab.links
 
 
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_get_lab_from_api_lab_hash_all_info(mock_get_links_api_objects, mock_get_machines_api_objects, docker_container,
-                                            docker_network, docker_manager):
-    mock_get_machines_api_objects.return_value = [docker_container]
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_get_lab_from_api_lab_hash_all_info(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                            docker_container, docker_network, docker_manager):
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
     mock_get_links_api_objects.return_value = [docker_network]
     lab = docker_manager.get_lab_from_api(lab_hash="lab_hash")
+    # Only names and labels of the networks are needed, so they are not inspected
+    assert mock_get_links_api_objects.call_args.kwargs["lab_hash"] == "lab_hash"
+    assert mock_get_links_api_objects.call_args.kwargs["greedy"] is False
     assert lab.hash == "lab_hash"
     assert lab.name == "reconstructed_lab"
     assert len(lab.machines) == 1
@@ -1432,11 +1543,11 @@ def test_get_lab_from_api_lab_hash_all_info(mock_get_links_api_objects, mock_get
     assert docker_network.attrs["Labels"]["name"] in lab.links
 
 
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_get_lab_from_api_lab_name_empty_meta(mock_get_links_api_objects, mock_get_machines_api_objects,
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_get_lab_from_api_lab_name_empty_meta(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
                                               docker_container_empty_meta, docker_manager):
-    mock_get_machines_api_objects.return_value = [docker_container_empty_meta]
+    mock_get_inspected_machines_api_objects.return_value = [docker_container_empty_meta]
     mock_get_links_api_objects.return_value = []
     lab = docker_manager.get_lab_from_api(lab_name="lab_test")
     assert len(lab.machines) == 1
@@ -1461,15 +1572,15 @@ def test_get_lab_from_api_exception(docker_manager):
 #
 # TESTS: update_lab_from_api
 #
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_update_lab_from_api_add_link(mock_get_links_api_objects, mock_get_machines_api_objects, docker_container,
-                                      docker_network, docker_network_b, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_update_lab_from_api_add_link(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                      docker_container, docker_network, docker_network_b, docker_manager):
     lab = Lab("test")
     device = lab.get_or_new_machine(docker_container.labels["name"])
     link = lab.new_link(docker_network.attrs["Labels"]["name"])
     device.add_interface(link)
-    mock_get_machines_api_objects.return_value = [docker_container]
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
     mock_get_links_api_objects.return_value = [docker_network, docker_network_b]
     docker_container.attrs["NetworkSettings"]["Networks"] = {
         "kathara_user_hash_test_network": {
@@ -1497,15 +1608,44 @@ def test_update_lab_from_api_add_link(mock_get_links_api_objects, mock_get_machi
     assert lab.machines[docker_container.labels["name"]].interfaces[1].mac_address == "00:00:00:00:00:02"
 
 
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_update_lab_from_api_remove_link(mock_get_links_api_objects, mock_get_machines_api_objects, docker_container,
-                                         docker_network, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_update_lab_from_api_skip_unchanged(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                            docker_container, docker_network, docker_network_b, docker_manager):
+    lab = Lab("test")
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
+    mock_get_links_api_objects.return_value = [docker_network, docker_network_b]
+    docker_container.attrs["NetworkSettings"]["Networks"] = {
+        "kathara_user_hash_test_network": {
+            "Links": None,
+            "DriverOpts": {
+                'kathara.iface': '0', 'kathara.link': 'A',
+            }
+        }
+    }
+
+    docker_manager.update_lab_from_api(lab)
+    device = lab.machines[docker_container.labels["name"]]
+    assert device.api_object is docker_container
+    assert len(device.interfaces) == 1
+
+    # The same object is returned for unchanged containers, so the device is not processed again
+    device.remove_interface(device.interfaces[0].link)
+    docker_manager.update_lab_from_api(lab)
+    assert device.interfaces[0] is None
+    assert not docker_container.reload.called
+    assert not docker_network.reload.called
+
+
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_update_lab_from_api_remove_link(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                         docker_container, docker_network, docker_manager):
     lab = Lab("test")
     device = lab.get_or_new_machine(docker_container.labels["name"])
     link = lab.new_link(docker_network.attrs["Labels"]["name"])
     device.add_interface(link)
-    mock_get_machines_api_objects.return_value = [docker_container]
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
     mock_get_links_api_objects.return_value = []
     docker_container.attrs["NetworkSettings"]["Networks"] = {}
 
@@ -1517,17 +1657,16 @@ def test_update_lab_from_api_remove_link(mock_get_links_api_objects, mock_get_ma
     assert docker_container.labels["name"] not in link.machines
 
 
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_machines_api_objects")
-@mock.patch("src.Kathara.manager.docker.DockerManager.DockerManager.get_links_api_objects")
-def test_update_lab_from_api_add_remove_link(mock_get_links_api_objects, mock_get_machines_api_objects,
-                                             docker_container,
-                                             docker_network, docker_network_b, docker_manager):
+@mock.patch("src.Kathara.manager.docker.DockerMachine.DockerMachine.get_inspected_machines_api_objects")
+@mock.patch("src.Kathara.manager.docker.DockerLink.DockerLink.get_links_api_objects_by_filters")
+def test_update_lab_from_api_add_remove_link(mock_get_links_api_objects, mock_get_inspected_machines_api_objects,
+                                             docker_container, docker_network, docker_network_b, docker_manager):
     lab = Lab("test")
     device = lab.get_or_new_machine(docker_container.labels["name"])
     link = Link(lab, docker_network.attrs["Labels"]["name"])
     device.add_interface(link)
 
-    mock_get_machines_api_objects.return_value = [docker_container]
+    mock_get_inspected_machines_api_objects.return_value = [docker_container]
     mock_get_links_api_objects.return_value = [docker_network_b]
     docker_container.attrs["NetworkSettings"]["Networks"] = {
         "kathara_user_hash_test_network_b": {
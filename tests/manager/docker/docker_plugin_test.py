@@ -1,4 +1,7 @@
+import json
+import os
 import sys
+import time
 from unittest import mock
 from unittest.mock import Mock
 
@@ -232,3 +235,160 @@ def test_check_and_download_remote_vde_plugin_not_enabled(mock_setting_get_insta
     assert str(e.value) == "Kathara Network Plugin not enabled on remote Docker connection."
     assert not mock_xtables_lock_mount.called
     assert not mock_configure_xtables_mount.called
+
+
+#
+# TEST: ensure_plugin
+#
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_saves_state(mock_setting_get_instance, mock_check_and_download_plugin, docker_plugin_bridge,
+                                   mock_plugin, mock_setting, tmp_path):
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+        docker_plugin_bridge.ensure_plugin()
+
+    mock_check_and_download_plugin.assert_called_once()
+    with open(cache_path, 'r') as cache_file:
+        state = json.load(cache_file)["local@kathara/katharanp:" + utils.get_architecture()]
+    assert state["digest"] == "digest"
+    assert state["enabled"]
+    assert state["mount_source"] == "/mount/path"
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin._xtables_lock_mount")
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_cached(mock_setting_get_instance, mock_check_and_download_plugin, mock_xtables_lock_mount,
+                              docker_plugin_bridge, mock_plugin, mock_setting, tmp_path):
+    mock_xtables_lock_mount.return_value = "/mount/path"
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        json.dump({"local@kathara/katharanp:" + utils.get_architecture(): {
+            "digest": "digest", "enabled": True, "mount_source": "/mount/path", "last_checked": time.time()
+        }}, cache_file)
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+
+    assert not mock_check_and_download_plugin.called
+    docker_plugin_bridge.client.plugins.get.assert_called_once_with("kathara/katharanp:" + utils.get_architecture())
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_cache_expired(mock_setting_get_instance, mock_check_and_download_plugin, docker_plugin_bridge,
+                                     mock_plugin, mock_setting, tmp_path):
+    mock_setting.plugin_check_ttl = 60
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        json.dump({"local@kathara/katharanp:" + utils.get_architecture(): {
+            "digest": "digest", "enabled": True, "mount_source": "/mount/path", "last_checked": time.time() - 120
+        }}, cache_file)
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+
+    mock_check_and_download_plugin.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_digest_changed(mock_setting_get_instance, mock_check_and_download_plugin, docker_plugin_bridge,
+                                      mock_plugin, mock_setting, tmp_path):
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "new_digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        json.dump({"local@kathara/katharanp:" + utils.get_architecture(): {
+            "digest": "digest", "enabled": True, "mount_source": "/mount/path", "last_checked": time.time()
+        }}, cache_file)
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+
+    mock_check_and_download_plugin.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin._xtables_lock_mount")
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_mount_changed(mock_setting_get_instance, mock_check_and_download_plugin, mock_xtables_lock_mount,
+                                     docker_plugin_bridge, mock_plugin, mock_setting, tmp_path):
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_xtables_lock_mount.return_value = ""
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        json.dump({"local@kathara/katharanp:" + utils.get_architecture(): {
+            "digest": "digest", "enabled": True, "mount_source": "/mount/path", "last_checked": time.time()
+        }}, cache_file)
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+
+    mock_check_and_download_plugin.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin._xtables_lock_mount")
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_vde_cached_without_mount(mock_setting_get_instance, mock_check_and_download_plugin,
+                                                mock_xtables_lock_mount, docker_plugin_vde, mock_plugin, mock_setting,
+                                                tmp_path):
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_vde.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        json.dump({"local@kathara/katharanp_vde:" + utils.get_architecture(): {
+            "digest": "digest", "enabled": True, "mount_source": None, "last_checked": time.time()
+        }}, cache_file)
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_vde.ensure_plugin()
+
+    assert not mock_check_and_download_plugin.called
+    assert not mock_xtables_lock_mount.called
+
+
+@mock.patch("src.Kathara.manager.docker.DockerPlugin.DockerPlugin.check_and_download_plugin")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_ensure_plugin_corrupted_cache(mock_setting_get_instance, mock_check_and_download_plugin,
+                                       docker_plugin_bridge, mock_plugin, mock_setting, tmp_path):
+    mock_setting.plugin_check_ttl = 86400
+    mock_setting_get_instance.return_value = mock_setting
+    mock_plugin.id = "digest"
+    mock_plugin.enabled = True
+    docker_plugin_bridge.client.plugins.get.return_value = mock_plugin
+    cache_path = os.path.join(tmp_path, "kathara_plugin.json")
+    with open(cache_path, 'w') as cache_file:
+        cache_file.write("{not json")
+
+    with mock.patch.object(DockerPlugin, "PLUGIN_CACHE_PATH", cache_path):
+        docker_plugin_bridge.ensure_plugin()
+
+    mock_check_and_download_plugin.assert_called_once()
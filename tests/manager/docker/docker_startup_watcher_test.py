@@ -0,0 +1,77 @@
+import queue
+import sys
+from unittest.mock import Mock
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.docker.DockerStartupWatcher import DockerStartupWatcher
+
+
+class FakeEventStream(object):
+    def __init__(self, events=None):
+        self.queue = queue.Queue()
+        for event in events or []:
+            self.put(event)
+
+    def put(self, event):
+        self.queue.put(event)
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.queue.put(None)
+
+
+def exec_die_event(container_id, exec_id):
+    return {"Type": "container", "Action": "exec_die",
+            "Actor": {"ID": container_id, "Attributes": {"execID": exec_id, "exitCode": "0"}}}
+
+
+def test_watcher_filters():
+    client = Mock()
+    client.events.return_value = FakeEventStream()
+
+    with DockerStartupWatcher(client, lab_hash="lab_hash", machine_name="pc1", user="user") as watcher:
+        assert watcher.is_open
+
+    client.events.assert_called_once_with(
+        decode=True,
+        filters={"type": ["container"], "event": ["exec_die"],
+                 "label": ["app=kathara", "user=user", "lab_hash=lab_hash", "name=pc1"]}
+    )
+    assert not watcher.is_open
+
+
+def test_watcher_get():
+    client = Mock()
+    stream = FakeEventStream([exec_die_event("container_id", "exec_id")])
+    client.events.return_value = stream
+
+    with DockerStartupWatcher(client, lab_hash="lab_hash") as watcher:
+        assert watcher.get(timeout=5) == ("container_id", "exec_id")
+        assert watcher.get(timeout=0.01) is None
+
+
+def test_watcher_stream_not_available():
+    client = Mock()
+    client.events.side_effect = Exception("error")
+
+    with DockerStartupWatcher(client, lab_hash="lab_hash") as watcher:
+        assert not watcher.is_open
+        assert watcher.get(timeout=5) is None
+
+
+def test_watcher_stream_interrupted():
+    client = Mock()
+    stream = FakeEventStream()
+    client.events.return_value = stream
+
+    with DockerStartupWatcher(client, lab_hash="lab_hash") as watcher:
+        stream.close()
+        assert watcher.get(timeout=5) is None
+        assert not watcher.is_open
@@ -0,0 +1,309 @@
+import queue
+import sys
+import threading
+import time
+import uuid
+from unittest import mock
+
+import pytest
+from docker.errors import NotFound
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.docker.DockerMachine import DockerMachine
+from src.Kathara.manager.docker.DockerStateCache import DockerStateCache
+
+
+#
+# FAKE DOCKER DAEMON
+#
+class FakeApiObject(object):
+    def __init__(self, object_id, attrs):
+        self.id = object_id
+        self.attrs = attrs
+
+
+class FakeEventStream(object):
+    def __init__(self, daemon):
+        self.daemon = daemon
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.queue.put(None)
+
+
+class FakeCollection(object):
+    def __init__(self, daemon, objects, labels_path, inspect_on_list):
+        self.daemon = daemon
+        self.objects = objects
+        self.labels_path = labels_path
+        self.inspect_on_list = inspect_on_list
+
+    def _labels(self, attrs):
+        for key in self.labels_path:
+            attrs = attrs[key]
+        return attrs
+
+    def _matches(self, attrs, filters):
+        labels = self._labels(attrs)
+        for label in filters.get("label", []):
+            (key, value) = label.split("=")
+            if labels.get(key, None) != value:
+                return False
+        return True
+
+    def get(self, object_id):
+        self.daemon.requests += 1
+        if object_id not in self.objects:
+            raise NotFound(object_id)
+        return FakeApiObject(object_id, self.objects[object_id])
+
+    def list(self, filters=None, sparse=False, greedy=False, **kwargs):
+        self.daemon.requests += 1
+        result = []
+        for object_id, attrs in list(self.objects.items()):
+            if self._matches(attrs, filters or {}):
+                # Non-sparse container lists and greedy network lists inspect each object
+                inspect = self.inspect_on_list(sparse, greedy)
+                result.append(self.get(object_id) if inspect else FakeApiObject(object_id, attrs))
+        return result
+
+
+class FakeDockerDaemon(object):
+    """Emulate the subset of the Docker client used by the state cache, counting the API requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.container_objects = {}
+        self.network_objects = {}
+        self.containers = FakeCollection(self, self.container_objects, ["Config", "Labels"],
+                                         lambda sparse, greedy: not sparse)
+        self.networks = FakeCollection(self, self.network_objects, ["Labels"], lambda sparse, greedy: greedy)
+        self.streams = []
+
+    def events(self, decode=True, since=None, filters=None):
+        self.requests += 1
+        stream = FakeEventStream(self)
+        self.streams.append(stream)
+        return stream
+
+    def emit(self, event_type, action, object_id, attributes):
+        for stream in self.streams:
+            stream.queue.put({"Type": event_type, "Action": action,
+                              "Actor": {"ID": object_id, "Attributes": attributes}})
+
+    def disconnect(self):
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+
+    def add_container(self, name, lab_hash="lab_hash", user="user", app="kathara", emit=True):
+        container_id = uuid.uuid4().hex
+        labels = {"app": app, "name": name, "lab_hash": lab_hash, "user": user}
+        self.container_objects[container_id] = {
+            "Config": {"Labels": labels}, "State": {"Status": "running"}, "NetworkSettings": {"Networks": {}}
+        }
+        if emit:
+            self.emit("container", "create", container_id, dict(labels, name=f"{user}_{name}"))
+        return container_id
+
+    def remove_container(self, container_id, emit=True):
+        labels = self.container_objects.pop(container_id)["Config"]["Labels"]
+        if emit:
+            self.emit("container", "destroy", container_id, dict(labels))
+
+    def add_network(self, name, lab_hash="lab_hash", user="user"):
+        network_id = uuid.uuid4().hex
+        self.network_objects[network_id] = {
+            "Name": f"kathara_{user}_{name}", "Labels": {"app": "kathara", "name": name, "lab_hash": lab_hash,
+                                                        "user": user}
+        }
+        self.emit("network", "create", network_id, {"name": f"kathara_{user}_{name}", "type": "katharanp"})
+        return network_id
+
+    def connect(self, network_id, container_id):
+        self.container_objects[container_id]["NetworkSettings"]["Networks"][network_id] = {}
+        self.emit("network", "connect", network_id, {"container": container_id, "type": "katharanp"})
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition not met.")
+        time.sleep(0.01)
+
+
+#
+# FIXTURE
+#
+@pytest.fixture()
+def daemon():
+    return FakeDockerDaemon()
+
+
+@pytest.fixture()
+def state_cache(daemon):
+    cache = DockerStateCache(daemon)
+    yield cache
+    cache.stop()
+
+
+#
+# TEST: sync and queries
+#
+def test_start_syncs_existing_objects(daemon, state_cache):
+    daemon.add_container("pc1", emit=False)
+    daemon.add_container("pc2", lab_hash="other_lab", emit=False)
+    daemon.add_container("pc1", user="other_user", emit=False)
+    daemon.add_container("not_kathara", app="other", emit=False)
+
+    assert state_cache.start(timeout=5)
+
+    assert len(state_cache.get_containers()) == 3
+    assert len(state_cache.get_containers(lab_hash="lab_hash")) == 2
+    assert len(state_cache.get_containers(lab_hash="lab_hash", user="user")) == 1
+    assert len(state_cache.get_containers(machine_name="pc2")) == 1
+    assert state_cache.get_containers(machine_name="not_kathara") == []
+
+
+def test_events_update_index(daemon, state_cache):
+    state_cache.start(timeout=5)
+
+    container_id = daemon.add_container("pc1")
+    wait_for(lambda: len(state_cache.get_containers(machine_name="pc1")) == 1)
+
+    daemon.remove_container(container_id)
+    wait_for(lambda: state_cache.get_containers(machine_name="pc1") == [])
+
+
+def test_events_ignore_other_containers(daemon, state_cache):
+    state_cache.start(timeout=5)
+
+    daemon.add_container("other", app="other")
+    daemon.add_container("pc1")
+    wait_for(lambda: len(state_cache.get_containers(machine_name="pc1")) == 1)
+
+    assert state_cache.get_containers(machine_name="other") == []
+
+
+def test_network_events_update_index(daemon, state_cache):
+    state_cache.start(timeout=5)
+    container_id = daemon.add_container("pc1")
+    network_id = daemon.add_network("A")
+    wait_for(lambda: len(state_cache.get_networks(link_name="A")) == 1)
+
+    daemon.connect(network_id, container_id)
+    wait_for(lambda: network_id in
+             state_cache.get_containers(machine_name="pc1")[0].attrs["NetworkSettings"]["Networks"])
+
+
+def test_resync_on_gap(daemon, state_cache):
+    state_cache.start(timeout=5)
+    daemon.add_container("pc1", emit=False)
+    assert state_cache.get_containers() == []
+
+    with mock.patch("src.Kathara.manager.docker.DockerStateCache.RESYNC_INTERVAL", 0.01):
+        daemon.disconnect()
+        wait_for(lambda: len(daemon.streams) == 1)
+
+    wait_for(state_cache.is_synced)
+    assert len(state_cache.get_containers(machine_name="pc1")) == 1
+
+
+def test_resync_does_not_inspect_networks(daemon, state_cache):
+    daemon.add_container("pc1", emit=False)
+    for name in ["A", "B", "C"]:
+        daemon.add_network(name)
+
+    daemon.requests = 0
+    state_cache.start(timeout=5)
+
+    # One inspect for the container, one list each for containers and networks, and one for the events stream
+    assert daemon.requests == 4
+    assert len(state_cache.get_networks(lab_hash="lab_hash")) == 3
+
+
+def test_write_through_replace(state_cache):
+    labels = {"Config": {"Labels": {"name": "pc1", "lab_hash": "lab_hash", "user": "user"}}}
+    state_cache.update_container(FakeApiObject("id1", labels))
+    container = FakeApiObject("id2", labels)
+
+    # A new container with the same name replaces the previous one
+    state_cache.update_container(container)
+    assert state_cache.get_containers(lab_hash="lab_hash") == [container]
+
+    state_cache.remove_container("id1")
+    assert state_cache.get_containers(lab_hash="lab_hash") == [container]
+
+
+def test_write_through(state_cache):
+    container = FakeApiObject("id1", {"Config": {"Labels": {"name": "pc1", "lab_hash": "lab_hash", "user": "user"}}})
+
+    state_cache.update_container(container)
+    assert state_cache.get_containers(lab_hash="lab_hash") == [container]
+
+    state_cache.remove_container("id1")
+    assert state_cache.get_containers(lab_hash="lab_hash") == []
+
+
+def test_stop(daemon, state_cache):
+    state_cache.start(timeout=5)
+    state_cache.stop()
+
+    assert not state_cache.is_synced()
+    assert state_cache._thread is None
+
+
+#
+# TEST: managers integration
+#
+@mock.patch("src.Kathara.manager.docker.DockerImage.DockerImage")
+@mock.patch("docker.DockerClient")
+def test_docker_machine_queries_cache_when_synced(mock_docker_client, mock_docker_image):
+    mock_docker_client.version.return_value = {"Version": "27.0.0"}
+    state_cache = mock.Mock()
+    state_cache.is_synced.return_value = True
+    docker_machine = DockerMachine(mock_docker_client, mock_docker_image, state_cache)
+
+    docker_machine.get_machines_api_objects_by_filters(lab_hash="lab_hash", user="user")
+
+    state_cache.get_containers.assert_called_once_with(lab_hash="lab_hash", machine_name=None, user="user")
+    assert not mock_docker_client.containers.list.called
+
+    state_cache.is_synced.return_value = False
+    docker_machine.get_machines_api_objects_by_filters(lab_hash="lab_hash", user="user")
+    assert mock_docker_client.containers.list.called
+
+
+#
+# TEST: requests to the daemon
+#
+def test_state_cache_requests_against_polling(daemon, state_cache):
+    n_devices = 50
+    n_queries = 20
+    for i in range(n_devices):
+        daemon.add_container(f"pc{i}", emit=False)
+    filters = {"label": ["app=kathara", "user=user", "lab_hash=lab_hash"]}
+
+    daemon.requests = 0
+    for _ in range(n_queries):
+        assert len(daemon.containers.list(all=True, filters=filters, ignore_removed=True)) == n_devices
+    polling_requests = daemon.requests
+
+    state_cache.start(timeout=5)
+    daemon.requests = 0
+    for _ in range(n_queries):
+        assert len(state_cache.get_containers(lab_hash="lab_hash", user="user")) == n_devices
+    cache_requests = daemon.requests
+
+    # Polling lists and inspects each container at each query, the cache does not contact the daemon
+    assert polling_requests == n_queries * (n_devices + 1)
+    assert cache_requests == 0
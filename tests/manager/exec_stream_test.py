@@ -0,0 +1,42 @@
+import sys
+from unittest import mock
+from unittest.mock import Mock
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.docker.exec_stream.DockerExecStream import DockerExecStream
+
+
+def test_decode():
+    # "è" is split between two chunks
+    exec_stream = DockerExecStream(iter([(b"a\xc3", None), (b"\xa8b", b"err")]), "id", Mock())
+
+    assert list(exec_stream.decode()) == [("a", ""), ("èb", "err")]
+
+
+def test_decode_incomplete_character():
+    exec_stream = DockerExecStream(iter([(b"a\xc3", None)]), "id", Mock())
+
+    assert list(exec_stream.decode()) == [("a", ""), ("�", "")]
+
+
+def test_decode_encoding():
+    exec_stream = DockerExecStream(iter([("è".encode("latin-1"), None)]), "id", Mock())
+
+    assert list(exec_stream.decode(encoding="latin-1")) == [("è", "")]
+
+
+def test_decode_encoding_does_not_import_chardet():
+    exec_stream = DockerExecStream(iter([(b"a", None)]), "id", Mock())
+
+    with mock.patch.dict(sys.modules, {"chardet": None}):
+        assert list(exec_stream.decode()) == [("a", "")]
+
+
+def test_decode_detect_encoding_once(monkeypatch):
+    mock_detect = Mock(return_value={'encoding': "utf-8"})
+    monkeypatch.setattr("chardet.detect", mock_detect)
+    exec_stream = DockerExecStream(iter([(b"a", None), (b"b", None), (b"c", None)]), "id", Mock())
+
+    assert list(exec_stream.decode(encoding=None)) == [("a", ""), ("b", ""), ("c", "")]
+    mock_detect.assert_called_once_with(b"a")
@@ -0,0 +1,187 @@
+import base64
+import io
+import json
+import os
+import sys
+import tarfile
+from unittest import mock
+from unittest.mock import Mock
+
+import pytest
+from kubernetes.client import ApiClient
+from kubernetes.client.rest import ApiException
+
+sys.path.insert(0, './')
+
+from src.Kathara.exceptions import KubernetesConfigMapError
+from src.Kathara.foundation.model.PackCache import PackCache
+from src.Kathara.manager.kubernetes.KubernetesConfigMap import KubernetesConfigMap, MAX_CONFIG_MAP_SIZE
+from src.Kathara.model.Lab import Lab
+
+
+#
+# FIXTURE
+#
+@pytest.fixture()
+@mock.patch("kubernetes.client.api.core_v1_api.CoreV1Api")
+def kubernetes_config_map(core_v1_api_mock):
+    return KubernetesConfigMap()
+
+
+@pytest.fixture()
+def pack_cache(tmp_path, monkeypatch):
+    cache = PackCache.get_instance()
+    monkeypatch.setattr(cache, "path", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "_indexes", {})
+    return cache
+
+
+@pytest.fixture()
+def lab():
+    lab = Lab("default_scenario")
+    pc1 = lab.new_machine("pc1")
+    pc1.add_meta("real_name", "devprefix-pc1-ec84ad3b")
+    pc2 = lab.new_machine("pc2")
+    pc2.add_meta("real_name", "devprefix-pc2-ec84ad3b")
+    return lab
+
+
+def read_tar_names(config_map, key):
+    tar_data = base64.b64decode(config_map.data[key])
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:gz") as tar:
+        return tar.getnames()
+
+
+#
+# TEST: deploy_for_lab
+#
+def test_deploy_for_lab(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("echo shared", "shared.startup")
+    lab.create_file_from_string("ip link set eth0 up", "pc1.startup")
+
+    shared_config_map, config_maps = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    assert shared_config_map.metadata.name == KubernetesConfigMap.build_name_for_lab(lab.hash)
+    assert read_tar_names(shared_config_map, "shared.b64") == ["hostlab", "hostlab/shared.startup"]
+
+    assert list(config_maps.keys()) == ["pc1"]
+    assert len(config_maps["pc1"]) == 1
+    assert config_maps["pc1"][0].metadata.name == f"devprefix-pc1-ec84ad3b-{lab.hash}-files"
+    pc1_names = read_tar_names(config_maps["pc1"][0], "hostlab.b64")
+    assert "hostlab/pc1.startup" in pc1_names
+    assert "hostlab/shared.startup" not in pc1_names
+
+    assert kubernetes_config_map.client.create_namespaced_config_map.call_count == 2
+    kubernetes_config_map.client.create_namespaced_config_map.assert_any_call(body=shared_config_map,
+                                                                               namespace=lab.hash)
+    kubernetes_config_map.client.create_namespaced_config_map.assert_any_call(body=config_maps["pc1"][0],
+                                                                               namespace=lab.hash)
+
+
+def test_deploy_for_lab_no_files(kubernetes_config_map, lab, pack_cache):
+    shared_config_map, config_maps = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    assert shared_config_map is None
+    assert config_maps == {}
+    assert not kubernetes_config_map.client.create_namespaced_config_map.called
+
+
+def test_deploy_for_lab_replace_shared(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("echo shared", "shared.startup")
+    kubernetes_config_map.client.create_namespaced_config_map.side_effect = ApiException(status=409)
+
+    shared_config_map, _ = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    kubernetes_config_map.client.replace_namespaced_config_map.assert_called_once_with(
+        name=shared_config_map.metadata.name, namespace=lab.hash, body=shared_config_map
+    )
+
+
+def test_deploy_for_lab_existing_device(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("ip link set eth0 up", "pc1.startup")
+    kubernetes_config_map.client.create_namespaced_config_map.side_effect = ApiException(status=409)
+
+    _, config_maps = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    assert "pc1" in config_maps
+    assert not kubernetes_config_map.client.replace_namespaced_config_map.called
+
+
+def test_deploy_for_lab_too_big(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("ip link set eth0 up", "pc1.startup")
+
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesConfigMap.MAX_FILE_SIZE", 3), \
+            mock.patch("src.Kathara.manager.kubernetes.KubernetesConfigMap.MAX_SHARDS", 2):
+        with pytest.raises(KubernetesConfigMapError):
+            kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    assert not kubernetes_config_map.client.create_namespaced_config_map.called
+
+
+def test_deploy_for_lab_shards(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("ip link set eth0 up", "pc1.startup")
+    tar_data = lab.machines["pc1"].pack_data(shared=False)
+
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesConfigMap.MAX_FILE_SIZE", 30):
+        _, config_maps = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    shards = config_maps["pc1"]
+    assert len(shards) == -(-len(tar_data) // 30)
+    name = f"devprefix-pc1-ec84ad3b-{lab.hash}-files"
+    assert [shard.metadata.name for shard in shards] == [name] + [f"{name}-{i}" for i in range(1, len(shards))]
+    assert [list(shard.data.keys()) for shard in shards] == [["hostlab.b64.%03d" % i] for i in range(len(shards))]
+
+    # The concatenation of the base64 shards is the base64 of the whole archive
+    assert base64.b64decode("".join(shard.data["hostlab.b64.%03d" % i] for i, shard in enumerate(shards))) == \
+           tar_data
+    assert kubernetes_config_map.client.create_namespaced_config_map.call_count == len(shards)
+
+
+@pytest.mark.parametrize("file_size", [100 * 1024, 1024 * 1024, 4 * 1024 * 1024])
+def test_deploy_for_lab_config_map_size_limit(kubernetes_config_map, lab, pack_cache, file_size):
+    # The base64 of random data is only compressed to its random bytes, so big files are split in shards
+    lab.machines["pc1"].create_file_from_string(base64.b64encode(os.urandom(file_size * 3 // 4)).decode("utf-8"),
+                                                "/big_file")
+    lab.create_file_from_string("echo shared", "shared.startup")
+
+    shared_config_map, config_maps = kubernetes_config_map.deploy_for_lab(lab, list(lab.machines.values()))
+
+    api_client = ApiClient()
+    for config_map in [shared_config_map] + config_maps["pc1"]:
+        encoded = json.dumps(api_client.sanitize_for_serialization(config_map)).encode("utf-8")
+        assert len(encoded) <= MAX_CONFIG_MAP_SIZE
+
+
+#
+# TEST: deploy_for_machine
+#
+def test_deploy_for_machine_with_shared(kubernetes_config_map, lab, pack_cache):
+    lab.create_file_from_string("echo shared", "shared.startup")
+
+    kubernetes_config_map.deploy_for_machine(lab.machines["pc1"])
+
+    body = kubernetes_config_map.client.create_namespaced_config_map.call_args.kwargs["body"]
+    assert "hostlab/shared.startup" in read_tar_names(body, "hostlab.b64")
+
+
+#
+# TEST: delete_for_machine
+#
+def test_delete_for_machine_shards(kubernetes_config_map):
+    kubernetes_config_map.client.delete_namespaced_config_map.side_effect = [None, ApiException(status=404), None]
+
+    kubernetes_config_map.delete_for_machine("devprefix-pc1", "lab_hash", shards=3)
+
+    assert kubernetes_config_map.client.delete_namespaced_config_map.call_args_list == [
+        mock.call(name="devprefix-pc1-lab_hash-files", namespace="lab_hash"),
+        mock.call(name="devprefix-pc1-lab_hash-files-1", namespace="lab_hash"),
+        mock.call(name="devprefix-pc1-lab_hash-files-2", namespace="lab_hash")
+    ]
+
+
+#
+# TEST: get_size
+#
+def test_get_size():
+    assert KubernetesConfigMap.get_size(None) == 0
+    assert KubernetesConfigMap.get_size(Mock(data={"a.b64": "abcd", "b.b64": "ef"})) == 6
@@ -0,0 +1,164 @@
+import queue
+import sys
+import time
+from unittest import mock
+from unittest.mock import Mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.kubernetes.KubernetesInformer import KubernetesInformer
+
+
+class FakeWatch(object):
+    def __init__(self):
+        self.events = queue.Queue()
+        self.calls = []
+        self.stopped = False
+
+    def stream(self, func, **kwargs):
+        self.calls.append(kwargs)
+        while not self.stopped:
+            try:
+                event = self.events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    def stop(self):
+        self.stopped = True
+
+
+def network(namespace, name, labels=None, version="1"):
+    return {"metadata": {"namespace": namespace, "name": name, "labels": labels or {"app": "kathara", "name": name},
+                         "resourceVersion": version}}
+
+
+def wait_until(condition, timeout=5):
+    start = time.monotonic()
+    while not condition():
+        if time.monotonic() - start > timeout:
+            raise TimeoutError()
+        time.sleep(0.01)
+
+
+@pytest.fixture()
+def fake_watch():
+    fake_watch = FakeWatch()
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesInformer.watch.Watch", return_value=fake_watch):
+        yield fake_watch
+    fake_watch.stop()
+
+
+def test_start(fake_watch):
+    list_func = Mock(return_value={"items": [network("lab1", "a")], "metadata": {"resourceVersion": "10"}})
+    informer = KubernetesInformer(list_func)
+
+    assert informer.start()
+    assert informer.is_synced
+    list_func.assert_called_once_with(label_selector="app=kathara", timeout_seconds=9999)
+    assert informer.list() == [network("lab1", "a")]
+
+    wait_until(lambda: fake_watch.calls)
+    assert fake_watch.calls[0]["resource_version"] == "10"
+    assert fake_watch.calls[0]["label_selector"] == "app=kathara"
+
+    informer.stop()
+    assert not informer.is_synced
+    assert fake_watch.stopped
+
+
+def test_start_model_objects(fake_watch):
+    pod = Mock()
+    pod.metadata.namespace = "lab1"
+    pod.metadata.name = "pc1"
+    pod.metadata.labels = {"app": "kathara", "name": "pc1"}
+    list_func = Mock(return_value=Mock(items=[pod]))
+    informer = KubernetesInformer(list_func)
+
+    assert informer.start()
+    assert informer.list(namespace="lab1", labels={"name": "pc1"}) == [pod]
+    assert informer.list(namespace="lab2") == []
+
+    informer.stop()
+
+
+def test_start_list_error(fake_watch):
+    list_func = Mock(side_effect=ApiException(status=403))
+    informer = KubernetesInformer(list_func)
+
+    assert not informer.start()
+    assert not informer.is_synced
+    assert not fake_watch.calls
+
+    informer.stop()
+
+
+def test_start_shared(fake_watch):
+    list_func = Mock(return_value={"items": [], "metadata": {"resourceVersion": "10"}})
+    informer = KubernetesInformer(list_func)
+
+    assert informer.start()
+    assert informer.start()
+    list_func.assert_called_once()
+
+    informer.stop()
+    assert informer.is_synced
+    assert not fake_watch.stopped
+
+    informer.stop()
+    assert not informer.is_synced
+    assert fake_watch.stopped
+
+
+def test_list_filters(fake_watch):
+    items = [network("lab1", "a"), network("lab1", "b"), network("lab2", "a")]
+    informer = KubernetesInformer(Mock(return_value={"items": items, "metadata": {}}))
+    informer.start()
+
+    assert informer.list() == items
+    assert informer.list(namespace="lab1") == items[:2]
+    assert informer.list(labels={"name": "a"}) == [items[0], items[2]]
+    assert informer.list(namespace="lab2", labels={"name": "b"}) == []
+
+    informer.stop()
+
+
+def test_watch_events(fake_watch):
+    informer = KubernetesInformer(
+        Mock(return_value={"items": [network("lab1", "a"), network("lab1", "b")], "metadata": {}})
+    )
+    informer.start()
+
+    fake_watch.events.put({"type": "ADDED", "object": network("lab2", "c", version="11")})
+    fake_watch.events.put({"type": "MODIFIED", "object": network("lab1", "a", version="12")})
+    fake_watch.events.put({"type": "DELETED", "object": network("lab1", "b", version="13")})
+
+    wait_until(lambda: informer._resource_version == "13")
+    assert informer.list() == [network("lab1", "a", version="12"), network("lab2", "c", version="11")]
+
+    informer.stop()
+
+
+def test_watch_expired(fake_watch):
+    list_func = Mock(side_effect=[
+        {"items": [network("lab1", "a")], "metadata": {"resourceVersion": "10"}},
+        {"items": [network("lab1", "b")], "metadata": {"resourceVersion": "20"}},
+    ])
+    informer = KubernetesInformer(list_func)
+    informer.start()
+
+    fake_watch.events.put(ApiException(status=410))
+
+    wait_until(lambda: len(fake_watch.calls) == 2)
+    assert list_func.call_count == 2
+    assert fake_watch.calls[1]["resource_version"] == "20"
+    assert informer.is_synced
+    assert informer.list() == [network("lab1", "b")]
+
+    informer.stop()
@@ -6,6 +6,7 @@ from unittest.mock import Mock, call
 
 import pytest
 from kubernetes import client
+from kubernetes.client.rest import ApiException
 
 from src.Kathara.exceptions import InvocationError
 
@@ -22,23 +23,6 @@ class FakeConfig(object):
         }
 
 
-class FakeManager(object):
-    def __init__(self, ctx):
-        pass
-
-    def start(self):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def dict(self, init_dict):
-        return init_dict
-
-    def __exit__(self, exit_type, value, traceback):
-        return True
-
-
 FakeLinkData = namedtuple('FakeLinkData', ['metadata'])
 FakeLinkMetadata = namedtuple('FakeLinkMetadata', ['name'])
 
@@ -54,21 +38,6 @@ def default_link():
     return Link(Lab("default_scenario"), "A")
 
 
-@pytest.fixture()
-def NETWORK_IDS_SINGLE():
-    return {
-        1362434: 1
-    }
-
-
-@pytest.fixture()
-def NETWORK_IDS_DOUBLE():
-    return {
-        1362434: 1,
-        1362435: 1
-    }
-
-
 @pytest.fixture()
 @mock.patch("kubernetes.client.api.custom_objects_api.CustomObjectsApi")
 @mock.patch("kubernetes.client.Configuration")
@@ -202,53 +171,28 @@ def test_get_network_id_offset(kubernetes_link):
 
 
 #
-# TEST: _get_unique_network_id
-#
-def test_get_unique_network_id(kubernetes_link):
-    network_ids = {}
-
-    actual_network_id = kubernetes_link._get_unique_network_id("A", network_ids)
-
-    assert actual_network_id == EXPECTED_NETWORK_ID
-    assert network_ids == {1362434: 1}
-
-
-def test_get_unique_network_id_collision(kubernetes_link, NETWORK_IDS_SINGLE):
-    expected_network_id = EXPECTED_NETWORK_ID + 1
-    actual_network_id = kubernetes_link._get_unique_network_id("A", NETWORK_IDS_SINGLE)
-
-    assert actual_network_id == expected_network_id
-    assert NETWORK_IDS_SINGLE == {1362434: 1, expected_network_id: 1}
-
-
-def test_get_unique_network_id_double_collision(kubernetes_link, NETWORK_IDS_DOUBLE):
-    expected_network_id = EXPECTED_NETWORK_ID + 2
-    actual_network_id = kubernetes_link._get_unique_network_id("A", NETWORK_IDS_DOUBLE)
-
-    assert actual_network_id == expected_network_id
-    assert NETWORK_IDS_DOUBLE == {1362434: 1, 1362435: 1, expected_network_id: 1}
-
-
-#
-# TEST: _get_existing_network_ids
+# TEST: _get_all_networks
 #
-@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.get_links_api_objects_by_filters")
-def test_get_existing_network_ids_no_ids(mock_get_links_by_filters, kubernetes_link):
-    mock_get_links_by_filters.return_value = []
-
-    result = kubernetes_link._get_existing_network_ids()
+def test_get_all_networks(kubernetes_link, kubernetes_network):
+    kubernetes_link.client.list_cluster_custom_object.return_value = {"items": [kubernetes_network]}
 
-    assert len(result) == 0
+    assert kubernetes_link._get_all_networks() == [kubernetes_network]
+    kubernetes_link.client.list_cluster_custom_object.assert_called_once_with(
+        group="k8s.cni.cncf.io",
+        version="v1",
+        plural="network-attachment-definitions",
+        label_selector="app=kathara",
+        timeout_seconds=9999
+    )
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.get_links_api_objects_by_filters")
-def test_get_existing_network_ids_one_id(mock_get_links_by_filters, kubernetes_link, kubernetes_network):
+def test_get_all_networks_forbidden(mock_get_links_by_filters, kubernetes_link, kubernetes_network):
+    kubernetes_link.client.list_cluster_custom_object.side_effect = ApiException(status=403)
     mock_get_links_by_filters.return_value = [kubernetes_network]
 
-    result = kubernetes_link._get_existing_network_ids()
-
-    assert len(result) == 1
-    assert result[0] == 1
+    assert kubernetes_link._get_all_networks() == [kubernetes_network]
+    mock_get_links_by_filters.assert_called_once_with()
 
 
 #
@@ -301,26 +245,57 @@ def test_create(mock_setting_get_instance, kubernetes_link, default_link):
 #
 # TEST: _deploy_link
 #
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+def test_deploy_link(mock_create_network, kubernetes_link, default_link):
+    kubernetes_link._deploy_link(("", default_link))
+    mock_create_network.assert_called_once_with(default_link, EXPECTED_NETWORK_ID)
+    assert EXPECTED_NETWORK_ID in kubernetes_link.vni_allocator.get_used_ids()
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+def test_deploy_link_collision(mock_create_network, kubernetes_link, default_link):
+    kubernetes_link.vni_allocator.allocate("A")
+
+    kubernetes_link._deploy_link(("", default_link))
+    mock_create_network.assert_called_once_with(default_link, EXPECTED_NETWORK_ID + 1)
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+def test_deploy_link_existing(mock_create_network, kubernetes_link, default_link, kubernetes_network):
+    kubernetes_network["metadata"]["namespace"] = default_link.lab.hash
+    kubernetes_link.vni_allocator.sync([kubernetes_network])
+
+    kubernetes_link._deploy_link(("", default_link))
+    assert not mock_create_network.called
+    assert default_link.api_object == kubernetes_network
+
+
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.create")
-def test_deploy_link(mock_create, kubernetes_link, default_link):
-    kubernetes_link._deploy_link({}, ("", default_link))
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+def test_deploy_link_conflict(mock_create_network, mock_create, kubernetes_link, default_link):
+    mock_create_network.side_effect = ApiException(status=409)
+
+    kubernetes_link._deploy_link(("", default_link))
     mock_create.assert_called_once_with(default_link, EXPECTED_NETWORK_ID)
+    assert EXPECTED_NETWORK_ID not in kubernetes_link.vni_allocator.get_used_ids()
 
 
-@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.create")
-def test_deploy_link_collision(mock_create, kubernetes_link, default_link, NETWORK_IDS_SINGLE):
-    kubernetes_link._deploy_link(NETWORK_IDS_SINGLE, ("", default_link))
-    mock_create.assert_called_once_with(default_link, EXPECTED_NETWORK_ID + 1)
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+def test_deploy_link_error(mock_create_network, kubernetes_link, default_link):
+    mock_create_network.side_effect = ApiException(status=500)
+
+    with pytest.raises(ApiException):
+        kubernetes_link._deploy_link(("", default_link))
+    assert EXPECTED_NETWORK_ID not in kubernetes_link.vni_allocator.get_used_ids()
 
 
 #
 # TEST: deploy_links
 #
-@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.get_links_api_objects_by_filters")
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._get_all_networks")
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._deploy_link")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
-def test_deploy_links(mock_deploy_link, mock_get_links_by_filters, kubernetes_link):
-    mock_get_links_by_filters.return_value = []
+def test_deploy_links(mock_deploy_link, mock_get_all_networks, kubernetes_link):
+    mock_get_all_networks.return_value = []
 
     lab = Lab("Default scenario")
     link_a = lab.get_or_new_link("A")
@@ -329,42 +304,39 @@ def test_deploy_links(mock_deploy_link, mock_get_links_by_filters, kubernetes_li
 
     kubernetes_link.deploy_links(lab)
 
-    mock_deploy_link.assert_any_call({}, ("A", link_a))
-    mock_deploy_link.assert_any_call({}, ("B", link_b))
-    mock_deploy_link.assert_any_call({}, ("C", link_c))
+    mock_deploy_link.assert_any_call(("A", link_a))
+    mock_deploy_link.assert_any_call(("B", link_b))
+    mock_deploy_link.assert_any_call(("C", link_c))
     assert mock_deploy_link.call_count == 3
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._deploy_link")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
 def test_deploy_links_selected_links(mock_deploy_link, kubernetes_link):
     lab = Lab("Default scenario")
     link_a = lab.get_or_new_link("A")
     link_b = lab.get_or_new_link("B")
     link_c = lab.get_or_new_link("C")
     kubernetes_link.deploy_links(lab, selected_links={"A"})
-    mock_deploy_link.assert_any_call({}, ("A", link_a))
-    assert call({}, ("B", link_b)) not in mock_deploy_link.mock_calls
-    assert call({}, ("C", link_c)) not in mock_deploy_link.mock_calls
+    mock_deploy_link.assert_any_call(("A", link_a))
+    assert call(("B", link_b)) not in mock_deploy_link.mock_calls
+    assert call(("C", link_c)) not in mock_deploy_link.mock_calls
     assert mock_deploy_link.call_count == 1
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._deploy_link")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
 def test_deploy_links_excluded_links(mock_deploy_link, kubernetes_link):
     lab = Lab("Default scenario")
     link_a = lab.get_or_new_link("A")
     link_b = lab.get_or_new_link("B")
     link_c = lab.get_or_new_link("C")
     kubernetes_link.deploy_links(lab, excluded_links={"A"})
-    assert call({}, ("A", link_a)) not in mock_deploy_link.mock_calls
-    mock_deploy_link.assert_any_call({}, ("B", link_b))
-    mock_deploy_link.assert_any_call({}, ("C", link_c))
+    assert call(("A", link_a)) not in mock_deploy_link.mock_calls
+    mock_deploy_link.assert_any_call(("B", link_b))
+    mock_deploy_link.assert_any_call(("C", link_c))
     assert mock_deploy_link.call_count == 2
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._deploy_link")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
 def test_deploy_links_selected_and_excluded_links(mock_deploy_link, kubernetes_link):
     lab = Lab("Default scenario")
     with pytest.raises(InvocationError):
@@ -382,36 +354,37 @@ def test_deploy_links_no_link(mock_deploy_link, kubernetes_link):
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._deploy_link")
-@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._get_existing_network_ids")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
-def test_deploy_links_with_loaded_ids(mock_get_existing_network_ids, mock_deploy_link, kubernetes_link,
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._get_all_networks")
+def test_deploy_links_with_loaded_ids(mock_get_all_networks, mock_deploy_link, kubernetes_link,
                                       kubernetes_network):
-    mock_get_existing_network_ids.return_value = [5432]
+    mock_get_all_networks.return_value = [kubernetes_network]
 
     lab = Lab("Default scenario")
     link = lab.get_or_new_link("A")
 
     kubernetes_link.deploy_links(lab)
 
-    mock_get_existing_network_ids.assert_called_once()
-    mock_deploy_link.assert_called_once_with({5432: 1}, (link.name, link))
+    mock_get_all_networks.assert_called_once()
+    mock_deploy_link.assert_called_once_with((link.name, link))
+    assert kubernetes_link.vni_allocator.get_used_ids() == {1}
 
 
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.create")
-@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._get_existing_network_ids")
-@mock.patch("multiprocessing.managers.SyncManager", new=FakeManager)
-def test_deploy_links_with_loaded_ids_and_collision(mock_get_existing_network_ids,
-                                                    mock_create, kubernetes_link,
-                                                    kubernetes_network):
-    mock_get_existing_network_ids.return_value = [1362434]
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._create_network")
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink._get_all_networks")
+def test_deploy_links_with_loaded_ids_and_collision(mock_get_all_networks, mock_create_network, mock_create,
+                                                    kubernetes_link, kubernetes_network):
+    kubernetes_network["spec"]["config"] = '{"vxlanId": 1362434}'
+    mock_get_all_networks.return_value = [kubernetes_network]
 
     lab = Lab("Default scenario")
     link = lab.get_or_new_link("A")
 
     kubernetes_link.deploy_links(lab)
 
-    mock_get_existing_network_ids.assert_called_once()
-    mock_create.assert_called_once_with(link, 1362434 + 1)
+    mock_get_all_networks.assert_called_once()
+    mock_create_network.assert_called_once_with(link, 1362434 + 1)
+    assert not mock_create.called
 
 
 #
@@ -460,10 +433,27 @@ def test_get_links_by_filters(kubernetes_link):
     )
 
 
-def test_get_links_by_filters_empty_filters(kubernetes_link):
+def test_get_links_by_filters_empty_filters(kubernetes_link, kubernetes_network):
+    kubernetes_link.client.list_cluster_custom_object.return_value = {"items": [kubernetes_network]}
+
+    assert kubernetes_link.get_links_api_objects_by_filters() == [kubernetes_network]
+
+    assert not kubernetes_link.kubernetes_namespace.get_all.called
+    assert not kubernetes_link.client.list_namespaced_custom_object.called
+    kubernetes_link.client.list_cluster_custom_object.assert_called_once_with(
+        group="k8s.cni.cncf.io",
+        version="v1",
+        plural="network-attachment-definitions",
+        label_selector="app=kathara",
+        timeout_seconds=9999
+    )
+
+
+def test_get_links_by_filters_empty_filters_forbidden(kubernetes_link):
     ld1 = FakeLinkData(metadata=FakeLinkMetadata(name='lab_hash_value1'))
     ld2 = FakeLinkData(metadata=FakeLinkMetadata(name='lab_hash_value2'))
     kubernetes_link.kubernetes_namespace.get_all.return_value = [ld1, ld2]
+    kubernetes_link.client.list_cluster_custom_object.side_effect = ApiException(status=403)
 
     kubernetes_link.get_links_api_objects_by_filters()
 
@@ -504,23 +494,30 @@ def test_get_links_by_filters_only_lab_hash(kubernetes_link):
 
 
 def test_get_links_by_filters_only_link_name(kubernetes_link):
-    ld = FakeLinkData(metadata=FakeLinkMetadata(name='lab_hash_value'))
-    kubernetes_link.kubernetes_namespace.get_all.return_value = [ld]
-
     kubernetes_link.get_links_api_objects_by_filters(None, "link_name_value")
 
     filters = ["app=kathara", "name=link_name_value"]
 
-    kubernetes_link.client.list_namespaced_custom_object.assert_called_once_with(
+    kubernetes_link.client.list_cluster_custom_object.assert_called_once_with(
         group="k8s.cni.cncf.io",
         version="v1",
-        namespace="lab_hash_value",
         plural="network-attachment-definitions",
         label_selector=",".join(filters),
         timeout_seconds=9999
     )
 
 
+def test_get_links_by_filters_informer(kubernetes_link, kubernetes_network):
+    kubernetes_link.informer = Mock()
+    kubernetes_link.informer.is_synced = True
+    kubernetes_link.informer.list.return_value = [kubernetes_network]
+
+    assert kubernetes_link.get_links_api_objects_by_filters("lab_hash_value") == [kubernetes_network]
+
+    kubernetes_link.informer.list.assert_called_once_with(namespace="lab_hash_value", labels=None)
+    assert not kubernetes_link.client.list_namespaced_custom_object.called
+
+
 #
 # TEST: undeploy
 #
@@ -606,6 +603,24 @@ def test_get_links_stats_lab_hash(mock_get_links_api_objects_by_filters, kuberne
     assert stat['test_network'].network_name == "test_network"
 
 
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.get_links_api_objects_by_filters")
+def test_get_links_stats_informer(mock_get_links_api_objects_by_filters, kubernetes_link, kubernetes_network):
+    kubernetes_network['metadata']['name'] = "test_network"
+    mock_get_links_api_objects_by_filters.return_value = [kubernetes_network]
+    kubernetes_link.informer = Mock()
+
+    stats_generator = kubernetes_link.get_links_stats(lab_hash="lab_hash")
+    next(stats_generator)
+    # One-shot reads never start the informer
+    assert not kubernetes_link.informer.start.called
+
+    next(stats_generator)
+    kubernetes_link.informer.start.assert_called_once()
+
+    stats_generator.close()
+    kubernetes_link.informer.stop.assert_called_once()
+
+
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesLink.KubernetesLink.get_links_api_objects_by_filters")
 def test_get_links_stats_lab_hash_link_name(mock_get_links_api_objects_by_filters, kubernetes_link,
                                             kubernetes_network):
@@ -11,6 +11,7 @@ from kubernetes.client import V1PodList
 sys.path.insert(0, './')
 
 from kubernetes import client
+from kubernetes.client.rest import ApiException
 from src.Kathara.exceptions import InvocationError
 from src.Kathara.model.Lab import Lab
 from src.Kathara.model.Machine import Machine
@@ -22,11 +23,13 @@ from src.Kathara.event.EventDispatcher import EventDispatcher
 # FIXTURE
 #
 @pytest.fixture()
+@mock.patch("kubernetes.client.api.custom_objects_api.CustomObjectsApi")
 @mock.patch("kubernetes.client.api.apps_v1_api.AppsV1Api")
 @mock.patch("kubernetes.client.api.core_v1_api.CoreV1Api")
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesConfigMap")
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesNamespace")
-def kubernetes_machine(kubernetes_namespace_mock, config_map_mock, core_v1_api_mock, apps_v1_api_mock):
+def kubernetes_machine(kubernetes_namespace_mock, config_map_mock, core_v1_api_mock, apps_v1_api_mock,
+                       custom_objects_api_mock):
     return KubernetesMachine(kubernetes_namespace_mock)
 
 
@@ -414,7 +417,7 @@ def test_build_definition(mock_setting_get_instance, config_map_mock, default_de
                                               spec=deployment_spec
                                               )
 
-    actual_definition = kubernetes_machine._build_definition(default_device, config_map_mock)
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map_mock])
 
     assert actual_definition == expected_definition
 
@@ -493,7 +496,7 @@ def test_build_docker_config_json(mock_setting_get_instance, config_map_mock, de
                                               spec=deployment_spec
                                               )
 
-    actual_definition = kubernetes_machine._build_definition(default_device, config_map_mock)
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map_mock])
 
     assert actual_definition == expected_definition
 
@@ -574,7 +577,7 @@ def test_build_definition_entrypoint(mock_setting_get_instance, config_map_mock,
                                               spec=deployment_spec
                                               )
 
-    actual_definition = kubernetes_machine._build_definition(default_device, config_map_mock)
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map_mock])
 
     assert actual_definition == expected_definition
 
@@ -655,7 +658,7 @@ def test_build_definition_entrypoint(mock_setting_get_instance, config_map_mock,
                                               spec=deployment_spec
                                               )
 
-    actual_definition = kubernetes_machine._build_definition(default_device, config_map_mock)
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map_mock])
 
     assert actual_definition == expected_definition
 
@@ -737,11 +740,70 @@ def test_build_definition_entrypoint(mock_setting_get_instance, config_map_mock,
                                               spec=deployment_spec
                                               )
 
-    actual_definition = kubernetes_machine._build_definition(default_device, config_map_mock)
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map_mock])
 
     assert actual_definition == expected_definition
 
 
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_build_definition_shared_config_map(mock_setting_get_instance, default_device, kubernetes_machine):
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{
+        'device_prefix': 'devprefix',
+        'device_shell': '/bin/bash',
+        'enable_ipv6': False,
+        'image_pull_policy': 'Always',
+        'host_shared': False,
+        'docker_config_json': None
+    })
+    mock_setting_get_instance.return_value = setting_mock
+
+    config_map = client.V1ConfigMap(metadata=client.V1ObjectMeta(name="test_device_config_map"))
+    shared_config_map = client.V1ConfigMap(metadata=client.V1ObjectMeta(name="shared_config_map"))
+
+    actual_definition = kubernetes_machine._build_definition(default_device, [config_map], shared_config_map)
+
+    container_definition = actual_definition.spec.template.spec.containers[0]
+    assert container_definition.volume_mounts == [
+        client.V1VolumeMount(name="hostlab", mount_path="/tmp/kathara"),
+        client.V1VolumeMount(name="hostlab-shared", mount_path="/tmp/kathara-shared")
+    ]
+    assert actual_definition.spec.template.spec.volumes == [
+        client.V1Volume(name="hostlab", config_map=client.V1ConfigMapVolumeSource(name="test_device_config_map")),
+        client.V1Volume(name="hostlab-shared", config_map=client.V1ConfigMapVolumeSource(name="shared_config_map"))
+    ]
+
+
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_build_definition_config_map_shards(mock_setting_get_instance, default_device, kubernetes_machine):
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{
+        'device_prefix': 'devprefix',
+        'device_shell': '/bin/bash',
+        'enable_ipv6': False,
+        'image_pull_policy': 'Always',
+        'host_shared': False,
+        'docker_config_json': None
+    })
+    mock_setting_get_instance.return_value = setting_mock
+
+    config_maps = [
+        client.V1ConfigMap(metadata=client.V1ObjectMeta(name="test_device_config_map")),
+        client.V1ConfigMap(metadata=client.V1ObjectMeta(name="test_device_config_map-1"))
+    ]
+
+    actual_definition = kubernetes_machine._build_definition(default_device, config_maps)
+
+    pod_template = actual_definition.spec.template
+    assert pod_template.metadata.annotations["kathara.config-map-shards"] == "2"
+    assert pod_template.spec.volumes == [
+        client.V1Volume(name="hostlab", projected=client.V1ProjectedVolumeSource(sources=[
+            client.V1VolumeProjection(config_map=client.V1ConfigMapProjection(name="test_device_config_map")),
+            client.V1VolumeProjection(config_map=client.V1ConfigMapProjection(name="test_device_config_map-1"))
+        ]))
+    ]
+
+
 #
 # TEST: create
 #
@@ -766,6 +828,26 @@ def test_create(mock_setting_get_instance, kubernetes_machine, default_device, k
     )
 
 
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine._build_definition")
+@mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
+def test_create_with_lab_config_maps(mock_setting_get_instance, mock_build_definition, kubernetes_machine,
+                                     default_device):
+    setting_mock = Mock()
+    setting_mock.configure_mock(**{'device_prefix': 'devprefix', 'enable_ipv6': False})
+    mock_setting_get_instance.return_value = setting_mock
+
+    config_map = Mock()
+    shared_config_map = Mock()
+    default_device.lab.add_option("_config_maps", {"test_device": [config_map]})
+    default_device.lab.add_option("_shared_config_map", shared_config_map)
+    kubernetes_machine.kubernetes_config_map = Mock()
+
+    kubernetes_machine.create(default_device)
+
+    assert not kubernetes_machine.kubernetes_config_map.deploy_for_machine.called
+    mock_build_definition.assert_called_once_with(default_device, [config_map], shared_config_map)
+
+
 @mock.patch("src.Kathara.setting.Setting.Setting.get_instance")
 def test_create_docker_json(mock_setting_get_instance, kubernetes_machine, default_device,
                             kubernetes_device_definition_image_pull_secrets):
@@ -1581,35 +1663,52 @@ def test_undeploy_machine(mock_delete_machine, kubernetes_machine, default_devic
 #
 # TEST: get_machines_api_objects_by_filter
 #
-@mock.patch("kubernetes.client.api.core_v1_api.CoreV1Api.list_namespaced_pod")
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesNamespace.KubernetesNamespace.get_all")
-def test_get_machines_api_objects_by_filter_empty_filter(mock_namespace_get_all, mock_list_namespaced_pod,
-                                                         kubernetes_namespace, default_device, kubernetes_machine):
-    mock_namespace_get_all.return_value = [kubernetes_namespace]
+def test_get_machines_api_objects_by_filter_empty_filter(mock_namespace_get_all, default_device, kubernetes_machine):
     kubernetes_machine.kubernetes_namespace.get_all = mock_namespace_get_all
-    mock_list_namespaced_pod.return_value = V1PodList(items=[default_device])
-    kubernetes_machine.core_client.list_namespaced_pod = mock_list_namespaced_pod
-    kubernetes_machine.get_machines_api_objects_by_filters()
-    mock_namespace_get_all.assert_called_once()
-    mock_list_namespaced_pod.assert_called_once_with(namespace="test_namespace",
-                                                     label_selector="app=kathara",
-                                                     timeout_seconds=9999)
+    kubernetes_machine.core_client.list_pod_for_all_namespaces.return_value = Mock(items=[default_device.api_object])
+    pods = kubernetes_machine.get_machines_api_objects_by_filters()
+    assert pods == [default_device.api_object]
+    assert not mock_namespace_get_all.called
+    kubernetes_machine.core_client.list_pod_for_all_namespaces.assert_called_once_with(label_selector="app=kathara",
+                                                                                      timeout_seconds=9999)
 
 
-@mock.patch("kubernetes.client.api.core_v1_api.CoreV1Api.list_namespaced_pod")
 @mock.patch("src.Kathara.manager.kubernetes.KubernetesNamespace.KubernetesNamespace.get_all")
-def test_get_machines_api_objects_by_filter_machine_name(mock_namespace_get_all, mock_list_namespaced_pod,
-                                                         kubernetes_namespace, default_device, kubernetes_machine):
-    mock_namespace_get_all.return_value = [kubernetes_namespace]
+def test_get_machines_api_objects_by_filter_machine_name(mock_namespace_get_all, default_device, kubernetes_machine):
     kubernetes_machine.kubernetes_namespace.get_all = mock_namespace_get_all
-    default_device.api_object.name = "test_device"
-    mock_list_namespaced_pod.return_value = V1PodList(items=[default_device.api_object])
-    kubernetes_machine.core_client.list_namespaced_pod = mock_list_namespaced_pod
+    kubernetes_machine.core_client.list_pod_for_all_namespaces.return_value = Mock(items=[default_device.api_object])
     kubernetes_machine.get_machines_api_objects_by_filters(machine_name="test_device")
+    assert not mock_namespace_get_all.called
+    kubernetes_machine.core_client.list_pod_for_all_namespaces.assert_called_once_with(
+        label_selector="app=kathara,name=test_device", timeout_seconds=9999
+    )
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesNamespace.KubernetesNamespace.get_all")
+def test_get_machines_api_objects_by_filter_forbidden(mock_namespace_get_all, kubernetes_namespace, default_device,
+                                                      kubernetes_machine):
+    mock_namespace_get_all.return_value = [kubernetes_namespace]
+    kubernetes_machine.kubernetes_namespace.get_all = mock_namespace_get_all
+    kubernetes_machine.core_client.list_pod_for_all_namespaces.side_effect = ApiException(status=403)
+    kubernetes_machine.core_client.list_namespaced_pod.return_value = Mock(items=[default_device.api_object])
+    pods = kubernetes_machine.get_machines_api_objects_by_filters()
+    assert pods == [default_device.api_object]
     mock_namespace_get_all.assert_called_once()
-    mock_list_namespaced_pod.assert_called_once_with(namespace="test_namespace",
-                                                     label_selector="app=kathara,name=test_device",
-                                                     timeout_seconds=9999)
+    kubernetes_machine.core_client.list_namespaced_pod.assert_called_once_with(namespace="test_namespace",
+                                                                               label_selector="app=kathara",
+                                                                               timeout_seconds=9999)
+
+
+def test_get_machines_api_objects_by_filter_informer(default_device, kubernetes_machine):
+    kubernetes_machine.informer = Mock()
+    kubernetes_machine.informer.is_synced = True
+    kubernetes_machine.informer.list.return_value = [default_device.api_object]
+    pods = kubernetes_machine.get_machines_api_objects_by_filters(lab_hash="lab_hash", machine_name="test_device")
+    assert pods == [default_device.api_object]
+    kubernetes_machine.informer.list.assert_called_once_with(namespace="lab_hash", labels={"name": "test_device"})
+    assert not kubernetes_machine.core_client.list_namespaced_pod.called
+    assert not kubernetes_machine.core_client.list_pod_for_all_namespaces.called
 
 
 @mock.patch("kubernetes.client.api.core_v1_api.CoreV1Api.list_namespaced_pod")
@@ -1684,3 +1783,118 @@ def test_get_machines_stats_device_not_found(mock_get_machines_api_objects_by_fi
     assert next(kubernetes_machine.get_machines_stats()) == {}
     mock_get_machines_api_objects_by_filters.assert_called_once_with(lab_hash=None,
                                                                      machine_name=None)
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_get_machines_stats_informer(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    def build_pod(name, phase):
+        pod = Mock()
+        pod.metadata.name = name
+        pod.metadata.labels = {"name": name}
+        pod.metadata.annotations = {'k8s.v1.cni.cncf.io/networks': json.dumps([])}
+        pod.status.container_statuses = None
+        pod.status.phase = phase
+        return pod
+
+    kubernetes_machine.informer = Mock()
+    kubernetes_machine.metrics_collector = Mock()
+    kubernetes_machine.metrics_collector.collect.return_value = {}
+    mock_get_machines_api_objects_by_filters.side_effect = [
+        [build_pod("pc1", "Pending"), build_pod("pc2", "Pending")],
+        [build_pod("pc1", "Running")],
+    ]
+
+    stats_generator = kubernetes_machine.get_machines_stats(lab_hash="lab_hash")
+    assert set(next(stats_generator).keys()) == {"pc1", "pc2"}
+    # The first refresh does not start the informer
+    assert not kubernetes_machine.informer.start.called
+
+    stats = next(stats_generator)
+    kubernetes_machine.informer.start.assert_called_once()
+    assert list(stats.keys()) == ["pc1"]
+    assert stats["pc1"].status == "Running"
+
+    stats_generator.close()
+    kubernetes_machine.informer.stop.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_get_machines_stats_one_shot(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    mock_get_machines_api_objects_by_filters.return_value = []
+    kubernetes_machine.informer = Mock()
+
+    stats_generator = kubernetes_machine.get_machines_stats(lab_hash="lab_hash")
+    assert next(stats_generator) == {}
+    stats_generator.close()
+
+    assert not kubernetes_machine.informer.start.called
+    assert not kubernetes_machine.informer.stop.called
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_get_machines_stats_metrics(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    pod = Mock()
+    pod.metadata.namespace = "lab_hash"
+    pod.metadata.name = "pc1-pod"
+    pod.metadata.labels = {"name": "pc1"}
+    pod.metadata.annotations = {'k8s.v1.cni.cncf.io/networks': json.dumps([])}
+    pod.status.container_statuses = None
+    pod.status.phase = "Running"
+    pod.spec.containers = [Mock()]
+    pod.spec.containers[0].resources.limits = {"memory": "64Mi"}
+    mock_get_machines_api_objects_by_filters.return_value = [pod]
+    kubernetes_machine.informer = Mock()
+    kubernetes_machine.metrics_collector = Mock()
+    kubernetes_machine.metrics_collector.collect.return_value = {("lab_hash", "pc1-pod"): (0.25, 16 * 1024 * 1024)}
+
+    stats = next(kubernetes_machine.get_machines_stats(lab_hash="lab_hash"))
+
+    kubernetes_machine.metrics_collector.collect.assert_called_once_with(lab_hash="lab_hash", machine_name=None)
+    assert stats["pc1-pod"].cpu_usage == "25.00%"
+    assert stats["pc1-pod"].mem_usage == "16.0 MB / 64.0 MB"
+    assert stats["pc1-pod"].mem_percent == "25.00 %"
+
+
+#
+# TEST: wait_ready
+#
+def build_ready_pod(name, ready):
+    pod = Mock()
+    pod.metadata.labels = {"name": name}
+    pod.status.container_statuses = [Mock(ready=ready)]
+    return pod
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_already_ready(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [build_ready_pod("pc1", True)]
+
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.watch.Watch") as mock_watch:
+        assert kubernetes_machine.wait_ready("lab_hash") == {"pc1": True}
+        assert not mock_watch.called
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_no_pods(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    mock_get_machines_api_objects_by_filters.return_value = []
+
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.watch.Watch") as mock_watch:
+        mock_watch.return_value.stream.return_value = [
+            {'type': "ADDED", 'object': build_ready_pod("pc1", False)},
+            {'type': "MODIFIED", 'object': build_ready_pod("pc1", True)},
+        ]
+        assert kubernetes_machine.wait_ready("lab_hash") == {"pc1": True}
+        mock_watch.return_value.stream.assert_called_once_with(
+            kubernetes_machine.core_client.list_namespaced_pod, namespace="lab_hash", label_selector="app=kathara"
+        )
+        mock_watch.return_value.stop.assert_called_once()
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.get_machines_api_objects_by_filters")
+def test_wait_ready_selected_machines_no_pod(mock_get_machines_api_objects_by_filters, kubernetes_machine):
+    mock_get_machines_api_objects_by_filters.return_value = [build_ready_pod("pc1", True)]
+
+    with mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.watch.Watch") as mock_watch:
+        mock_watch.return_value.stream.return_value = [{'type': "ADDED", 'object': build_ready_pod("pc3", True)}]
+        assert kubernetes_machine.wait_ready("lab_hash", selected_machines={"pc1", "pc2"}, timeout=1) == \
+               {"pc1": True, "pc2": False}
@@ -1246,3 +1246,23 @@ def test_get_link_stats_invocation_error(mock_get_links_stats, kubernetes_manage
     with pytest.raises(InvocationError):
         next(kubernetes_manager.get_link_stats(link_name="test_network"))
     assert not mock_get_links_stats.called
+
+
+#
+# TEST: wait_ready
+#
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.wait_ready")
+def test_wait_ready_lab_name_mixed_case(mock_wait_ready, kubernetes_manager):
+    lab_hash = generate_urlsafe_hash("Lab_Name")
+    assert lab_hash != lab_hash.lower()
+
+    kubernetes_manager.wait_ready(lab_name="Lab_Name")
+
+    mock_wait_ready.assert_called_once_with(lab_hash.lower(), selected_machines=None, timeout=None)
+
+
+@mock.patch("src.Kathara.manager.kubernetes.KubernetesMachine.KubernetesMachine.wait_ready")
+def test_wait_ready_lab_hash_mixed_case(mock_wait_ready, kubernetes_manager):
+    kubernetes_manager.wait_ready(lab_hash="LaB_HaSh", selected_machines={"pc1"}, timeout=5)
+
+    mock_wait_ready.assert_called_once_with("lab_hash", selected_machines={"pc1"}, timeout=5)
@@ -0,0 +1,80 @@
+import sys
+from unittest import mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.kubernetes.KubernetesMetricsCollector import KubernetesMetricsCollector
+
+
+@pytest.fixture()
+@mock.patch("kubernetes.client.api.custom_objects_api.CustomObjectsApi")
+def metrics_collector(_):
+    return KubernetesMetricsCollector()
+
+
+def pod_metrics(namespace, name, containers):
+    return {
+        "kind": "PodMetrics",
+        "apiVersion": "metrics.k8s.io/v1beta1",
+        "metadata": {"namespace": namespace, "name": name, "labels": {"app": "kathara"}},
+        "timestamp": "2024-01-01T00:00:00Z",
+        "window": "15s",
+        "containers": [{"name": f"container-{i}", "usage": usage} for i, usage in enumerate(containers)]
+    }
+
+
+def test_collect_lab_hash(metrics_collector):
+    metrics_collector.client.list_namespaced_custom_object.return_value = {
+        "items": [
+            pod_metrics("lab_hash", "pc1", [{"cpu": "250m", "memory": "1024Ki"}]),
+            pod_metrics("lab_hash", "pc2", [{"cpu": "500000n", "memory": "1Mi"}, {"cpu": "1m", "memory": "1Mi"}]),
+        ]
+    }
+
+    usage = metrics_collector.collect(lab_hash="lab_hash")
+
+    metrics_collector.client.list_namespaced_custom_object.assert_called_once_with(
+        group="metrics.k8s.io", version="v1beta1", namespace="lab_hash", plural="pods", label_selector="app=kathara"
+    )
+    assert not metrics_collector.client.list_cluster_custom_object.called
+    assert usage == {("lab_hash", "pc1"): (0.25, 1024 * 1024), ("lab_hash", "pc2"): (0.0015, 2 * 1024 * 1024)}
+
+
+def test_collect_all_namespaces(metrics_collector):
+    metrics_collector.client.list_cluster_custom_object.return_value = {
+        "items": [pod_metrics("lab_hash_1", "pc1", [{"cpu": "1", "memory": "1Gi"}])]
+    }
+
+    usage = metrics_collector.collect(machine_name="pc1")
+
+    metrics_collector.client.list_cluster_custom_object.assert_called_once_with(
+        group="metrics.k8s.io", version="v1beta1", plural="pods", label_selector="app=kathara,name=pc1"
+    )
+    assert usage == {("lab_hash_1", "pc1"): (1.0, 1024 * 1024 * 1024)}
+
+
+def test_collect_no_items(metrics_collector):
+    metrics_collector.client.list_namespaced_custom_object.return_value = {"items": []}
+
+    assert metrics_collector.collect(lab_hash="lab_hash") == {}
+    assert metrics_collector.is_available
+
+
+def test_collect_api_not_available(metrics_collector):
+    metrics_collector.client.list_namespaced_custom_object.side_effect = ApiException(status=404)
+
+    assert metrics_collector.collect(lab_hash="lab_hash") == {}
+    assert not metrics_collector.is_available
+
+    assert metrics_collector.collect(lab_hash="lab_hash") == {}
+    metrics_collector.client.list_namespaced_custom_object.assert_called_once()
+
+
+def test_collect_api_error(metrics_collector):
+    metrics_collector.client.list_namespaced_custom_object.side_effect = ApiException(status=503)
+
+    assert metrics_collector.collect(lab_hash="lab_hash") == {}
+    assert metrics_collector.is_available
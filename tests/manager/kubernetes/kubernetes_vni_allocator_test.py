@@ -0,0 +1,138 @@
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.kubernetes.KubernetesVniAllocator import KubernetesVniAllocator, MAX_K8S_LINK_NUMBER
+
+EXPECTED_NETWORK_ID = 1362434
+
+
+def network_definition(namespace, name, network_id, resource_version="1"):
+    return {
+        "metadata": {"name": f"netprefix-{name.lower()}", "namespace": namespace, "resourceVersion": resource_version,
+                     "labels": {"name": name, "app": "kathara"}},
+        "spec": {"config": '{"cniVersion": "0.3.0", "type": "megalos", "vxlanId": %d}' % network_id}
+    }
+
+
+#
+# FIXTURE
+#
+@pytest.fixture()
+def allocator():
+    return KubernetesVniAllocator("user123")
+
+
+#
+# TEST: get_candidate
+#
+def test_get_candidate(allocator):
+    assert allocator.get_candidate("A") == EXPECTED_NETWORK_ID
+    assert allocator.get_candidate("A", 1) == EXPECTED_NETWORK_ID + 1
+
+
+def test_get_candidate_wraps():
+    allocator = KubernetesVniAllocator("user123")
+    allocator._hashes["A"] = MAX_K8S_LINK_NUMBER - 1
+
+    assert allocator.get_candidate("A", 1) == 0
+
+
+#
+# TEST: allocate
+#
+def test_allocate(allocator):
+    assert allocator.allocate("A") == EXPECTED_NETWORK_ID
+    assert allocator.get_used_ids() == {EXPECTED_NETWORK_ID}
+
+
+def test_allocate_collision(allocator):
+    allocator.sync([network_definition("lab1", "X", EXPECTED_NETWORK_ID)])
+
+    assert allocator.allocate("A") == EXPECTED_NETWORK_ID + 1
+
+
+def test_allocate_double_collision(allocator):
+    allocator.sync([network_definition("lab1", "X", EXPECTED_NETWORK_ID),
+                    network_definition("lab1", "Y", EXPECTED_NETWORK_ID + 1)])
+
+    assert allocator.allocate("A") == EXPECTED_NETWORK_ID + 2
+
+
+def test_allocate_concurrent(allocator):
+    network_ids = []
+    lock = threading.Lock()
+
+    def allocate():
+        network_id = allocator.allocate("A")
+        with lock:
+            network_ids.append(network_id)
+
+    threads = [threading.Thread(target=allocate) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(network_ids) == list(range(EXPECTED_NETWORK_ID, EXPECTED_NETWORK_ID + 50))
+
+
+def test_release(allocator):
+    network_id = allocator.allocate("A")
+    allocator.release(network_id)
+
+    assert allocator.get_used_ids() == set()
+    assert allocator.allocate("A") == network_id
+
+
+def test_release_deployed(allocator):
+    allocator.sync([network_definition("lab1", "X", 10)])
+    allocator.release(10)
+
+    assert allocator.get_used_ids() == {10}
+
+
+#
+# TEST: sync
+#
+def test_sync_keeps_pending_allocations(allocator):
+    network_id = allocator.allocate("A")
+    allocator.sync([network_definition("lab1", "X", 10)])
+
+    assert allocator.get_used_ids() == {10, network_id}
+
+    # Once deployed, the VNI is tracked by the network definition
+    allocator.sync([network_definition("lab1", "X", 10), network_definition("lab1", "A", network_id)])
+    allocator.sync([network_definition("lab1", "X", 10)])
+    assert allocator.get_used_ids() == {10}
+
+
+def test_sync_parses_changed_definitions_only(allocator):
+    allocator.sync([network_definition("lab1", "X", 10)])
+
+    # Same resource version, the cached VNI is used
+    allocator.sync([network_definition("lab1", "X", 11)])
+    assert allocator.get_used_ids() == {10}
+
+    allocator.sync([network_definition("lab1", "X", 11, resource_version="2")])
+    assert allocator.get_used_ids() == {11}
+
+
+def test_sync_invalid_definition(allocator):
+    network = network_definition("lab1", "X", 10)
+    network["spec"]["config"] = "invalid"
+    allocator.sync([network])
+
+    assert allocator.get_used_ids() == set()
+    assert allocator.get_network("lab1", "X") == network
+
+
+def test_get_network(allocator):
+    network = network_definition("lab1", "A", 10)
+    allocator.sync([network, network_definition("lab2", "A", 11)])
+
+    assert allocator.get_network("lab1", "A") == network
+    assert allocator.get_network("lab1", "B") is None
@@ -0,0 +1,114 @@
+import queue
+import select
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.manager.kubernetes.terminal.session.KubernetesWSTerminalSession import KubernetesWSTerminalSession
+
+
+class FakeWSClient(object):
+    """Deliver the queued frames like the `WSClient` of the Kubernetes client, None closes the connection."""
+
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.buffer = ""
+        self.connected = True
+        self.written = []
+
+    def is_open(self):
+        return self.connected
+
+    def update(self, timeout=0):
+        try:
+            frame = self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+        if frame is None:
+            self.connected = False
+        else:
+            self.buffer += frame
+
+    def read_all(self):
+        (data, self.buffer) = (self.buffer, "")
+        return data
+
+    def write_stdin(self, data):
+        self.written.append(data)
+
+    def write_channel(self, channel, data):
+        self.written.append((channel, data))
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture()
+def ws_client():
+    return FakeWSClient()
+
+
+def read_until(session, expected, timeout=5):
+    data = b""
+    start = time.monotonic()
+    while len(data) < len(expected) and time.monotonic() - start < timeout:
+        data += session.read(4096)
+    return data
+
+
+def test_read(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+    ws_client.frames.put("hello ")
+    ws_client.frames.put("world")
+
+    assert read_until(session, b"hello world") == b"hello world"
+    session.close()
+
+
+def test_fileno_readable_on_output(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+
+    assert select.select([session.fileno()], [], [], 0.05)[0] == []
+    ws_client.frames.put("$ ")
+    assert select.select([session.fileno()], [], [], 5)[0] == [session.fileno()]
+    assert session.read(4096) == b"$ "
+    session.close()
+
+
+def test_read_end_of_output(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+    ws_client.frames.put("bye")
+    ws_client.frames.put(None)
+
+    assert read_until(session, b"bye") == b"bye"
+    with pytest.raises(EOFError):
+        session.read(4096)
+    session.close()
+
+
+def test_read_closed(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+    session.close()
+
+    assert session.read(4096) == b""
+    assert not ws_client.is_open()
+
+
+def test_write(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+    session.write(b"ls\n")
+
+    assert ws_client.written == [b"ls\n"]
+    session.close()
+
+
+def test_resize(ws_client):
+    session = KubernetesWSTerminalSession(ws_client)
+    session.resize(80, 24)
+
+    assert ws_client.written == [(4, '{"Height": 24, "Width": 80}')]
+    session.close()
@@ -0,0 +1,64 @@
+import sys
+from unittest.mock import Mock
+
+sys.path.insert(0, './')
+
+from src.Kathara.exceptions import MachineNotRunningError
+from src.Kathara.foundation.manager.exec_stream.MultiExecStream import MultiExecStream
+
+
+class FakeExecStream(object):
+    def __init__(self, outputs, exit_code=0):
+        self.outputs = iter(outputs)
+        self.code = exit_code
+
+    def __next__(self):
+        return next(self.outputs)
+
+    def exit_code(self):
+        return self.code
+
+
+def test_multi_exec_stream():
+    streams = {
+        "pc1": FakeExecStream([(b"a\n", None), (b"b\n", b"err\n")]),
+        "pc2": FakeExecStream([(b"c\n", None)], exit_code=2),
+    }
+    exec_output = MultiExecStream(["pc1", "pc2"], lambda name: streams[name], concurrency=2)
+
+    outputs = list(exec_output)
+
+    assert sorted(outputs, key=lambda x: x[0]) == [("pc1", b"a\n", None), ("pc1", b"b\n", b"err\n"),
+                                                   ("pc2", b"c\n", None)]
+    assert [output for output in outputs if output[0] == "pc1"] == [("pc1", b"a\n", None),
+                                                                    ("pc1", b"b\n", b"err\n")]
+    assert exec_output.exit_codes == {"pc1": 0, "pc2": 2}
+    assert exec_output.errors == {}
+
+
+def test_multi_exec_stream_concurrency():
+    exec_output = MultiExecStream(["pc1", "pc2", "pc3"], Mock(), concurrency=10)
+    assert exec_output.concurrency == 3
+
+    exec_output = MultiExecStream(["pc1", "pc2", "pc3"], Mock(), concurrency=2)
+    assert exec_output.concurrency == 2
+
+
+def test_multi_exec_stream_error():
+    def exec_func(name):
+        if name == "pc2":
+            raise MachineNotRunningError(name)
+        return FakeExecStream([(b"a\n", None)])
+
+    exec_output = MultiExecStream(["pc1", "pc2"], exec_func)
+
+    assert exec_output.wait() == {"pc1": 0}
+    assert isinstance(exec_output.errors["pc2"], MachineNotRunningError)
+
+
+def test_multi_exec_stream_no_devices():
+    exec_func = Mock()
+    exec_output = MultiExecStream([], exec_func)
+
+    assert list(exec_output) == []
+    assert not exec_func.called
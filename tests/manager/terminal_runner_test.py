@@ -0,0 +1,256 @@
+import queue
+import socket
+import sys
+import threading
+from unittest import mock
+from unittest.mock import Mock
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.manager.terminal.core import TerminalRunner as terminal_runner_module
+from src.Kathara.foundation.manager.terminal.core.IConsoleAdapter import IConsoleAdapter
+from src.Kathara.foundation.manager.terminal.core.ITerminalSession import ITerminalSession
+from src.Kathara.foundation.manager.terminal.core.TerminalRunner import TerminalRunner, MIN_READ_SIZE, MAX_READ_SIZE, \
+    MIN_IDLE_DELAY, MAX_IDLE_DELAY
+from src.Kathara.manager.docker.terminal.session.DockerTTYTerminalSession import DockerTTYTerminalSession
+from src.Kathara.manager.kubernetes.terminal.session.KubernetesWSTerminalSession import KubernetesWSTerminalSession
+
+
+class FakeConsole(IConsoleAdapter):
+    def __init__(self, on_write=None):
+        self.writes = []
+        self.on_write = on_write
+
+    def enter_raw(self):
+        pass
+
+    def exit_raw(self):
+        pass
+
+    def install_input_reader(self, loop, on_bytes, on_close):
+        pass
+
+    def remove_input_reader(self, loop):
+        pass
+
+    def write_stdout(self, data):
+        self.writes.append(data)
+        if self.on_write:
+            self.on_write(data)
+
+    def watch_resize(self, loop, cb):
+        pass
+
+    def unwatch_resize(self, loop):
+        pass
+
+
+class PollingSession(ITerminalSession):
+    """Session without a file descriptor, returning no data instead of blocking."""
+
+    def __init__(self, chunks):
+        super().__init__(None, None)
+        self.chunks = queue.Queue()
+        for chunk in chunks:
+            self.chunks.put(chunk)
+        self.reads = 0
+
+    def fileno(self):
+        return None
+
+    def read(self, n=4096):
+        self.reads += 1
+        try:
+            chunk = self.chunks.get_nowait()
+        except queue.Empty:
+            return b""
+        if chunk is None:
+            raise EOFError()
+        return chunk
+
+    def write(self, data):
+        pass
+
+    def resize(self, cols, rows):
+        pass
+
+    def close(self):
+        self._closed = True
+
+
+class BulkSession(PollingSession):
+    """Session returning as much of the payload as requested by each read."""
+
+    def __init__(self, payload):
+        super().__init__([])
+        self.payload = memoryview(payload)
+        self.offset = 0
+
+    def read(self, n=4096):
+        self.reads += 1
+        if self.offset >= len(self.payload):
+            raise EOFError()
+        data = bytes(self.payload[self.offset:self.offset + n])
+        self.offset += len(data)
+        return data
+
+
+class FakeWSClient(object):
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.buffer = []
+        self.connected = True
+
+    def is_open(self):
+        return self.connected
+
+    def update(self, timeout=0):
+        # Like `WSClient.update`, wait for the first frame, then consume all the available ones
+        try:
+            frame = self.frames.get(timeout=timeout)
+            while frame is not None:
+                self.buffer.append(frame)
+                frame = self.frames.get_nowait()
+            self.connected = False
+        except queue.Empty:
+            pass
+
+    def read_all(self):
+        (data, self.buffer) = ("".join(self.buffer), [])
+        return data
+
+    def close(self):
+        self.connected = False
+
+
+def run_threaded(runner):
+    with mock.patch("src.Kathara.foundation.manager.terminal.core.TerminalRunner.exec_by_platform",
+                    lambda unix, windows, osx: windows()):
+        runner.start()
+
+
+def run_docker_session(payload, chunk_size=65536):
+    (session_socket, container_socket) = socket.socketpair()
+    console = FakeConsole()
+    # The session closes the file descriptor of the exec socket
+    handler = Mock(fileno=Mock(return_value=session_socket.detach()))
+    runner = TerminalRunner(console, DockerTTYTerminalSession(handler, Mock(), "exec_id"))
+
+    def produce():
+        with container_socket:
+            for i in range(0, len(payload), chunk_size):
+                container_socket.sendall(payload[i:i + chunk_size])
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    runner.start()
+    producer.join()
+
+    return console
+
+
+def run_kubernetes_session(frames):
+    ws_client = FakeWSClient()
+    console = FakeConsole()
+    # All the frames are already available, so they are read together
+    for frame in frames:
+        ws_client.frames.put(frame)
+    ws_client.frames.put(None)
+
+    TerminalRunner(console, KubernetesWSTerminalSession(ws_client)).start()
+
+    return console
+
+
+def test_adapt_read_size():
+    runner = TerminalRunner(FakeConsole(), PollingSession([]))
+
+    runner._adapt_read_size(MIN_READ_SIZE)
+    assert runner._read_size == MIN_READ_SIZE * 2
+
+    for _ in range(20):
+        runner._adapt_read_size(runner._read_size)
+    assert runner._read_size == MAX_READ_SIZE
+
+    runner._adapt_read_size(MAX_READ_SIZE // 2)
+    assert runner._read_size == MAX_READ_SIZE
+
+    runner._adapt_read_size(10)
+    assert runner._read_size == MAX_READ_SIZE // 2
+
+    for _ in range(20):
+        runner._adapt_read_size(10)
+    assert runner._read_size == MIN_READ_SIZE
+
+
+def test_threaded_stdout():
+    session = PollingSession([b"a", b"b", None])
+    console = FakeConsole()
+    runner = TerminalRunner(console, session)
+
+    run_threaded(runner)
+
+    assert console.writes == [b"a", b"b"]
+    assert session._closed
+
+
+def test_threaded_stdout_back_off():
+    session = PollingSession([b""] * 8 + [b"a", b"", None])
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    with mock.patch.object(terminal_runner_module.asyncio, "sleep", sleep):
+        run_threaded(TerminalRunner(FakeConsole(), session))
+
+    # The delay doubles while the session is idle, up to the maximum, and it is reset when data arrives
+    assert delays == [MIN_IDLE_DELAY * 2 ** i for i in range(5)] + [MAX_IDLE_DELAY] * 3 + [MIN_IDLE_DELAY]
+    assert session.reads == 11
+
+
+def test_threaded_stdout_adaptive_reads():
+    payload = b"x" * (8 * 1024 * 1024)
+
+    fixed_console = FakeConsole()
+    with mock.patch.object(terminal_runner_module, "MAX_READ_SIZE", MIN_READ_SIZE):
+        run_threaded(TerminalRunner(fixed_console, BulkSession(payload)))
+    adaptive_console = FakeConsole()
+    run_threaded(TerminalRunner(adaptive_console, BulkSession(payload)))
+
+    assert b"".join(adaptive_console.writes) == payload
+    assert len(fixed_console.writes) == len(payload) // MIN_READ_SIZE
+    # Bulk output is written with larger (and fewer) writes, reads double up to MAX_READ_SIZE
+    ramp = sum(MIN_READ_SIZE * 2 ** i for i in range(6))
+    assert len(adaptive_console.writes) == 6 + -(-(len(payload) - ramp) // MAX_READ_SIZE)
+
+
+def test_docker_session_output():
+    payload = bytes(range(256)) * 4096
+    console = run_docker_session(payload)
+
+    assert b"".join(console.writes) == payload
+
+
+def test_kubernetes_session_output():
+    frames = [f"line {i}\n" for i in range(1000)]
+    console = run_kubernetes_session(frames)
+
+    assert b"".join(console.writes) == "".join(frames).encode("utf-8")
+    # Frames received together are written together
+    assert len(console.writes) < len(frames)
+
+
+def test_kubernetes_session_interactive():
+    ws_client = FakeWSClient()
+    prompts = []
+
+    def on_write(data):
+        # Each prompt is delivered as soon as it arrives, without waiting for other output
+        prompts.append(data)
+        ws_client.frames.put("$ " if len(prompts) < 50 else None)
+
+    ws_client.frames.put("$ ")
+    TerminalRunner(FakeConsole(on_write=on_write), KubernetesWSTerminalSession(ws_client)).start()
+
+    assert prompts == [b"$ "] * 50
@@ -0,0 +1,33 @@
+import sys
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.manager.WipeReport import WipeReport
+
+
+def test_measure():
+    report = WipeReport(fast=True)
+
+    assert report.measure("devices", lambda n: n, 3) == 3
+    assert report.measure("collision domains", lambda n: n, n=2) == 2
+
+    assert report.get_count("devices") == 3
+    assert report.get_count("collision domains") == 2
+    assert report.get_count("namespaces") == 0
+    assert report.total_time >= 0
+
+
+def test_to_dict():
+    report = WipeReport()
+    report.steps = [("devices", 3, 1.5), ("collision domains", 2, 0.5)]
+
+    assert report.to_dict() == {
+        "fast": False,
+        "steps": [{"kind": "devices", "count": 3, "time": 1.5}, {"kind": "collision domains", "count": 2, "time": 0.5}],
+        "total_time": 2.0
+    }
+    assert str(report) == "Removed 3 devices in 1.50s, 2 collision domains in 0.50s (total 2.00s)."
+
+
+def test_empty_report():
+    assert str(WipeReport()) == "Removed nothing (total 0.00s)."
@@ -1,5 +1,7 @@
+import io
 import os.path
 import sys
+import tarfile
 from unittest import mock
 from unittest.mock import Mock
 
@@ -10,6 +12,8 @@ sys.path.insert(0, './')
 from src.Kathara.model.Lab import Lab
 from src.Kathara.model.Machine import Machine
 from src.Kathara.model.Link import Link
+from src.Kathara.foundation.model.PackCache import PackCache
+from src.Kathara.setting.Setting import Setting
 from src.Kathara.exceptions import MachineOptionError, NonSequentialMachineInterfaceError, \
     MachineCollisionDomainError, MountDeniedError
 from src.Kathara.types import SharedCollisionDomainsOption
@@ -713,3 +717,119 @@ def test_get_volumes_one_volume_never(mock_setting_get_instance, default_device)
 
     with pytest.raises(MountDeniedError):
         default_device.get_volumes()
+
+
+#
+# TEST: pack_data
+#
+@pytest.fixture()
+def pack_cache(tmp_path, monkeypatch):
+    cache = PackCache.get_instance()
+    monkeypatch.setattr(cache, "path", os.path.join(tmp_path, "cache"))
+    monkeypatch.setattr(cache, "_indexes", {})
+    return cache
+
+
+def test_pack_data_empty(default_device, pack_cache):
+    assert default_device.pack_data() is None
+
+
+def test_pack_data(default_device, pack_cache):
+    default_device.create_file_from_string("content\r\n", "/etc/test.conf")
+    default_device.lab.create_file_from_string("ip link set eth0 up", "test_machine.startup")
+    default_device.lab.create_file_from_string("ip link set eth0 down", "other.startup")
+
+    tar_data = default_device.pack_data()
+
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:gz") as tar:
+        names = tar.getnames()
+        assert tar.extractfile("hostlab/test_machine/etc/test.conf").read() == b"content\n"
+    assert "hostlab/test_machine.startup" in names
+    assert "hostlab/other.startup" not in names
+
+
+def test_pack_data_cached(default_device, pack_cache):
+    default_device.create_file_from_string("content", "/etc/test.conf")
+    tar_data = default_device.pack_data()
+
+    with mock.patch("src.Kathara.utils.stream_tar") as mock_stream_tar:
+        assert default_device.pack_data() == tar_data
+        assert not mock_stream_tar.called
+
+
+def test_pack_data_cache_invalidated(default_device, pack_cache):
+    default_device.create_file_from_string("content", "/etc/test.conf")
+    tar_data = default_device.pack_data()
+
+    default_device.lab.create_file_from_string("ip link set eth0 up", "shared.startup")
+    new_tar_data = default_device.pack_data()
+
+    assert new_tar_data != tar_data
+    with tarfile.open(fileobj=io.BytesIO(new_tar_data), mode="r:gz") as tar:
+        assert "hostlab/shared.startup" in tar.getnames()
+
+
+def test_pack_data_cache_disabled(default_device, pack_cache, monkeypatch):
+    monkeypatch.setattr(Setting.get_instance(), "pack_cache", False)
+    default_device.create_file_from_string("content", "/etc/test.conf")
+
+    with mock.patch.object(PackCache, "get_key") as mock_get_key:
+        tar_data = default_device.pack_data()
+        assert default_device.pack_data() == tar_data
+        assert not mock_get_key.called
+    assert not os.path.exists(pack_cache.path)
+
+
+def test_pack_data_cache_entry_too_large(default_device, pack_cache, monkeypatch):
+    monkeypatch.setattr(Setting.get_instance(), "pack_cache_max_entry_size", 4)
+    default_device.create_file_from_string("content", "/etc/test.conf")
+
+    with mock.patch.object(PackCache, "get_key") as mock_get_key:
+        tar_stream = default_device.pack_data_stream()
+        with tarfile.open(fileobj=io.BytesIO(b"".join(tar_stream)), mode="r:") as tar:
+            assert tar.extractfile("hostlab/test_machine/etc/test.conf").read() == b"content"
+        assert not mock_get_key.called
+    assert not os.path.exists(pack_cache.path)
+
+
+def test_pack_data_stream_uncompressed(default_device, pack_cache):
+    default_device.create_file_from_string("content", "/etc/test.conf")
+    binary_content = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+    default_device.fs.makedir("bin")
+    with default_device.fs.openbin("bin/data", "w") as binary_file:
+        binary_file.write(binary_content)
+
+    tar_stream = default_device.pack_data_stream()
+
+    with tarfile.open(fileobj=io.BytesIO(b"".join(tar_stream)), mode="r:") as tar:
+        assert tar.getmember("hostlab/test_machine/etc").isdir()
+        assert tar.extractfile("hostlab/test_machine/etc/test.conf").read() == b"content"
+        assert tar.extractfile("hostlab/test_machine/bin/data").read() == binary_content
+
+
+def test_pack_data_stream_cached_by_compression(default_device, pack_cache):
+    default_device.create_file_from_string("content", "/etc/test.conf")
+
+    tar_data = b"".join(default_device.pack_data_stream())
+    gz_tar_data = default_device.pack_data(compression="gz")
+
+    assert tar_data != gz_tar_data
+    assert b"".join(default_device.pack_data_stream()) == tar_data
+
+
+def test_pack_data_without_shared(default_device, pack_cache):
+    default_device.lab.create_file_from_string("ip link set eth0 up", "test_machine.startup")
+    default_device.lab.create_file_from_string("ip link set eth0 up", "shared.startup")
+
+    tar_data = default_device.pack_data(shared=False)
+
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:gz") as tar:
+        names = tar.getnames()
+    assert "hostlab/test_machine.startup" in names
+    assert "hostlab/shared.startup" not in names
+
+
+def test_pack_data_only_shared_files(default_device, pack_cache):
+    default_device.lab.create_file_from_string("ip link set eth0 up", "shared.startup")
+
+    assert default_device.pack_data(shared=False) is None
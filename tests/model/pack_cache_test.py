@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+
+import pytest
+from fs import open_fs
+
+sys.path.insert(0, './')
+
+from src.Kathara.foundation.model.PackCache import PackCache
+
+
+@pytest.fixture()
+def pack_cache(tmp_path, monkeypatch):
+    cache = PackCache.get_instance()
+    monkeypatch.setattr(cache, "path", os.path.join(tmp_path, "cache"))
+    monkeypatch.setattr(cache, "max_size", 1024)
+    monkeypatch.setattr(cache, "_indexes", {})
+    return cache
+
+
+@pytest.fixture()
+def device_fs(tmp_path):
+    os.makedirs(os.path.join(tmp_path, "lab", "pc1", "etc"))
+    with open(os.path.join(tmp_path, "lab", "pc1", "etc", "frr.conf"), "w") as conf_file:
+        conf_file.write("router bgp 1")
+    return open_fs(f"osfs://{os.path.join(tmp_path, 'lab', 'pc1')}")
+
+
+def test_get_key_same_content(pack_cache, device_fs):
+    files = [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")]
+    assert pack_cache.get_key("lab", "pc1", files, ["hostlab/pc1/etc"]) == \
+           pack_cache.get_key("lab", "pc1", files, ["hostlab/pc1/etc"])
+
+
+def test_get_key_different_device(pack_cache, device_fs):
+    files = [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")]
+    assert pack_cache.get_key("lab", "pc1", files) != pack_cache.get_key("lab", "pc2", files)
+
+
+def test_get_key_content_changed(pack_cache, device_fs):
+    files = [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")]
+    key = pack_cache.get_key("lab", "pc1", files)
+    device_fs.writetext("/etc/frr.conf", "router bgp 2")
+    assert pack_cache.get_key("lab", "pc1", files) != key
+
+
+def test_get_key_stat_short_circuit(pack_cache, device_fs):
+    files = [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")]
+    key = pack_cache.get_key("lab", "pc1", files)
+
+    sys_path = device_fs.getsyspath("/etc/frr.conf")
+    stat = os.stat(sys_path)
+    pack_cache._indexes["lab"][sys_path][2] = "cached_digest"
+    assert pack_cache.get_key("lab", "pc1", files) != key
+
+    # A different modification time invalidates the cached digest
+    os.utime(sys_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert pack_cache.get_key("lab", "pc1", files) == key
+
+
+def test_get_key_memory_fs(pack_cache):
+    mem_fs = open_fs("mem://")
+    mem_fs.writetext("/pc1.startup", "ip link set eth0 up")
+    files = [("hostlab/pc1.startup", mem_fs, "/pc1.startup")]
+    key = pack_cache.get_key("lab", "pc1", files)
+    mem_fs.writetext("/pc1.startup", "ip link set eth1 up")
+    assert pack_cache.get_key("lab", "pc1", files) != key
+
+
+def test_put_and_get(pack_cache, device_fs):
+    key = pack_cache.get_key("lab", "pc1", [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")])
+    assert pack_cache.get(key) is None
+    pack_cache.put("lab", key, b"archive")
+    assert pack_cache.get(key) == b"archive"
+    assert os.path.exists(os.path.join(pack_cache.path, "indexes", "lab.json"))
+
+
+def test_put_saves_index(pack_cache, device_fs):
+    files = [("hostlab/pc1/etc/frr.conf", device_fs, "/etc/frr.conf")]
+    key = pack_cache.get_key("lab", "pc1", files)
+    pack_cache.put("lab", key, b"archive")
+
+    pack_cache._indexes = {}
+    assert pack_cache.get_key("lab", "pc1", files) == key
+    assert device_fs.getsyspath("/etc/frr.conf") in pack_cache._indexes["lab"]
+
+
+def test_put_too_large(pack_cache):
+    pack_cache.put("lab", "key", b"a" * 2048)
+    assert pack_cache.get("key") is None
+
+
+def test_put_stream_entry_too_large(pack_cache):
+    chunks = [b"a" * 100, b"b" * 100]
+    assert list(pack_cache.put_stream("lab", "key", chunks, max_entry_size=150)) == chunks
+    assert pack_cache.get("key") is None
+    assert not os.listdir(os.path.join(pack_cache.path, "archives"))
+
+    assert list(pack_cache.put_stream("lab", "key", chunks, max_entry_size=200)) == chunks
+    assert pack_cache.get("key") == b"a" * 100 + b"b" * 100
+
+
+def test_put_evicts_least_recently_used(pack_cache):
+    pack_cache.put("lab", "key1", b"a" * 400)
+    pack_cache.put("lab", "key2", b"b" * 400)
+    os.utime(os.path.join(pack_cache.path, "archives", "key1"), (time.time() - 20, time.time() - 20))
+    os.utime(os.path.join(pack_cache.path, "archives", "key2"), (time.time() - 10, time.time() - 10))
+
+    # Reading key1 marks it as recently used, so key2 is evicted
+    assert pack_cache.get("key1") == b"a" * 400
+    pack_cache.put("lab", "key3", b"c" * 400)
+
+    assert pack_cache.get("key1") == b"a" * 400
+    assert pack_cache.get("key2") is None
+    assert pack_cache.get("key3") == b"c" * 400
+
+
+def test_clear(pack_cache):
+    pack_cache.put("lab", "key", b"archive")
+    pack_cache.clear()
+    assert pack_cache.get("key") is None
@@ -1,6 +1,8 @@
-import pytest
+import os
 import sys
 
+import pytest
+
 sys.path.insert(0, './')
 
 from src.Kathara.parser.netkit.DepParser import DepParser
@@ -25,3 +27,67 @@ def test_with_comment():
 def test_syntax_error():
     with pytest.raises(SyntaxError):
         DepParser.parse("tests/parser/labdep/syntax_error")
+
+
+def test_parse_graph():
+    dependencies = DepParser.parse_graph("tests/parser/labdep/three_devices_dependencies")
+    assert dependencies == {'pc1': ['pc2', 'pc3'], 'pc3': ['pc2']}
+
+
+def test_parse_graph_no_file():
+    assert DepParser.parse_graph("tests/parser/labdep") is None
+
+
+def test_devices_loop_members():
+    with pytest.raises(MachineDependencyError) as e:
+        DepParser.parse("tests/parser/labdep/devices_loop")
+    assert "pc1 -> pc2 -> pc3 -> pc1" in str(e.value)
+
+
+def test_levels():
+    levels = DepParser.levels({'pc1': ['pc2', 'pc3'], 'pc3': ['pc2'], 'pc4': ['pc2'], 'pc5': []})
+    assert levels == [['pc2', 'pc5'], ['pc3', 'pc4'], ['pc1']]
+
+
+def test_levels_self_loop():
+    with pytest.raises(MachineDependencyError) as e:
+        DepParser.levels({'pc1': ['pc1'], 'pc2': ['pc1']})
+    assert "pc1 -> pc1" in str(e.value)
+
+
+def test_find_loops():
+    loops = DepParser.find_loops({'a': ['b'], 'b': ['c', 'd'], 'c': ['a'], 'd': ['e'], 'e': ['d'], 'f': ['a']})
+    assert sorted(map(sorted, loops)) == [['a', 'b', 'c'], ['d', 'e']]
+
+
+def test_find_loops_no_loops():
+    assert DepParser.find_loops({'pc1': ['pc2', 'pc3'], 'pc3': ['pc2']}) == []
+
+
+def test_order_diamonds(tmp_path):
+    # Chain of 2500 diamonds (10k devices): exponential with a naive recursive ordering
+    lines = []
+    for i in range(2500):
+        lines.append(f"l{i}: t{i} r{i}")
+        lines.append(f"r{i}: t{i}")
+        lines.append(f"b{i}: l{i} r{i}")
+        if i > 0:
+            lines.append(f"t{i}: b{i - 1}")
+    with open(os.path.join(tmp_path, "lab.dep"), "w") as lab_dep:
+        lab_dep.write("\n".join(lines))
+
+    dependencies = DepParser.parse(str(tmp_path))
+
+    assert len(dependencies) == 10000
+    assert dependencies[0] == "t0" and dependencies[-1] == "b2499"
+
+
+def test_find_loops_large_loop():
+    # Single loop of 10k devices
+    dependencies = {f"pc{i}": [f"pc{(i + 1) % 10000}"] for i in range(10000)}
+
+    with pytest.raises(MachineDependencyError):
+        DepParser.levels(dependencies)
+
+    loops = DepParser.find_loops(dependencies)
+    assert len(loops) == 1 and len(loops[0]) == 10000
@@ -0,0 +1,248 @@
+import json
+import os
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, './')
+
+from src.Kathara.parser.netkit.DepParser import DepParser
+from src.Kathara.parser.netkit.ExtParser import ExtParser
+from src.Kathara.parser.netkit.LabCache import LabCache
+from src.Kathara.parser.netkit.LabParser import LabParser
+
+
+@pytest.fixture()
+def lab_cache(tmp_path, monkeypatch):
+    cache = LabCache.get_instance()
+    monkeypatch.setattr(cache, "path", os.path.join(tmp_path, "cache"))
+    return cache
+
+
+@pytest.fixture()
+def lab_path(tmp_path):
+    os.makedirs(os.path.join(tmp_path, "lab", "pc1"))
+    write_file(os.path.join(tmp_path, "lab", "lab.conf"), 'LAB_NAME="cached"\npc1[0]="A"\npc2[0]="A"\n')
+    return os.path.join(tmp_path, "lab")
+
+
+def write_file(path, content, age=10):
+    with open(path, "w") as file:
+        file.write(content)
+    # Files modified too recently are always hashed, so they are aged to test the stat check
+    modified_at = time.time() - age
+    os.utime(path, (modified_at, modified_at))
+
+
+def parse_lab(lab_path):
+    with mock.patch.object(LabParser, "_parse", wraps=LabParser._parse) as mock_parse:
+        lab = LabParser.parse(lab_path)
+    return lab, mock_parse.called
+
+
+def test_parse_cached(lab_cache, lab_path):
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+
+    (cached_lab, parsed) = parse_lab(lab_path)
+    assert not parsed
+    assert cached_lab.hash == lab.hash
+    assert cached_lab.name == "cached"
+    assert list(cached_lab.machines) == ["pc1", "pc2"]
+    assert list(cached_lab.links) == ["A"]
+    assert cached_lab.machines["pc1"].interfaces[0].link.name == "A"
+    assert cached_lab.machines["pc1"].fs is not None
+    assert cached_lab.machines["pc2"].fs is None
+
+
+def test_parse_cached_fs(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "pc1", "hello"), "world")
+    parse_lab(lab_path)
+
+    (cached_lab, parsed) = parse_lab(lab_path)
+    assert not parsed
+    assert cached_lab.machines["pc1"].fs.readtext("hello") == "world"
+    assert cached_lab.machines["pc1"].fs.delegate_fs() is cached_lab.fs
+
+
+def test_parse_content_changed(lab_cache, lab_path):
+    parse_lab(lab_path)
+    write_file(os.path.join(lab_path, "lab.conf"), 'LAB_NAME="cached"\npc1[0]="B"\npc2[0]="B"\n')
+
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+    assert list(lab.links) == ["B"]
+
+
+def test_parse_content_changed_same_stat(lab_cache, lab_path):
+    parse_lab(lab_path)
+    lab_conf_path = os.path.join(lab_path, "lab.conf")
+    stat = os.stat(lab_conf_path)
+    write_file(lab_conf_path, 'LAB_NAME="cached"\npc1[0]="B"\npc2[0]="B"\n')
+    os.utime(lab_conf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    # The stat is unchanged, so the entry is (knowingly) reused
+    (lab, parsed) = parse_lab(lab_path)
+    assert not parsed
+    assert list(lab.links) == ["A"]
+
+
+def test_parse_touched(lab_cache, lab_path):
+    parse_lab(lab_path)
+    lab_conf_path = os.path.join(lab_path, "lab.conf")
+    os.utime(lab_conf_path, (time.time() - 5, time.time() - 5))
+
+    with mock.patch.object(LabCache, "_get_file_digest", wraps=LabCache._get_file_digest) as mock_digest:
+        (_, parsed) = parse_lab(lab_path)
+        assert not parsed
+        assert mock_digest.call_count == 1
+
+        # The new modification time is stored, so the file is not hashed again
+        (_, parsed) = parse_lab(lab_path)
+        assert not parsed
+        assert mock_digest.call_count == 1
+
+
+def test_parse_recently_modified(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "lab.conf"), 'pc1[0]="A"\n', age=0)
+    parse_lab(lab_path)
+
+    with mock.patch.object(LabCache, "_get_file_digest", wraps=LabCache._get_file_digest) as mock_digest:
+        (_, parsed) = parse_lab(lab_path)
+        assert not parsed
+        assert mock_digest.called
+
+
+def test_parse_device_folder_added(lab_cache, lab_path):
+    parse_lab(lab_path)
+    os.makedirs(os.path.join(lab_path, "pc2"))
+
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+    assert lab.machines["pc2"].fs is not None
+
+
+def test_parse_different_path(lab_cache, lab_path, tmp_path):
+    # Without a name, the hash of the network scenario depends on the path as specified
+    write_file(os.path.join(lab_path, "lab.conf"), 'pc1[0]="A"\n')
+    (lab, _) = parse_lab(lab_path)
+
+    (other_lab, parsed) = parse_lab(os.path.join(tmp_path, "lab", ""))
+    assert parsed
+    assert other_lab.hash != lab.hash
+
+
+def test_parse_error_not_cached(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "lab.conf"), 'pc1[0]="A"\nwrong\n')
+
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            LabParser.parse(lab_path)
+
+    assert not os.path.exists(lab_cache.path)
+
+
+def test_parse_corrupted_entry(lab_cache, lab_path):
+    parse_lab(lab_path)
+    for entry in os.scandir(lab_cache.path):
+        with open(entry.path, "wb") as entry_file:
+            entry_file.write(b"corrupted")
+
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+    assert list(lab.machines) == ["pc1", "pc2"]
+
+
+def test_evict(lab_cache, lab_path, monkeypatch):
+    monkeypatch.setattr(lab_cache, "max_size", 1)
+    parse_lab(lab_path)
+
+    assert not os.listdir(lab_cache.path)
+
+
+def test_dep_parse_cached(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "lab.dep"), "pc2: pc1\n")
+    assert DepParser.parse(lab_path) == ["pc1", "pc2"]
+
+    with mock.patch.object(DepParser, "_parse_graph") as mock_parse_graph:
+        assert DepParser.parse(lab_path) == ["pc1", "pc2"]
+        assert not mock_parse_graph.called
+
+    write_file(os.path.join(lab_path, "lab.dep"), "pc1: pc2\n")
+    assert DepParser.parse(lab_path) == ["pc2", "pc1"]
+
+
+def test_ext_parse_cached(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "lab.ext"), "A eth0.10\n")
+    links = ExtParser.parse(lab_path)
+
+    with mock.patch.object(ExtParser, "_parse") as mock_parse:
+        cached_links = ExtParser.parse(lab_path)
+        assert not mock_parse.called
+
+    assert list(cached_links) == list(links) == ["A"]
+    assert cached_links["A"][0].interface == "eth0"
+    assert cached_links["A"][0].vlan == 10
+
+
+def test_parse_cached_metas(lab_cache, lab_path):
+    write_file(os.path.join(lab_path, "lab.conf"),
+               'LAB_DESCRIPTION="metas"\npc2[1]="A/00:00:00:00:00:01"\npc1[0]="A"\npc2[0]="B"\n'
+               'pc1[port]="8080:80/udp"\npc1[sysctl]="net.ipv4.ip_forward=1"\npc1[ulimit]="nofile=1024:2048"\n'
+               'pc1[privileged]="true"\npc1[exec]="ls"\npc1[image]="kathara/frr"\n')
+    (lab, _) = parse_lab(lab_path)
+
+    (cached_lab, parsed) = parse_lab(lab_path)
+    assert not parsed
+    assert cached_lab.hash == lab.hash
+    assert cached_lab.description == "metas"
+    assert list(cached_lab.machines) == ["pc2", "pc1"]
+    assert list(cached_lab.links["A"].machines) == ["pc2", "pc1"]
+    assert cached_lab.machines["pc1"].meta == lab.machines["pc1"].meta
+    assert cached_lab.machines["pc1"].meta["ports"] == {(8080, "udp"): 80}
+    assert cached_lab.machines["pc1"].get_image() == "kathara/frr"
+    assert [(number, interface.link.name, interface.mac_address)
+            for number, interface in cached_lab.machines["pc2"].interfaces.items()] == \
+           [(0, "B", None), (1, "A", "00:00:00:00:00:01")]
+
+
+def test_entry_is_data(lab_cache, lab_path):
+    parse_lab(lab_path)
+
+    (entry_path,) = [entry.path for entry in os.scandir(lab_cache.path)]
+    with open(entry_path) as entry_file:
+        entry = json.load(entry_file)
+    assert [machine[0] for machine in entry['data']['machines']] == ["pc1", "pc2"]
+
+
+def test_parse_tampered_entry(lab_cache, lab_path):
+    parse_lab(lab_path)
+    for entry in os.scandir(lab_cache.path):
+        with open(entry.path) as entry_file:
+            entry_content = json.load(entry_file)
+        entry_content['data'] = {'machines': [["pc1", {}, [[0, "Z", None]]]]}
+        with open(entry.path, "w") as entry_file:
+            json.dump(entry_content, entry_file)
+
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+    assert list(lab.links) == ["A"]
+
+
+def test_parse_large_lab(lab_cache, lab_path):
+    lines = []
+    for i in range(2500):
+        os.makedirs(os.path.join(lab_path, f"pc{i}"), exist_ok=True)
+        lines += [f'pc{i}[0]="A{i}"', f'pc{i}[1]="B{i % 100}"', f'pc{i}[image]="kathara/base"', f'pc{i}[mem]="64m"']
+    write_file(os.path.join(lab_path, "lab.conf"), "\n".join(lines) + "\n")
+
+    (lab, parsed) = parse_lab(lab_path)
+    assert parsed
+
+    (cached_lab, parsed) = parse_lab(lab_path)
+    assert not parsed
+    assert len(cached_lab.machines) == len(lab.machines) == 2500
+    assert cached_lab.machines["pc42"].interfaces[1].link.name == "B42"
+    assert list(cached_lab.links["B42"].machines) == list(lab.links["B42"].machines)
@@ -4,6 +4,7 @@ import pytest
 
 from src.Kathara.exceptions import InterfaceMacAddressError
 from src.Kathara.exceptions import MachineCollisionDomainError
+from src.Kathara.model.Lab import Lab
 from src.Kathara.parser.netkit.LabParser import LabParser
 
 def test_one_device():
@@ -102,3 +103,30 @@ def test_mac_address_error():
 def test_mac_address_parse_error():
     with pytest.raises(SyntaxError):
         LabParser.parse("tests/parser/labconf/mac_address_parse_error")
+
+
+def test_parse_name(tmp_path):
+    (tmp_path / "lab.conf").write_text('LAB_DESCRIPTION="Description"\nLAB_NAME="first"\npc1[0]=A\nLAB_NAME="test_lab"\n')
+    assert LabParser.parse_name(str(tmp_path)) == "test_lab"
+
+
+def test_parse_name_not_specified():
+    assert LabParser.parse_name("tests/parser/labconf/one_device") is None
+
+
+def test_parse_name_no_lab_conf(tmp_path):
+    assert LabParser.parse_name(str(tmp_path)) is None
+
+
+def test_parse_hash_with_lab_name(tmp_path):
+    (tmp_path / "lab.conf").write_text('LAB_NAME="test_lab"\npc1[0]=A\n')
+    assert LabParser.parse_hash(str(tmp_path)) == LabParser.parse(str(tmp_path)).hash
+
+
+def test_parse_hash_without_lab_name():
+    path = "tests/parser/labconf/one_device"
+    assert LabParser.parse_hash(path) == LabParser.parse(path).hash
+
+
+def test_parse_hash_no_lab_conf(tmp_path):
+    assert LabParser.parse_hash(str(tmp_path)) == Lab(None, path=str(tmp_path)).hash
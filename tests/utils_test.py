@@ -1,8 +1,14 @@
+import io
 import sys
+import tarfile
+from unittest import mock
+
+import pytest
 
 sys.path.insert(0, './')
 
-from src.Kathara.utils import parse_docker_engine_version
+from src.Kathara.utils import parse_docker_engine_version, stream_tar, pack_files_for_tar, \
+    convert_win_2_linux_content, write_output
 
 
 def test_docker_engine_version_numbers_only():
@@ -19,3 +25,84 @@ def test_docker_engine_version_debian_str_tilde():
 
 def test_docker_engine_version_debian_str_nosep():
     assert parse_docker_engine_version('20.10.5dfsg1') == '20.10.5'
+
+
+def test_stream_tar_uncompressed():
+    tar_info = tarfile.TarInfo("dir/file")
+    tar_info.size = 5
+    chunks = list(stream_tar([(tar_info, io.BytesIO(b"hello"))], chunk_size=2))
+
+    tar_data = b"".join(chunks)
+    assert len(tar_data) % tarfile.RECORDSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:") as tar:
+        assert tar.extractfile("dir/file").read() == b"hello"
+
+
+def test_stream_tar_gz():
+    dir_info = tarfile.TarInfo("dir")
+    dir_info.type = tarfile.DIRTYPE
+    tar_info = tarfile.TarInfo("dir/file")
+    tar_info.size = 3 * 1024 * 1024
+    content = bytes(range(256)) * (tar_info.size // 256)
+
+    tar_data = b"".join(stream_tar([(dir_info, None), (tar_info, io.BytesIO(content))], compression="gz"))
+
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:gz") as tar:
+        assert tar.getmember("dir").isdir()
+        assert tar.extractfile("dir/file").read() == content
+
+
+def test_stream_tar_is_lazy():
+    def entries():
+        tar_info = tarfile.TarInfo("file1")
+        tar_info.size = 1
+        yield tar_info, io.BytesIO(b"1")
+        raise RuntimeError("Second entry read")
+
+    tar_stream = stream_tar(entries())
+    assert next(tar_stream)
+    with pytest.raises(RuntimeError):
+        list(tar_stream)
+
+
+def test_stream_tar_truncated_file():
+    tar_info = tarfile.TarInfo("file")
+    tar_info.size = 10
+    with pytest.raises(OSError):
+        list(stream_tar([(tar_info, io.BytesIO(b"short"))]))
+
+
+def test_stream_tar_invalid_compression():
+    with pytest.raises(ValueError):
+        list(stream_tar([], compression="bz2"))
+
+
+def test_pack_files_for_tar():
+    tar_data = pack_files_for_tar({"/etc/file": io.BytesIO(b"content")})
+
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r:") as tar:
+        assert tar.extractfile("/etc/file").read() == b"content"
+
+
+def test_convert_win_2_linux_content():
+    assert convert_win_2_linux_content("\ufeffline1\r\nline2\r".encode("utf-8")) == b"line1\nline2\n"
+    binary_content = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+    assert convert_win_2_linux_content(binary_content) == binary_content
+
+
+def test_write_output():
+    output = mock.Mock()
+
+    write_output(output, b"\xc3\xa8 raw")
+
+    output.flush.assert_called_once()
+    output.buffer.write.assert_called_once_with(b"\xc3\xa8 raw")
+    assert not output.write.called
+
+
+def test_write_output_no_buffer():
+    output = io.StringIO()
+
+    write_output(output, b"\xc3\xa8 raw \xff")
+
+    assert output.getvalue() == "è raw �"